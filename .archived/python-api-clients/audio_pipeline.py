@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Pipelined Episode Audio Production
+Overlaps chunk synthesis, chunk-level STT validation and MP3 concatenation.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Optional
+
+from mp3_concat import MP3Concatenator, MP3FormatError
+from tts_direct_api import ElevenLabsDirectAPI, load_production_config, plan_summary, print_plan
+from stt_validation import ElevenLabsSTTValidator
+
+
+class AudioPipeline:
+    """
+    Streaming synthesize → validate → concatenate stage
+
+    Chunks are synthesized concurrently; each finished chunk goes straight
+    to STT validation on its own worker pool, and a chunk is appended to
+    the final MP3 as soon as it and every chunk before it are accepted.
+    A chunk whose transcript falls below ``min_word_accuracy`` is
+    re-synthesized in place (bypassing the cache) up to ``max_resynthesis``
+    times. Since the stages overlap, wall time approaches the slowest stage
+    rather than the sum of all three.
+    """
+
+    def __init__(self, tts_client: ElevenLabsDirectAPI, stt_validator: ElevenLabsSTTValidator = None,
+                 min_word_accuracy: float = 85.0, max_resynthesis: int = 1, stt_concurrency: int = 2):
+        """
+        Initialize the pipeline
+
+        Args:
+            tts_client: Chunked synthesis client (its max_concurrency sizes the TTS pool)
+            stt_validator: Chunk validator; None skips validation
+            min_word_accuracy: Word accuracy (%) below which a chunk is re-synthesized
+            max_resynthesis: Re-synthesis rounds allowed per chunk
+            stt_concurrency: Concurrent STT requests
+        """
+        self.tts = tts_client
+        self.stt = stt_validator
+        self.min_word_accuracy = min_word_accuracy
+        self.max_resynthesis = max_resynthesis
+        self.stt_concurrency = stt_concurrency
+
+    def _synthesize(self, chunk: str, chunk_path: str, index: int, total: int, use_cache: bool,
+                    model_id: str) -> dict:
+        start = time.perf_counter()
+        result = self.tts._synthesize_with_retries(chunk, chunk_path, index, total, use_cache=use_cache,
+                                                   model_id=model_id)
+        result["stage_seconds"] = time.perf_counter() - start
+        return result
+
+    def _validate(self, chunk: str, chunk_path: str) -> dict:
+        start = time.perf_counter()
+        result = self.stt.validate_chunk(chunk_path, chunk)
+        result["stage_seconds"] = time.perf_counter() - start
+        return result
+
+    def run(self, script_path: str, output_directory: str, episode_name: str = "episode_1",
+            max_chunk_size: Optional[int] = None, model_id: Optional[str] = None) -> dict:
+        """
+        Produce the final episode MP3 from an SSML script
+
+        Chunking and model come from the same planner as
+        ElevenLabsDirectAPI.synthesize_episode, and every cost figure is
+        priced at the chosen model's rate.
+
+        Args:
+            script_path: Path to SSML script file
+            output_directory: Directory for chunk files, final audio and log
+            episode_name: Episode identifier
+            max_chunk_size: Maximum characters per synthesis chunk (default: chosen by the planner)
+            model_id: ElevenLabs model (default: chosen by the planner)
+
+        Returns:
+            Pipeline log with per-chunk records and stage timings
+        """
+        print(f"\n🚀 Starting Audio Pipeline: {episode_name}")
+
+        try:
+            with open(script_path, 'r', encoding='utf-8') as f:
+                script_content = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            return {"success": False, "error": f"Script read error: {str(e)}"}
+        if not script_content.strip():
+            return {"success": False, "error": "Script file is empty"}
+
+        os.makedirs(output_directory, exist_ok=True)
+        try:
+            plan = self.tts.plan_episode(script_content, max_chunk_size, model_id, output_directory)
+        except ValueError as e:
+            return {"success": False, "error": f"Script chunking error: {str(e)}"}
+        print_plan(plan)
+        chunks = [chunk.content for chunk in plan.chunks]
+        price_per_1k = plan.price_per_1k_characters
+        total = len(chunks)
+        chunk_paths = [os.path.join(output_directory, f"{episode_name}_chunk_{i+1:03d}.mp3")
+                       for i in range(total)]
+        final_audio_path = os.path.join(output_directory, f"{episode_name}_final.mp3")
+
+        pipeline_log = {
+            "episode_name": episode_name,
+            "script_path": script_path,
+            "total_chunks": total,
+            "total_characters": len(script_content),
+            "model_id": plan.model,
+            "plan": plan_summary(plan),
+            "chunks_synthesized": 0,
+            "chunks_appended": 0,
+            "failed_chunks": [],
+            "resynthesized_chunks": [],
+            "low_accuracy_chunks": [],
+            "unvalidated_chunks": [],
+            "chunks": [None] * total,
+            "errors": [],
+            "start_time": datetime.now().isoformat(),
+            "estimated_cost": plan.cost,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "characters_synthesized": 0,
+            "cost_saved": 0.0
+        }
+        stage_seconds = {"synthesize": 0.0, "validate": 0.0, "concatenate": 0.0}
+        started = time.perf_counter()
+        first_append_at = None
+
+        accepted = [False] * total
+        next_to_append = 0
+        join_failed = False
+        joiner = MP3Concatenator(final_audio_path)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.tts.max_concurrency, thread_name_prefix="tts") as tts_pool, \
+                    ThreadPoolExecutor(max_workers=self.stt_concurrency, thread_name_prefix="stt") as stt_pool:
+                pending = {
+                    tts_pool.submit(self._synthesize, chunk, chunk_paths[i], i, total, True,
+                                    plan.model): ("synthesize", i)
+                    for i, chunk in enumerate(chunks)
+                }
+
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        stage, i = pending.pop(future)
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            # A raising stage (e.g. the cache failing to store a chunk) is
+                            # one chunk's error, not the episode's
+                            result = {"success": False, "error": f"{type(e).__name__}: {str(e)}",
+                                      "stage_seconds": 0.0}
+                        stage_seconds[stage] += result.pop("stage_seconds")
+                        record = pipeline_log["chunks"][i]
+
+                        if stage == "synthesize":
+                            if not result["success"]:
+                                pipeline_log["failed_chunks"].append(i+1)
+                                pipeline_log["errors"].append({"chunk_number": i+1, "error": result["error"]})
+                                continue
+
+                            if record is None:
+                                pipeline_log["chunks_synthesized"] += 1
+                                record = pipeline_log["chunks"][i] = {
+                                    "chunk_number": i+1,
+                                    "file_path": result["file_path"],
+                                    "characters": result["characters"],
+                                    "synthesis_rounds": 0,
+                                    "attempts": 0
+                                }
+                            record["synthesis_rounds"] += 1
+                            record["attempts"] += result["attempts"]
+                            record["file_size"] = result["size"]
+                            record["cached"] = result.get("cached", False)
+                            if record["cached"]:
+                                pipeline_log["cache_hits"] += 1
+                                pipeline_log["cost_saved"] += result["characters"] / 1000 * price_per_1k
+                            else:
+                                pipeline_log["cache_misses"] += 1
+                                pipeline_log["characters_synthesized"] += result["characters"]
+
+                            if self.stt:
+                                pending[stt_pool.submit(self._validate, chunks[i], chunk_paths[i])] = ("validate", i)
+                            else:
+                                accepted[i] = True
+                            continue
+
+                        # Validation result
+                        if not result["success"]:
+                            record["validation_error"] = result["error"]
+                            pipeline_log["unvalidated_chunks"].append(i+1)
+                            accepted[i] = True
+                            continue
+
+                        record["word_accuracy_percent"] = result["word_accuracy_percent"]
+                        if result["word_accuracy_percent"] >= self.min_word_accuracy:
+                            accepted[i] = True
+                        elif record["synthesis_rounds"] <= self.max_resynthesis:
+                            print(f"🔁 Chunk {i+1} word accuracy {result['word_accuracy_percent']}% - re-synthesizing")
+                            pipeline_log["resynthesized_chunks"].append(i+1)
+                            pending[tts_pool.submit(self._synthesize, chunks[i], chunk_paths[i], i, total,
+                                                    False, plan.model)] = ("synthesize", i)
+                        else:
+                            pipeline_log["low_accuracy_chunks"].append(i+1)
+                            accepted[i] = True
+
+                    # Append every chunk whose predecessors are all in the final file
+                    append_start = time.perf_counter()
+                    while not join_failed and next_to_append < total and accepted[next_to_append]:
+                        try:
+                            joiner.append(chunk_paths[next_to_append])
+                        except (OSError, MP3FormatError) as e:
+                            join_failed = True
+                            pipeline_log["errors"].append({"chunk_number": next_to_append + 1,
+                                                           "error": f"Concatenation failed: {str(e)}"})
+                            break
+                        next_to_append += 1
+                        if first_append_at is None:
+                            first_append_at = time.perf_counter() - started
+                    stage_seconds["concatenate"] += time.perf_counter() - append_start
+
+            pipeline_log["chunks_appended"] = next_to_append
+            if next_to_append == total and not join_failed:
+                append_start = time.perf_counter()
+                pipeline_log["final_audio"] = joiner.close()
+                stage_seconds["concatenate"] += time.perf_counter() - append_start
+                pipeline_log["final_audio_path"] = final_audio_path
+                pipeline_log["success"] = True
+                print(f"🎯 Episode audio complete: {final_audio_path}")
+            else:
+                joiner.abort()
+                pipeline_log["success"] = False
+                print(f"❌ Pipeline incomplete: {next_to_append}/{total} chunks in final audio")
+        except BaseException:
+            joiner.abort()
+            raise
+
+        wall_seconds = time.perf_counter() - started
+        pipeline_log["chunks"] = [record for record in pipeline_log["chunks"] if record]
+        pipeline_log["failed_chunks"].sort()
+        pipeline_log["timing"] = {
+            "wall_seconds": round(wall_seconds, 3),
+            "stage_busy_seconds": {stage: round(seconds, 3) for stage, seconds in stage_seconds.items()},
+            "sequential_seconds": round(sum(stage_seconds.values()), 3),
+            "first_append_seconds": round(first_append_at, 3) if first_append_at is not None else None
+        }
+        pipeline_log["rate_limiter"] = self.tts.rate_limiter.get_stats()
+        pipeline_log["http"] = self.tts.http.get_stats()
+        pipeline_log["end_time"] = datetime.now().isoformat()
+        pipeline_log["actual_cost"] = pipeline_log["characters_synthesized"] / 1000 * price_per_1k
+
+        print(f"⏱️ Wall time {pipeline_log['timing']['wall_seconds']}s vs "
+              f"{pipeline_log['timing']['sequential_seconds']}s of stage work")
+
+        log_path = os.path.join(output_directory, f"{episode_name}_pipeline_log.json")
+        with open(log_path, 'w') as f:
+            json.dump(pipeline_log, f, indent=2)
+        print(f"📊 Pipeline log saved: {log_path}")
+
+        return pipeline_log
+
+
+def main():
+    """Run the full audio pipeline for Episode 1"""
+    print("🎙️ Episode 1 Audio Pipeline - Synthesis, Validation, Concatenation")
+    print("=" * 60)
+
+    api_key = os.getenv('ELEVENLABS_API_KEY')
+    if not api_key:
+        print("❌ ELEVENLABS_API_KEY environment variable not set")
+        return
+
+    config = load_production_config()
+    tts = ElevenLabsDirectAPI(api_key, config.get("voice_id", "ZF6FPAbjXT4488VcRRnw"))
+    validation = tts.validate_api_key()
+    if not validation["success"]:
+        print(f"❌ API validation failed: {validation['error']}")
+        return
+
+    pipeline = AudioPipeline(tts, ElevenLabsSTTValidator(api_key))
+    result = pipeline.run("nobody-knows/production/ep_001_test/script/tts_optimized_script.ssml",
+                          "nobody-knows/production/ep_001_test/audio", "episode_1_pipeline")
+
+    print("\n" + "=" * 60)
+    print(f"{'🎯 Status: SUCCESS' if result.get('success') else '❌ Status: FAILED'}")
+    if "timing" in result:
+        print(f"⏱️ Timing: {result['timing']}")
+    if result.get("low_accuracy_chunks"):
+        print(f"⚠️ Low accuracy chunks kept: {result['low_accuracy_chunks']}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
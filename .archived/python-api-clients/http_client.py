@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Client for ElevenLabs API Clients
+Pooled keep-alive session with per-request DNS/connect/TLS/TTFB/transfer timing.
+"""
+
+import hashlib
+import os
+import socket
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+_active = threading.local()
+
+# Streamed downloads are written in blocks of this size
+DOWNLOAD_BLOCK_SIZE = 64 * 1024
+
+
+@dataclass
+class RequestTiming:
+    """Phase breakdown of one HTTP request (seconds)"""
+    method: str
+    url: str
+    status: int = 0
+    dns: float = 0.0
+    connect: float = 0.0
+    tls: float = 0.0
+    ttfb: float = 0.0
+    transfer: float = 0.0
+    total: float = 0.0
+    bytes_received: int = 0
+    reused_connection: bool = True
+
+
+def _timing() -> Optional[RequestTiming]:
+    return getattr(_active, "timing", None)
+
+
+class _TimedConnectionMixin:
+    """Records DNS and TCP connect time of new connections on the calling thread"""
+
+    def _new_conn(self):
+        timing = _timing()
+        if timing is None:
+            return super()._new_conn()
+
+        timing.reused_connection = False
+        start = time.perf_counter()
+        original_host = self._dns_host
+        try:
+            # Resolve once, timed; every resolved address is then tried in
+            # order, as urllib3 would (e.g. AAAA, then A when IPv6 is broken).
+            # The Host header and TLS SNI still use the original hostname.
+            addresses = list(dict.fromkeys(
+                sockaddr[0] for _, _, _, _, sockaddr in socket.getaddrinfo(
+                    original_host.strip("[]"), self.port, allowed_gai_family(), socket.SOCK_STREAM)))
+        except socket.gaierror:
+            addresses = [original_host]  # let urllib3 raise its own resolution error
+        resolved = time.perf_counter()
+        timing.dns += resolved - start
+
+        try:
+            for attempt, address in enumerate(addresses, 1):
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except (NewConnectionError, ConnectTimeoutError):
+                    if attempt == len(addresses):
+                        raise
+        finally:
+            self._dns_host = original_host
+            timing.connect += time.perf_counter() - resolved
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+
+    def connect(self):
+        timing = _timing()
+        start = time.perf_counter()
+        before = (timing.dns + timing.connect) if timing else 0.0
+        super().connect()
+        if timing is not None:
+            # Whatever connect() spent beyond DNS + TCP is the TLS handshake
+            timing.tls += (time.perf_counter() - start) - (timing.dns + timing.connect - before)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools create timed connections"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+class PooledHTTPClient:
+    """
+    Keep-alive HTTP client shared by the TTS and STT clients
+
+    One requests.Session with a connection pool per host, so consecutive
+    chunk requests reuse an open TCP/TLS connection instead of paying the
+    handshake every time. ``pool_maxsize`` with ``pool_block`` caps the
+    connections to a single host; ``host_limits`` adds stricter caps for
+    specific hosts (e.g. a plan's concurrency limit). Every response gets a
+    ``timing`` attribute (RequestTiming) and recent timings are kept for
+    ``get_stats()``.
+    """
+
+    def __init__(self, pool_connections: int = 4, pool_maxsize: int = 8, pool_block: bool = True,
+                 host_limits: Optional[Dict[str, int]] = None, history_size: int = 500):
+        """
+        Initialize the pooled session
+
+        Args:
+            pool_connections: Number of hosts to keep pools for
+            pool_maxsize: Connections kept open per host
+            pool_block: Wait for a free connection instead of opening extra ones
+            host_limits: Maximum concurrent requests per hostname
+            history_size: Recent request timings retained for statistics
+        """
+        self.session = requests.Session()
+        adapter = _TimedAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                pool_block=pool_block)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.host_limits = {host: threading.BoundedSemaphore(limit)
+                            for host, limit in (host_limits or {}).items()}
+        self.timings = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _host_slot(self, url: str):
+        semaphore = self.host_limits.get(urlsplit(url).hostname or "")
+        if semaphore is None:
+            yield
+            return
+        with semaphore:
+            yield
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the pool; the response carries ``.timing``"""
+        timing = RequestTiming(method=method.upper(), url=url)
+        _active.timing = timing
+        start = time.perf_counter()
+        try:
+            with self._host_slot(url):
+                response = self.session.request(method, url, **kwargs)
+        finally:
+            _active.timing = None
+
+        timing.total = time.perf_counter() - start
+        headers_at = response.elapsed.total_seconds()
+        timing.ttfb = max(0.0, headers_at - timing.dns - timing.connect - timing.tls)
+        timing.transfer = max(0.0, timing.total - headers_at)
+        timing.status = response.status_code
+        if not kwargs.get("stream"):
+            timing.bytes_received = len(response.content)
+
+        response.timing = timing
+        with self._lock:
+            self.timings.append(timing)
+        return response
+
+    def download(self, method: str, url: str, output_path: str, block_size: int = DOWNLOAD_BLOCK_SIZE,
+                 progress_callback: Optional[Callable[[int, Optional[int]], None]] = None,
+                 **kwargs) -> requests.Response:
+        """
+        Stream a successful response body to ``output_path`` in fixed-size blocks
+
+        Peak memory is one block regardless of audio length. The body is
+        hashed as it streams and written to a temp file that is renamed into
+        place only once complete, so a dropped connection never leaves a
+        truncated file behind. Non-200 responses are read normally (they are
+        small error documents) and nothing is written.
+
+        Args:
+            progress_callback: Called as ``callback(bytes_written, total_bytes_or_None)``
+
+        Returns:
+            The response, with ``bytes_written`` and ``sha256`` attributes on success
+        """
+        kwargs["stream"] = True
+        response = self.request(method, url, **kwargs)
+        response.bytes_written = 0
+        response.sha256 = None
+        if response.status_code != 200:
+            response.content  # read the error body; releases the connection
+            return response
+
+        total = response.headers.get("Content-Length")
+        total = int(total) if total and total.isdigit() else None
+        digest = hashlib.sha256()
+        started = time.perf_counter()
+
+        directory = os.path.dirname(os.path.abspath(output_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for block in response.iter_content(chunk_size=block_size):
+                    if not block:
+                        continue
+                    f.write(block)
+                    digest.update(block)
+                    response.bytes_written += len(block)
+                    if progress_callback:
+                        progress_callback(response.bytes_written, total)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        finally:
+            response.close()
+
+        response.sha256 = digest.hexdigest()
+        response.timing.transfer = time.perf_counter() - started
+        response.timing.total += response.timing.transfer
+        response.timing.bytes_received = response.bytes_written
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def get_stats(self) -> dict:
+        """Average phase times and connection reuse over recent requests"""
+        with self._lock:
+            timings = list(self.timings)
+        if not timings:
+            return {"requests": 0}
+
+        count = len(timings)
+        stats = {
+            "requests": count,
+            "connections_opened": sum(1 for t in timings if not t.reused_connection),
+            "connection_reuse_rate": sum(1 for t in timings if t.reused_connection) / count,
+            "bytes_received": sum(t.bytes_received for t in timings)
+        }
+        for phase in ("dns", "connect", "tls", "ttfb", "transfer", "total"):
+            stats[f"avg_{phase}_ms"] = round(sum(getattr(t, phase) for t in timings) / count * 1000, 2)
+        return stats
+
+    def recent_timings(self, limit: int = 10) -> list:
+        with self._lock:
+            return [asdict(t) for t in list(self.timings)[-limit:]]
+
+    def close(self):
+        self.session.close()
+
+
+_shared_client: Optional[PooledHTTPClient] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_client() -> PooledHTTPClient:
+    """Process-wide pooled client so all API clients share open connections"""
+    global _shared_client
+
+    if _shared_client is None:
+        with _shared_lock:
+            if _shared_client is None:
+                _shared_client = PooledHTTPClient()
+    return _shared_client
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+MP3 Frame Concatenation
+Joins synthesized MP3 chunks frame by frame in-process, without ffmpeg.
+"""
+
+import mmap
+import os
+import tempfile
+from array import array
+from typing import NamedTuple, Optional
+
+# Frames are copied to the output in runs of at most this many bytes
+COPY_BLOCK_SIZE = 1024 * 1024
+
+# Bitrates in kbps by (low sampling frequency, layer)
+_BITRATES = {
+    (False, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (False, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (False, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (True, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (True, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (True, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+# Sample rates by version bits (0 = MPEG 2.5, 2 = MPEG 2, 3 = MPEG 1)
+_SAMPLE_RATES = {
+    0: (11025, 12000, 8000),
+    2: (22050, 24000, 16000),
+    3: (44100, 48000, 32000),
+}
+
+_XING_FLAGS = 0x0001 | 0x0002 | 0x0004  # frames, bytes, TOC
+
+
+class MP3FormatError(ValueError):
+    """Raised when a chunk has no usable MPEG audio or does not match the others"""
+
+
+class FrameHeader(NamedTuple):
+    raw: bytes
+    layer: int
+    bitrate: int
+    sample_rate: int
+    mono: bool
+    protected: bool
+    length: int
+    samples: int
+
+    @property
+    def stream_format(self) -> tuple:
+        """Fields that must agree for frames to be played back as one stream"""
+        return (self.raw[1] & 0xFE, self.sample_rate, self.mono)
+
+    @property
+    def side_info_size(self) -> int:
+        lsf = (self.raw[1] >> 3) & 3 != 3
+        if lsf:
+            return 9 if self.mono else 17
+        return 17 if self.mono else 32
+
+
+def parse_frame_header(data, offset: int = 0) -> Optional[FrameHeader]:
+    """
+    Decode the 4-byte MPEG audio frame header at ``offset``
+
+    Returns:
+        FrameHeader, or None if the bytes are not a valid header
+        (free-format bitrates are not supported)
+    """
+    raw = bytes(data[offset:offset + 4])
+    if len(raw) < 4 or raw[0] != 0xFF or raw[1] & 0xE0 != 0xE0:
+        return None
+
+    version_bits = (raw[1] >> 3) & 3
+    layer_bits = (raw[1] >> 1) & 3
+    bitrate_index = raw[2] >> 4
+    rate_index = (raw[2] >> 2) & 3
+    if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    lsf = version_bits != 3
+    layer = 4 - layer_bits
+    bitrate = _BITRATES[(lsf, layer)][bitrate_index]
+    sample_rate = _SAMPLE_RATES[version_bits][rate_index]
+    padding = (raw[2] >> 1) & 1
+
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate * 1000 // sample_rate + padding) * 4
+    else:
+        samples = 576 if layer == 3 and lsf else 1152
+        length = samples // 8 * bitrate * 1000 // sample_rate + padding
+
+    return FrameHeader(raw=raw, layer=layer, bitrate=bitrate, sample_rate=sample_rate,
+                       mono=raw[3] >> 6 == 3, protected=not raw[1] & 1,
+                       length=length, samples=samples)
+
+
+def _audio_bounds(data) -> tuple:
+    """Byte range of ``data`` left after leading ID3v2 and trailing ID3v1/APEv2 tags"""
+    start, end = 0, len(data)
+
+    while end - start >= 10 and data[start:start + 3] == b"ID3":
+        size = 0
+        for byte in data[start + 6:start + 10]:
+            size = (size << 7) | (byte & 0x7F)
+        footer = 10 if data[start + 5] & 0x10 else 0
+        start += 10 + size + footer
+
+    if end - start >= 128 and data[end - 128:end - 125] == b"TAG":
+        end -= 128
+    if end - start >= 32 and data[end - 32:end - 24] == b"APETAGEX":
+        tag_size = int.from_bytes(data[end - 20:end - 16], "little")
+        flags = int.from_bytes(data[end - 12:end - 8], "little")
+        end -= tag_size + (32 if flags & 0x80000000 else 0)
+
+    return min(start, len(data)), max(end, 0)
+
+
+def _is_vbr_info_frame(data, offset: int, header: FrameHeader) -> bool:
+    """True for a Xing/Info or VBRI metadata frame (carries no audio)"""
+    if header.layer != 3:
+        return False
+    tag_offset = offset + 4 + (2 if header.protected else 0) + header.side_info_size
+    if data[tag_offset:tag_offset + 4] in (b"Xing", b"Info"):
+        return True
+    return data[offset + 36:offset + 40] == b"VBRI"
+
+
+class MP3Concatenator:
+    """
+    Frame-level MP3 joiner
+
+    Each appended chunk is memory-mapped and scanned frame by frame; ID3
+    and APE tags, the chunk's own Xing/Info/VBRI frame and any junk between
+    frames are dropped, and runs of audio frames are copied straight from
+    the map to the output. On ``close()`` a single Xing (VBR) or Info (CBR)
+    frame with frame count, byte count and seek TOC is written at the start
+    and the file is renamed into place. Source chunks are never modified,
+    so a failed join can simply be retried.
+    """
+
+    def __init__(self, output_path: str):
+        """
+        Open a temp file next to ``output_path``
+
+        Args:
+            output_path: Final MP3 path, written atomically on close()
+        """
+        self.output_path = output_path
+        fd, self._tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output_path)),
+                                              suffix=".part")
+        self._file = os.fdopen(fd, "wb")
+        self._format: Optional[FrameHeader] = None
+        self._info_frame_size = 0
+        self._frame_offsets = array("Q")
+        self._audio_bytes = 0
+        self._bitrates = set()
+
+        self.sources = 0
+        self.frames = 0
+        self.samples = 0
+        self.skipped_bytes = 0
+
+    def _start_stream(self, header: FrameHeader):
+        self._format = header
+        if header.layer == 3:
+            self._info_frame_size = len(self._info_frame(0, 0, bytes(100)))
+            self._file.write(bytes(self._info_frame_size))  # placeholder until close()
+
+    def _in_sync(self, data, offset: int, end: int, header: FrameHeader) -> bool:
+        """A frame is accepted only if the next one (or the end of the audio) follows it"""
+        following = offset + header.length
+        if following > end:
+            return False
+        if end - following < 4:
+            return True
+        next_header = parse_frame_header(data, following)
+        return next_header is not None and next_header.stream_format == header.stream_format
+
+    def _copy(self, data, start: int, stop: int):
+        for block_start in range(start, stop, COPY_BLOCK_SIZE):
+            self._file.write(data[block_start:min(stop, block_start + COPY_BLOCK_SIZE)])
+
+    def append(self, path: str) -> int:
+        """
+        Append the audio frames of one MP3 chunk
+
+        Returns:
+            Number of audio frames appended
+
+        Raises:
+            MP3FormatError: The chunk holds no frames or its sample rate,
+                channel count or MPEG version differs from earlier chunks
+        """
+        if os.path.getsize(path) == 0:
+            raise MP3FormatError(f"{path}: empty file")
+
+        appended = 0
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            offset, end = _audio_bounds(data)
+            run_start = run_end = offset
+
+            while offset + 4 <= end:
+                header = parse_frame_header(data, offset)
+                if header is None or not self._in_sync(data, offset, end, header):
+                    next_sync = data.find(b"\xff", offset + 1, end)
+                    next_sync = end if next_sync < 0 else next_sync
+                    self.skipped_bytes += next_sync - offset
+                    offset = next_sync
+                    continue
+
+                if appended == 0 and _is_vbr_info_frame(data, offset, header):
+                    self.skipped_bytes += header.length
+                    offset += header.length
+                    continue
+
+                if self._format is None:
+                    self._start_stream(header)
+                elif header.stream_format != self._format.stream_format:
+                    raise MP3FormatError(
+                        f"{path}: {header.sample_rate} Hz {'mono' if header.mono else 'stereo'} "
+                        f"does not match {self._format.sample_rate} Hz "
+                        f"{'mono' if self._format.mono else 'stereo'} of earlier chunks")
+
+                if offset != run_end:
+                    self._copy(data, run_start, run_end)
+                    run_start = offset
+                run_end = offset + header.length
+
+                self._frame_offsets.append(self._info_frame_size + self._audio_bytes)
+                self._audio_bytes += header.length
+                self._bitrates.add(header.bitrate)
+                self.samples += header.samples
+                appended += 1
+                offset += header.length
+
+            self._copy(data, run_start, run_end)
+            self.skipped_bytes += max(0, end - offset)
+
+        if appended == 0:
+            raise MP3FormatError(f"{path}: no MPEG audio frames found")
+
+        self.frames += appended
+        self.sources += 1
+        return appended
+
+    def _info_frame(self, frames: int, total_bytes: int, toc: bytes) -> bytes:
+        """Xing/Info frame matching the stream format, sized to hold the full header"""
+        header = self._format
+        needed = 4 + header.side_info_size + 4 + 4 + 4 + 4 + 100
+        lsf = (header.raw[1] >> 3) & 3 != 3
+
+        for bitrate_index in range(1, 15):
+            frame_header = bytes((0xFF, header.raw[1] | 0x01,
+                                  (bitrate_index << 4) | (header.raw[2] & 0x0C), header.raw[3]))
+            info = parse_frame_header(frame_header)
+            if info.length >= needed:
+                break
+
+        tag = b"Xing" if len(self._bitrates) > 1 else b"Info"
+        body = (tag + _XING_FLAGS.to_bytes(4, "big") + frames.to_bytes(4, "big")
+                + total_bytes.to_bytes(4, "big") + toc)
+        frame = frame_header + bytes(header.side_info_size) + body
+        return frame + bytes(info.length - len(frame))
+
+    def _toc(self, total_bytes: int) -> bytes:
+        """100-entry seek table: file position (/256) at each percent of duration"""
+        toc = bytearray(100)
+        for percent in range(100):
+            frame_offset = self._frame_offsets[min(self.frames - 1, percent * self.frames // 100)]
+            toc[percent] = min(255, frame_offset * 256 // total_bytes)
+        return bytes(toc)
+
+    def close(self) -> dict:
+        """
+        Write the Xing/Info frame and move the file into place
+
+        Returns:
+            Frame count, duration, size and skipped-byte statistics
+        """
+        if self.frames == 0:
+            self.abort()
+            raise MP3FormatError("No MPEG audio frames to write")
+
+        try:
+            total_bytes = self._info_frame_size + self._audio_bytes
+            if self._info_frame_size:
+                self._file.seek(0)
+                self._file.write(self._info_frame(self.frames, total_bytes, self._toc(total_bytes)))
+            self._file.close()
+            os.replace(self._tmp_path, self.output_path)
+        except BaseException:
+            self.abort()
+            raise
+
+        return {
+            "output_path": self.output_path,
+            "sources": self.sources,
+            "frames": self.frames,
+            "duration_seconds": round(self.samples / self._format.sample_rate, 3),
+            "bytes": total_bytes,
+            "vbr": len(self._bitrates) > 1,
+            "skipped_bytes": self.skipped_bytes
+        }
+
+    def abort(self):
+        """Discard the partial output"""
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+
+
+def concatenate_mp3(audio_files: list, output_path: str) -> dict:
+    """
+    Join MP3 chunks, in order, into ``output_path``
+
+    Args:
+        audio_files: Chunk paths in playback order
+        output_path: Final file path
+
+    Returns:
+        Statistics from MP3Concatenator.close()
+    """
+    with MP3Concatenator(output_path) as joiner:
+        for path in audio_files:
+            joiner.append(path)
+        return joiner.close()
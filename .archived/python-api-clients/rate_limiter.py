@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Rate Limiting for ElevenLabs API Clients
+Thread-safe token bucket shared by concurrent synthesis workers.
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter with provider backoff
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``;
+    each API request takes one. When the provider answers 429, ``pause()``
+    stops every worker until the ``Retry-After`` time has passed, so the
+    whole pool backs off together instead of each thread hammering the API.
+    """
+
+    def __init__(self, rate: float = 2.0, capacity: float = 3.0):
+        """
+        Initialize the bucket full
+
+        Args:
+            rate: Sustained requests per second
+            capacity: Burst size
+        """
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1")
+
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.condition = threading.Condition()
+
+        self.requests_granted = 0
+        self.total_wait_seconds = 0.0
+        self.pauses = 0
+
+    def _refill(self, now: float):
+        if now <= self.updated:
+            return  # nothing accrues until a provider pause has ended
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """
+        Block until ``tokens`` are available (and any backoff has ended)
+
+        Returns:
+            True when acquired, False if the timeout elapsed first
+
+        Raises:
+            ValueError: More tokens than the bucket can ever hold
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket of capacity {self.capacity}")
+
+        start = time.monotonic()
+        deadline = start + timeout if timeout is not None else None
+
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+
+                if now >= self.paused_until and self.tokens >= tokens:
+                    self.tokens -= tokens
+                    self.requests_granted += 1
+                    self.total_wait_seconds += now - start
+                    return True
+
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                else:
+                    wait = (tokens - self.tokens) / self.rate
+                if deadline is not None:
+                    if now >= deadline:
+                        return False
+                    wait = min(wait, deadline - now)
+                self.condition.wait(wait)
+
+    def pause(self, seconds: float):
+        """Hold all requests for ``seconds`` (e.g. from a Retry-After header)"""
+        with self.condition:
+            until = time.monotonic() + seconds
+            if until > self.paused_until:
+                self.paused_until = until
+                self.pauses += 1
+            # Requests resuming after the pause start from an empty bucket;
+            # tokens only accrue from the end of the pause
+            self.tokens = 0.0
+            self.updated = self.paused_until
+            self.condition.notify_all()
+
+    def get_stats(self) -> dict:
+        with self.condition:
+            return {
+                "requests_granted": self.requests_granted,
+                "total_wait_seconds": round(self.total_wait_seconds, 3),
+                "provider_pauses": self.pauses
+            }
+
+
+def parse_retry_after(value: Optional[str], default: float = 5.0) -> float:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
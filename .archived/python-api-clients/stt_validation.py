@@ -9,28 +9,53 @@ import json
 import os
 import sys
 import re
-import difflib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Tuple, Any
 
+from http_client import PooledHTTPClient, get_shared_client
+from word_alignment import align_texts
+from term_matcher import build_glossary_matcher, glossary_terms, load_glossary
+
+# Composite quality score weights
+QUALITY_WEIGHTS = {
+    "word_accuracy": 0.30,
+    "character_accuracy": 0.20,
+    "technical_terms": 0.25,
+    "statistics": 0.15,
+    "expert_names": 0.10
+}
+
 class ElevenLabsSTTValidator:
     """Direct STT API validation for synthesized audio quality"""
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, http_client: PooledHTTPClient = None, glossary_path: str = None):
         """
         Initialize STT validator with ElevenLabs API
 
         Args:
             api_key: ElevenLabs API key (from environment variable for security)
+            http_client: Pooled keep-alive client (defaults to the shared one)
+            glossary_path: Series glossary JSON (defaults to the Episode 1 terms)
         """
         if not api_key:
             raise ValueError("API key is required for STT validation")
 
         self.api_key = api_key
         self.base_url = "https://api.elevenlabs.io/v1"
+        self.http = http_client or get_shared_client()
         self.headers = {"xi-api-key": self.api_key}
 
+        # One compiled matcher finds every term, statistic and name per scan;
+        # each text is scanned once and shared by all the checks below
+        self.glossary = load_glossary(glossary_path)
+        self.term_matcher = build_glossary_matcher(self.glossary)
+        self._scan_terms = lru_cache(maxsize=16)(self.term_matcher.scan)
+        self.expert_names = glossary_terms(self.glossary, "expert_names")
+
         print("✅ ElevenLabs STT Validator initialized")
         print("   Model: scribe_v1_experimental (Episode 1 validated)")
 
@@ -78,7 +103,7 @@ class ElevenLabsSTTValidator:
                 }
 
                 print("🔄 Making STT API request...")
-                response = requests.post(
+                response = self.http.post(
                     f"{self.base_url}/speech-to-text",
                     headers=headers_stt,
                     files=files,
@@ -97,7 +122,8 @@ class ElevenLabsSTTValidator:
                     "transcript": transcript,
                     "character_count": len(transcript),
                     "word_count": len(transcript.split()),
-                    "api_response": result
+                    "api_response": result,
+                    "request_seconds": round(response.timing.total, 3)
                 }
 
             elif response.status_code == 401:
@@ -111,21 +137,68 @@ class ElevenLabsSTTValidator:
             elif response.status_code == 422:
                 return {"success": False, "error": f"Invalid audio format or corrupted file: {response.text}"}
             elif response.status_code == 429:
-                return {"success": False, "error": "Rate limit exceeded - wait and retry"}
+                return {"success": False, "error": "Rate limit exceeded - wait and retry", "retryable": True}
             else:
-                return {"success": False, "error": f"STT API error: {response.status_code} - {response.text}"}
+                return {"success": False, "error": f"STT API error: {response.status_code} - {response.text}",
+                        "retryable": response.status_code >= 500}
 
         except requests.exceptions.Timeout:
-            return {"success": False, "error": "STT request timeout (10+ minutes) - audio file may be too large"}
+            return {"success": False, "error": "STT request timeout (10+ minutes) - audio file may be too large",
+                    "retryable": True}
         except requests.exceptions.ConnectionError:
-            return {"success": False, "error": "Connection failed - check internet connectivity"}
+            return {"success": False, "error": "Connection failed - check internet connectivity", "retryable": True}
         except requests.exceptions.RequestException as e:
-            return {"success": False, "error": f"Network error during STT request: {str(e)}"}
+            return {"success": False, "error": f"Network error during STT request: {str(e)}", "retryable": True}
         except MemoryError:
             return {"success": False, "error": "Insufficient memory to process audio file"}
         except Exception as e:
             return {"success": False, "error": f"Unexpected STT error: {str(e)}"}
 
+    def transcribe_with_retries(self, audio_path: str, max_retries: int = 3) -> Dict[str, Any]:
+        """
+        Transcribe with exponential backoff on rate limits, timeouts and 5xx errors
+
+        Returns:
+            transcribe_audio() result plus the number of attempts made
+        """
+        for attempt in range(max_retries):
+            result = self.transcribe_audio(audio_path)
+            result["attempts"] = attempt + 1
+            if result["success"] or not result.get("retryable"):
+                return result
+
+            if attempt < max_retries - 1:
+                print(f"🔄 Retrying transcription of {audio_path} in {2**attempt} seconds...")
+                time.sleep(2**attempt)
+        return result
+
+    def validate_chunk(self, audio_path: str, source_text: str, max_retries: int = 3) -> Dict[str, Any]:
+        """
+        Transcribe one synthesized chunk and score it against its SSML source
+
+        Args:
+            audio_path: Chunk MP3 path
+            source_text: SSML text the chunk was synthesized from
+            max_retries: Transcription attempts before giving up
+
+        Returns:
+            Transcription result plus word_accuracy_percent
+        """
+        transcription = self.transcribe_with_retries(audio_path, max_retries)
+        if not transcription["success"]:
+            return transcription
+
+        alignment = align_texts(self.clean_text_for_comparison(source_text),
+                                self.clean_text_for_comparison(transcription["transcript"]))
+
+        return {
+            "success": True,
+            "transcript": transcription["transcript"],
+            "word_accuracy_percent": round(alignment.word_accuracy * 100, 2) if alignment.reference_words else 100.0,
+            "word_error_rate": round(alignment.wer, 4),
+            "request_seconds": transcription["request_seconds"]
+        }
+
     def clean_text_for_comparison(self, text: str) -> str:
         """
         Clean text for accurate comparison between original and transcript
@@ -171,55 +244,40 @@ class ElevenLabsSTTValidator:
         original_clean = self.clean_text_for_comparison(original_text)
         transcript_clean = self.clean_text_for_comparison(transcript)
 
-        # Word-level comparison
-        original_words = original_clean.split()
-        transcript_words = transcript_clean.split()
-
-        # Calculate word accuracy using sequence matching
-        matcher = difflib.SequenceMatcher(None, original_words, transcript_words)
-
-        # Get matching blocks
-        matching_blocks = matcher.get_matching_blocks()
-        total_matches = sum(block.size for block in matching_blocks)
+        # Word opcodes (Myers diff) and WER/CER in near-linear time
+        alignment = align_texts(original_clean, transcript_clean)
+        original_words = alignment.reference_words
+        transcript_words = alignment.hypothesis_words
 
-        word_accuracy = (total_matches / len(original_words)) * 100 if original_words else 0
+        word_accuracy = alignment.word_accuracy * 100 if original_words else 0
 
-        # Character-level accuracy
-        char_matcher = difflib.SequenceMatcher(None, original_clean, transcript_clean)
-        char_accuracy = char_matcher.ratio() * 100
+        # Character-level accuracy (2 * matched characters / total characters)
+        char_accuracy = alignment.character_similarity * 100
 
         # Find differences
-        word_differences = []
-        opcodes = matcher.get_opcodes()
-
-        for tag, i1, i2, j1, j2 in opcodes:
-            if tag != 'equal':
-                original_segment = ' '.join(original_words[i1:i2])
-                transcript_segment = ' '.join(transcript_words[j1:j2])
-                word_differences.append({
-                    'type': tag,
-                    'original': original_segment,
-                    'transcript': transcript_segment,
-                    'position': i1
-                })
+        word_differences = alignment.differences()
 
         # Technical term accuracy check
-        technical_terms = self.extract_technical_terms(original_text)
+        technical_terms = self.extract_technical_terms(original_clean)
         term_accuracy = self.check_technical_term_accuracy(original_clean, transcript_clean, technical_terms)
 
         # Statistical validation
         statistics_accuracy = self.validate_statistics_pronunciation(original_clean, transcript_clean)
 
         # Expert name validation
-        expert_names = ["yoshua bengio", "geoffrey hinton"]
-        expert_accuracy = self.check_expert_names(original_clean, transcript_clean, expert_names)
+        expert_accuracy = self.check_expert_names(original_clean, transcript_clean, self.expert_names)
 
         metrics = {
             "word_accuracy_percent": round(word_accuracy, 2),
             "character_accuracy_percent": round(char_accuracy, 2),
             "original_word_count": len(original_words),
+            "original_character_count": alignment.reference_characters,
             "transcript_word_count": len(transcript_words),
             "word_count_ratio": len(transcript_words) / len(original_words) if original_words else 0,
+            "word_errors": alignment.word_errors,
+            "word_error_rate": round(alignment.wer, 4),
+            "character_errors": alignment.character_errors,
+            "character_error_rate": round(alignment.cer, 4),
             "technical_term_accuracy": term_accuracy,
             "statistics_accuracy": statistics_accuracy,
             "expert_name_accuracy": expert_accuracy,
@@ -227,64 +285,57 @@ class ElevenLabsSTTValidator:
             "differences_sample": word_differences[:10],  # First 10 differences
         }
 
-        # Calculate composite quality score
-        weights = {
-            "word_accuracy": 0.30,
-            "character_accuracy": 0.20,
-            "technical_terms": 0.25,
-            "statistics": 0.15,
-            "expert_names": 0.10
-        }
-
-        composite_score = (
-            (word_accuracy * weights["word_accuracy"]) +
-            (char_accuracy * weights["character_accuracy"]) +
-            (term_accuracy["accuracy_percent"] * weights["technical_terms"]) +
-            (statistics_accuracy["accuracy_percent"] * weights["statistics"]) +
-            (expert_accuracy["accuracy_percent"] * weights["expert_names"])
-        )
+        composite_score = self.calculate_composite_score(
+            word_accuracy, char_accuracy, term_accuracy["accuracy_percent"],
+            statistics_accuracy["accuracy_percent"], expert_accuracy["accuracy_percent"])
 
         metrics["composite_quality_score"] = round(composite_score, 2)
         metrics["quality_rating"] = self.get_quality_rating(composite_score)
 
         return metrics
 
-    def extract_technical_terms(self, text: str) -> List[str]:
-        """Extract technical terms from the original script"""
-        # Common AI/tech terms from Episode 1
-        technical_terms = [
-            "artificial intelligence", "ai", "neural networks", "deep learning",
-            "machine learning", "turing award", "nobei", "oecd", "pew research",
-            "percentage", "thirty-nine percentage", "thirty nine percentage",
-            "thirty-nine-percentage", "intellectual humility", "remarkably uncertain"
-        ]
-
-        found_terms = []
-        text_lower = text.lower()
+    def calculate_composite_score(self, word_accuracy: float, char_accuracy: float, term_accuracy: float,
+                                  statistics_accuracy: float, expert_accuracy: float) -> float:
+        """Weighted composite quality score (0-100) from the individual accuracies"""
+        return (
+            (word_accuracy * QUALITY_WEIGHTS["word_accuracy"]) +
+            (char_accuracy * QUALITY_WEIGHTS["character_accuracy"]) +
+            (term_accuracy * QUALITY_WEIGHTS["technical_terms"]) +
+            (statistics_accuracy * QUALITY_WEIGHTS["statistics"]) +
+            (expert_accuracy * QUALITY_WEIGHTS["expert_names"])
+        )
 
-        for term in technical_terms:
-            if term in text_lower:
-                found_terms.append(term)
+    def extract_technical_terms(self, text: str) -> List[str]:
+        """Glossary technical terms that occur in the text, in glossary order"""
+        found = self._scan_terms(text.lower()).get("technical_terms", {})
+        return [term for term in glossary_terms(self.glossary, "technical_terms") if term in found]
 
-        return found_terms
+    def find_term_positions(self, text: str) -> Dict[str, Dict[str, List[Tuple[int, int]]]]:
+        """Every glossary match in the text as {category: {term: [(start, end), ...]}}"""
+        return self._scan_terms(text.lower())
 
     def check_technical_term_accuracy(self, original: str, transcript: str, terms: List[str]) -> Dict[str, Any]:
         """Check accuracy of technical term pronunciation"""
         if not terms:
             return {"accuracy_percent": 100, "correct_terms": 0, "total_terms": 0}
 
+        original_found = self._scan_terms(original.lower()).get("technical_terms", {})
+        transcript_found = self._scan_terms(transcript.lower()).get("technical_terms", {})
+
         correct_count = 0
         term_details = []
 
         for term in terms:
-            original_has = term.lower() in original
-            transcript_has = term.lower() in transcript
+            original_has = term in original_found
+            transcript_has = term in transcript_found
 
             if original_has and transcript_has:
                 correct_count += 1
-                term_details.append({"term": term, "status": "correct"})
+                term_details.append({"term": term, "status": "correct",
+                                     "positions": original_found[term]})
             elif original_has and not transcript_has:
-                term_details.append({"term": term, "status": "missing"})
+                term_details.append({"term": term, "status": "missing",
+                                     "positions": original_found[term]})
             elif not original_has and transcript_has:
                 term_details.append({"term": term, "status": "added"})
 
@@ -298,26 +349,24 @@ class ElevenLabsSTTValidator:
         }
 
     def validate_statistics_pronunciation(self, original: str, transcript: str) -> Dict[str, Any]:
-        """Validate pronunciation of key statistics"""
-        key_statistics = [
-            "thirty-nine percentage", "thirty nine percentage", "39 percentage",
-            "fifty-six percent", "56 percent", "seventeen percent", "17 percent",
-            "298 pages", "two hundred ninety-eight pages", "january 29th",
-            "april 2025", "july 2025"
-        ]
+        """Validate pronunciation of key statistics (any glossary spelling counts)"""
+        original_found = self._scan_terms(original.lower()).get("statistics", {})
+        transcript_found = self._scan_terms(transcript.lower()).get("statistics", {})
 
         found_stats = 0
         correct_stats = 0
         stat_details = []
 
-        for stat in key_statistics:
-            if stat in original:
+        for stat in glossary_terms(self.glossary, "statistics"):
+            if stat in original_found:
                 found_stats += 1
-                if stat in transcript or stat.replace("-", " ") in transcript:
+                if stat in transcript_found:
                     correct_stats += 1
-                    stat_details.append({"statistic": stat, "status": "correct"})
+                    stat_details.append({"statistic": stat, "status": "correct",
+                                         "positions": original_found[stat]})
                 else:
-                    stat_details.append({"statistic": stat, "status": "incorrect"})
+                    stat_details.append({"statistic": stat, "status": "incorrect",
+                                         "positions": original_found[stat]})
 
         accuracy = (correct_stats / found_stats) * 100 if found_stats else 100
 
@@ -329,33 +378,32 @@ class ElevenLabsSTTValidator:
         }
 
     def check_expert_names(self, original: str, transcript: str, names: List[str]) -> Dict[str, Any]:
-        """Check pronunciation accuracy of expert names"""
+        """Check pronunciation accuracy of expert names (hyphenated/joined spellings count)"""
+        original_found = self._scan_terms(original.lower()).get("expert_names", {})
+        transcript_found = self._scan_terms(transcript.lower()).get("expert_names", {})
+
         correct_count = 0
+        found_names = 0
         name_details = []
 
         for name in names:
-            if name.lower() in original:
-                # Check various pronunciation possibilities
-                name_variants = [
-                    name,
-                    name.replace(" ", "-"),
-                    name.replace(" ", ""),
-                ]
-
-                found = any(variant.lower() in transcript for variant in name_variants)
-
-                if found:
+            name = name.lower()
+            if name in original_found:
+                found_names += 1
+                if name in transcript_found:
                     correct_count += 1
-                    name_details.append({"name": name, "status": "correct"})
+                    name_details.append({"name": name, "status": "correct",
+                                         "positions": original_found[name]})
                 else:
-                    name_details.append({"name": name, "status": "incorrect"})
+                    name_details.append({"name": name, "status": "incorrect",
+                                         "positions": original_found[name]})
 
-        accuracy = (correct_count / len(names)) * 100 if names else 100
+        accuracy = (correct_count / found_names) * 100 if found_names else 100
 
         return {
             "accuracy_percent": round(accuracy, 2),
             "correct_names": correct_count,
-            "total_names": len(names),
+            "total_names": found_names,
             "name_details": name_details
         }
 
@@ -480,6 +528,209 @@ class ElevenLabsSTTValidator:
 
         return validation_result
 
+    def _validate_chunk_source(self, index: int, audio_path: str, source_text: str,
+                               max_retries: int) -> Dict[str, Any]:
+        """Transcribe and score one chunk (runs on a worker thread)"""
+        transcription = self.transcribe_with_retries(audio_path, max_retries)
+        chunk_result = {
+            "chunk_number": index + 1,
+            "audio_path": audio_path,
+            "attempts": transcription["attempts"],
+            "success": transcription["success"]
+        }
+        if not transcription["success"]:
+            chunk_result["error"] = transcription["error"]
+            return chunk_result
+
+        chunk_result["transcript"] = transcription["transcript"]
+        chunk_result["request_seconds"] = transcription["request_seconds"]
+        chunk_result["accuracy_metrics"] = self.calculate_accuracy_metrics(source_text, transcription["transcript"])
+        return chunk_result
+
+    def merge_chunk_metrics(self, chunk_metrics: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Combine per-chunk accuracy metrics into episode-level metrics
+
+        Word accuracy is weighted by words, character accuracy by characters,
+        and term/statistic counts are summed, so the result matches what a
+        whole-episode comparison reports without aligning the full texts.
+
+        Args:
+            chunk_metrics: calculate_accuracy_metrics() results in chunk order
+
+        Returns:
+            Metrics in the calculate_accuracy_metrics() format
+        """
+        original_words = sum(m["original_word_count"] for m in chunk_metrics)
+        transcript_words = sum(m["transcript_word_count"] for m in chunk_metrics)
+        original_chars = sum(m["original_character_count"] for m in chunk_metrics)
+        word_errors = sum(m["word_errors"] for m in chunk_metrics)
+        character_errors = sum(m["character_errors"] for m in chunk_metrics)
+
+        word_accuracy = (sum(m["word_accuracy_percent"] * m["original_word_count"] for m in chunk_metrics)
+                         / original_words) if original_words else 0
+        char_accuracy = (sum(m["character_accuracy_percent"] * m["original_character_count"] for m in chunk_metrics)
+                         / original_chars) if original_chars else 0
+
+        correct_terms = sum(m["technical_term_accuracy"]["correct_terms"] for m in chunk_metrics)
+        total_terms = sum(m["technical_term_accuracy"]["total_terms"] for m in chunk_metrics)
+        term_accuracy = {
+            "accuracy_percent": round(correct_terms / total_terms * 100, 2) if total_terms else 100,
+            "correct_terms": correct_terms,
+            "total_terms": total_terms,
+            "term_details": [detail for m in chunk_metrics
+                             for detail in m["technical_term_accuracy"].get("term_details", [])]
+        }
+
+        correct_stats = sum(m["statistics_accuracy"]["correct_statistics"] for m in chunk_metrics)
+        total_stats = sum(m["statistics_accuracy"]["total_statistics"] for m in chunk_metrics)
+        statistics_accuracy = {
+            "accuracy_percent": round(correct_stats / total_stats * 100, 2) if total_stats else 100,
+            "correct_statistics": correct_stats,
+            "total_statistics": total_stats,
+            "statistic_details": [detail for m in chunk_metrics
+                                  for detail in m["statistics_accuracy"]["statistic_details"]]
+        }
+
+        # A name counts as correct only if every chunk that mentions it got it right
+        name_status = {}
+        for m in chunk_metrics:
+            for detail in m["expert_name_accuracy"]["name_details"]:
+                if name_status.get(detail["name"]) != "incorrect":
+                    name_status[detail["name"]] = detail["status"]
+        correct_names = sum(1 for status in name_status.values() if status == "correct")
+        expert_accuracy = {
+            "accuracy_percent": round(correct_names / len(name_status) * 100, 2) if name_status else 100,
+            "correct_names": correct_names,
+            "total_names": len(name_status),
+            "name_details": [{"name": name, "status": status} for name, status in name_status.items()]
+        }
+
+        differences = []
+        word_offset = 0
+        for chunk_number, m in enumerate(chunk_metrics, 1):
+            for difference in m["differences_sample"]:
+                differences.append({**difference, "position": difference["position"] + word_offset,
+                                    "chunk_number": chunk_number})
+            word_offset += m["original_word_count"]
+
+        composite_score = self.calculate_composite_score(
+            word_accuracy, char_accuracy, term_accuracy["accuracy_percent"],
+            statistics_accuracy["accuracy_percent"], expert_accuracy["accuracy_percent"])
+
+        return {
+            "word_accuracy_percent": round(word_accuracy, 2),
+            "character_accuracy_percent": round(char_accuracy, 2),
+            "original_word_count": original_words,
+            "original_character_count": original_chars,
+            "transcript_word_count": transcript_words,
+            "word_count_ratio": transcript_words / original_words if original_words else 0,
+            "word_errors": word_errors,
+            "word_error_rate": round(word_errors / original_words, 4) if original_words else 0,
+            "character_errors": character_errors,
+            "character_error_rate": round(character_errors / original_chars, 4) if original_chars else 0,
+            "technical_term_accuracy": term_accuracy,
+            "statistics_accuracy": statistics_accuracy,
+            "expert_name_accuracy": expert_accuracy,
+            "total_differences": sum(m["total_differences"] for m in chunk_metrics),
+            "differences_sample": differences[:10],
+            "composite_quality_score": round(composite_score, 2),
+            "quality_rating": self.get_quality_rating(composite_score)
+        }
+
+    def validate_episode_chunks(self, chunks: List[Tuple[str, str]], output_dir: str,
+                                max_workers: int = 4, max_retries: int = 3) -> Dict[str, Any]:
+        """
+        Validate an episode chunk by chunk with concurrent transcription
+
+        Each chunk's audio is transcribed on its own (retrying only that
+        chunk on transient errors) and scored against the SSML it was
+        synthesized from; the per-chunk metrics are merged into the episode
+        report and the weakest chunks are listed so problems can be located.
+
+        Args:
+            chunks: (audio_path, ssml_text) pairs in episode order
+            output_dir: Directory for validation reports
+            max_workers: Concurrent STT requests
+            max_retries: Transcription attempts per chunk
+
+        Returns:
+            Validation results in the validate_episode_audio() format plus per-chunk details
+        """
+        print(f"\n🔍 Starting Chunked Audio Validation: {len(chunks)} chunks, {max_workers} workers")
+
+        validation_result = {
+            "validation_start": datetime.now().isoformat(),
+            "mode": "chunked",
+            "total_chunks": len(chunks),
+            "success": False
+        }
+
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+        except OSError as e:
+            validation_result["error"] = f"Cannot create output directory: {str(e)}"
+            return validation_result
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stt") as executor:
+            chunk_results = list(executor.map(
+                lambda item: self._validate_chunk_source(item[0], item[1][0], item[1][1], max_retries),
+                enumerate(chunks)))
+        validation_result["wall_seconds"] = round(time.perf_counter() - started, 3)
+
+        scored = [r for r in chunk_results if r["success"]]
+        validation_result["failed_chunks"] = [r["chunk_number"] for r in chunk_results if not r["success"]]
+        validation_result["chunks"] = [{
+            "chunk_number": r["chunk_number"],
+            "audio_path": r["audio_path"],
+            "attempts": r["attempts"],
+            "error": r.get("error"),
+            "word_accuracy_percent": r["accuracy_metrics"]["word_accuracy_percent"] if r["success"] else None,
+            "composite_quality_score": r["accuracy_metrics"]["composite_quality_score"] if r["success"] else None,
+            "quality_rating": r["accuracy_metrics"]["quality_rating"] if r["success"] else None
+        } for r in chunk_results]
+
+        if not scored:
+            validation_result["error"] = "Transcription failed for every chunk"
+            return validation_result
+
+        metrics = self.merge_chunk_metrics([r["accuracy_metrics"] for r in scored])
+        validation_result["accuracy_metrics"] = metrics
+        validation_result["quality_assessment"] = {
+            "overall_rating": metrics["quality_rating"],
+            "composite_score": metrics["composite_quality_score"],
+            "passes_threshold": metrics["composite_quality_score"] >= 85,
+            "target_threshold": 85
+        }
+        validation_result["weakest_chunks"] = sorted(
+            (c for c in validation_result["chunks"] if c["composite_quality_score"] is not None),
+            key=lambda c: c["composite_quality_score"])[:5]
+        validation_result["recommendations"] = self.generate_recommendations(metrics)
+        if validation_result["failed_chunks"]:
+            validation_result["error"] = f"Transcription failed for chunks {validation_result['failed_chunks']}"
+        else:
+            validation_result["success"] = True
+        validation_result["validation_end"] = datetime.now().isoformat()
+
+        report_path = os.path.join(output_dir, "chunked_audio_validation_report.json")
+        try:
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(validation_result, f, indent=2, ensure_ascii=False)
+            print(f"📊 Validation report saved: {report_path}")
+        except Exception as e:
+            print(f"⚠️ Failed to save validation report: {e}")
+
+        transcript_path = os.path.join(output_dir, "transcribed_audio.txt")
+        try:
+            with open(transcript_path, 'w', encoding='utf-8') as f:
+                f.write("\n\n".join(r["transcript"] for r in scored))
+            print(f"📝 Transcript saved: {transcript_path}")
+        except Exception as e:
+            print(f"⚠️ Failed to save transcript: {e}")
+
+        return validation_result
+
     def generate_recommendations(self, metrics: Dict[str, Any]) -> List[str]:
         """Generate improvement recommendations based on metrics"""
         recommendations = []
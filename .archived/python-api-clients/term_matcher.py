@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Glossary Term Matcher for STT Validation
+Aho-Corasick automaton that finds every glossary term, statistic and name in one pass.
+"""
+
+import json
+import os
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# Glossary used when no series glossary is supplied (Episode 1 terms)
+DEFAULT_GLOSSARY = {
+    "technical_terms": [
+        "artificial intelligence", "ai", "neural networks", "deep learning",
+        "machine learning", "turing award", "nobei", "oecd", "pew research",
+        "percentage", "thirty-nine percentage", "thirty nine percentage",
+        "thirty-nine-percentage", "intellectual humility", "remarkably uncertain"
+    ],
+    "statistics": [
+        "thirty-nine percentage", "thirty nine percentage", "39 percentage",
+        "fifty-six percent", "56 percent", "seventeen percent", "17 percent",
+        "298 pages", "two hundred ninety-eight pages", "january 29th",
+        "april 2025", "july 2025"
+    ],
+    "expert_names": ["yoshua bengio", "geoffrey hinton"]
+}
+
+
+@dataclass(frozen=True)
+class TermMatch:
+    """One occurrence of a glossary entry"""
+    start: int
+    end: int
+    term: str        # canonical glossary entry
+    category: str
+    surface: str     # the variant that matched
+
+
+class TermMatcher:
+    """
+    Multi-pattern matcher (Aho-Corasick automaton)
+
+    Patterns are compiled once into a trie with failure links; a scan then
+    visits each character of the text once regardless of how many patterns
+    there are, reporting every (possibly overlapping) occurrence. With
+    ``whole_words`` a match must not start or end inside a word, so "ai"
+    no longer matches inside "said".
+    """
+
+    def __init__(self, whole_words: bool = True):
+        self.whole_words = whole_words
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[int]] = [[]]
+        self._patterns: List[Tuple[str, str, str]] = []  # (surface, term, category)
+        self._built = True
+
+    def add(self, pattern: str, term: Optional[str] = None, category: str = "term"):
+        """
+        Add a pattern (matched case-insensitively)
+
+        Args:
+            pattern: Text to find
+            term: Canonical entry reported for the match (defaults to the pattern)
+            category: Glossary section the entry belongs to
+        """
+        surface = pattern.lower()
+        if not surface:
+            return
+        state = 0
+        for char in surface:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append(len(self._patterns))
+        self._patterns.append((surface, (term or pattern).lower(), category))
+        self._built = False
+
+    def build(self):
+        """Compute failure links breadth-first and merge suffix outputs"""
+        queue = deque()
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+        self._built = True
+
+    def find_all(self, text: str) -> List[TermMatch]:
+        """
+        Every pattern occurrence in ``text`` (positions refer to ``text.lower()``)
+
+        Returns:
+            Matches ordered by end position
+        """
+        if not self._built:
+            self.build()
+
+        text = text.lower()
+        goto, fail, outputs, patterns = self._goto, self._fail, self._outputs, self._patterns
+        matches = []
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not outputs[state]:
+                continue
+
+            end = position + 1
+            for index in outputs[state]:
+                surface, term, category = patterns[index]
+                start = end - len(surface)
+                if self.whole_words and (
+                        (start > 0 and text[start - 1].isalnum() and surface[0].isalnum()) or
+                        (end < len(text) and text[end].isalnum() and surface[-1].isalnum())):
+                    continue
+                matches.append(TermMatch(start, end, term, category, surface))
+        return matches
+
+    def scan(self, text: str) -> Dict[str, Dict[str, List[Tuple[int, int]]]]:
+        """
+        Group matches by category and canonical term
+
+        Returns:
+            {category: {term: [(start, end), ...]}}
+        """
+        found: Dict[str, Dict[str, List[Tuple[int, int]]]] = {}
+        for match in self.find_all(text):
+            found.setdefault(match.category, {}).setdefault(match.term, []).append((match.start, match.end))
+        return found
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+
+def load_glossary(path: Optional[str] = None) -> Dict[str, list]:
+    """
+    Load a glossary JSON file, or the default Episode 1 glossary
+
+    Each section maps to a list of entries, either plain strings or
+    ``{"term": ..., "variants": [...]}`` objects.
+    """
+    if not path:
+        return DEFAULT_GLOSSARY
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Glossary not found: {path}")
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _entry_variants(entry, category: str) -> Tuple[str, List[str]]:
+    """Canonical term and accepted spellings, including the per-category defaults"""
+    if isinstance(entry, dict):
+        term = entry["term"].lower()
+        variants = [term] + [variant.lower() for variant in entry.get("variants", [])]
+    else:
+        term = entry.lower()
+        variants = [term]
+
+    if category == "statistics":
+        variants.append(term.replace("-", " "))
+    elif category == "expert_names":
+        variants += [term.replace(" ", "-"), term.replace(" ", "")]
+    return term, list(dict.fromkeys(variants))
+
+
+def glossary_terms(glossary: Dict[str, list], category: str) -> List[str]:
+    """Canonical terms of one glossary section, in glossary order"""
+    return [_entry_variants(entry, category)[0] for entry in glossary.get(category, [])]
+
+
+def build_glossary_matcher(glossary: Dict[str, list], whole_words: bool = True) -> TermMatcher:
+    """Compile every entry and variant of a glossary into one matcher"""
+    matcher = TermMatcher(whole_words=whole_words)
+    for category, entries in glossary.items():
+        if not isinstance(entries, list):
+            continue
+        for entry in entries:
+            term, variants = _entry_variants(entry, category)
+            for variant in variants:
+                matcher.add(variant, term, category)
+    matcher.build()
+    return matcher
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+TTS Synthesis Cache
+Stores synthesized MP3 chunks on disk keyed by normalized SSML and voice configuration.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+
+# ElevenLabs pricing used for savings reporting ($ per 1k characters)
+COST_PER_1K_CHARS = 0.18
+
+DEFAULT_CACHE_DIR = os.path.join("nobody-knows", "output", "tts_cache")
+COPY_BLOCK_SIZE = 1024 * 1024
+
+
+# Comments, or tags whose quoted attribute values may contain '>' (but not '<',
+# so a stray '<' in text cannot pair up apostrophes into one long "tag")
+_MARKUP_RE = re.compile(r"""(<!--.*?-->|<(?:[^<>"']|"[^"<]*"|'[^'<]*')*>)""", re.DOTALL)
+_TAG_PART_RE = re.compile(r"""("[^"]*"|'[^']*')""")
+
+
+def _normalize_tag(tag: str) -> str:
+    """Canonical spelling of one tag: collapsed spacing, double-quoted attribute values"""
+    parts = []
+    for part in _TAG_PART_RE.split(tag):
+        if part[:1] == "'" and '"' not in part:
+            parts.append('"' + part[1:-1] + '"')
+        elif part[:1] in ("'", '"'):
+            parts.append(part)  # attribute values are kept verbatim
+        else:
+            part = re.sub(r'\s+', ' ', part)
+            parts.append(re.sub(r'\s*(=|/?>)\s*', r'\1', part))
+    return "".join(parts)
+
+
+def normalize_ssml(ssml: str) -> str:
+    """
+    Canonical form of an SSML chunk for cache keying
+
+    Edits that cannot change the audio (indentation, line wrapping,
+    attribute quote style, self-closing tag spacing, comments) map to the
+    same key, so reformatting a script does not invalidate its cache.
+    Tags are rewritten only inside the markup, and whitespace between
+    tags is dropped only where it does not separate two words.
+    """
+    pieces = []  # (is_markup, text)
+    for index, piece in enumerate(_MARKUP_RE.split(ssml)):
+        if index % 2:
+            if not piece.startswith("<!--"):
+                pieces.append((True, _normalize_tag(piece)))
+        elif piece:
+            pieces.append((False, re.sub(r'\s+', ' ', piece)))
+
+    texts = [text for is_markup, text in pieces if not is_markup]
+    result, text_index = [], 0
+    for is_markup, text in pieces:
+        if is_markup:
+            result.append(text)
+            continue
+        if text == " ":
+            before = texts[text_index - 1] if text_index else " "
+            after = texts[text_index + 1] if text_index + 1 < len(texts) else " "
+            if before.endswith(" ") or after.startswith(" "):
+                text = ""  # indentation between tags, not a word separator
+        result.append(text)
+        text_index += 1
+    return "".join(result).strip()
+
+
+class TTSAudioCache:
+    """Content-addressed on-disk cache of synthesized audio chunks"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, cost_per_1k_chars: float = COST_PER_1K_CHARS):
+        """
+        Initialize the cache directory
+
+        Args:
+            cache_dir: Directory for cached MP3 files
+            cost_per_1k_chars: Synthesis price used to report dollars saved
+        """
+        self.cache_dir = cache_dir
+        self.cost_per_1k_chars = cost_per_1k_chars
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self.characters_saved = 0
+
+    @staticmethod
+    def make_key(ssml: str, voice_id: str, model_id: str, voice_settings: dict) -> str:
+        """
+        Cache key for one synthesis request
+
+        Args:
+            ssml: SSML chunk text
+            voice_id: ElevenLabs voice ID
+            model_id: ElevenLabs model ID
+            voice_settings: Stability, similarity and style settings
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        canonical = json.dumps({
+            "ssml": normalize_ssml(ssml),
+            "voice_id": voice_id,
+            "model_id": model_id,
+            "voice_settings": voice_settings
+        }, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.mp3")
+
+    def _digest_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.sha256")
+
+    def _recorded_digest(self, key: str):
+        try:
+            with open(self._digest_path(key), 'r') as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            return None
+
+    def _record_digest(self, key: str, sha256: str):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self._path(key)), suffix=".tmp")
+        with os.fdopen(fd, 'w') as f:
+            f.write(sha256)
+        os.replace(tmp_path, self._digest_path(key))
+
+    def _discard(self, key: str, audio: bool = True):
+        """Drop an entry (or just its digest, before the audio is replaced)"""
+        for path in (self._digest_path(key), self._path(key)) if audio else (self._digest_path(key),):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def get(self, key: str, characters: int = 0):
+        """
+        Return cached MP3 bytes, or None on a miss
+
+        Args:
+            key: Key from make_key()
+            characters: Chunk length, counted toward savings on a hit
+        """
+        try:
+            with open(self._path(key), 'rb') as f:
+                audio = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        expected = self._recorded_digest(key)
+        if not audio or (expected and hashlib.sha256(audio).hexdigest() != expected):
+            if audio:
+                self._discard(key)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.characters_saved += characters
+        return audio
+
+    def copy_to(self, key: str, output_path: str, characters: int = 0) -> bool:
+        """
+        Stream a cached chunk into ``output_path`` without loading it into memory
+
+        The copy is hashed as it streams and checked against the digest
+        recorded by put_file(), then renamed into place: a file already at
+        ``output_path`` may be linked to a cache entry and is never
+        overwritten in place.
+
+        Returns:
+            True on a hit, False on a miss
+        """
+        path = self._path(key)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            self.misses += 1
+            return False
+
+        expected = self._recorded_digest(key)
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output_path)), suffix=".tmp")
+        try:
+            with open(path, 'rb') as source, os.fdopen(fd, 'wb') as target:
+                for block in iter(lambda: source.read(COPY_BLOCK_SIZE), b""):
+                    target.write(block)
+                    digest.update(block)
+            if expected and digest.hexdigest() != expected:
+                os.remove(tmp_path)
+                self._discard(key)
+                self.misses += 1
+                return False
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.hits += 1
+        self.characters_saved += characters
+        return True
+
+    def put_file(self, key: str, audio_path: str, sha256: str = None, size: int = None) -> bool:
+        """
+        Store an already-written MP3 file without copying its bytes
+
+        The file is hard-linked into the cache (copied only where linking is
+        not possible, e.g. across filesystems) and renamed into place
+        atomically. Pass the digest and size computed while the audio was
+        streamed: a file whose size no longer matches is not cached, and the
+        digest is recorded so hits are verified (a linked entry shares its
+        data with ``audio_path`` until either is replaced).
+
+        Returns:
+            True if the file was cached
+        """
+        if size is not None and os.path.getsize(audio_path) != size:
+            return False
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        os.close(fd)
+        os.remove(tmp_path)  # only the unique name is needed
+        try:
+            os.link(audio_path, tmp_path)
+        except OSError:
+            shutil.copyfile(audio_path, tmp_path)
+        self._discard(key, audio=False)
+        os.replace(tmp_path, path)
+        if sha256:
+            self._record_digest(key, sha256)
+        return True
+
+    def put(self, key: str, audio: bytes):
+        """Store MP3 bytes atomically (a crash never leaves a truncated entry)"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            f.write(audio)
+        self._discard(key, audio=False)
+        os.replace(tmp_path, path)
+        self._record_digest(key, hashlib.sha256(audio).hexdigest())
+
+    @property
+    def dollars_saved(self) -> float:
+        return self.characters_saved / 1000 * self.cost_per_1k_chars
+
+    def get_stats(self) -> dict:
+        """Hit/miss counts and estimated savings"""
+        lookups = self.hits + self.misses
+        return {
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "characters_saved": self.characters_saved,
+            "dollars_saved": round(self.dollars_saved, 4)
+        }
@@ -7,29 +7,54 @@ Production-Ready Implementation with Comprehensive Error Handling
 import requests
 import json
 import time
+import glob
 import os
-import re
-import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
+
+from tts_cache import TTSAudioCache, DEFAULT_CACHE_DIR
+from rate_limiter import TokenBucket, parse_retry_after
+from http_client import PooledHTTPClient, get_shared_client
+from mp3_concat import MP3FormatError, concatenate_mp3
+
+# The structure-aware chunker lives with the SSML tokenizer it builds on
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             '..', '..', 'nobody-knows', 'src', 'validation'))
+
+from ssml_chunker import chunk_ssml
+from chunk_planner import SynthesisPlan, measured_latency, plan_summary, plan_synthesis, print_plan
 
 class ElevenLabsDirectAPI:
     """Production-grade ElevenLabs API client with intelligent chunking and error handling"""
 
-    def __init__(self, api_key: str, voice_id: str = "ZF6FPAbjXT4488VcRRnw"):
+    def __init__(self, api_key: str, voice_id: str = "ZF6FPAbjXT4488VcRRnw",
+                 cache_dir: str = DEFAULT_CACHE_DIR, max_concurrency: int = 4,
+                 requests_per_second: float = 2.0, burst: int = 3,
+                 base_url: str = "https://api.elevenlabs.io/v1",
+                 http_client: PooledHTTPClient = None):
         """
         Initialize ElevenLabs client with Amelia voice
 
         Args:
             api_key: ElevenLabs API key (from environment variable for security)
             voice_id: Amelia voice ID (ZF6FPAbjXT4488VcRRnw) - Episode 1 validated
+            cache_dir: Synthesis cache directory (None disables caching)
+            max_concurrency: Chunks synthesized in parallel (plan concurrency limit)
+            requests_per_second: Sustained request rate allowed by the token bucket
+            burst: Requests allowed back to back before rate limiting applies
+            base_url: API root (point at a local stub server for testing)
+            http_client: Pooled keep-alive client (defaults to the shared one)
         """
         if not api_key:
             raise ValueError("API key is required for TTS synthesis")
 
         self.api_key = api_key
         self.voice_id = voice_id  # Amelia - young and enthusiastic
-        self.base_url = "https://api.elevenlabs.io/v1"
+        self.base_url = base_url
+        self.http = http_client or get_shared_client()
         self.headers = {
             "xi-api-key": self.api_key,
             "Content-Type": "application/json"
@@ -43,6 +68,13 @@ class ElevenLabsDirectAPI:
             "use_speaker_boost": True
         }
 
+        # Unchanged chunks are served from disk instead of re-synthesized
+        self.cache = TTSAudioCache(cache_dir) if cache_dir else None
+
+        # Shared by all synthesis workers; replaces fixed sleeps between chunks
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = TokenBucket(rate=requests_per_second, capacity=burst)
+
         print(f"✅ ElevenLabs client initialized")
         print(f"   Voice: Amelia (ZF6FPAbjXT4488VcRRnw)")
         print(f"   Settings: Stability={self.voice_settings['stability']}, Similarity={self.voice_settings['similarity_boost']}")
@@ -50,7 +82,7 @@ class ElevenLabsDirectAPI:
     def validate_api_key(self):
         """Validate API key before processing"""
         try:
-            response = requests.get(
+            response = self.http.get(
                 f"{self.base_url}/voices",
                 headers={"xi-api-key": self.api_key},
                 timeout=10
@@ -67,50 +99,22 @@ class ElevenLabsDirectAPI:
         """
         Intelligently chunk large SSML text preserving markup structure
 
+        Chunks are cut at paragraph, sentence or break boundaries; elements
+        open at a cut are closed and re-opened, so every chunk is valid SSML.
+
         Args:
             text: SSML formatted text
             max_chunk_size: Maximum characters per chunk
 
         Returns:
             List of SSML chunks
+
+        Raises:
+            ValueError: Malformed SSML, or text that cannot fit the chunk size
         """
         print(f"📝 Chunking script: {len(text)} characters")
 
-        # Remove XML declaration and root speak tags for processing
-        text_content = text.strip()
-        if text_content.startswith('<?xml'):
-            text_content = re.sub(r'<\?xml.*?\?>', '', text_content, flags=re.DOTALL)
-
-        # Extract content between <speak> tags
-        speak_match = re.search(r'<speak>(.*)</speak>', text_content, re.DOTALL)
-        if speak_match:
-            inner_content = speak_match.group(1).strip()
-        else:
-            inner_content = text_content
-
-        chunks = []
-        current_chunk = ""
-
-        # Split on natural SSML break points
-        segments = re.split(r'(</prosody>|<break time="[^"]*"/>)', inner_content)
-
-        for i, segment in enumerate(segments):
-            segment = segment.strip()
-            if not segment:
-                continue
-
-            # Check if adding this segment exceeds chunk size
-            if len(current_chunk) + len(segment) <= max_chunk_size:
-                current_chunk += segment + " "
-            else:
-                if current_chunk.strip():
-                    # Wrap in speak tags for synthesis
-                    chunks.append(f'<speak>{current_chunk.strip()}</speak>')
-                current_chunk = segment + " "
-
-        # Add final chunk
-        if current_chunk.strip():
-            chunks.append(f'<speak>{current_chunk.strip()}</speak>')
+        chunks = [chunk.content for chunk in chunk_ssml(text, max_chunk_size)]
 
         print(f"📊 Created {len(chunks)} chunks")
         for i, chunk in enumerate(chunks):
@@ -118,7 +122,8 @@ class ElevenLabsDirectAPI:
 
         return chunks
 
-    def synthesize_chunk(self, text: str, output_path: str, model_id: str = "eleven_turbo_v2_5") -> dict:
+    def synthesize_chunk(self, text: str, output_path: str, model_id: str = "eleven_turbo_v2_5",
+                         progress_callback=None, use_cache: bool = True) -> dict:
         """
         Synthesize single text chunk to audio
 
@@ -126,10 +131,27 @@ class ElevenLabsDirectAPI:
             text: SSML formatted text chunk
             output_path: Output file path
             model_id: ElevenLabs model to use
+            progress_callback: Called as callback(bytes_written, total_bytes) while streaming
+            use_cache: Reuse cached audio; False forces a fresh synthesis (which
+                still replaces the cache entry)
 
         Returns:
             Dictionary with success status and metadata
         """
+        cache_key = None
+        if self.cache:
+            cache_key = self.cache.make_key(text, self.voice_id, model_id, self.voice_settings)
+            if use_cache and self.cache.copy_to(cache_key, output_path, characters=len(text)):
+                file_size = os.path.getsize(output_path)
+                print(f"♻️ Cache hit: {file_size} bytes reused for {output_path}")
+                return {
+                    "success": True,
+                    "file_path": output_path,
+                    "size": file_size,
+                    "characters": len(text),
+                    "cached": True
+                }
+
         payload = {
             "text": text,
             "model_id": model_id,
@@ -137,35 +159,44 @@ class ElevenLabsDirectAPI:
         }
 
         try:
+            self.rate_limiter.acquire()
             print(f"🎤 Synthesizing chunk ({len(text)} chars)...")
 
-            response = requests.post(
+            # Audio streams straight to disk in blocks instead of being buffered
+            response = self.http.download(
+                "POST",
                 f"{self.base_url}/text-to-speech/{self.voice_id}",
+                output_path,
+                progress_callback=progress_callback,
                 headers=self.headers,
                 json=payload,
                 timeout=300
             )
 
             if response.status_code == 200:
-                with open(output_path, 'wb') as f:
-                    f.write(response.content)
+                if cache_key:
+                    self.cache.put_file(cache_key, output_path, sha256=response.sha256, size=response.bytes_written)
 
-                file_size = len(response.content)
+                file_size = response.bytes_written
                 print(f"✅ Synthesis successful: {file_size} bytes saved to {output_path}")
                 return {
                     "success": True,
                     "file_path": output_path,
                     "size": file_size,
-                    "characters": len(text)
+                    "characters": len(text),
+                    "cached": False,
+                    "sha256": response.sha256,
+                    "request_seconds": round(response.timing.total, 3)
                 }
 
             elif response.status_code == 401:
                 return {"success": False, "error": "Authentication failed - check API key"}
 
             elif response.status_code == 429:
-                print("⚠️ Rate limit hit, implementing backoff...")
-                time.sleep(5)  # Simple backoff
-                return {"success": False, "error": "Rate limit exceeded - retry needed"}
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                print(f"⚠️ Rate limit hit, pausing all requests for {retry_after:.1f}s...")
+                self.rate_limiter.pause(retry_after)
+                return {"success": False, "error": "Rate limit exceeded - retry needed", "rate_limited": True}
 
             elif response.status_code == 422:
                 return {"success": False, "error": f"Invalid SSML input: {response.text}"}
@@ -176,7 +207,64 @@ class ElevenLabsDirectAPI:
         except requests.exceptions.RequestException as e:
             return {"success": False, "error": f"Network error: {str(e)}"}
 
-    def synthesize_episode(self, script_path: str, output_directory: str, episode_name: str = "episode_1") -> dict:
+    def plan_episode(self, script_content: str, max_chunk_size: Optional[int] = None,
+                     model_id: Optional[str] = None, log_directory: Optional[str] = None) -> SynthesisPlan:
+        """
+        Choose chunking and model for an episode before any request is sent
+
+        Partitions are priced per billed character and timed against this
+        client's concurrency and rate limit; latencies measured in earlier
+        synthesis logs replace the configured estimates.
+
+        Args:
+            script_content: SSML script
+            max_chunk_size: Fixed chunk limit (default: searched by the planner)
+            model_id: Fixed model (default: chosen by the planner)
+            log_directory: Directory holding earlier *_synthesis_log.json files
+
+        Returns:
+            The chosen synthesis plan
+
+        Raises:
+            ValueError: Malformed SSML, or no model and chunk size fit the script
+        """
+        latency = {}
+        if log_directory:
+            latency = measured_latency(sorted(glob.glob(os.path.join(log_directory, "*_synthesis_log.json"))))
+        return plan_synthesis(
+            script_content,
+            models=[model_id] if model_id else None,
+            max_chars=max_chunk_size,
+            concurrency=self.max_concurrency,
+            requests_per_second=self.rate_limiter.rate,
+            burst=int(self.rate_limiter.capacity),
+            latency_overrides=latency
+        )
+
+    def _synthesize_with_retries(self, chunk: str, chunk_path: str, index: int, total: int,
+                                 max_retries: int = 3, use_cache: bool = True,
+                                 model_id: str = "eleven_turbo_v2_5") -> dict:
+        """
+        Synthesize one chunk, retrying failures (runs on a worker thread)
+
+        Rate-limit responses are retried after the shared bucket's pause
+        instead of a local sleep; other failures back off exponentially.
+        """
+        print(f"\n📍 Processing chunk {index+1}/{total}")
+        for attempt in range(max_retries):
+            result = self.synthesize_chunk(chunk, chunk_path, model_id, use_cache=use_cache)
+            result["attempts"] = attempt + 1
+            if result["success"]:
+                return result
+
+            print(f"❌ Chunk {index+1} attempt {attempt+1} failed: {result['error']}")
+            if attempt < max_retries - 1 and not result.get("rate_limited"):
+                print(f"🔄 Retrying chunk {index+1} in {2**attempt} seconds...")
+                time.sleep(2**attempt)  # Exponential backoff
+        return result
+
+    def synthesize_episode(self, script_path: str, output_directory: str, episode_name: str = "episode_1",
+                           max_chunk_size: Optional[int] = None, model_id: Optional[str] = None) -> dict:
         """
         Synthesize complete episode with chunking and concatenation
 
@@ -184,6 +272,8 @@ class ElevenLabsDirectAPI:
             script_path: Path to SSML script file
             output_directory: Directory for output files
             episode_name: Episode identifier
+            max_chunk_size: Maximum characters per synthesis chunk (default: chosen by the planner)
+            model_id: ElevenLabs model (default: chosen by the planner)
 
         Returns:
             Synthesis results with detailed logging
@@ -215,8 +305,14 @@ class ElevenLabsDirectAPI:
         # Create output directory
         os.makedirs(output_directory, exist_ok=True)
 
-        # Chunk the script intelligently
-        chunks = self.chunk_large_text(script_content)
+        # Plan chunking and model, and report the plan before any request is sent
+        try:
+            plan = self.plan_episode(script_content, max_chunk_size, model_id, output_directory)
+        except ValueError as e:
+            return {"success": False, "error": f"Script chunking error: {str(e)}"}
+        print_plan(plan)
+        chunks = [chunk.content for chunk in plan.chunks]
+        price_per_1k = plan.price_per_1k_characters
 
         # Synthesis tracking
         synthesis_log = {
@@ -224,57 +320,76 @@ class ElevenLabsDirectAPI:
             "script_path": script_path,
             "total_chunks": len(chunks),
             "total_characters": len(script_content),
+            "model_id": plan.model,
+            "plan": plan_summary(plan),
             "chunks_synthesized": 0,
             "failed_chunks": [],
             "audio_files": [],
             "errors": [],
             "start_time": datetime.now().isoformat(),
-            "estimated_cost": len(script_content) / 1000 * 0.18  # $0.18 per 1k chars
+            "estimated_cost": plan.cost,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "characters_synthesized": 0,
+            "cost_saved": 0.0
         }
 
         print(f"💰 Estimated cost: ${synthesis_log['estimated_cost']:.2f}")
 
-        # Synthesize each chunk
-        audio_files = []
-
-        for i, chunk in enumerate(chunks):
-            chunk_filename = f"{episode_name}_chunk_{i+1:03d}.mp3"
-            chunk_path = os.path.join(output_directory, chunk_filename)
-
-            print(f"\n📍 Processing chunk {i+1}/{len(chunks)}")
-
-            # Synthesize with retry logic
-            max_retries = 3
-            for attempt in range(max_retries):
-                result = self.synthesize_chunk(chunk, chunk_path)
-
-                if result["success"]:
-                    audio_files.append(chunk_path)
-                    synthesis_log["chunks_synthesized"] += 1
-                    synthesis_log["audio_files"].append({
+        # Synthesize chunks concurrently; results land in ordered slots so the
+        # episode is reassembled in script order whatever finishes first
+        audio_slots = [None] * len(chunks)
+        chunk_records = [None] * len(chunks)
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="tts") as executor:
+            futures = {
+                executor.submit(
+                    self._synthesize_with_retries, chunk,
+                    os.path.join(output_directory, f"{episode_name}_chunk_{i+1:03d}.mp3"), i, len(chunks),
+                    model_id=plan.model
+                ): i
+                for i, chunk in enumerate(chunks)
+            }
+
+            for future in as_completed(futures):
+                i = futures[future]
+                result = future.result()
+                if not result["success"]:
+                    synthesis_log["failed_chunks"].append(i+1)
+                    synthesis_log["errors"].append({
                         "chunk_number": i+1,
-                        "file_path": chunk_path,
-                        "file_size": result["size"],
-                        "characters": result["characters"]
+                        "error": result["error"]
                     })
-                    break
+                    continue
+
+                audio_slots[i] = result["file_path"]
+                synthesis_log["chunks_synthesized"] += 1
+                if result.get("cached"):
+                    synthesis_log["cache_hits"] += 1
+                    synthesis_log["cost_saved"] += result["characters"] / 1000 * price_per_1k
                 else:
-                    print(f"❌ Attempt {attempt+1} failed: {result['error']}")
-                    if attempt < max_retries - 1:
-                        print(f"🔄 Retrying in {2**attempt} seconds...")
-                        time.sleep(2**attempt)  # Exponential backoff
-                    else:
-                        synthesis_log["failed_chunks"].append(i+1)
-                        synthesis_log["errors"].append({
-                            "chunk_number": i+1,
-                            "error": result["error"]
-                        })
-
-            # Rate limiting - pause between chunks
-            if i < len(chunks) - 1:  # Don't wait after last chunk
-                time.sleep(1.5)
+                    synthesis_log["cache_misses"] += 1
+                    synthesis_log["characters_synthesized"] += result["characters"]
+                chunk_records[i] = {
+                    "chunk_number": i+1,
+                    "file_path": result["file_path"],
+                    "file_size": result["size"],
+                    "characters": result["characters"],
+                    "cached": result.get("cached", False),
+                    "attempts": result["attempts"],
+                    "request_seconds": result.get("request_seconds")
+                }
+
+        audio_files = [path for path in audio_slots if path]
+        synthesis_log["audio_files"] = [record for record in chunk_records if record]
+        synthesis_log["failed_chunks"].sort()
+        synthesis_log["rate_limiter"] = self.rate_limiter.get_stats()
+        synthesis_log["http"] = self.http.get_stats()
 
         synthesis_log["end_time"] = datetime.now().isoformat()
+        synthesis_log["actual_cost"] = synthesis_log["characters_synthesized"] / 1000 * price_per_1k
+        print(f"♻️ Cache: {synthesis_log['cache_hits']} hits, {synthesis_log['cache_misses']} misses, "
+              f"${synthesis_log['cost_saved']:.2f} saved")
 
         # Concatenate audio files if all successful
         if synthesis_log["chunks_synthesized"] == len(chunks):
@@ -304,7 +419,10 @@ class ElevenLabsDirectAPI:
 
     def concatenate_audio_files(self, audio_files: list, output_path: str) -> bool:
         """
-        Concatenate multiple audio files using ffmpeg
+        Concatenate multiple audio files at the MP3 frame level
+
+        Chunk files are left in place, so a failed join can be retried
+        without re-synthesizing anything.
 
         Args:
             audio_files: List of audio file paths
@@ -317,42 +435,16 @@ class ElevenLabsDirectAPI:
             print("❌ No audio files to concatenate")
             return False
 
-        # Create ffmpeg concat file
-        concat_file = output_path.replace('.mp3', '_concat_list.txt')
-
         try:
-            with open(concat_file, 'w') as f:
-                for audio_file in audio_files:
-                    f.write(f"file '{audio_file}'\n")
-
-            # Use ffmpeg to concatenate
-            concat_command = [
-                "ffmpeg", "-f", "concat", "-safe", "0",
-                "-i", concat_file, "-c", "copy", output_path, "-y"
-            ]
-
-            print("🔗 Running ffmpeg concatenation...")
-            result = subprocess.run(concat_command, capture_output=True, text=True)
+            print("🔗 Joining MP3 frames...")
+            result = concatenate_mp3(audio_files, output_path)
 
-            if result.returncode == 0:
-                print(f"✅ Audio concatenation successful")
+            print(f"✅ Audio concatenation successful")
+            print(f"📁 Final audio: {output_path} ({result['bytes']} bytes, "
+                  f"{result['frames']} frames, {result['duration_seconds']:.1f}s)")
+            return True
 
-                # Get final file info
-                file_size = os.path.getsize(output_path)
-                print(f"📁 Final audio: {output_path} ({file_size} bytes)")
-
-                # Clean up individual chunk files and concat list
-                for audio_file in audio_files:
-                    os.remove(audio_file)
-                os.remove(concat_file)
-
-                print("🧹 Cleanup completed - individual chunks removed")
-                return True
-            else:
-                print(f"❌ FFmpeg error: {result.stderr}")
-                return False
-
-        except Exception as e:
+        except (OSError, MP3FormatError) as e:
             print(f"❌ Concatenation error: {str(e)}")
             return False
 
@@ -425,6 +517,7 @@ def main():
         print(f"📁 Final audio: {result.get('final_audio_path', 'N/A')}")
         print(f"📊 Chunks processed: {result['chunks_synthesized']}/{result['total_chunks']}")
         print(f"💰 Estimated cost: ${result['estimated_cost']:.2f}")
+        print(f"♻️ Cache: {result['cache_hits']} chunks reused, ${result['cost_saved']:.2f} saved")
         print(f"⏱️ Duration: {result['start_time']} to {result['end_time']}")
     else:
         print("❌ Status: FAILED")
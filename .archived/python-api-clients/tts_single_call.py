@@ -9,23 +9,35 @@ import requests
 import json
 import time
 import os
+import sys
 from datetime import datetime
 from pathlib import Path
 
+from http_client import PooledHTTPClient, get_shared_client
+
+# Model pricing, limits and latency live with the chunk planner's config
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             '..', '..', 'nobody-knows', 'src', 'validation'))
+
+from chunk_planner import choose_model, load_default_model, ssml_tags
+
 class ElevenLabsSingleCall:
     """Simplified ElevenLabs client for single-call long-form synthesis"""
 
-    def __init__(self, api_key: str, voice_id: str = "ZF6FPAbjXT4488VcRRnw"):
+    def __init__(self, api_key: str, voice_id: str = "ZF6FPAbjXT4488VcRRnw",
+                 http_client: PooledHTTPClient = None):
         """
         Initialize ElevenLabs client with Amelia voice for single-call synthesis
 
         Args:
             api_key: ElevenLabs API key (from environment variable)
             voice_id: Amelia voice ID (ZF6FPAbjXT4488VcRRnw) - Episode 1 validated
+            http_client: Pooled keep-alive client (defaults to the shared one)
         """
         self.api_key = api_key
         self.voice_id = voice_id  # Amelia - young and enthusiastic
         self.base_url = "https://api.elevenlabs.io/v1"
+        self.http = http_client or get_shared_client()
         self.headers = {
             "xi-api-key": self.api_key,
             "Content-Type": "application/json"
@@ -47,7 +59,7 @@ class ElevenLabsSingleCall:
     def validate_api_key(self):
         """Validate API key and verify voice availability"""
         try:
-            response = requests.get(
+            response = self.http.get(
                 f"{self.base_url}/voices",
                 headers={"xi-api-key": self.api_key},
                 timeout=10
@@ -119,12 +131,16 @@ class ElevenLabsSingleCall:
 
         estimated_duration = base_duration_minutes + (total_break_seconds / 60)
 
+        # Priced as one request to the configured default model unless a better fit is found below
+        default_model, default_profile = load_default_model()
         validation = {
             "char_count": char_count,
             "word_count": word_count,
             "estimated_duration_minutes": estimated_duration,
             "within_limits": True,
-            "recommended_model": "eleven_turbo_v2_5",
+            "recommended_model": default_model,
+            "estimated_cost": (char_count / 1000 * default_profile["price_per_1k_characters"]
+                               + default_profile.get("price_per_request", 0.0)),
             "warnings": [],
             "errors": []
         }
@@ -143,13 +159,13 @@ class ElevenLabsSingleCall:
         elif estimated_duration > 35:
             validation["warnings"].append(f"Near duration limit: {estimated_duration:.1f}/40 minutes")
 
-        # Model recommendations
-        if char_count <= 10000:
-            validation["recommended_model"] = "eleven_multilingual_v2"  # Cheaper option
-        elif char_count <= 30000:
-            validation["recommended_model"] = "eleven_turbo_v2_5"  # Balanced
-        else:
-            validation["recommended_model"] = "eleven_turbo_v2_5"  # Required for >30k
+        # Model recommendation: fewest ignored tags, then lowest cost plus wall-clock time,
+        # among models accepting one request this size
+        choice = choose_model([char_count], concurrency=1, tags=ssml_tags(text))
+        if choice:
+            validation["recommended_model"] = choice["model"]
+            validation["estimated_cost"] = choice["cost"]
+            validation["estimated_request_seconds"] = choice["wall_clock_seconds"]
 
         return validation
 
@@ -231,7 +247,7 @@ class ElevenLabsSingleCall:
             "estimated_duration": validation["estimated_duration_minutes"],
             "model_used": validation["recommended_model"],
             "start_time": datetime.now().isoformat(),
-            "estimated_cost": validation["char_count"] / 1000 * 0.18,  # $0.18 per 1k chars
+            "estimated_cost": validation["estimated_cost"],
             "synthesis_method": "single_call"
         }
 
@@ -252,38 +268,48 @@ class ElevenLabsSingleCall:
         print(f"   Target: {output_file}")
 
         try:
-            # Make synthesis request with extended timeout for long content
-            response = requests.post(
+            # Make synthesis request with extended timeout for long content;
+            # the ~27-minute episode streams to disk instead of into memory
+            progress = {"next_mb": 1}
+
+            def report_progress(bytes_written, total_bytes):
+                if bytes_written >= progress["next_mb"] * 1024 * 1024:
+                    progress["next_mb"] = bytes_written // (1024 * 1024) + 1
+                    total_text = f" / {total_bytes / (1024 * 1024):.1f} MB" if total_bytes else ""
+                    print(f"   ⬇️ {bytes_written / (1024 * 1024):.1f} MB{total_text} received")
+
+            response = self.http.download(
+                "POST",
                 f"{self.base_url}/text-to-speech/{self.voice_id}",
+                output_file,
+                progress_callback=report_progress,
                 headers=self.headers,
                 json=payload,
                 timeout=900  # 15 minutes for long synthesis
             )
 
             synthesis_log["response_status"] = response.status_code
+            synthesis_log["http_timing"] = {
+                "ttfb_seconds": round(response.timing.ttfb, 3),
+                "transfer_seconds": round(response.timing.transfer, 3),
+                "reused_connection": response.timing.reused_connection
+            }
             synthesis_log["end_time"] = datetime.now().isoformat()
 
             if response.status_code == 200:
-                # Save audio file with enhanced error handling
+                # Audio was streamed to output_file atomically by download()
                 try:
                     # Validate audio content
-                    audio_content = response.content
-                    file_size = len(audio_content)
+                    file_size = response.bytes_written
 
                     if file_size < 1000:  # Less than 1KB suggests invalid audio
+                        os.remove(output_file)
                         synthesis_log["success"] = False
                         synthesis_log["error"] = f"Audio file too small ({file_size} bytes) - may be invalid"
                         return synthesis_log
 
-                    # Write audio file with atomic operation
-                    temp_file = output_file + ".tmp"
-                    with open(temp_file, 'wb') as f:
-                        f.write(audio_content)
-
-                    # Atomic rename to final file
-                    os.rename(temp_file, output_file)
-
                     synthesis_log["output_file"] = output_file
+                    synthesis_log["sha256"] = response.sha256
                     synthesis_log["file_size_bytes"] = file_size
                     synthesis_log["file_size_mb"] = file_size / (1024 * 1024)
                     synthesis_log["success"] = True
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Word Alignment Engine for STT Accuracy Metrics
+Myers diff for word opcodes and banded NumPy edit distance for WER/CER.
+"""
+
+import difflib
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Initial band half-width for the banded edit distance; doubled until exact
+DEFAULT_BAND = 32
+
+
+def _bisect(a: Sequence, b: Sequence, alo: int, ahi: int, blo: int, bhi: int) -> Optional[Tuple[int, int]]:
+    """
+    Myers' middle snake: a split point on an optimal edit path
+
+    Runs the forward and reverse searches together in O((N+M)D) time and
+    O(N+M) space. Returns None when the ranges share no element.
+    """
+    n, m = ahi - alo, bhi - blo
+    max_d = (n + m + 1) // 2
+    v_offset = max_d
+    v_length = 2 * max_d + 2
+    v1 = [-1] * v_length
+    v2 = [-1] * v_length
+    v1[v_offset + 1] = 0
+    v2[v_offset + 1] = 0
+    delta = n - m
+    front = delta % 2 != 0
+    k1start = k1end = k2start = k2end = 0
+
+    for d in range(max_d):
+        for k1 in range(-d + k1start, d + 1 - k1end, 2):
+            k1_offset = v_offset + k1
+            if k1 == -d or (k1 != d and v1[k1_offset - 1] < v1[k1_offset + 1]):
+                x1 = v1[k1_offset + 1]
+            else:
+                x1 = v1[k1_offset - 1] + 1
+            y1 = x1 - k1
+            while x1 < n and y1 < m and a[alo + x1] == b[blo + y1]:
+                x1 += 1
+                y1 += 1
+            v1[k1_offset] = x1
+            if x1 > n:
+                k1end += 2
+            elif y1 > m:
+                k1start += 2
+            elif front:
+                k2_offset = v_offset + delta - k1
+                if 0 <= k2_offset < v_length and v2[k2_offset] != -1:
+                    if x1 >= n - v2[k2_offset]:
+                        return alo + x1, blo + y1
+
+        for k2 in range(-d + k2start, d + 1 - k2end, 2):
+            k2_offset = v_offset + k2
+            if k2 == -d or (k2 != d and v2[k2_offset - 1] < v2[k2_offset + 1]):
+                x2 = v2[k2_offset + 1]
+            else:
+                x2 = v2[k2_offset - 1] + 1
+            y2 = x2 - k2
+            while x2 < n and y2 < m and a[ahi - x2 - 1] == b[bhi - y2 - 1]:
+                x2 += 1
+                y2 += 1
+            v2[k2_offset] = x2
+            if x2 > n:
+                k2end += 2
+            elif y2 > m:
+                k2start += 2
+            elif not front:
+                k1_offset = v_offset + delta - k2
+                if 0 <= k1_offset < v_length and v1[k1_offset] != -1:
+                    x1 = v1[k1_offset]
+                    if x1 >= n - x2:
+                        return alo + x1, blo + v_offset + x1 - k1_offset
+    return None
+
+
+def matching_blocks(a: Sequence, b: Sequence) -> List[Tuple[int, int, int]]:
+    """
+    Longest-common-subsequence matching blocks of two sequences
+
+    Returns:
+        (i, j, size) triples like difflib.SequenceMatcher.get_matching_blocks(),
+        without the trailing sentinel
+    """
+    blocks = []
+    # Explicit stack of ranges (or finished blocks) keeps recursion off the C stack
+    stack = [(0, len(a), 0, len(b))]
+    while stack:
+        item = stack.pop()
+        if len(item) == 3:
+            blocks.append(item)
+            continue
+
+        alo, ahi, blo, bhi = item
+        prefix = 0
+        while alo + prefix < ahi and blo + prefix < bhi and a[alo + prefix] == b[blo + prefix]:
+            prefix += 1
+        if prefix:
+            blocks.append((alo, blo, prefix))
+            alo += prefix
+            blo += prefix
+
+        suffix = 0
+        while ahi - suffix > alo and bhi - suffix > blo and a[ahi - suffix - 1] == b[bhi - suffix - 1]:
+            suffix += 1
+        ahi -= suffix
+        bhi -= suffix
+        if suffix:
+            stack.append((ahi, bhi, suffix))
+
+        if alo < ahi and blo < bhi:
+            split = _bisect(a, b, alo, ahi, blo, bhi)
+            if split is not None:
+                x, y = split
+                stack.append((x, ahi, y, bhi))
+                stack.append((alo, x, blo, y))
+
+    merged = []
+    for i, j, size in blocks:
+        if merged and merged[-1][0] + merged[-1][2] == i and merged[-1][1] + merged[-1][2] == j:
+            merged[-1] = (merged[-1][0], merged[-1][1], merged[-1][2] + size)
+        else:
+            merged.append((i, j, size))
+    return merged
+
+
+def opcodes_from_blocks(blocks: List[Tuple[int, int, int]], n: int, m: int) -> List[Tuple[str, int, int, int, int]]:
+    """difflib-style (tag, i1, i2, j1, j2) opcodes from matching blocks"""
+    opcodes = []
+    i = j = 0
+    for ai, bj, size in blocks + [(n, m, 0)]:
+        if i < ai and j < bj:
+            opcodes.append(("replace", i, ai, j, bj))
+        elif i < ai:
+            opcodes.append(("delete", i, ai, j, bj))
+        elif j < bj:
+            opcodes.append(("insert", i, ai, j, bj))
+        i, j = ai + size, bj + size
+        if size:
+            opcodes.append(("equal", ai, i, bj, j))
+    return opcodes
+
+
+def _encode(a: Sequence, b: Sequence) -> Tuple[np.ndarray, np.ndarray]:
+    """Integer arrays for two strings (code points) or token lists (shared ids)"""
+    if isinstance(a, str) and isinstance(b, str):
+        return (np.frombuffer(a.encode("utf-32-le"), dtype=np.uint32).astype(np.int64),
+                np.frombuffer(b.encode("utf-32-le"), dtype=np.uint32).astype(np.int64))
+    ids: Dict = {}
+    return (np.array([ids.setdefault(token, len(ids)) for token in a], dtype=np.int64),
+            np.array([ids.setdefault(token, len(ids)) for token in b], dtype=np.int64))
+
+
+def _banded_distance(a: np.ndarray, b: np.ndarray, band: int, substitution_cost: int) -> int:
+    """Edit distance restricted to diagonals within ``band`` of the corner-to-corner strip"""
+    n, m = len(a), len(b)
+    inf = (n + m) * max(1, substitution_cost) + 1
+    lo = min(0, m - n) - band
+    hi = max(0, m - n) + band
+    diagonals = np.arange(lo, hi + 1)  # j - i for each band cell
+    steps = np.arange(len(diagonals))
+    # b padded so b_padded[j] is b[j-1] for every j the band can touch
+    b_padded = np.full(n + hi + 2 - lo, -1, dtype=np.int64)
+    b_padded[1 - lo:1 - lo + m] = b
+
+    columns = diagonals
+    previous = np.where((columns >= 0) & (columns <= m), columns, inf)
+    vertical = np.empty_like(previous)
+    for i in range(1, n + 1):
+        columns = diagonals + i
+        valid = (columns >= 0) & (columns <= m)
+        mismatch = b_padded[columns - lo] != a[i - 1]
+        best = previous + mismatch * substitution_cost     # from (i-1, j-1)
+        vertical[:-1] = previous[1:] + 1                    # from (i-1, j)
+        vertical[-1] = inf
+        np.minimum(best, vertical, out=best)
+        best[~valid] = inf
+        # Horizontal moves: cur[t] = min over s <= t of best[s] + (t - s)
+        current = np.minimum.accumulate(best - steps) + steps
+        current[~valid] = inf
+        previous = current
+    return int(previous[m - n - lo])
+
+
+def edit_distance(a: Sequence, b: Sequence, substitution_cost: int = 1, band: int = DEFAULT_BAND) -> int:
+    """
+    Edit distance between two strings or token sequences
+
+    Only a diagonal band of the DP matrix is computed, one NumPy-vectorized
+    row at a time; the band is doubled until the distance fits inside it,
+    which makes the result exact in O(N * distance) time and O(band) memory.
+
+    Args:
+        substitution_cost: 1 for Levenshtein distance, 2 for insert/delete-only
+            distance (len(a) + len(b) - 2 * LCS)
+        band: Initial band half-width
+    """
+    n, m = len(a), len(b)
+    if n == 0 or m == 0:
+        return n + m
+    a_codes, b_codes = _encode(a, b)
+    band = max(1, band)
+    while True:
+        distance = _banded_distance(a_codes, b_codes, band, substitution_cost)
+        if distance <= band:
+            return distance
+        band *= 2
+
+
+def similarity_ratio(a: Sequence, b: Sequence) -> float:
+    """2 * LCS / (len(a) + len(b)), the quantity difflib's ratio() approximates"""
+    total = len(a) + len(b)
+    if total == 0:
+        return 1.0
+    return (total - edit_distance(a, b, substitution_cost=2)) / total
+
+
+@dataclass
+class AlignmentResult:
+    """Word- and character-level comparison of a reference and a hypothesis"""
+    reference_words: List[str]
+    hypothesis_words: List[str]
+    opcodes: List[Tuple[str, int, int, int, int]]
+    matched_words: int
+    word_errors: int
+    character_errors: int
+    reference_characters: int
+    character_similarity: float
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def word_accuracy(self) -> float:
+        """Share of reference words matched in order (0-1)"""
+        return self.matched_words / len(self.reference_words) if self.reference_words else 0.0
+
+    @property
+    def wer(self) -> float:
+        return self.word_errors / len(self.reference_words) if self.reference_words else 0.0
+
+    @property
+    def cer(self) -> float:
+        return self.character_errors / self.reference_characters if self.reference_characters else 0.0
+
+    def differences(self, limit: Optional[int] = None) -> List[dict]:
+        """Non-equal opcodes as original/transcript word spans"""
+        differences = []
+        for tag, i1, i2, j1, j2 in self.opcodes:
+            if tag == "equal":
+                continue
+            differences.append({
+                "type": tag,
+                "original": " ".join(self.reference_words[i1:i2]),
+                "transcript": " ".join(self.hypothesis_words[j1:j2]),
+                "position": i1
+            })
+            if limit is not None and len(differences) >= limit:
+                break
+        return differences
+
+
+def align_texts(reference: str, hypothesis: str) -> AlignmentResult:
+    """
+    Align two cleaned texts for accuracy metrics
+
+    Words are aligned with the Myers diff; character-level distances are
+    then computed only inside the non-matching word spans (anchored on the
+    matched words), so a 25k-character episode with a few percent of errors
+    costs a handful of small banded DPs instead of one quadratic pass.
+    Whitespace is normalized to single spaces.
+
+    Args:
+        reference: Original script text (already cleaned)
+        hypothesis: STT transcript (already cleaned)
+
+    Returns:
+        AlignmentResult with opcodes, WER, CER and character similarity
+    """
+    timings = {}
+    reference_words = reference.split()
+    hypothesis_words = hypothesis.split()
+    reference_chars = len(" ".join(reference_words))
+    hypothesis_chars = len(" ".join(hypothesis_words))
+
+    start = time.perf_counter()
+    blocks = matching_blocks(reference_words, hypothesis_words)
+    opcodes = opcodes_from_blocks(blocks, len(reference_words), len(hypothesis_words))
+    timings["words_seconds"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    word_errors = character_errors = indel_errors = 0
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            continue
+        original = " ".join(reference_words[i1:i2])
+        transcript = " ".join(hypothesis_words[j1:j2])
+        if tag == "replace":
+            word_errors += edit_distance(reference_words[i1:i2], hypothesis_words[j1:j2])
+            character_errors += edit_distance(original, transcript)
+            indel_errors += edit_distance(original, transcript, substitution_cost=2)
+        else:
+            # A whole span plus its separating space was dropped or added
+            removed = len(original or transcript) + (1 if reference_words and hypothesis_words else 0)
+            word_errors += (i2 - i1) + (j2 - j1)
+            character_errors += removed
+            indel_errors += removed
+    timings["characters_seconds"] = time.perf_counter() - start
+
+    total_chars = reference_chars + hypothesis_chars
+    return AlignmentResult(
+        reference_words=reference_words,
+        hypothesis_words=hypothesis_words,
+        opcodes=opcodes,
+        matched_words=sum(size for _, _, size in blocks),
+        word_errors=word_errors,
+        character_errors=character_errors,
+        reference_characters=reference_chars,
+        character_similarity=max(0.0, (total_chars - indel_errors) / total_chars) if total_chars else 1.0,
+        timings=timings
+    )
+
+
+def compare_with_difflib(reference: str, hypothesis: str) -> dict:
+    """
+    Benchmark align_texts() against the difflib-based metrics it replaces
+
+    Returns:
+        Word accuracy and character accuracy (%) plus seconds for both engines
+    """
+    start = time.perf_counter()
+    reference_words, hypothesis_words = reference.split(), hypothesis.split()
+    word_matcher = difflib.SequenceMatcher(None, reference_words, hypothesis_words)
+    difflib_words = sum(block.size for block in word_matcher.get_matching_blocks())
+    difflib_chars = difflib.SequenceMatcher(None, reference, hypothesis).ratio()
+    difflib_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = align_texts(reference, hypothesis)
+    engine_seconds = time.perf_counter() - start
+
+    word_count = len(reference_words) or 1
+    return {
+        "difflib": {
+            "word_accuracy_percent": round(difflib_words / word_count * 100, 2),
+            "character_accuracy_percent": round(difflib_chars * 100, 2),
+            "seconds": round(difflib_seconds, 3)
+        },
+        "alignment_engine": {
+            "word_accuracy_percent": round(result.word_accuracy * 100, 2),
+            "character_accuracy_percent": round(result.character_similarity * 100, 2),
+            "word_error_rate": round(result.wer, 4),
+            "character_error_rate": round(result.cer, 4),
+            "seconds": round(engine_seconds, 3)
+        }
+    }
+
+
+def main():
+    """Compare engines on a script and its transcript: word_alignment.py SCRIPT TRANSCRIPT"""
+    if len(sys.argv) != 3:
+        print("Usage: python word_alignment.py <script.ssml> <transcript.txt>")
+        return
+
+    def clean(text):
+        return re.sub(r'\s+', ' ', re.sub(r'<[^>]*>', ' ', text)).lower().strip()
+
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        reference = clean(f.read())
+    with open(sys.argv[2], 'r', encoding='utf-8') as f:
+        hypothesis = clean(f.read())
+
+    report = compare_with_difflib(reference, hypothesis)
+    for engine, values in report.items():
+        print(f"📊 {engine}: {values}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Cooperative Cancellation for Episode Tasks
+Cancellation tokens with deadlines that phases poll between units of work.
+"""
+
+import threading
+import time
+from typing import Callable, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TaskCancelledError(Exception):
+    """Raised inside a phase when its task has been cancelled or timed out"""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class CancellationToken:
+    """
+    Thread-safe cancellation signal carried by each episode task
+
+    Phases call ``check()`` between units of work and use ``wait()``
+    instead of ``time.sleep()`` so a cancel or an expired deadline
+    interrupts them promptly. Callbacks registered with ``add_callback``
+    run exactly once, at the moment of cancellation, which is where
+    callers release budget reservations and other held resources.
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[str], None]] = []
+        self.reason: Optional[str] = None
+        self.cancelled_at: Optional[float] = None
+        self.deadline: Optional[float] = None
+        if timeout is not None:
+            self.start(timeout)
+
+    def start(self, timeout: Optional[float]):
+        """Arm the deadline relative to now (no-op for None)"""
+        if timeout is not None:
+            self.deadline = time.time() + timeout
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def expired(self) -> bool:
+        """True once the deadline has passed"""
+        return self.deadline is not None and time.time() >= self.deadline
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until the deadline, or None when no deadline is set"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.time())
+
+    def cancel(self, reason: str = "cancelled") -> bool:
+        """
+        Cancel the token
+
+        Returns:
+            bool: True if this call cancelled it, False if it already was
+        """
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self.reason = reason
+            self.cancelled_at = time.time()
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+
+        for callback in callbacks:
+            try:
+                callback(reason)
+            except Exception as e:
+                logger.error(f"Cancellation callback failed: {e}")
+        return True
+
+    def add_callback(self, callback: Callable[[str], None]):
+        """Run ``callback(reason)`` on cancellation (immediately if already cancelled)"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback(self.reason)
+
+    def check(self):
+        """Raise TaskCancelledError if cancelled or past the deadline"""
+        if not self._event.is_set() and self.expired():
+            self.cancel("deadline exceeded")
+        if self._event.is_set():
+            raise TaskCancelledError(self.reason or "cancelled")
+
+    def wait(self, seconds: float):
+        """Interruptible sleep: returns early and raises if cancelled"""
+        remaining = self.remaining()
+        if remaining is not None:
+            seconds = min(seconds, remaining)
+        self._event.wait(seconds)
+        self.check()
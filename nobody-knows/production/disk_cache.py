@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Persistent Disk-Backed Response Cache
+Second cache tier that survives restarts and is shared between processes.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional, Tuple
+import logging
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# Index file: header, then fixed-size open-addressing slots
+_HEADER = struct.Struct("<8sIIQQQ")        # magic, version, slot count, entries, blob bytes, tombstones
+_SLOT = struct.Struct("<32sBxxxIddQ")      # digest, state, blob size, expires_at, last_access, reserved
+_MAGIC = b"NKCACHE1"
+_VERSION = 1
+_EMPTY, _USED, _DELETED = 0, 1, 2
+
+# Deleted slots are reclaimed by rebuilding the index once they pass this share of all slots
+_TOMBSTONE_LIMIT = 0.25
+
+# Blob encoding prefixes
+_JSON, _BYTES = b"J", b"B"
+
+
+def make_cache_key(namespace: str, content: str, **settings) -> str:
+    """
+    Content-addressed cache key
+
+    Args:
+        namespace: Tool or phase, e.g. "research" or "tts"
+        content: Query or text being processed
+        settings: Model, voice and other parameters that change the response
+
+    Returns:
+        Hex SHA-256 digest of the canonical request
+    """
+    canonical = json.dumps({"ns": namespace, "content": content, "settings": settings},
+                           sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """
+    Content-addressed on-disk cache with a memory-mapped index
+
+    The index is a fixed-slot, linearly probed hash table in a single
+    memory-mapped file; each slot holds the key digest, blob size, expiry
+    and last access time. Values are zlib-compressed blobs (JSON documents
+    or raw bytes - never pickle, so a shared cache directory cannot execute
+    code) written atomically with rename. An flock on a lock file serializes
+    index updates across processes and a thread lock does the same within
+    one, so several runs can share a cache directory safely.
+
+    Eviction drops least recently used entries once the blob bytes exceed
+    ``max_bytes`` or the index passes 75% occupancy. Removed entries leave
+    tombstones on the probe paths; once they pass 25% of the slots the
+    index is rebuilt in place so lookups keep ending at an empty slot.
+    """
+
+    def __init__(self, root_dir: str, max_bytes: int = 1024 * 1024 * 1024,
+                 slots: int = 16384, default_ttl: Optional[float] = 7 * 24 * 3600.0):
+        self.root_dir = root_dir
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.blob_dir = os.path.join(root_dir, "blobs")
+        os.makedirs(self.blob_dir, exist_ok=True)
+
+        self._thread_lock = threading.RLock()
+        self._lock_file = open(os.path.join(root_dir, "index.lock"), "a+b")
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0, "expirations": 0,
+                      "probes": 0, "compactions": 0}
+
+        index_path = os.path.join(root_dir, "index.bin")
+        with self._locked():
+            if not os.path.exists(index_path) or os.path.getsize(index_path) < _HEADER.size:
+                with open(index_path, "wb") as f:
+                    f.write(_HEADER.pack(_MAGIC, _VERSION, slots, 0, 0, 0))
+                    f.truncate(_HEADER.size + slots * _SLOT.size)
+
+        self._index_file = open(index_path, "r+b")
+        self._index = mmap.mmap(self._index_file.fileno(), 0)
+        magic, version, self.slots, _, _, _ = _HEADER.unpack_from(self._index, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Unrecognized cache index at {index_path}")
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Exclusive access to the index across threads and processes"""
+        with self._thread_lock:
+            if fcntl:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _digest(key: str) -> bytes:
+        return hashlib.sha256(key.encode("utf-8")).digest()
+
+    def _blob_path(self, digest: bytes) -> str:
+        name = digest.hex()
+        return os.path.join(self.blob_dir, name[:2], name)
+
+    def _header(self) -> Tuple[int, int, int]:
+        """(entries, blob bytes, tombstones) kept in the index header"""
+        _, _, _, entries, total_bytes, tombstones = _HEADER.unpack_from(self._index, 0)
+        return entries, total_bytes, tombstones
+
+    def _write_header(self, entries: int, total_bytes: int, tombstones: int):
+        _HEADER.pack_into(self._index, 0, _MAGIC, _VERSION, self.slots,
+                          max(0, entries), max(0, total_bytes), max(0, tombstones))
+
+    def _totals(self) -> Tuple[int, int]:
+        """(entries, blob bytes) kept in the index header"""
+        return self._header()[:2]
+
+    def _adjust_totals(self, entries_delta: int, bytes_delta: int, tombstones_delta: int = 0):
+        entries, total_bytes, tombstones = self._header()
+        self._write_header(entries + entries_delta, total_bytes + bytes_delta, tombstones + tombstones_delta)
+
+    def _read_slot(self, index: int) -> Tuple[bytes, int, int, float, float]:
+        digest, state, size, expires_at, last_access, _ = _SLOT.unpack_from(
+            self._index, _HEADER.size + index * _SLOT.size)
+        return digest, state, size, expires_at, last_access
+
+    def _write_slot(self, index: int, digest: bytes, state: int, size: int,
+                    expires_at: float, last_access: float):
+        _SLOT.pack_into(self._index, _HEADER.size + index * _SLOT.size,
+                        digest, state, size, expires_at, last_access, 0)
+
+    def _find(self, digest: bytes) -> Tuple[Optional[int], Optional[int]]:
+        """Return (slot holding digest, first reusable slot on its probe path)"""
+        start = int.from_bytes(digest[:8], "little") % self.slots
+        free = None
+        for step in range(self.slots):
+            index = (start + step) % self.slots
+            slot_digest, state, _, _, _ = self._read_slot(index)
+            self.stats["probes"] += 1
+            if state == _EMPTY:
+                return None, free if free is not None else index
+            if state == _DELETED:
+                if free is None:
+                    free = index
+            elif slot_digest == digest:
+                return index, free
+        return None, free
+
+    def _insert_slot(self, digest: bytes, size: int, expires_at: float, last_access: float):
+        """Place an entry in the first empty slot of its probe path (rebuilds only)"""
+        start = int.from_bytes(digest[:8], "little") % self.slots
+        for step in range(self.slots):
+            index = (start + step) % self.slots
+            if self._read_slot(index)[1] == _EMPTY:
+                self._write_slot(index, digest, _USED, size, expires_at, last_access)
+                return
+
+    def _drop(self, index: int, digest: bytes):
+        _, _, size, _, _ = self._read_slot(index)
+        self._write_slot(index, digest, _DELETED, 0, 0.0, 0.0)
+        self._adjust_totals(-1, -size, 1)
+        try:
+            os.remove(self._blob_path(digest))
+        except FileNotFoundError:
+            pass
+
+    def _compact(self):
+        """Rebuild the index in place once tombstones lengthen probe paths (lock held)"""
+        entries, total_bytes, tombstones = self._header()
+        if tombstones <= _TOMBSTONE_LIMIT * self.slots:
+            return
+        live = [(digest, size, expires_at, last_access)
+                for _, digest, size, expires_at, last_access in self._used_slots()]
+        self._index[_HEADER.size:] = bytes(self.slots * _SLOT.size)
+        for entry in live:
+            self._insert_slot(*entry)
+        self._write_header(entries, total_bytes, 0)
+        self.stats["compactions"] += 1
+
+    @staticmethod
+    def _encode(value: Any) -> bytes:
+        if isinstance(value, (bytes, bytearray)):
+            return _BYTES + zlib.compress(bytes(value))
+        return _JSON + zlib.compress(json.dumps(value).encode("utf-8"))
+
+    @staticmethod
+    def _decode(blob: bytes) -> Any:
+        payload = zlib.decompress(blob[1:])
+        if blob[:1] == _BYTES:
+            return payload
+        return json.loads(payload.decode("utf-8"))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value or ``default``"""
+        return self.get_entry(key, default)[0]
+
+    def get_entry(self, key: str, default: Any = None) -> Tuple[Any, float]:
+        """Return (cached value, expires_at) or (``default``, 0.0); expires_at 0.0 means never"""
+        digest = self._digest(key)
+        with self._locked():
+            index, _ = self._find(digest)
+            if index is None:
+                self.stats["misses"] += 1
+                return default, 0.0
+
+            _, _, size, expires_at, _ = self._read_slot(index)
+            if expires_at and expires_at <= time.time():
+                self._drop(index, digest)
+                self._compact()
+                self.stats["expirations"] += 1
+                self.stats["misses"] += 1
+                return default, 0.0
+
+            try:
+                with open(self._blob_path(digest), "rb") as f:
+                    value = self._decode(f.read())
+            except (OSError, ValueError, zlib.error) as e:
+                logger.warning(f"Dropping unreadable cache entry {key[:12]}: {e}")
+                self._drop(index, digest)
+                self._compact()
+                self.stats["misses"] += 1
+                return default, 0.0
+
+            self._write_slot(index, digest, _USED, size, expires_at, time.time())
+            self.stats["hits"] += 1
+            return value, expires_at
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = _MISSING):
+        """
+        Store a JSON-serializable value or bytes
+
+        Args:
+            ttl: Seconds until expiry (defaults to default_ttl; None = never)
+        """
+        if ttl is _MISSING:
+            ttl = self.default_ttl
+        expires_at = time.time() + ttl if ttl else 0.0
+        blob = self._encode(value)
+        digest = self._digest(key)
+
+        # Write the blob outside the index lock; rename makes it atomic
+        blob_path = self._blob_path(digest)
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(blob_path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+
+        with self._locked():
+            os.replace(tmp_path, blob_path)
+            index, free = self._find(digest)
+            if index is not None:
+                _, _, old_size, _, _ = self._read_slot(index)
+                self._adjust_totals(0, len(blob) - old_size)
+            else:
+                if free is None or self._totals()[0] >= 0.75 * self.slots:
+                    self._evict(needed_slots=max(1, self.slots // 10))
+                    _, free = self._find(digest)
+                index = free
+                reused = self._read_slot(index)[1] == _DELETED
+                self._adjust_totals(1, len(blob), -1 if reused else 0)
+            self._write_slot(index, digest, _USED, len(blob), expires_at, time.time())
+            self.stats["writes"] += 1
+
+            if self._totals()[1] > self.max_bytes:
+                self._evict()
+            self._compact()
+
+    def delete(self, key: str) -> bool:
+        digest = self._digest(key)
+        with self._locked():
+            index, _ = self._find(digest)
+            if index is None:
+                return False
+            self._drop(index, digest)
+            self._compact()
+            return True
+
+    def _used_slots(self) -> Iterator[Tuple[int, bytes, int, float, float]]:
+        for index in range(self.slots):
+            digest, state, size, expires_at, last_access = self._read_slot(index)
+            if state == _USED:
+                yield index, digest, size, expires_at, last_access
+
+    def _evict(self, needed_slots: int = 0):
+        """Drop expired entries, then LRU entries until under budget (lock held)"""
+        now = time.time()
+        entries = []
+        for index, digest, size, expires_at, last_access in self._used_slots():
+            if expires_at and expires_at <= now:
+                self._drop(index, digest)
+                self.stats["expirations"] += 1
+                needed_slots -= 1
+            else:
+                entries.append((last_access, index, digest, size))
+
+        total = sum(size for _, _, _, size in entries)
+        entries.sort()
+        for _, index, digest, size in entries:
+            if total <= self.max_bytes and needed_slots <= 0:
+                break
+            self._drop(index, digest)
+            self.stats["evictions"] += 1
+            total -= size
+            needed_slots -= 1
+
+    def purge_expired(self) -> int:
+        """Remove expired entries; returns the number removed"""
+        now = time.time()
+        removed = 0
+        with self._locked():
+            for index, digest, _, expires_at, _ in list(self._used_slots()):
+                if expires_at and expires_at <= now:
+                    self._drop(index, digest)
+                    removed += 1
+            self.stats["expirations"] += removed
+            self._compact()
+        return removed
+
+    def __len__(self) -> int:
+        with self._locked():
+            return self._totals()[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._locked():
+            entries, total_bytes, tombstones = self._header()
+        return {**self.stats, "entries": entries, "bytes": total_bytes, "tombstones": tombstones,
+                "max_bytes": self.max_bytes}
+
+    def close(self):
+        self._index.flush()
+        self._index.close()
+        self._index_file.close()
+        self._lock_file.close()
+
+
+class TieredCache:
+    """
+    In-memory cache backed by a DiskCache
+
+    Reads try memory first and promote disk hits into memory for the disk
+    entry's remaining lifetime; writes go to both tiers, so a restarted process finds everything that was cached
+    before the crash.
+    """
+
+    def __init__(self, memory_cache, disk_cache: DiskCache):
+        self.memory = memory_cache
+        self.disk = disk_cache
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            with self._lock:
+                self.stats["memory_hits"] += 1
+            return value
+
+        value, expires_at = self.disk.get_entry(key, _MISSING)
+        if value is _MISSING:
+            with self._lock:
+                self.stats["misses"] += 1
+            return default
+
+        with self._lock:
+            self.stats["disk_hits"] += 1
+        remaining = expires_at - time.time() if expires_at else None
+        if remaining is None or remaining > 0:
+            self.memory.put(key, value, remaining)
+        return value
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = _MISSING, **memory_options) -> bool:
+        """Write through to both tiers; returns whether the memory tier kept it"""
+        if ttl is _MISSING:
+            stored = self.memory.put(key, value, **memory_options)
+        else:
+            stored = self.memory.put(key, value, ttl, **memory_options)
+
+        try:
+            if ttl is _MISSING:
+                self.disk.put(key, value)
+            else:
+                self.disk.put(key, value, ttl)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Value for {key[:40]} not persisted to disk cache: {e}")
+        return stored is not False
+
+    def purge_expired(self) -> int:
+        return self.memory.purge_expired() + self.disk.purge_expired()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        stats["disk"] = self.disk.get_stats()
+        return stats
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Episode Task Futures and Progress Events
+Result handles returned by ThreadSafeEpisodeProcessor.submit_episode.
+"""
+
+import time
+import threading
+from concurrent import futures
+from dataclasses import dataclass, field
+from queue import Queue, Empty
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional
+import logging
+
+from cancellation import CancellationToken
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProgressEvent:
+    """Incremental progress report from a running phase"""
+    episode_id: str
+    task_type: str
+    stage: str
+    current: int
+    total: int
+    message: str = ""
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def fraction(self) -> float:
+        return self.current / self.total if self.total else 0.0
+
+
+class EpisodeFuture(futures.Future):
+    """
+    Future for one submitted episode task
+
+    Resolves to the phase result dictionary (cost, quality score, sources,
+    ...), or raises TaskCancelledError / the phase's exception. Progress
+    events are delivered to registered callbacks as they happen and can
+    also be consumed in order with ``iter_progress()``.
+    Cancelling the future also cancels the task's CancellationToken, so a
+    running phase is interrupted rather than merely having its result dropped.
+    """
+
+    def __init__(self, episode_id: str, task_type: str, task_id: str, token: CancellationToken):
+        super().__init__()
+        self.episode_id = episode_id
+        self.task_type = task_type
+        self.task_id = task_id
+        self.token = token
+        self._progress_lock = threading.Lock()
+        self._progress_callbacks: List[Callable[[ProgressEvent], None]] = []
+        self._progress_events: "Queue[Optional[ProgressEvent]]" = Queue()
+        self.add_done_callback(lambda _: self._progress_events.put(None))
+
+    def cancel(self) -> bool:
+        self.token.cancel("future cancelled")
+        return super().cancel()
+
+    def add_progress_callback(self, callback: Callable[[ProgressEvent], None]):
+        """Call ``callback(event)`` for every subsequent progress event"""
+        with self._progress_lock:
+            self._progress_callbacks.append(callback)
+
+    def report_progress(self, stage: str, current: int, total: int, message: str = ""):
+        """Publish a progress event (called from the worker thread)"""
+        event = ProgressEvent(self.episode_id, self.task_type, stage, current, total, message)
+        self._progress_events.put(event)
+
+        with self._progress_lock:
+            callbacks = list(self._progress_callbacks)
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Progress callback failed for episode {self.episode_id}: {e}")
+
+    def iter_progress(self, timeout: Optional[float] = None) -> Iterator[ProgressEvent]:
+        """
+        Yield progress events in order until the task finishes
+
+        Args:
+            timeout: Longest wait for the next event (None = no limit)
+
+        Raises:
+            TimeoutError: If no event or completion arrives within timeout
+        """
+        while True:
+            try:
+                event = self._progress_events.get(timeout=timeout)
+            except Empty:
+                raise TimeoutError(f"No progress from episode {self.episode_id} within {timeout}s")
+            if event is None:
+                return
+            yield event
+
+    def _resolve(self, result: Optional[Dict[str, Any]] = None, error: Optional[BaseException] = None):
+        """Set the outcome unless the future was already cancelled or resolved"""
+        try:
+            if error is not None:
+                self.set_exception(error)
+            else:
+                self.set_result(result)
+        except futures.InvalidStateError:
+            pass
+
+
+def as_completed(episode_futures: Iterable[EpisodeFuture],
+                 timeout: Optional[float] = None) -> Iterator[EpisodeFuture]:
+    """Yield futures as their tasks finish, so downstream phases start immediately"""
+    return futures.as_completed(episode_futures, timeout=timeout)
+
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Streaming Latency Sketch
+Mergeable percentile estimates for processing-time statistics.
+"""
+
+import math
+from typing import Dict, Any, Iterable
+
+
+class LatencySketch:
+    """
+    Log-bucketed quantile sketch with bounded relative error
+
+    Every value lands in bucket ceil(log_gamma(value)), so any reported
+    quantile is within ``relative_accuracy`` of the true value. Buckets are
+    plain counters, which makes sketches cheap to update from a single
+    owner thread and trivially mergeable across threads (sum the counts).
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-6):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        """Record one observation"""
+        if value <= self.min_value:
+            self.zero_count += 1
+        else:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[key] = self.bins.get(key, 0) + 1
+
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "LatencySketch"):
+        """Fold another sketch with the same accuracy into this one"""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+
+        # dict() copy is atomic, so merging a sketch that its owner thread
+        # is still updating never sees a dict resized mid-iteration
+        for key, bucket_count in dict(other.bins).items():
+            self.bins[key] = self.bins.get(key, 0) + bucket_count
+
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @classmethod
+    def merged(cls, sketches: Iterable["LatencySketch"], relative_accuracy: float = 0.01) -> "LatencySketch":
+        """Build a new sketch from several shards"""
+        result = cls(relative_accuracy)
+        for sketch in sketches:
+            result.merge(sketch)
+        return result
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile (0 <= q <= 1)"""
+        if self.count == 0:
+            return 0.0
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be between 0 and 1")
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if rank < seen:
+                # Bucket midpoint in log space keeps the error symmetric
+                estimate = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(estimate, self.min), self.max)
+
+        return self.max
+
+    def summary(self, percentiles: Iterable[int] = (50, 90, 99)) -> Dict[str, Any]:
+        """Percentile summary suitable for status reports"""
+        result: Dict[str, Any] = {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.min if self.count else 0.0,
+            "max": self.max if self.count else 0.0,
+        }
+        for p in percentiles:
+            result[f"p{p}"] = self.quantile(p / 100)
+        return result
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+On-Disk Payload Store for Episode Task Queues
+Keeps large episode payloads out of process memory while tasks wait in a queue.
+"""
+
+import os
+import heapq
+import json
+import pickle
+import shutil
+import tempfile
+import threading
+import uuid
+from typing import Dict, Any, Optional, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PayloadStore:
+    """
+    Blob store that hands out small string handles for episode payloads
+
+    Payloads are pickled to one file per handle and written atomically
+    (temp file + rename), so a queue only ever holds handles and its memory
+    footprint is independent of payload size. The store is process-local
+    and trusted: only data written by this process is ever unpickled.
+    """
+
+    def __init__(self, root_dir: Optional[str] = None):
+        self._owns_root = root_dir is None
+        self.root_dir = root_dir or tempfile.mkdtemp(prefix="episode_payloads_")
+        os.makedirs(self.root_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._sizes: Dict[str, int] = {}
+
+    def _path(self, handle: str) -> str:
+        return os.path.join(self.root_dir, f"{handle}.pkl")
+
+    def put(self, data: Dict[str, Any]) -> str:
+        """Persist a payload and return its handle"""
+        handle = uuid.uuid4().hex
+        blob = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+
+        temp_path = self._path(handle) + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(blob)
+        os.replace(temp_path, self._path(handle))
+
+        with self._lock:
+            self._sizes[handle] = len(blob)
+        return handle
+
+    def get(self, handle: str) -> Dict[str, Any]:
+        """Load a payload by handle"""
+        with open(self._path(handle), 'rb') as f:
+            return pickle.load(f)
+
+    def delete(self, handle: str) -> None:
+        """Remove a payload once its task has finished"""
+        with self._lock:
+            self._sizes.pop(handle, None)
+        try:
+            os.remove(self._path(handle))
+        except FileNotFoundError:
+            pass
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sizes)
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes currently held on disk by live payloads"""
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def close(self) -> None:
+        """Remove the store directory if this instance created it"""
+        if self._owns_root:
+            shutil.rmtree(self.root_dir, ignore_errors=True)
+
+
+class SpillQueue:
+    """
+    Disk-backed priority queue for task records that did not fit in a bounded queue
+
+    Records are appended as JSON lines; only a small (priority, sequence,
+    offset) index entry per record stays in memory, so spilled payloads
+    never come back into the process until they are popped. Records pop
+    lowest priority value first, FIFO within a priority. The file is
+    truncated whenever every record has been popped.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._index: List[tuple] = []  # heap of (priority, seq, offset)
+        self._seq = 0
+        self._write_offset = 0
+        open(self.path, 'w').close()
+
+    def push(self, record: Dict[str, Any], priority: int = 0) -> None:
+        """Append a record to the spill file"""
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode('utf-8')
+        with self._lock:
+            with open(self.path, 'ab') as f:
+                f.write(line)
+            heapq.heappush(self._index, (priority, self._seq, self._write_offset))
+            self._seq += 1
+            self._write_offset += len(line)
+
+    def pop_many(self, limit: int) -> List[Dict[str, Any]]:
+        """Read up to ``limit`` records, highest priority (lowest value) first"""
+        records: List[Dict[str, Any]] = []
+        if limit <= 0:
+            return records
+
+        with self._lock:
+            if not self._index:
+                return records
+
+            with open(self.path, 'rb') as f:
+                while self._index and len(records) < limit:
+                    _, _, offset = heapq.heappop(self._index)
+                    f.seek(offset)
+                    records.append(json.loads(f.readline()))
+
+            if not self._index:
+                # Every record popped - reclaim the disk space
+                open(self.path, 'w').close()
+                self._write_offset = 0
+
+        return records
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._index)
@@ -16,6 +16,9 @@ import logging
 import gc
 import sys
 
+from query_cache import SizeAwareQueryCache
+from disk_cache import DiskCache, TieredCache
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -51,14 +54,29 @@ class PerformanceMonitor:
     - Performance regression detection
     """
     
-    def __init__(self, sampling_interval: float = 5.0, history_size: int = 1000):
+    def __init__(self, sampling_interval: float = 5.0, history_size: int = 1000,
+                 disk_cache_dir: Optional[str] = None):
         self.sampling_interval = sampling_interval
         self.history_size = history_size
         self.metrics_history = deque(maxlen=history_size)
         self.optimization_log = deque(maxlen=100)
-        self.query_cache: Dict[str, Any] = {}
-        self.cache_access_times: Dict[str, float] = {}
         self.max_cache_size = 1000
+        # Byte budget for cached responses; shrunk step by step under memory
+        # pressure and restored once memory recovers
+        self.max_cache_bytes = 256 * 1024 * 1024
+        self.min_cache_bytes = 16 * 1024 * 1024
+        self.cache_shrink_factor = 0.5
+        self.query_cache = SizeAwareQueryCache(
+            max_bytes=self.max_cache_bytes,
+            max_entries=self.max_cache_size,
+            default_ttl=3600
+        )
+        # Optional persistent second tier so cached responses survive restarts
+        self.disk_cache: Optional[DiskCache] = None
+        self.response_cache = self.query_cache
+        if disk_cache_dir:
+            self.disk_cache = DiskCache(disk_cache_dir)
+            self.response_cache = TieredCache(self.query_cache, self.disk_cache)
         self.monitoring_active = False
         self.monitor_thread: Optional[threading.Thread] = None
         self.lock = threading.Lock()
@@ -110,9 +128,11 @@ class PerformanceMonitor:
                 # Perform automated optimizations if needed
                 if metrics.memory_mb > self.memory_warning_mb:
                     self.optimize_memory()
+                elif metrics.memory_mb < self.memory_warning_mb * 0.8:
+                    self._restore_cache_budget()
                 
-                if len(self.query_cache) > self.max_cache_size * 0.8:
-                    self.optimize_query_cache()
+                # Capacity is enforced on insert; the sweep only reclaims expired entries
+                self.optimize_query_cache()
                 
                 time.sleep(self.sampling_interval)
                 
@@ -166,12 +186,8 @@ class PerformanceMonitor:
         before_memory = self._get_memory_usage()
         
         try:
-            # Clear query cache if too large
-            if len(self.query_cache) > 100:
-                cache_cleared = len(self.query_cache)
-                self.query_cache.clear()
-                self.cache_access_times.clear()
-                logger.info(f"Cleared query cache: {cache_cleared} entries removed")
+            # Shrink the cache budget one step; lowest-value entries go first
+            self._shrink_cache_budget(self.cache_shrink_factor)
             
             # Force garbage collection
             collected = gc.collect()
@@ -214,9 +230,8 @@ class PerformanceMonitor:
         try:
             logger.critical("EMERGENCY: Performing aggressive memory optimization")
             
-            # Clear all caches
-            self.query_cache.clear()
-            self.cache_access_times.clear()
+            # Drop the cache to its floor budget (keeps the highest-value entries)
+            self._shrink_cache_budget(0.0)
             
             # Trim metrics history
             if len(self.metrics_history) > 100:
@@ -252,56 +267,37 @@ class PerformanceMonitor:
                 success=False
             )
     
-    def optimize_query_cache(self):
-        """Optimize query cache using LRU eviction"""
-        if len(self.query_cache) <= self.max_cache_size:
-            return
-        
-        current_time = time.time()
-        
-        # Sort by access time (LRU)
-        sorted_cache = sorted(
-            self.cache_access_times.items(),
-            key=lambda x: x[1]
-        )
-        
-        # Remove oldest entries
-        entries_to_remove = len(self.query_cache) - int(self.max_cache_size * 0.7)
-        
-        for key, _ in sorted_cache[:entries_to_remove]:
-            self.query_cache.pop(key, None)
-            self.cache_access_times.pop(key, None)
-        
-        logger.info(f"Query cache optimized: removed {entries_to_remove} LRU entries")
+    def _shrink_cache_budget(self, factor: float) -> int:
+        """Scale the cache byte budget down (not below min_cache_bytes); returns bytes released"""
+        new_budget = max(self.min_cache_bytes, int(self.query_cache.max_bytes * factor))
+        if new_budget >= self.query_cache.max_bytes:
+            return 0
+        released = self.query_cache.resize(new_budget)
+        logger.info(f"Query cache budget reduced to {new_budget / 1024 / 1024:.1f}MB: "
+                    f"{released / 1024 / 1024:.2f}MB released")
+        return released
     
-    def cache_query_result(self, query_key: str, result: Any, ttl: float = 3600):
-        """Cache query result with TTL"""
-        current_time = time.time()
-        
-        # Remove expired entries
-        expired_keys = [
-            key for key, access_time in self.cache_access_times.items()
-            if current_time - access_time > ttl
-        ]
-        
-        for key in expired_keys:
-            self.query_cache.pop(key, None)
-            self.cache_access_times.pop(key, None)
-        
-        # Add new entry
-        self.query_cache[query_key] = result
-        self.cache_access_times[query_key] = current_time
-        
-        # Trigger optimization if needed
-        if len(self.query_cache) > self.max_cache_size:
-            self.optimize_query_cache()
+    def _restore_cache_budget(self):
+        """Grow a shrunken cache budget back toward max_cache_bytes"""
+        if self.query_cache.max_bytes < self.max_cache_bytes:
+            new_budget = min(self.max_cache_bytes, int(self.query_cache.max_bytes / self.cache_shrink_factor))
+            self.query_cache.resize(new_budget)
+            logger.info(f"Query cache budget restored to {new_budget / 1024 / 1024:.1f}MB")
+    
+    def optimize_query_cache(self) -> int:
+        """Reclaim expired query cache entries (LRU eviction happens on insert)"""
+        expired = self.response_cache.purge_expired()
+        if expired:
+            logger.info(f"Query cache optimized: removed {expired} expired entries")
+        return expired
+    
+    def cache_query_result(self, query_key: str, result: Any, ttl: float = 3600, cost: float = 1.0) -> bool:
+        """Cache query result with TTL; ``cost`` is what recomputing it would cost"""
+        return self.response_cache.put(query_key, result, ttl, cost=cost)
     
     def get_cached_query_result(self, query_key: str) -> Optional[Any]:
         """Get cached query result and update access time"""
-        if query_key in self.query_cache:
-            self.cache_access_times[query_key] = time.time()
-            return self.query_cache[query_key]
-        return None
+        return self.response_cache.get(query_key)
     
     def get_performance_report(self) -> Dict[str, Any]:
         """Generate comprehensive performance report"""
@@ -322,6 +318,8 @@ class PerformanceMonitor:
             else:
                 memory_trend = 0.0
             
+            cache_stats = self.query_cache.stats()
+            
             report = {
                 "timestamp": time.time(),
                 "system_health": {
@@ -333,14 +331,20 @@ class PerformanceMonitor:
                     "baseline_memory_mb": self.baseline_memory
                 },
                 "optimization_summary": {
-                    "query_cache_size": len(self.query_cache),
-                    "cache_hit_potential": f"{min(100, len(self.query_cache) * 5):.1f}%",
+                    "query_cache_size": cache_stats["size"],
+                    "query_cache_mb": cache_stats["bytes"] / 1024 / 1024,
+                    "query_cache_budget_mb": cache_stats["max_bytes"] / 1024 / 1024,
+                    "cache_hit_rate": f"{cache_stats['hit_rate'] * 100:.1f}%",
+                    "cache_hits": cache_stats["hits"],
+                    "cache_misses": cache_stats["misses"],
+                    "cache_evictions": cache_stats["evictions"],
+                    "cache_expirations": cache_stats["expirations"],
                     "optimizations_performed": len(self.optimization_log),
                     "total_memory_freed_mb": sum(opt.freed_mb for opt in self.optimization_log if opt.success)
                 },
                 "performance_metrics": {
                     "memory_efficiency": f"{(self.baseline_memory / avg_memory) * 100:.1f}%",
-                    "cache_efficiency": f"{(1 - len(self.query_cache) / max(1, self.max_cache_size)) * 100:.1f}%",
+                    "cache_utilization": f"{cache_stats['bytes'] / max(1, cache_stats['max_bytes']) * 100:.1f}%",
                     "thread_utilization": f"{(avg_threads / threading.active_count()) * 100:.1f}%"
                 },
                 "recent_optimizations": [
@@ -348,6 +352,9 @@ class PerformanceMonitor:
                 ]
             }
             
+            if self.disk_cache is not None:
+                report["optimization_summary"]["tiered_cache"] = self.response_cache.get_stats()
+            
             return report
     
     def _get_health_status(self, memory_mb: float, cpu_percent: float) -> str:
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Cross-Episode Research Query Batching
+Coalesces research queries from concurrent episodes into batched tool calls.
+"""
+
+import json
+import re
+from abc import ABC, abstractmethod
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, InvalidStateError
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
+import logging
+
+from semantic_cache import SemanticQueryCache, DEFAULT_COST_LIMITS_PATH, load_optimization_setting
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(text: str) -> str:
+    """Canonical form used to detect duplicate queries"""
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+@dataclass
+class ResearchQuery:
+    """A single research request from an episode"""
+    text: str
+    episode_id: str
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        """Coalescing key: normalized text plus request parameters"""
+        return normalize_query(self.text) + "|" + json.dumps(self.params, sort_keys=True)
+
+
+class ResearchBackend(ABC):
+    """
+    Interface for the research tool client behind the batcher
+
+    Implementations answer a whole batch in one request and return one
+    result per query, in order.
+    """
+
+    # Cost model used for savings reporting
+    per_request_cost: float = 0.0
+    per_query_cost: float = 0.0
+
+    @abstractmethod
+    def batch_search(self, queries: List[ResearchQuery]) -> List[Dict[str, Any]]:
+        """Answer every query in one request, returning results in query order"""
+
+
+class MockResearchBackend(ResearchBackend):
+    """
+    Local deterministic backend for tests and dry runs
+
+    Records every batch it receives so tests can assert how queries were
+    grouped, and simulates a fixed per-request latency.
+    """
+
+    def __init__(self, latency: float = 0.0, per_request_cost: float = 0.005,
+                 per_query_cost: float = 0.01):
+        self.latency = latency
+        self.per_request_cost = per_request_cost
+        self.per_query_cost = per_query_cost
+        self.calls: List[List[str]] = []
+        self._lock = threading.Lock()
+
+    def batch_search(self, queries: List[ResearchQuery]) -> List[Dict[str, Any]]:
+        with self._lock:
+            self.calls.append([q.text for q in queries])
+        if self.latency:
+            time.sleep(self.latency)
+        return [
+            {
+                "query": q.text,
+                "answer": f"Mock research answer for: {q.text}",
+                "sources": [f"https://example.org/{abs(hash(q.key)) % 10000}"],
+            }
+            for q in queries
+        ]
+
+
+def _resolve(future: Future, result: Any, error: Optional[BaseException] = None):
+    """Complete a caller's future unless the caller already cancelled it"""
+    try:
+        if not future.set_running_or_notify_cancel():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    except InvalidStateError:
+        logger.debug("Research query future was already resolved")
+
+
+class _PendingQuery:
+    """One unique query and every caller waiting on it"""
+
+    def __init__(self, query: ResearchQuery):
+        self.query = query
+        self.futures: List[Future] = []
+        self.episodes: List[str] = []
+
+
+class ResearchQueryBatcher:
+    """
+    Batching layer in front of the research tool client
+
+    Queries submitted within ``window_seconds`` of the first pending query
+    are sent to the backend as one batched call (at most ``max_batch_size``
+    unique queries). Identical queries - pending or already in flight - are
+    coalesced so the backend sees each one once, and the result is fanned
+    back out to every caller's future.
+
+    When batching is disabled (feature flag ``batch_mcp_queries`` or the
+    ``query_consolidation`` setting in cost_limits.json) every query is
+    sent immediately as a batch of one.
+
+    An optional SemanticQueryCache is consulted before queueing: queries
+    that near-duplicate earlier research are answered without a backend
+    call, and fresh backend answers are stored for later episodes.
+    """
+
+    def __init__(self, backend: ResearchBackend, window_seconds: float = 0.05,
+                 max_batch_size: int = 16, enabled: Optional[bool] = None,
+                 flag_manager=None, config_path: str = DEFAULT_COST_LIMITS_PATH,
+                 cache: Optional[SemanticQueryCache] = None):
+        self.backend = backend
+        self.cache = cache
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+
+        if enabled is None:
+            if flag_manager is not None:
+                enabled = flag_manager.should_batch_queries()
+            else:
+                enabled = load_optimization_setting("query_consolidation", config_path)
+        self.enabled = enabled
+
+        self._condition = threading.Condition()
+        self._pending: "OrderedDict[str, _PendingQuery]" = OrderedDict()
+        self._in_flight: Dict[str, _PendingQuery] = {}
+        self._first_pending_at: Optional[float] = None
+        self._closed = False
+        self.stats = {
+            "queries_submitted": 0,
+            "duplicates_coalesced": 0,
+            "backend_requests": 0,
+            "queries_sent": 0,
+            "backend_errors": 0,
+            "cache_hits": 0
+        }
+
+        self._flusher: Optional[threading.Thread] = None
+        if self.enabled:
+            self._flusher = threading.Thread(target=self._flush_loop, name="ResearchBatcher", daemon=True)
+            self._flusher.start()
+
+        logger.info(f"Research query batcher initialized (batching={'on' if self.enabled else 'off'}, "
+                    f"window={window_seconds * 1000:.0f}ms, max_batch={max_batch_size})")
+
+    def submit(self, text: str, episode_id: str, **params) -> Future:
+        """
+        Queue a research query
+
+        Returns:
+            Future resolving to the backend's result for this query
+        """
+        query = ResearchQuery(text=text, episode_id=episode_id, params=params)
+        future: Future = Future()
+
+        # The cache keys on query text only, so parameterized queries bypass it
+        if self.cache is not None and not params:
+            hit = self.cache.lookup(text, episode_id)
+            if hit is not None:
+                with self._condition:
+                    self.stats["queries_submitted"] += 1
+                    self.stats["cache_hits"] += 1
+                _resolve(future, hit.result)
+                return future
+
+        if not self.enabled:
+            with self._condition:
+                self.stats["queries_submitted"] += 1
+            entry = _PendingQuery(query)
+            entry.futures.append(future)
+            entry.episodes.append(episode_id)
+            self._send([entry])
+            return future
+
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Research query batcher is closed")
+
+            self.stats["queries_submitted"] += 1
+            key = query.key
+            entry = self._in_flight.get(key) or self._pending.get(key)
+            if entry is not None:
+                self.stats["duplicates_coalesced"] += 1
+            else:
+                entry = _PendingQuery(query)
+                self._pending[key] = entry
+                if self._first_pending_at is None:
+                    self._first_pending_at = time.time()
+
+            entry.futures.append(future)
+            entry.episodes.append(episode_id)
+            self._condition.notify()
+
+        return future
+
+    def search(self, text: str, episode_id: str, timeout: Optional[float] = None, **params) -> Dict[str, Any]:
+        """Blocking convenience wrapper around submit()"""
+        return self.submit(text, episode_id, **params).result(timeout=timeout)
+
+    def _flush_loop(self):
+        """Background loop: wait for the batching window, then send"""
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if self._closed and not self._pending:
+                    return
+
+                # Collect until the window closes or the batch is full
+                while not self._closed and len(self._pending) < self.max_batch_size:
+                    remaining = self._first_pending_at + self.window_seconds - time.time()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                batch = []
+                while self._pending and len(batch) < self.max_batch_size:
+                    key, entry = self._pending.popitem(last=False)
+                    self._in_flight[key] = entry
+                    batch.append(entry)
+                self._first_pending_at = time.time() if self._pending else None
+
+            self._send(batch)
+
+    def _send(self, batch: List[_PendingQuery]):
+        """Issue one backend call and fan results out to all waiters"""
+        # Every waiter gets a result or an exception, whatever fails below
+        results, error = [None] * len(batch), RuntimeError("Batched research request did not complete")
+        try:
+            try:
+                results = self.backend.batch_search([entry.query for entry in batch])
+                if len(results) != len(batch):
+                    raise ValueError(f"Backend returned {len(results)} results for {len(batch)} queries")
+                error = None
+            except Exception as e:
+                logger.error(f"Batched research request failed ({len(batch)} queries): {e}")
+                results, error = [None] * len(batch), e
+
+            if error is None and self.cache is not None:
+                for entry, result in zip(batch, results):
+                    if entry.query.params:
+                        continue
+                    try:
+                        self.cache.store(entry.query.text, result, entry.query.episode_id)
+                    except Exception as e:
+                        logger.warning(f"Research result for '{entry.query.text[:40]}' not cached: {e}")
+        finally:
+            with self._condition:
+                self.stats["backend_requests"] += 1
+                self.stats["queries_sent"] += len(batch)
+                if error is not None:
+                    self.stats["backend_errors"] += 1
+                for entry in batch:
+                    self._in_flight.pop(entry.query.key, None)
+
+            # Entries are out of _in_flight, so no new waiter can attach now
+            for entry, result in zip(batch, results):
+                for future in entry.futures:
+                    _resolve(future, result, error)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Send pending queries now and wait until nothing is pending or in flight"""
+        deadline = time.time() + timeout
+        with self._condition:
+            if self._pending:
+                self._first_pending_at = time.time() - self.window_seconds
+                self._condition.notify()
+        while time.time() < deadline:
+            with self._condition:
+                if not self._pending and not self._in_flight:
+                    return True
+            time.sleep(0.005)
+        return False
+
+    def close(self, timeout: float = 5.0):
+        """Flush outstanding queries and stop the background thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._flusher:
+            self._flusher.join(timeout=timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Batching effectiveness and estimated savings"""
+        with self._condition:
+            stats = self.stats.copy()
+
+        # Cache hits save the whole query, not just request overhead
+        requests_avoided = stats["queries_submitted"] - stats["cache_hits"] - stats["backend_requests"]
+        stats["average_batch_size"] = stats["queries_sent"] / max(1, stats["backend_requests"])
+        stats["requests_avoided"] = requests_avoided
+        stats["estimated_savings"] = (
+            requests_avoided * self.backend.per_request_cost +
+            (stats["duplicates_coalesced"] + stats["cache_hits"]) * self.backend.per_query_cost +
+            stats["cache_hits"] * self.backend.per_request_cost
+        )
+        return stats
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Thread-Safe Query Cache
+Byte-budgeted, cost-aware sharded cache with TTL and real hit/miss/eviction counters.
+"""
+
+import heapq
+import itertools
+import sys
+import threading
+import time
+import zlib
+from typing import Dict, Any, Hashable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def approximate_size(obj: Any, _depth: int = 0) -> int:
+    """Approximate deep size in bytes of a cached value (JSON-like structures)"""
+    size = sys.getsizeof(obj)
+    if _depth > 20:
+        return size
+    if isinstance(obj, dict):
+        size += sum(approximate_size(k, _depth + 1) + approximate_size(v, _depth + 1) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(approximate_size(item, _depth + 1) for item in obj)
+    return size
+
+
+class _SizedEntry:
+    """Cached value plus the bookkeeping GDSF needs"""
+    __slots__ = ("value", "size", "cost", "frequency", "priority", "expires_at")
+
+    def __init__(self, value: Any, size: int, cost: float, expires_at: float):
+        self.value = value
+        self.size = size
+        self.cost = cost
+        self.frequency = 1
+        self.priority = 0.0
+        self.expires_at = expires_at
+
+
+class _SizedShard:
+    """One lock-protected GDSF segment; the byte and entry budgets are cache-wide"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries: Dict[Hashable, _SizedEntry] = {}
+        # Min-heap of (priority, seq, key); stale items are skipped lazily
+        self.heap: List[Tuple[float, int, Hashable]] = []
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejected = 0
+
+
+class SizeAwareQueryCache:
+    """
+    Byte-budgeted cache with Greedy-Dual-Size-Frequency eviction
+
+    Each entry's priority is ``L + frequency * cost / size``: small, popular
+    or expensive-to-recompute entries stay, a single multi-megabyte research
+    response that is never re-read goes first. ``L`` (the inflation value)
+    rises to the priority of each evicted entry, so entries that stop being
+    used age out instead of living forever on old hits. Values are sized
+    with ``approximate_size`` unless the caller passes ``size``.
+
+    Keys hash onto independently locked shards so concurrent callers and
+    the monitoring thread rarely contend, but the byte and entry budgets
+    apply to the whole cache: any entry up to ``max_bytes`` fits, and an
+    insert that overflows a budget evicts the lowest-priority entry of
+    whichever shard holds it. Expiry is lazy - an expired entry is dropped
+    when it is next read or reaches the bottom of the heap - and
+    ``purge_expired()`` lets a background thread reclaim the rest.
+
+    The budget can be changed at runtime with ``resize()``, which evicts
+    lowest-priority entries until the cache fits. That lets the performance
+    monitor shed cache memory step by step under pressure rather than
+    clearing it.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, max_entries: Optional[int] = None,
+                 default_ttl: Optional[float] = 3600.0, shards: int = 8):
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+
+        self.default_ttl = default_ttl
+        self.max_bytes = max(1, int(max_bytes))
+        self.max_entries = max_entries
+        self._counter = itertools.count()
+        self._shards: List[_SizedShard] = [_SizedShard() for _ in range(max(1, shards))]
+        # Cache-wide totals; shard locks are never held while taking another shard's lock
+        self._totals_lock = threading.Lock()
+        self._bytes = 0
+        self._entries = 0
+        self._inflation = 0.0
+
+    def _shard(self, key: Hashable) -> _SizedShard:
+        if isinstance(key, str):
+            index = zlib.crc32(key.encode())
+        else:
+            index = hash(key)
+        return self._shards[index % len(self._shards)]
+
+    def _account(self, bytes_delta: int, entries_delta: int):
+        with self._totals_lock:
+            self._bytes += bytes_delta
+            self._entries += entries_delta
+
+    def _over_budget(self) -> bool:
+        with self._totals_lock:
+            return self._bytes > self.max_bytes or (
+                self.max_entries is not None and self._entries > self.max_entries)
+
+    def _touch(self, shard: _SizedShard, key: Hashable, entry: _SizedEntry):
+        entry.priority = self._inflation + entry.frequency * entry.cost / max(1, entry.size)
+        heapq.heappush(shard.heap, (entry.priority, next(self._counter), key))
+        if len(shard.heap) > 2 * len(shard.entries) + 64:
+            shard.heap = [(e.priority, next(self._counter), k) for k, e in shard.entries.items()]
+            heapq.heapify(shard.heap)
+
+    def _remove(self, shard: _SizedShard, key: Hashable) -> _SizedEntry:
+        entry = shard.entries.pop(key)
+        shard.bytes -= entry.size
+        self._account(-entry.size, -1)
+        return entry
+
+    @staticmethod
+    def _lowest(shard: _SizedShard) -> Optional[float]:
+        """Priority of the shard's lowest live entry, dropping stale heap items (shard lock held)"""
+        while shard.heap:
+            priority, _, key = shard.heap[0]
+            entry = shard.entries.get(key)
+            if entry is not None and entry.priority == priority:
+                return priority
+            heapq.heappop(shard.heap)
+        return None
+
+    def _evict_to_fit(self):
+        """Evict the cache-wide lowest-priority entries until both budgets are met"""
+        while self._over_budget():
+            victim_shard, lowest = None, None
+            for shard in self._shards:
+                with shard.lock:
+                    priority = self._lowest(shard)
+                if priority is not None and (lowest is None or priority < lowest):
+                    victim_shard, lowest = shard, priority
+            if victim_shard is None:
+                return
+
+            with victim_shard.lock:
+                # Another thread may have changed the shard since it was peeked
+                priority = self._lowest(victim_shard)
+                if priority is None:
+                    continue
+                _, _, key = heapq.heappop(victim_shard.heap)
+                entry = self._remove(victim_shard, key)
+                if entry.expires_at and entry.expires_at <= time.time():
+                    victim_shard.expirations += 1
+                else:
+                    victim_shard.evictions += 1
+                    self._inflation = max(self._inflation, priority)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value (raising its priority) or ``default``"""
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is None:
+                shard.misses += 1
+                return default
+
+            if entry.expires_at and entry.expires_at <= time.time():
+                self._remove(shard, key)
+                shard.expirations += 1
+                shard.misses += 1
+                return default
+
+            entry.frequency += 1
+            self._touch(shard, key, entry)
+            shard.hits += 1
+            return entry.value
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = _MISSING,
+            cost: float = 1.0, size: Optional[int] = None) -> bool:
+        """
+        Insert or replace an entry
+
+        Args:
+            ttl: Seconds until expiry (defaults to default_ttl; None = never)
+            cost: Relative cost of recomputing the value (e.g. API dollars)
+            size: Size in bytes (estimated with approximate_size if omitted)
+
+        Returns:
+            bool: False if the value alone exceeds the cache's byte budget
+        """
+        if ttl is _MISSING:
+            ttl = self.default_ttl
+        expires_at = time.time() + ttl if ttl else 0.0
+        if size is None:
+            size = approximate_size(value)
+
+        shard = self._shard(key)
+        with shard.lock:
+            frequency = 1
+            if key in shard.entries:
+                frequency = self._remove(shard, key).frequency
+
+            if size > self.max_bytes:
+                shard.rejected += 1
+                return False
+
+            entry = _SizedEntry(value, size, cost, expires_at)
+            entry.frequency = frequency
+            shard.entries[key] = entry
+            shard.bytes += size
+            self._account(size, 1)
+            self._touch(shard, key, entry)
+        self._evict_to_fit()
+        return True
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove an entry; returns True if it was present"""
+        shard = self._shard(key)
+        with shard.lock:
+            if key not in shard.entries:
+                return False
+            self._remove(shard, key)
+            return True
+
+    def __contains__(self, key: Hashable) -> bool:
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            return entry is not None and not (entry.expires_at and entry.expires_at <= time.time())
+
+    def __len__(self) -> int:
+        with self._totals_lock:
+            return self._entries
+
+    @property
+    def total_bytes(self) -> int:
+        with self._totals_lock:
+            return self._bytes
+
+    def resize(self, max_bytes: int) -> int:
+        """
+        Change the byte budget, evicting lowest-priority entries to fit
+
+        Returns:
+            int: Bytes released
+        """
+        before = self.total_bytes
+        self.max_bytes = max(1, int(max_bytes))
+        self._evict_to_fit()
+        return max(0, before - self.total_bytes)
+
+    def clear(self) -> int:
+        """Drop every entry; returns the number removed"""
+        removed = 0
+        for shard in self._shards:
+            with shard.lock:
+                removed += len(shard.entries)
+                self._account(-shard.bytes, -len(shard.entries))
+                shard.entries.clear()
+                shard.heap.clear()
+                shard.bytes = 0
+        return removed
+
+    def purge_expired(self) -> int:
+        """Reclaim expired entries (background sweep); returns the number removed"""
+        now = time.time()
+        removed = 0
+        for shard in self._shards:
+            with shard.lock:
+                expired = [key for key, entry in shard.entries.items()
+                           if entry.expires_at and entry.expires_at <= now]
+                for key in expired:
+                    self._remove(shard, key)
+                shard.expirations += len(expired)
+                removed += len(expired)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Aggregate counters across shards"""
+        totals = {"size": 0, "bytes": 0, "hits": 0, "misses": 0,
+                  "evictions": 0, "expirations": 0, "rejected": 0}
+        for shard in self._shards:
+            with shard.lock:
+                totals["size"] += len(shard.entries)
+                totals["bytes"] += shard.bytes
+                totals["hits"] += shard.hits
+                totals["misses"] += shard.misses
+                totals["evictions"] += shard.evictions
+                totals["expirations"] += shard.expirations
+                totals["rejected"] += shard.rejected
+
+        lookups = totals["hits"] + totals["misses"]
+        totals["max_bytes"] = self.max_bytes
+        totals["max_entries"] = self.max_entries
+        totals["hit_rate"] = totals["hits"] / lookups if lookups else 0.0
+        return totals
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Semantic Research Query Cache
+Reuses research answers for near-duplicate queries across episodes.
+"""
+
+import json
+import math
+import os
+import re
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Callable, Dict, Any, List, Optional, Set, Tuple
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COST_LIMITS_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "content", "config", "cost_limits.json"
+)
+
+# Words that carry no topic signal in research queries
+STOPWORDS = frozenset("""
+a an and are as at be by can do does for from how in is it of on or the to
+what when where which who why with about into vs versus
+""".split())
+
+
+def load_optimization_setting(name: str, config_path: str = DEFAULT_COST_LIMITS_PATH,
+                              default: bool = False) -> bool:
+    """Read a flag from cost_limits.json optimization_settings"""
+    try:
+        with open(config_path, 'r') as f:
+            config = json.load(f)
+        return bool(config.get("optimization_settings", {}).get(name, default))
+    except Exception as e:
+        logger.warning(f"Could not read optimization setting '{name}': {e}")
+        return default
+
+
+def normalize_query_terms(text: str) -> List[str]:
+    """Lowercase, strip punctuation and stopwords, drop plural 's'"""
+    terms = []
+    for word in re.findall(r"[a-z0-9]+", text.lower()):
+        if word in STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        terms.append(word)
+    return terms
+
+
+@dataclass
+class SemanticCacheHit:
+    """A cached answer and how closely its query matched"""
+    result: Any
+    matched_query: str
+    similarity: float
+    source_episode: Optional[str]
+
+
+class SemanticQueryCache:
+    """
+    Near-duplicate research query cache
+
+    Queries are reduced to normalized terms and hashed into a sparse
+    term-frequency row (unigrams plus half-weight bigrams), kept as at most
+    ``max_terms`` (feature, weight) pairs, with an inverted index from each
+    feature to the rows that contain it. A lookup scores only the rows that
+    share a feature with the query, applying the current corpus IDF to the
+    stored raw weights, so stores never rebuild anything and memory grows
+    with the number of terms rather than the hash width. The best match at
+    or above ``similarity_threshold`` is returned. Exact normalized matches
+    are answered from a dict without scoring.
+
+    Hit rates are tracked per episode, including hits answered by research
+    paid for in a *different* episode - the saving that matters across a
+    long series with recurring topics.
+    """
+
+    def __init__(self, similarity_threshold: float = 0.8, n_features: int = 4096,
+                 max_entries: int = 5000, enabled: Optional[bool] = None,
+                 config_path: str = DEFAULT_COST_LIMITS_PATH, max_terms: int = 64):
+        self.similarity_threshold = similarity_threshold
+        self.n_features = n_features
+        self.max_entries = max_entries
+        self.max_terms = max_terms
+        if enabled is None:
+            enabled = load_optimization_setting("semantic_deduplication", config_path)
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._capacity = 64
+        # Padding slots hold feature 0 with weight 0, which adds nothing to any score
+        self._features = np.zeros((self._capacity, max_terms), dtype=np.int32)
+        self._weights = np.zeros((self._capacity, max_terms), dtype=np.float32)
+        self._postings: Dict[int, Set[int]] = {}
+        self._doc_freq = np.zeros(n_features, dtype=np.float32)
+        # Recency is a logical clock, so ties never depend on timer resolution
+        self._last_used = np.zeros(self._capacity, dtype=np.int64)
+        self._clock = 0
+        self._queries: List[str] = []
+        self._results: List[Any] = []
+        self._episodes: List[Optional[str]] = []
+        self._exact: Dict[str, int] = {}
+
+        self.episode_stats: Dict[str, Dict[str, int]] = {}
+        self.stats = {"lookups": 0, "hits": 0, "exact_hits": 0, "stores": 0, "evictions": 0}
+
+    def __len__(self) -> int:
+        return len(self._queries)
+
+    def _vectorize(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sparse hashed term-frequency row with sublinear (1 + log tf) weighting
+
+        Returns:
+            (features, weights), heaviest first, at most ``max_terms`` long
+        """
+        terms = normalize_query_terms(text)
+        unigrams: Dict[int, float] = {}
+        for term in terms:
+            feature = zlib.crc32(term.encode()) % self.n_features
+            unigrams[feature] = unigrams.get(feature, 0.0) + 1.0
+
+        # Bigrams capture phrasing at half weight, so word order matters
+        # less than the topic terms themselves
+        bigrams: Dict[int, float] = {}
+        for first, second in zip(terms, terms[1:]):
+            feature = zlib.crc32(f"{first} {second}".encode()) % self.n_features
+            bigrams[feature] = bigrams.get(feature, 0.0) + 1.0
+
+        row: Dict[int, float] = {}
+        for feature, count in unigrams.items():
+            row[feature] = 1.0 + math.log(count)
+        for feature, count in bigrams.items():
+            row[feature] = row.get(feature, 0.0) + 0.5 * (1.0 + math.log(count))
+
+        heaviest = sorted(row.items(), key=lambda item: -item[1])[:self.max_terms]
+        features = np.array([feature for feature, _ in heaviest], dtype=np.int32)
+        weights = np.array([weight for _, weight in heaviest], dtype=np.float32)
+        return features, weights
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def _idf(self) -> np.ndarray:
+        count = len(self._queries)
+        return np.log((1.0 + count) / (1.0 + self._doc_freq)) + 1.0
+
+    def _record_lookup(self, episode_id: Optional[str], hit: bool, cross_episode: bool):
+        self.stats["lookups"] += 1
+        if hit:
+            self.stats["hits"] += 1
+        if episode_id is None:
+            return
+        episode = self.episode_stats.setdefault(episode_id, {"lookups": 0, "hits": 0, "cross_episode_hits": 0})
+        episode["lookups"] += 1
+        if hit:
+            episode["hits"] += 1
+        if cross_episode:
+            episode["cross_episode_hits"] += 1
+
+    def lookup(self, query: str, episode_id: Optional[str] = None) -> Optional[SemanticCacheHit]:
+        """
+        Find a cached answer for ``query`` or a near-duplicate of it
+
+        Returns:
+            SemanticCacheHit, or None on a miss (or when the cache is disabled)
+        """
+        if not self.enabled:
+            return None
+
+        key = " ".join(normalize_query_terms(query))
+        features, weights = self._vectorize(query)
+
+        with self._lock:
+            row, similarity = self._exact.get(key), 1.0
+            if row is not None:
+                self.stats["exact_hits"] += 1
+            elif len(features):
+                candidates = set().union(*(self._postings.get(int(feature), ()) for feature in features))
+                if candidates:
+                    rows = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+                    idf = self._idf()
+                    weighted_query = np.zeros(self.n_features, dtype=np.float32)
+                    weighted_query[features] = weights * idf[features]
+                    weighted_query /= max(float(np.linalg.norm(weighted_query)), 1e-12)
+
+                    row_features = self._features[rows]
+                    weighted_rows = self._weights[rows] * idf[row_features]
+                    norms = np.sqrt(np.einsum('ij,ij->i', weighted_rows, weighted_rows))
+                    scores = np.einsum('ij,ij->i', weighted_rows, weighted_query[row_features])
+                    scores /= np.maximum(norms, 1e-12)
+                    best = int(np.argmax(scores))
+                    if scores[best] >= self.similarity_threshold:
+                        row, similarity = int(rows[best]), float(scores[best])
+
+            if row is None:
+                self._record_lookup(episode_id, hit=False, cross_episode=False)
+                return None
+
+            self._last_used[row] = self._tick()
+            source_episode = self._episodes[row]
+            self._record_lookup(episode_id, hit=True,
+                                cross_episode=source_episode is not None and source_episode != episode_id)
+            return SemanticCacheHit(self._results[row], self._queries[row], similarity, source_episode)
+
+    def store(self, query: str, result: Any, episode_id: Optional[str] = None):
+        """Cache the answer to ``query`` (replacing an exact normalized duplicate)"""
+        if not self.enabled:
+            return
+
+        key = " ".join(normalize_query_terms(query))
+        features, weights = self._vectorize(query)
+
+        with self._lock:
+            row = self._exact.get(key)
+            if row is not None:
+                self._results[row] = result
+                self._episodes[row] = episode_id
+                self._last_used[row] = self._tick()
+                return
+
+            if len(self._queries) >= self.max_entries:
+                self._evict_lru()
+
+            row = len(self._queries)
+            if row == self._capacity:
+                self._grow()
+
+            self._features[row, :len(features)] = features
+            self._weights[row, :len(weights)] = weights
+            for feature in features:
+                self._postings.setdefault(int(feature), set()).add(row)
+            self._doc_freq[features] += 1
+            self._last_used[row] = self._tick()
+            self._queries.append(query)
+            self._results.append(result)
+            self._episodes.append(episode_id)
+            self._exact[key] = row
+            self.stats["stores"] += 1
+
+    def get_or_compute(self, query: str, compute: Callable[[str], Any],
+                       episode_id: Optional[str] = None) -> Any:
+        """Return a cached answer, or compute, cache and return a fresh one"""
+        hit = self.lookup(query, episode_id)
+        if hit is not None:
+            return hit.result
+        result = compute(query)
+        self.store(query, result, episode_id)
+        return result
+
+    def _grow(self):
+        """Double row capacity (amortized O(1) appends)"""
+        count = len(self._queries)
+        self._capacity *= 2
+        for name, dtype in (("_features", np.int32), ("_weights", np.float32)):
+            grown = np.zeros((self._capacity, self.max_terms), dtype=dtype)
+            grown[:count] = getattr(self, name)[:count]
+            setattr(self, name, grown)
+        last_used = np.zeros(self._capacity, dtype=np.int64)
+        last_used[:count] = self._last_used[:count]
+        self._last_used = last_used
+
+    def _row_features(self, row: int) -> np.ndarray:
+        return self._features[row][self._weights[row] > 0]
+
+    def _evict_lru(self):
+        """Drop the least recently used entry by moving the last row into its slot"""
+        count = len(self._queries)
+        victim = int(np.argmin(self._last_used[:count]))
+        last = count - 1
+
+        victim_features = self._row_features(victim)
+        self._doc_freq[victim_features] -= 1
+        for feature in victim_features:
+            postings = self._postings[int(feature)]
+            postings.discard(victim)
+            if not postings:
+                del self._postings[int(feature)]
+        del self._exact[" ".join(normalize_query_terms(self._queries[victim]))]
+
+        if victim != last:
+            for feature in self._row_features(last):
+                postings = self._postings[int(feature)]
+                postings.discard(last)
+                postings.add(victim)
+            self._features[victim] = self._features[last]
+            self._weights[victim] = self._weights[last]
+            self._last_used[victim] = self._last_used[last]
+            self._queries[victim] = self._queries[last]
+            self._results[victim] = self._results[last]
+            self._episodes[victim] = self._episodes[last]
+            self._exact[" ".join(normalize_query_terms(self._queries[victim]))] = victim
+
+        self._features[last] = 0
+        self._weights[last] = 0
+        self._queries.pop()
+        self._results.pop()
+        self._episodes.pop()
+        self.stats["evictions"] += 1
+
+    def save(self, path: str):
+        """Persist entries as JSON so later sessions of the series reuse them"""
+        with self._lock:
+            entries = [
+                {"query": q, "result": r, "episode_id": e}
+                for q, r, e in zip(self._queries, self._results, self._episodes)
+            ]
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"entries": entries}, f)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str) -> int:
+        """Load entries written by save(); returns the number loaded (0 when disabled)"""
+        if not self.enabled or not os.path.exists(path):
+            return 0
+        with open(path, 'r') as f:
+            entries = json.load(f).get("entries", [])
+        for entry in entries:
+            self.store(entry["query"], entry["result"], entry.get("episode_id"))
+        return len(entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Overall and per-episode hit rates"""
+        with self._lock:
+            stats = dict(self.stats)
+            episodes = {
+                episode_id: {**counts, "hit_rate": counts["hits"] / counts["lookups"] if counts["lookups"] else 0.0}
+                for episode_id, counts in self.episode_stats.items()
+            }
+            stats["entries"] = len(self._queries)
+
+        stats["hit_rate"] = stats["hits"] / stats["lookups"] if stats["lookups"] else 0.0
+        stats["per_episode"] = episodes
+        return stats
@@ -4,28 +4,77 @@ Thread Safety Module for Concurrent Episode Processing
 Fixes threading issues identified in multi-agent review.
 """
 
+import os
 import threading
 import time
-from typing import Dict, Any, Optional
-from dataclasses import dataclass
-from queue import Queue, PriorityQueue
+import uuid
+from concurrent import futures
+from typing import Callable, Dict, Any, Iterable, Iterator, Optional, List, Set, Tuple, Union
+from dataclasses import dataclass, field, fields
+from enum import Enum
+from queue import Queue, PriorityQueue, Empty, Full
 import logging
 from contextlib import contextmanager
 
+from payload_store import PayloadStore, SpillQueue
+from latency_sketch import LatencySketch
+from cancellation import CancellationToken, TaskCancelledError
+from episode_futures import EpisodeFuture, as_completed
+from query_batcher import ResearchQueryBatcher
+
 logger = logging.getLogger(__name__)
 
+# Phase progress reporter: progress(stage, current, total, message="")
+ProgressReporter = Callable[..., None]
+
+# Default in-flight deadlines per task type (seconds)
+DEFAULT_TASK_TIMEOUTS = {
+    "research": 300.0,
+    "script": 600.0,
+    "audio": 900.0
+}
+
+class QueueFullPolicy(Enum):
+    """What submit_episode does when the bounded task queue is full"""
+    BLOCK = "block"    # Wait for space (optionally bounded by submit_timeout)
+    REJECT = "reject"  # Refuse the submission immediately
+    SPILL = "spill"    # Park the task record on disk until space frees up
+
+@dataclass
+class WorkerStatsShard:
+    """Per-worker statistics, written only by the owning worker thread"""
+    episodes_processed: int = 0
+    episodes_failed: int = 0
+    episodes_cancelled: int = 0
+    total_processing_time: float = 0.0
+    concurrent_peak: int = 0
+    processing_times: LatencySketch = field(default_factory=LatencySketch)
+
 @dataclass
 class EpisodeTask:
-    """Thread-safe episode task representation"""
+    """Thread-safe episode task representation
+
+    Only a handle to the payload travels through the queue; the payload
+    itself lives in the processor's PayloadStore until a worker runs it.
+    """
     episode_id: str
     priority: int
     task_type: str
-    data: Dict[str, Any]
+    payload_handle: str
     timestamp: float
+    task_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    timeout: Optional[float] = None
+    cancel_token: Optional[CancellationToken] = field(default=None, compare=False, repr=False)
+    future: Optional[EpisodeFuture] = field(default=None, compare=False, repr=False)
     
     def __lt__(self, other):
         """For PriorityQueue comparison"""
         return self.priority < other.priority
+    
+    def to_record(self) -> Dict[str, Any]:
+        """Serializable form for the spill file (runtime handles excluded)"""
+        return {f.name: getattr(self, f.name) for f in fields(self)
+                if f.name not in ("cancel_token", "future")}
 
 class ThreadSafeEpisodeProcessor:
     """
@@ -35,115 +84,414 @@ class ThreadSafeEpisodeProcessor:
     - Race conditions in state updates
     - Memory leaks from unjoined threads
     - Resource contention in MCP tool usage
+    - Unbounded memory growth from large queued payloads
+    - Lock contention that grew with worker and episode counts
+    - Stuck phases that held a worker slot indefinitely
     """
     
-    def __init__(self, max_concurrent_episodes: int = 3):
+    def __init__(self, max_concurrent_episodes: int = 3, max_queue_size: int = 0,
+                 queue_full_policy: Union[QueueFullPolicy, str] = QueueFullPolicy.BLOCK,
+                 submit_timeout: Optional[float] = None,
+                 payload_store: Optional[PayloadStore] = None,
+                 lock_stripes: int = 64,
+                 task_timeouts: Optional[Dict[str, float]] = None,
+                 cancel_grace_period: float = 2.0,
+                 research_batcher: Optional[ResearchQueryBatcher] = None):
+        """
+        Args:
+            max_concurrent_episodes: Number of worker threads
+            max_queue_size: Maximum queued tasks (0 = unbounded)
+            queue_full_policy: Behaviour when the queue is full (block, reject, spill)
+            submit_timeout: Longest a blocking submit waits for space (None = forever)
+            payload_store: Blob store for task payloads (defaults to a private temp dir)
+            lock_stripes: Size of the striped episode lock table
+            task_timeouts: Per-task-type in-flight deadlines, merged over DEFAULT_TASK_TIMEOUTS
+            cancel_grace_period: Seconds a cancelled phase gets to stop cooperatively
+                before its worker is abandoned and replaced
+            research_batcher: Shared batching layer for research queries, so
+                queries from concurrent episodes go out as batched calls
+        """
         self.max_concurrent_episodes = max_concurrent_episodes
+        self.max_queue_size = max_queue_size
+        self.queue_full_policy = QueueFullPolicy(queue_full_policy)
+        self.submit_timeout = submit_timeout
+        self.research_batcher = research_batcher
+        self.payload_store = payload_store or PayloadStore()
+        self.spill_queue = SpillQueue(os.path.join(self.payload_store.root_dir, "spilled_tasks.jsonl"))
         self.active_episodes: Dict[str, threading.Thread] = {}
-        self.episode_locks: Dict[str, threading.Lock] = {}
-        self.task_queue = PriorityQueue()
+        # Fixed-size lock table: episodes hash onto stripes, so memory stays
+        # bounded however many episodes pass through the processor
+        self.episode_locks: List[threading.Lock] = [threading.Lock() for _ in range(max(1, lock_stripes))]
+        self.task_queue = PriorityQueue(maxsize=max_queue_size)
         self.worker_threads: List[threading.Thread] = []
+        # Workers retired by the watchdog that are still stuck in their phase
+        self.abandoned_threads: List[threading.Thread] = []
         self.shutdown_event = threading.Event()
+        # Submission-side counters only; per-task statistics live in
+        # per-worker shards that are merged on read
         self.stats_lock = threading.Lock()
         self.processing_stats = {
-            "episodes_processed": 0,
-            "episodes_failed": 0,
-            "average_processing_time": 0.0,
-            "concurrent_peak": 0
+            "submissions_rejected": 0,
+            "tasks_spilled": 0,
+            "workers_abandoned": 0
         }
+        self.stats_shards: Dict[str, WorkerStatsShard] = {}
+        
+        # Cancellation state: tokens for every queued or running task, and
+        # the (task, worker, held stripe lock) of every in-flight task
+        self.task_timeouts = {**DEFAULT_TASK_TIMEOUTS, **(task_timeouts or {})}
+        self.cancel_grace_period = cancel_grace_period
+        self._tokens_lock = threading.Lock()
+        self._task_tokens: Dict[str, CancellationToken] = {}
+        self._task_futures: Dict[str, EpisodeFuture] = {}
+        self._episode_tasks: Dict[str, Set[str]] = {}
+        self._in_flight: Dict[str, Tuple[EpisodeTask, threading.Thread, threading.Lock]] = {}
+        self._abandoned_workers: Set[str] = set()
+        # Episodes whose abandoned phase is still running, with the tasks
+        # held back until it returns so two phases never overlap
+        self._busy_episodes: Dict[str, List[EpisodeTask]] = {}
+        self._worker_counter = 0
         
         # Start worker threads
-        for i in range(max_concurrent_episodes):
-            worker = threading.Thread(
-                target=self._worker_loop,
-                name=f"EpisodeWorker-{i}",
-                daemon=True
-            )
-            worker.start()
-            self.worker_threads.append(worker)
+        for _ in range(max_concurrent_episodes):
+            self._start_worker()
+        
+        self.watchdog_thread = threading.Thread(
+            target=self._watchdog_loop,
+            name="EpisodeWatchdog",
+            daemon=True
+        )
+        self.watchdog_thread.start()
             
         logger.info(f"Initialized thread-safe processor with {max_concurrent_episodes} workers")
     
+    def _start_worker(self) -> threading.Thread:
+        """Start one worker thread with its own stats shard"""
+        name = f"EpisodeWorker-{self._worker_counter}"
+        self._worker_counter += 1
+        self.stats_shards[name] = WorkerStatsShard()
+        worker = threading.Thread(
+            target=self._worker_loop,
+            name=name,
+            daemon=True
+        )
+        worker.start()
+        self.worker_threads.append(worker)
+        return worker
+    
+    def _episode_stripe(self, episode_id: str) -> threading.Lock:
+        return self.episode_locks[hash(episode_id) % len(self.episode_locks)]
+    
     @contextmanager
     def episode_lock(self, episode_id: str):
-        """Context manager for episode-specific locking"""
-        if episode_id not in self.episode_locks:
-            self.episode_locks[episode_id] = threading.Lock()
-        
-        lock = self.episode_locks[episode_id]
-        try:
-            lock.acquire()
+        """Context manager for episode-specific locking (striped)"""
+        with self._episode_stripe(episode_id):
             yield
-        finally:
-            lock.release()
     
-    def submit_episode(self, episode_id: str, task_type: str, data: Dict[str, Any], priority: int = 5) -> bool:
+    def submit_episode(self, episode_id: str, task_type: str, data: Dict[str, Any], priority: int = 5,
+                       timeout: Optional[float] = None,
+                       cancel_token: Optional[CancellationToken] = None) -> Optional[EpisodeFuture]:
         """
         Submit episode for processing with thread safety
         
+        The payload is written to the payload store (which doubles as the
+        defensive copy) and only its handle is queued. When the queue is
+        full the configured QueueFullPolicy decides whether to wait, reject
+        or spill the task record to disk.
+        
         Args:
             episode_id: Unique episode identifier
             task_type: Type of processing (research, script, audio)
             data: Episode data dictionary
             priority: Processing priority (1=highest, 10=lowest)
+            timeout: In-flight deadline override (defaults to task_timeouts[task_type])
+            cancel_token: Caller-owned token, e.g. with a callback that releases
+                a budget reservation; a fresh token is created when omitted
             
         Returns:
-            bool: True if submitted successfully
+            EpisodeFuture resolving to the phase result (truthy), or None if
+            the submission was rejected
         """
+        handle = None
+        task = None
         try:
+            handle = self.payload_store.put(data)
             task = EpisodeTask(
                 episode_id=episode_id,
                 priority=priority,
                 task_type=task_type,
-                data=data.copy(),  # Defensive copy
-                timestamp=time.time()
+                payload_handle=handle,
+                timestamp=time.time(),
+                timeout=timeout,
+                cancel_token=cancel_token or CancellationToken()
             )
+            task.future = EpisodeFuture(episode_id, task_type, task.task_id, task.cancel_token)
+            self._register_token(task)
             
-            self.task_queue.put(task)
-            logger.info(f"Submitted episode {episode_id} for {task_type} processing (priority: {priority})")
-            return True
+            if self._enqueue(task):
+                logger.info(f"Submitted episode {episode_id} for {task_type} processing (priority: {priority})")
+                return task.future
+            
+            self.payload_store.delete(handle)
+            self._unregister_token(task)
+            with self.stats_lock:
+                self.processing_stats["submissions_rejected"] += 1
+            logger.warning(f"Rejected episode {episode_id} ({task_type}): task queue full")
+            return None
             
         except Exception as e:
+            if handle:
+                self.payload_store.delete(handle)
+            if task:
+                self._unregister_token(task)
             logger.error(f"Failed to submit episode {episode_id}: {e}")
+            return None
+    
+    def submit_batch(self, submissions: Iterable[Dict[str, Any]]) -> List[Optional[EpisodeFuture]]:
+        """
+        Submit several tasks at once
+        
+        Args:
+            submissions: Dicts of submit_episode keyword arguments
+            
+        Returns:
+            One entry per submission, in order: the EpisodeFuture, or None
+            where submit_episode rejected it; pair with as_completed() to
+            consume results in completion order
+        """
+        return [self.submit_episode(**submission) for submission in submissions]
+    
+    def as_completed(self, episode_futures: Iterable[Optional[EpisodeFuture]],
+                     timeout: Optional[float] = None) -> Iterator[EpisodeFuture]:
+        """Yield futures as their tasks finish, skipping rejected (None) submissions"""
+        return as_completed([f for f in episode_futures if f is not None], timeout=timeout)
+    
+    def _enqueue(self, task: EpisodeTask) -> bool:
+        """Place a task on the queue according to the queue-full policy"""
+        if self.queue_full_policy == QueueFullPolicy.BLOCK:
+            try:
+                self.task_queue.put(task, timeout=self.submit_timeout)
+                return True
+            except Full:
+                return False
+        
+        # Once tasks are spilled, new ones join them so the spill index
+        # decides (by priority, then arrival) which record is re-fed next
+        if self.queue_full_policy == QueueFullPolicy.SPILL and len(self.spill_queue):
+            self._spill(task)
+            return True
+        
+        try:
+            self.task_queue.put_nowait(task)
+            return True
+        except Full:
+            if self.queue_full_policy == QueueFullPolicy.SPILL:
+                self._spill(task)
+                return True
             return False
     
+    def _spill(self, task: EpisodeTask):
+        """Park a task record on disk until the queue has room"""
+        self.spill_queue.push(task.to_record(), priority=task.priority)
+        with self.stats_lock:
+            self.processing_stats["tasks_spilled"] += 1
+        logger.info(f"Spilled episode {task.episode_id} ({task.task_type}) to disk: task queue full")
+    
+    def _refill_from_spill(self):
+        """Move spilled task records back into the queue, highest priority first, while it has room"""
+        if not len(self.spill_queue):
+            return
+        
+        free_slots = self.max_queue_size - self.task_queue.qsize() if self.max_queue_size > 0 else len(self.spill_queue)
+        for record in self.spill_queue.pop_many(free_slots):
+            with self._tokens_lock:
+                token = self._task_tokens.get(record["task_id"])
+                future = self._task_futures.get(record["task_id"])
+            task = EpisodeTask(**record, cancel_token=token, future=future)
+            try:
+                self.task_queue.put_nowait(task)
+            except Full:
+                # Raced with a concurrent submitter - park it again rather than block a worker
+                self.spill_queue.push(record, priority=record["priority"])
+    
+    def _register_token(self, task: EpisodeTask):
+        with self._tokens_lock:
+            self._task_tokens[task.task_id] = task.cancel_token
+            self._task_futures[task.task_id] = task.future
+            self._episode_tasks.setdefault(task.episode_id, set()).add(task.task_id)
+    
+    def _unregister_token(self, task: EpisodeTask):
+        with self._tokens_lock:
+            self._task_tokens.pop(task.task_id, None)
+            self._task_futures.pop(task.task_id, None)
+            episode_tasks = self._episode_tasks.get(task.episode_id)
+            if episode_tasks is not None:
+                episode_tasks.discard(task.task_id)
+                if not episode_tasks:
+                    del self._episode_tasks[task.episode_id]
+    
+    def cancel_episode(self, episode_id: str, reason: str = "cancelled by request") -> int:
+        """
+        Cancel every queued and in-flight task of an episode
+        
+        Queued tasks are skipped when a worker dequeues them; running phases
+        stop at their next cancellation check, or are abandoned by the
+        watchdog after cancel_grace_period.
+        
+        Returns:
+            int: Number of tasks newly cancelled
+        """
+        with self._tokens_lock:
+            tokens = [self._task_tokens[task_id] for task_id in self._episode_tasks.get(episode_id, ())]
+        
+        cancelled = sum(1 for token in tokens if token.cancel(reason))
+        if cancelled:
+            logger.info(f"Cancelled {cancelled} task(s) for episode {episode_id}: {reason}")
+        return cancelled
+    
+    def cancel_all(self, reason: str = "cancelled by request") -> int:
+        """Cancel every queued and in-flight task"""
+        with self._tokens_lock:
+            tokens = list(self._task_tokens.values())
+        return sum(1 for token in tokens if token.cancel(reason))
+    
+    def _watchdog_loop(self):
+        """Enforce deadlines and reclaim workers stuck in cancelled phases"""
+        while not self.shutdown_event.wait(0.1):
+            try:
+                now = time.time()
+                with self._tokens_lock:
+                    in_flight = list(self._in_flight.items())
+                
+                for task_id, (task, worker, _) in in_flight:
+                    token = task.cancel_token
+                    if not token.cancelled and token.expired():
+                        token.cancel(f"{task.task_type} deadline exceeded")
+                        logger.warning(f"Episode {task.episode_id} {task.task_type} task exceeded its deadline")
+                    
+                    if token.cancelled and now - token.cancelled_at >= self.cancel_grace_period:
+                        self._abandon_task(task_id)
+                        
+            except Exception as e:
+                logger.error(f"Watchdog error: {e}")
+    
+    def _abandon_task(self, task_id: str):
+        """
+        Release the slot of a phase that ignored cancellation
+        
+        The stuck thread cannot be killed, so it is retired: it leaves
+        worker_threads for abandoned_threads, its stripe lock is released on
+        its behalf (other episodes on the stripe must not wait for it), the
+        task is finalized here, and a fresh worker takes its place so pool
+        capacity is restored immediately. The episode itself stays busy:
+        its later tasks are held back until the stuck phase returns.
+        """
+        with self._tokens_lock:
+            entry = self._in_flight.pop(task_id, None)
+            if entry is None:
+                return  # Worker finished on its own in the meantime
+            task, worker, stripe_lock = entry
+            self._abandoned_workers.add(worker.name)
+            self._busy_episodes.setdefault(task.episode_id, [])
+            if worker in self.worker_threads:
+                self.worker_threads.remove(worker)
+            self.abandoned_threads.append(worker)
+        
+        self.active_episodes.pop(task.episode_id, None)
+        stripe_lock.release()
+        task.future._resolve(error=TaskCancelledError(task.cancel_token.reason or "abandoned"))
+        self.payload_store.delete(task.payload_handle)
+        self._unregister_token(task)
+        
+        with self.stats_lock:
+            self.processing_stats["workers_abandoned"] += 1
+        
+        if not self.shutdown_event.is_set():
+            self._start_worker()
+        
+        self._refill_from_spill()
+        self.task_queue.task_done()
+        logger.warning(f"Abandoned worker {worker.name} stuck on episode {task.episode_id} "
+                       f"({task.cancel_token.reason}); replacement started")
+    
+    def _hold_if_busy(self, task: EpisodeTask) -> bool:
+        """Hold a task back while an abandoned phase of its episode still runs"""
+        with self._tokens_lock:
+            held = self._busy_episodes.get(task.episode_id)
+            if held is None:
+                return False
+            held.append(task)
+        logger.info(f"Holding {task.task_type} task for episode {task.episode_id} "
+                    f"until its abandoned phase returns")
+        return True
+    
+    def _retire_abandoned_worker(self, episode_id: str):
+        """Called by an abandoned worker on its way out: requeue the episode's held tasks"""
+        current_thread = threading.current_thread()
+        with self._tokens_lock:
+            self._abandoned_workers.discard(current_thread.name)
+            if current_thread in self.abandoned_threads:
+                self.abandoned_threads.remove(current_thread)
+            held = self._busy_episodes.pop(episode_id, [])
+        for task in held:
+            if self.shutdown_event.is_set():
+                task.future._resolve(error=TaskCancelledError("processor shutdown"))
+                self._finish_task(task)
+                continue
+            # Put back before marking the original dequeue done, so join() never sees a false empty
+            self.task_queue.put(task)
+            self.task_queue.task_done()
+    
     def _worker_loop(self):
         """Worker thread main loop"""
         worker_name = threading.current_thread().name
+        shard = self.stats_shards[worker_name]
         logger.info(f"Worker {worker_name} started")
         
         while not self.shutdown_event.is_set():
             try:
                 # Get next task with timeout
-                task = self.task_queue.get(timeout=1.0)
+                try:
+                    task = self.task_queue.get(timeout=1.0)
+                except Empty:
+                    self._refill_from_spill()
+                    continue
+                
+                # A task held back behind an abandoned phase is already running
+                if task.cancel_token.cancelled or not (task.future.running()
+                                                       or task.future.set_running_or_notify_cancel()):
+                    # Cancelled while queued - never start it
+                    logger.info(f"Worker {worker_name} skipping cancelled episode {task.episode_id}")
+                    task.future._resolve(error=TaskCancelledError(task.cancel_token.reason or "cancelled"))
+                    shard.episodes_cancelled += 1
+                    self._finish_task(task)
+                    continue
                 
                 logger.info(f"Worker {worker_name} processing episode {task.episode_id}")
                 
                 start_time = time.time()
                 success = self._process_episode_task(task)
                 processing_time = time.time() - start_time
+                if success is None:
+                    continue  # Held until its episode's abandoned phase returns
                 
-                # Update statistics thread-safely
-                with self.stats_lock:
-                    if success:
-                        self.processing_stats["episodes_processed"] += 1
-                    else:
-                        self.processing_stats["episodes_failed"] += 1
-                    
-                    # Update running average
-                    total_episodes = (self.processing_stats["episodes_processed"] + 
-                                    self.processing_stats["episodes_failed"])
-                    current_avg = self.processing_stats["average_processing_time"]
-                    self.processing_stats["average_processing_time"] = (
-                        (current_avg * (total_episodes - 1) + processing_time) / total_episodes
-                    )
-                    
-                    # Update concurrent peak
-                    current_active = len(self.active_episodes)
-                    if current_active > self.processing_stats["concurrent_peak"]:
-                        self.processing_stats["concurrent_peak"] = current_active
+                if worker_name in self._abandoned_workers:
+                    # The watchdog already finalized this task and replaced us
+                    logger.warning(f"Worker {worker_name} returned after being abandoned; exiting")
+                    self._retire_abandoned_worker(task.episode_id)
+                    break
                 
-                self.task_queue.task_done()
+                # Update this worker's own shard - no shared lock needed
+                if success:
+                    shard.episodes_processed += 1
+                elif task.cancel_token.cancelled:
+                    shard.episodes_cancelled += 1
+                else:
+                    shard.episodes_failed += 1
+                shard.total_processing_time += processing_time
+                shard.processing_times.add(processing_time)
+                
+                self._finish_task(task)
                 logger.info(f"Worker {worker_name} completed episode {task.episode_id} in {processing_time:.2f}s")
                 
             except Exception as e:
@@ -153,7 +501,15 @@ class ThreadSafeEpisodeProcessor:
         
         logger.info(f"Worker {worker_name} shutting down")
     
-    def _process_episode_task(self, task: EpisodeTask) -> bool:
+    def _finish_task(self, task: EpisodeTask):
+        """Release a dequeued task's payload and token and mark it done"""
+        self.payload_store.delete(task.payload_handle)
+        self._unregister_token(task)
+        # Refill before task_done so join() never sees a false empty
+        self._refill_from_spill()
+        self.task_queue.task_done()
+    
+    def _process_episode_task(self, task: EpisodeTask) -> Optional[bool]:
         """
         Process a single episode task with proper resource management
         
@@ -161,37 +517,73 @@ class ThreadSafeEpisodeProcessor:
             task: EpisodeTask to process
             
         Returns:
-            bool: True if processed successfully
+            bool: True if processed successfully, None if the task was held
+            back behind an abandoned phase of the same episode
         """
         episode_id = task.episode_id
+        token = task.cancel_token
         
         try:
-            with self.episode_lock(episode_id):
-                # Track active episode
-                current_thread = threading.current_thread()
-                self.active_episodes[episode_id] = current_thread
+            data = self.payload_store.get(task.payload_handle)
+            
+            # The stripe lock is managed by hand rather than via episode_lock():
+            # if this phase gets stuck the watchdog releases it on our behalf
+            stripe_lock = self._episode_stripe(episode_id)
+            stripe_lock.acquire()
+            if self._busy_episodes and self._hold_if_busy(task):
+                stripe_lock.release()
+                return None
+            
+            current_thread = threading.current_thread()
+            token.start(task.timeout if task.timeout is not None else self.task_timeouts.get(task.task_type))
+            with self._tokens_lock:
+                self._in_flight[task.task_id] = (task, current_thread, stripe_lock)
+            
+            # Track active episode
+            self.active_episodes[episode_id] = current_thread
+            
+            shard = self.stats_shards.get(current_thread.name)
+            current_active = len(self.active_episodes)
+            if shard and current_active > shard.concurrent_peak:
+                shard.concurrent_peak = current_active
+            
+            try:
+                token.check()
+                progress = task.future.report_progress
                 
-                try:
-                    # Route to appropriate processor based on task type
-                    if task.task_type == "research":
-                        return self._process_research_phase(episode_id, task.data)
-                    elif task.task_type == "script":
-                        return self._process_script_phase(episode_id, task.data)
-                    elif task.task_type == "audio":
-                        return self._process_audio_phase(episode_id, task.data)
-                    else:
-                        logger.error(f"Unknown task type: {task.task_type}")
-                        return False
-                        
-                finally:
+                # Route to appropriate processor based on task type
+                if task.task_type == "research":
+                    result = self._process_research_phase(episode_id, data, token, progress)
+                elif task.task_type == "script":
+                    result = self._process_script_phase(episode_id, data, token, progress)
+                elif task.task_type == "audio":
+                    result = self._process_audio_phase(episode_id, data, token, progress)
+                else:
+                    raise ValueError(f"Unknown task type: {task.task_type}")
+                
+                task.future._resolve(result)
+                return True
+                    
+            finally:
+                with self._tokens_lock:
+                    still_owned = self._in_flight.pop(task.task_id, None) is not None
+                
+                if still_owned:
                     # Clean up active episode tracking
                     self.active_episodes.pop(episode_id, None)
+                    stripe_lock.release()
                     
+        except TaskCancelledError as e:
+            logger.warning(f"Episode {episode_id} {task.task_type} task cancelled: {e.reason}")
+            task.future._resolve(error=e)
+            return False
         except Exception as e:
             logger.error(f"Failed to process episode {episode_id}: {e}")
+            task.future._resolve(error=e)
             return False
     
-    def _process_research_phase(self, episode_id: str, data: Dict[str, Any]) -> bool:
+    def _process_research_phase(self, episode_id: str, data: Dict[str, Any],
+                                token: CancellationToken, progress: ProgressReporter) -> Dict[str, Any]:
         """Thread-safe research phase processing"""
         try:
             # Simulate research processing with proper resource management
@@ -209,52 +601,122 @@ class ThreadSafeEpisodeProcessor:
                 "processing_thread": threading.current_thread().name
             }
             
+            queries = data.get("queries", []) if isinstance(data, dict) else []
+            if queries and self.research_batcher:
+                research_result["query_results"] = self._run_research_queries(
+                    episode_id, queries, token, progress)
+                research_result["sources_count"] = sum(
+                    len(r.get("sources", [])) for r in research_result["query_results"])
+            else:
+                progress("research", 1, 1)
             logger.info(f"Research completed for episode {episode_id}: cost=${target_cost:.2f}")
-            return True
+            return research_result
             
+        except TaskCancelledError:
+            raise
         except Exception as e:
             logger.error(f"Research phase failed for episode {episode_id}: {e}")
-            return False
+            raise
+    
+    def _run_research_queries(self, episode_id: str, queries: List[str],
+                              token: CancellationToken, progress: ProgressReporter) -> List[Dict[str, Any]]:
+        """Send an episode's queries through the shared batcher and wait for all answers"""
+        pending = [self.research_batcher.submit(query, episode_id) for query in queries]
+        results = []
+        for index, query_future in enumerate(pending, 1):
+            while True:
+                token.check()
+                try:
+                    results.append(query_future.result(timeout=0.1))
+                    break
+                except futures.TimeoutError:
+                    continue
+            progress("research", index, len(pending))
+        return results
     
-    def _process_script_phase(self, episode_id: str, data: Dict[str, Any]) -> bool:
+    def _process_script_phase(self, episode_id: str, data: Dict[str, Any],
+                              token: CancellationToken, progress: ProgressReporter) -> Dict[str, Any]:
         """Thread-safe script phase processing"""
         try:
             logger.info(f"Script phase for episode {episode_id}")
             
             # Simulate script processing
-            time.sleep(0.5)  # Simulate processing time
+            token.wait(0.5)  # Simulate processing time (interruptible)
+            progress("script", 1, 1)
             
             logger.info(f"Script completed for episode {episode_id}")
-            return True
+            return {
+                "episode_id": episode_id,
+                "status": "completed",
+                "processing_thread": threading.current_thread().name
+            }
             
+        except TaskCancelledError:
+            raise
         except Exception as e:
             logger.error(f"Script phase failed for episode {episode_id}: {e}")
-            return False
+            raise
     
-    def _process_audio_phase(self, episode_id: str, data: Dict[str, Any]) -> bool:
+    def _process_audio_phase(self, episode_id: str, data: Dict[str, Any],
+                             token: CancellationToken, progress: ProgressReporter) -> Dict[str, Any]:
         """Thread-safe audio phase processing"""
         try:
             logger.info(f"Audio phase for episode {episode_id}")
             
-            # Simulate audio processing with ElevenLabs MCP tool
-            time.sleep(0.3)  # Simulate processing time
+            # Simulate chunked synthesis with ElevenLabs MCP tool
+            total_chunks = max(1, len(data.get("chunks", [])))
+            for chunk_number in range(1, total_chunks + 1):
+                token.wait(0.3 / total_chunks)  # Simulate processing time (interruptible)
+                progress("synthesis", chunk_number, total_chunks, f"chunk {chunk_number} of {total_chunks} synthesized")
             
             logger.info(f"Audio completed for episode {episode_id}")
-            return True
+            return {
+                "episode_id": episode_id,
+                "chunks_synthesized": total_chunks,
+                "processing_thread": threading.current_thread().name
+            }
             
+        except TaskCancelledError:
+            raise
         except Exception as e:
             logger.error(f"Audio phase failed for episode {episode_id}: {e}")
-            return False
+            raise
+    
+    def _merged_statistics(self) -> Dict[str, Any]:
+        """Merge per-worker stats shards into a single snapshot"""
+        shards = list(self.stats_shards.values())
+        processed = sum(s.episodes_processed for s in shards)
+        failed = sum(s.episodes_failed for s in shards)
+        cancelled = sum(s.episodes_cancelled for s in shards)
+        total_time = sum(s.total_processing_time for s in shards)
+        sketch = LatencySketch.merged(s.processing_times for s in shards)
+        
+        with self.stats_lock:
+            submission_stats = self.processing_stats.copy()
+        
+        return {
+            "episodes_processed": processed,
+            "episodes_failed": failed,
+            "episodes_cancelled": cancelled,
+            "average_processing_time": total_time / max(1, sketch.count),
+            "processing_time_percentiles": sketch.summary(),
+            "concurrent_peak": max((s.concurrent_peak for s in shards), default=0),
+            **submission_stats
+        }
     
     def get_status(self) -> Dict[str, Any]:
         """Get thread-safe status information"""
-        with self.stats_lock:
-            return {
-                "active_episodes": list(self.active_episodes.keys()),
-                "queue_size": self.task_queue.qsize(),
-                "worker_threads_alive": sum(1 for t in self.worker_threads if t.is_alive()),
-                "statistics": self.processing_stats.copy()
-            }
+        return {
+            "active_episodes": list(self.active_episodes.keys()),
+            "queue_size": self.task_queue.qsize(),
+            "queue_capacity": self.max_queue_size or None,
+            "queue_full_policy": self.queue_full_policy.value,
+            "spilled_tasks": len(self.spill_queue),
+            "payload_store_bytes": self.payload_store.total_bytes,
+            "worker_threads_alive": sum(1 for t in self.worker_threads if t.is_alive()),
+            "abandoned_threads_alive": sum(1 for t in list(self.abandoned_threads) if t.is_alive()),
+            "statistics": self._merged_statistics()
+        }
     
     def wait_for_completion(self, timeout: Optional[float] = None) -> bool:
         """Wait for all queued tasks to complete"""
@@ -262,13 +724,16 @@ class ThreadSafeEpisodeProcessor:
             if timeout:
                 # Wait with timeout
                 start_time = time.time()
-                while not self.task_queue.empty():
+                while not self.task_queue.empty() or len(self.spill_queue):
                     if time.time() - start_time > timeout:
                         return False
                     time.sleep(0.1)
             else:
-                # Wait indefinitely
+                # Wait indefinitely, including tasks still parked on disk
                 self.task_queue.join()
+                while len(self.spill_queue):
+                    self._refill_from_spill()
+                    self.task_queue.join()
             return True
         except Exception as e:
             logger.error(f"Error waiting for completion: {e}")
@@ -278,20 +743,29 @@ class ThreadSafeEpisodeProcessor:
         """Graceful shutdown of all worker threads"""
         logger.info("Initiating graceful shutdown...")
         
-        # Signal shutdown
+        # Signal shutdown and interrupt in-flight phases
         self.shutdown_event.set()
+        self.cancel_all("processor shutdown")
         
-        # Wait for workers to finish
+        # Wait for workers to finish (abandoned workers are not waited on)
         shutdown_start = time.time()
-        for worker in self.worker_threads:
+        for worker in list(self.worker_threads):
             remaining_time = max(0, timeout - (time.time() - shutdown_start))
             worker.join(timeout=remaining_time)
             
             if worker.is_alive():
                 logger.warning(f"Worker {worker.name} did not shutdown gracefully")
         
-        # Clean up episode locks
-        self.episode_locks.clear()
+        # Tasks still held behind an abandoned phase will never run
+        with self._tokens_lock:
+            held = [task for tasks in self._busy_episodes.values() for task in tasks]
+            self._busy_episodes.clear()
+        for task in held:
+            task.future._resolve(error=TaskCancelledError("processor shutdown"))
+            self._finish_task(task)
+        
+        # Drop payloads of tasks that never ran
+        self.payload_store.close()
         
         logger.info("Shutdown complete")
         return True
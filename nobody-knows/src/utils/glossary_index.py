@@ -0,0 +1,504 @@
+#!/usr/bin/env python3
+"""
+Series Pronunciation Glossary Index
+Builds an indexed glossary of proper nouns, spelled-out numerals and acronyms from series content.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+CONTENT_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "content")
+DEFAULT_INDEX_PATH = os.path.join(CONTENT_DIR, "config", "glossary_index.json")
+DEFAULT_PRONUNCIATIONS_PATH = os.path.join(CONTENT_DIR, "config", "pronunciations.json")
+INDEX_VERSION = 3
+
+CATEGORIES = ("proper_nouns", "numerals", "acronyms")
+# Multi-word proper nouns that look like people's names get their own category at build time
+PERSON_NAMES = "person_names"
+
+NUMBER_VALUES = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13,
+    "fourteen": 14, "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18,
+    "nineteen": 19, "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50, "sixty": 60,
+    "seventy": 70, "eighty": 80, "ninety": 90, "hundred": 100, "thousand": 1000,
+    "million": 1000000, "billion": 1000000000, "trillion": 1000000000000
+}
+
+# Words that make a spelled-out number worth indexing on its own ("seventeen percent")
+NUMBER_UNITS = {"percent", "percentage", "pages", "years", "people", "dollars", "hours",
+                "minutes", "seconds", "days", "times", "parameters", "users", "am", "pm"}
+
+# Capitalized words that are not pronunciation-worthy proper nouns
+COMMON_CAPITALIZED = {
+    "i", "monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday",
+    "january", "february", "march", "april", "may", "june", "july", "august", "september",
+    "october", "november", "december", "episode", "season"
+}
+
+# All-caps tokens that read as ordinary words once the validator lowercases text ("AM", "STAR")
+WORD_ACRONYMS = {"am", "pm", "aka", "ok", "us", "it", "who", "star", "art", "aid", "ace"}
+
+# Words that make a capitalized phrase an institution or title rather than a person ("Nobel Prize")
+INSTITUTION_WORDS = {"prize", "award", "university", "institute", "college", "school", "lab", "labs",
+                     "laboratory", "foundation", "company", "project", "center", "centre", "group"}
+
+# Lowercase words that may join capitalized words into one name ("University of Pennsylvania")
+NAME_CONNECTORS = {"of"}
+
+_TOKEN_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9'’\-]*")
+_SENTENCE_RE = re.compile(r"(?<=[.!?:])\s+|\n+")
+
+
+def _strip_markup(text: str) -> str:
+    """Drop SSML/HTML tags and Markdown heading markers"""
+    text = re.sub(r'<!--.*?-->', ' ', text, flags=re.DOTALL)
+    text = re.sub(r'<[^>]+>', ' ', text)
+    return re.sub(r'^#+\s*', '', text, flags=re.MULTILINE)
+
+
+def words_to_number(words: List[str]) -> Optional[int]:
+    """
+    Value of a spelled-out number ("two hundred ninety-eight" -> 298)
+
+    Returns:
+        The integer, or None if the words are not one number ("eight fifteen")
+    """
+    parts = [part for word in words for part in word.lower().split("-")]
+    if not parts or any(part not in NUMBER_VALUES for part in parts):
+        return None
+
+    total = current = 0
+    for part in parts:
+        value = NUMBER_VALUES[part]
+        if value == 100:
+            current = (current or 1) * 100
+        elif value >= 1000:
+            total += (current or 1) * value
+            current = 0
+        elif current % 100 == 0 or (current % 100 in range(20, 100, 10) and value < 10):
+            current += value
+        else:
+            return None
+    return total + current
+
+
+def _normalize_token(token: str) -> str:
+    """
+    Strip possessives, plural acronyms and lowercase compound tails
+    ("DeepMind's" -> "DeepMind", "AIs" -> "AI", "English-language" -> "English")
+    """
+    token = re.sub(r"['’]s$", "", token)
+    parts = token.split("-")
+    head = parts[0]
+    if len(head) >= 2 and head.isupper() and token != head and not token.isupper():
+        return head  # "AI-generated" -> "AI"
+    if head[:1].isupper() and head.lower() not in NUMBER_VALUES and any(part[:1].islower() for part in parts[1:]):
+        return head  # "Prize-winning" -> "Prize", "X-ray" -> "X"
+    if len(token) >= 3 and token.endswith("s") and token[:-1].isupper():
+        return token[:-1]
+    return token
+
+
+def _is_acronym(token: str) -> bool:
+    return len(token) >= 2 and token.isupper() and sum(c.isalpha() for c in token) >= 2
+
+
+def _is_capitalized(token: str) -> bool:
+    return len(token) >= 2 and token[0].isupper() and not token.isupper()
+
+
+def _is_heading(tokens: List[str]) -> bool:
+    """Title-case lines (episode titles, headings) say nothing about proper nouns"""
+    words = [token for token in tokens if token[0].isalpha()]
+    return len(words) >= 3 and all(token[0].isupper() for token in words if len(token) > 3)
+
+
+def extract_terms(text: str) -> Dict[str, Dict[str, int]]:
+    """
+    Pronunciation-sensitive terms in one source text
+
+    Proper nouns are runs of capitalized words, optionally joined by "of".
+    A sentence's first word only counts when the same word is also
+    capitalized mid-sentence somewhere in the text, a single word only when
+    it never appears in lowercase, and title-case headings and labels
+    followed by a letter ("Series A") are skipped.
+
+    Returns:
+        {category: {term: occurrences}} for proper nouns, spelled-out
+        numerals and acronyms
+    """
+    found = {category: {} for category in CATEGORIES}
+
+    def count(category, term):
+        found[category][term] = found[category].get(term, 0) + 1
+
+    sentences = []
+    for sentence in _SENTENCE_RE.split(_strip_markup(text)):
+        tokens = [_normalize_token(token) for token in _TOKEN_RE.findall(sentence)]
+        if tokens:
+            sentences.append(tokens)
+
+    mid_sentence = {token for tokens in sentences if not _is_heading(tokens)
+                    for token in tokens[1:] if _is_capitalized(token)}
+    lowercase = {token for tokens in sentences for token in tokens if token.islower()}
+
+    for tokens in sentences:
+        heading = _is_heading(tokens)
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+
+            if _is_acronym(token):
+                count("acronyms", token)
+                i += 1
+                continue
+
+            if _is_capitalized(token) or (token[0].isupper() and len(token) == 1):
+                run = [token]
+                while i + len(run) < len(tokens):
+                    following = tokens[i + len(run)]
+                    if _is_capitalized(following):
+                        run.append(following)
+                    elif (following in NAME_CONNECTORS and i + len(run) + 1 < len(tokens)
+                          and _is_capitalized(tokens[i + len(run) + 1])):
+                        run += tokens[i + len(run):i + len(run) + 2]
+                    else:
+                        break
+                end = i + len(run)
+                label = end < len(tokens) and len(tokens[end]) == 1 and tokens[end].isupper()
+                if i == 0 and run[0] not in mid_sentence:
+                    run = run[1:]
+                run = [word for word in run if len(word) > 1 and "'" not in word and "’" not in word
+                       and word.lower() not in COMMON_CAPITALIZED and word.lower() not in NUMBER_VALUES]
+                while run and run[0] in NAME_CONNECTORS:
+                    run = run[1:]
+                if label or (len(run) == 1 and run[0].lower() in lowercase):
+                    run = []
+                if run and not heading:
+                    count("proper_nouns", " ".join(run))
+                i = end
+                continue
+
+            lower = token.lower()
+            if all(part in NUMBER_VALUES for part in lower.split("-")):
+                run = [lower]
+                while i + len(run) < len(tokens) and all(
+                        part in NUMBER_VALUES for part in tokens[i + len(run)].lower().split("-")):
+                    run.append(tokens[i + len(run)].lower())
+                following = tokens[i + len(run)].lower() if i + len(run) < len(tokens) else ""
+                if following in NUMBER_UNITS:
+                    count("numerals", " ".join(run + [following]))
+                elif len(run) > 1 or "-" in lower:
+                    count("numerals", " ".join(run))
+                i += len(run)
+                continue
+
+            i += 1
+    return found
+
+
+def _lowercase_words(text: str) -> List[str]:
+    """Words a source uses in lowercase, so other sources' capitalized uses can be checked against them"""
+    return sorted({token for token in map(_normalize_token, _TOKEN_RE.findall(_strip_markup(text)))
+                   if token.islower() and token.isalpha()})
+
+
+def _is_person_name(term: str, lowercase: set) -> bool:
+    """
+    "Yoshua Bengio" but not "Nobody Knows", "Nobel Prize" or "Full Self-Driving": two or
+    three plain capitalized words, none of them ever used in lowercase or naming an institution
+    """
+    words = term.split()
+    return (2 <= len(words) <= 3 and all(word.isalpha() and word.istitle() for word in words)
+            and not any(word.lower() in lowercase or word.lower() in INSTITUTION_WORDS for word in words))
+
+
+def _json_strings(value) -> Iterable[str]:
+    """Every string value in a parsed JSON document"""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _json_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _json_strings(item)
+
+
+def _source_text(path: str, raw: bytes) -> str:
+    text = raw.decode("utf-8")
+    if path.endswith(".json"):
+        # One string per line so titles never run into each other as one sentence
+        return "\n".join(_json_strings(json.loads(text)))
+    return text
+
+
+@dataclass
+class GlossaryEntry:
+    """One indexed term"""
+    term: str
+    category: str
+    count: int = 0
+    sources: List[str] = field(default_factory=list)
+    variants: List[str] = field(default_factory=list)
+    ipa: Optional[str] = None
+
+
+def _numeral_variants(term: str) -> List[str]:
+    """Digit spellings an STT transcript may use for a spelled-out numeral"""
+    words = term.split()
+    unit = words[-1] if words[-1] in NUMBER_UNITS else None
+    value = words_to_number(words[:-1] if unit else words)
+    if value is None:
+        return []
+    if unit in ("percent", "percentage"):
+        return [f"{value} {unit}", f"{value}%"]
+    return [f"{value} {unit}" if unit else str(value)]
+
+
+class GlossaryIndex:
+    """
+    Loaded glossary with O(1) per-token lookup
+
+    Entries are keyed by the lowercased first token of every spelling, so
+    scanning a text costs one dict lookup per token plus a short check of
+    the few multi-word candidates that start there.
+    """
+
+    def __init__(self, entries: List[GlossaryEntry]):
+        self.entries = entries
+        self._by_first_token: Dict[str, List[Tuple[Tuple[str, ...], GlossaryEntry]]] = {}
+        for entry in entries:
+            for spelling in [entry.term] + entry.variants:
+                tokens = tuple(spelling.lower().split())
+                if tokens:
+                    self._by_first_token.setdefault(tokens[0], []).append((tokens, entry))
+        for candidates in self._by_first_token.values():
+            candidates.sort(key=lambda candidate: -len(candidate[0]))  # longest spelling first
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def lookup(self, token: str) -> List[GlossaryEntry]:
+        """Entries with a spelling that starts with ``token``"""
+        return [entry for _, entry in self._by_first_token.get(token.lower(), [])]
+
+    def match_tokens(self, tokens: List[str]) -> List[Tuple[int, int, GlossaryEntry]]:
+        """
+        Longest glossary matches in a token list
+
+        Returns:
+            (start, end, entry) token spans, non-overlapping, left to right
+        """
+        lowered = [token.lower() for token in tokens]
+        matches = []
+        i = 0
+        while i < len(lowered):
+            for spelling, entry in self._by_first_token.get(lowered[i], []):
+                if tuple(lowered[i:i + len(spelling)]) == spelling:
+                    matches.append((i, i + len(spelling), entry))
+                    i += len(spelling)
+                    break
+            else:
+                i += 1
+        return matches
+
+    def inject_phonemes(self, ssml: str) -> str:
+        """
+        Wrap glossary terms that have an IPA pronunciation in <phoneme> tags
+
+        Only text outside tags is touched, and text already inside a
+        <phoneme> element is left alone.
+        """
+        pieces = re.split(r'(<[^>]+>)', ssml)
+        inside_phoneme = 0
+        output = []
+        for piece in pieces:
+            if piece.startswith("<"):
+                if re.match(r'<phoneme\b', piece) and not piece.endswith("/>"):
+                    inside_phoneme += 1
+                elif piece.startswith("</phoneme"):
+                    inside_phoneme = max(0, inside_phoneme - 1)
+                output.append(piece)
+                continue
+            if inside_phoneme or not piece:
+                output.append(piece)
+                continue
+
+            spans = [match for match in _TOKEN_RE.finditer(piece)]
+            cursor = 0
+            for start, end, entry in self.match_tokens([match.group() for match in spans]):
+                if not entry.ipa:
+                    continue
+                first, last = spans[start].start(), spans[end - 1].end()
+                output.append(piece[cursor:first])
+                output.append(f'<phoneme alphabet="ipa" ph="{entry.ipa}">{piece[first:last]}</phoneme>')
+                cursor = last
+            output.append(piece[cursor:])
+        return "".join(output)
+
+    def to_validator_glossary(self) -> Dict[str, list]:
+        """Glossary in the STT validator's format (see term_matcher.load_glossary)"""
+        return {
+            "technical_terms": [{"term": entry.term.lower(), "variants": entry.variants}
+                                for entry in self.entries if entry.category in ("acronyms", "proper_nouns")],
+            "statistics": [{"term": entry.term, "variants": entry.variants}
+                           for entry in self.entries if entry.category == "numerals"],
+            "expert_names": [{"term": entry.term.lower(), "variants": entry.variants}
+                             for entry in self.entries if entry.category == PERSON_NAMES]
+        }
+
+    @classmethod
+    def load(cls, index_path: str = DEFAULT_INDEX_PATH) -> "GlossaryIndex":
+        """Load a built index file"""
+        with open(index_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported glossary index version: {data.get('version')}")
+        return cls([GlossaryEntry(*row) for row in data["entries"]])
+
+
+def build_glossary_index(sources: List[str], index_path: str = DEFAULT_INDEX_PATH,
+                         pronunciations_path: Optional[str] = DEFAULT_PRONUNCIATIONS_PATH,
+                         min_count: int = 1, content_dir: str = CONTENT_DIR) -> Dict[str, object]:
+    """
+    Build or incrementally update the glossary index
+
+    Each source's extracted terms are stored with its SHA-256, so a rebuild
+    only re-reads sources whose content changed and drops removed ones.
+    Merging applies checks a single source cannot: a one-word proper noun
+    is dropped if any source uses it in lowercase ("Help", "Time"), and one
+    found only in series-bible JSON (titles and labels, all title case)
+    must also appear in a script. A plain one-word proper noun ("Earth",
+    "Sarah") needs two occurrences, and acronyms that read as words ("AM",
+    "STAR") are dropped. Multi-word names of people are indexed as
+    person_names.
+
+    Args:
+        sources: Reference scripts and series-bible JSON files
+        index_path: Output index file
+        pronunciations_path: Optional JSON mapping terms to IPA
+        min_count: Minimum occurrences across sources for an entry
+        content_dir: Sources are keyed by their path relative to this directory
+
+    Returns:
+        Build statistics (entries, rebuilt and reused sources)
+    """
+    previous = {}
+    if os.path.exists(index_path):
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                previous = data.get("sources", {})
+        except (OSError, ValueError):
+            previous = {}
+
+    source_terms = {}
+    rebuilt, reused = [], []
+    for path in sorted(sources):
+        key = os.path.relpath(path, content_dir).replace(os.sep, "/")
+        with open(path, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if key in previous and previous[key]["sha256"] == digest:
+            source_terms[key] = previous[key]
+            reused.append(key)
+            continue
+        text = _source_text(path, raw)
+        source_terms[key] = {"sha256": digest, "terms": extract_terms(text), "lowercase": _lowercase_words(text)}
+        rebuilt.append(key)
+
+    pronunciations = {}
+    if pronunciations_path and os.path.exists(pronunciations_path):
+        with open(pronunciations_path, 'r', encoding='utf-8') as f:
+            pronunciations = {term.lower(): ipa for term, ipa in json.load(f).items()}
+
+    lowercase = {word for source in source_terms.values() for word in source["lowercase"]}
+    script_nouns = {term for key, source in source_terms.items() if not key.endswith(".json")
+                    for term in source["terms"]["proper_nouns"]}
+
+    merged: Dict[Tuple[str, str], GlossaryEntry] = {}
+    for key, source in source_terms.items():
+        for category, terms in source["terms"].items():
+            for term, occurrences in terms.items():
+                entry_category = category
+                if category == "proper_nouns":
+                    if " " not in term and (term.lower() in lowercase
+                                            or (key.endswith(".json") and term not in script_nouns)):
+                        continue
+                    if _is_person_name(term, lowercase):
+                        entry_category = PERSON_NAMES
+                elif category == "acronyms" and (term.lower() in WORD_ACRONYMS or term.lower() in lowercase):
+                    continue
+                entry = merged.setdefault((entry_category, term), GlossaryEntry(term, entry_category))
+                entry.count += occurrences
+                entry.sources.append(key)
+
+    entries = []
+    for (category, term), entry in sorted(merged.items()):
+        if entry.count < min_count:
+            continue
+        if category == "proper_nouns" and entry.count < 2 and term.isalpha() and term.istitle():
+            continue
+        if category == "numerals":
+            entry.variants = _numeral_variants(term)
+        elif category == "acronyms":
+            entry.variants = [" ".join(term.lower())]
+        entry.ipa = pronunciations.get(term.lower())
+        entries.append(entry)
+
+    os.makedirs(os.path.dirname(os.path.abspath(index_path)), exist_ok=True)
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            "version": INDEX_VERSION,
+            "sources": source_terms,
+            "entries": [[e.term, e.category, e.count, e.sources, e.variants, e.ipa] for e in entries]
+        }, f, separators=(",", ":"), ensure_ascii=False)
+    os.replace(tmp_path, index_path)
+
+    return {
+        "index_path": index_path,
+        "entries": len(entries),
+        "by_category": {category: sum(1 for e in entries if e.category == category)
+                        for category in CATEGORIES + (PERSON_NAMES,)},
+        "rebuilt_sources": rebuilt,
+        "reused_sources": reused,
+        "removed_sources": sorted(set(previous) - set(source_terms))
+    }
+
+
+def default_sources(content_dir: str = CONTENT_DIR) -> List[str]:
+    """Reference scripts plus the series-bible episode and theme files"""
+    reference_dir = os.path.join(content_dir, "reference-scripts")
+    scripts = [os.path.join(reference_dir, name) for name in sorted(os.listdir(reference_dir))
+               if name.endswith(".md")] if os.path.isdir(reference_dir) else []
+    bible = [os.path.join(content_dir, "series-bible", name)
+             for name in ("episodes_master.json", "season_themes.json")]
+    return scripts + [path for path in bible if os.path.exists(path)]
+
+
+def main():
+    """Build the series glossary index and the validator glossary next to it"""
+    index_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_INDEX_PATH
+    print("📚 Building series glossary index...")
+
+    stats = build_glossary_index(default_sources(), index_path)
+    print(f"✅ {stats['entries']} entries: {stats['by_category']}")
+    print(f"   Rebuilt: {len(stats['rebuilt_sources'])} sources, reused: {len(stats['reused_sources'])}")
+
+    validator_path = os.path.join(os.path.dirname(os.path.abspath(index_path)), "validator_glossary.json")
+    with open(validator_path, 'w', encoding='utf-8') as f:
+        json.dump(GlossaryIndex.load(index_path).to_validator_glossary(), f, indent=2, ensure_ascii=False)
+    print(f"📝 Validator glossary saved: {validator_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,17 @@ Validates intelligent text chunking without API calls
 
 import re
 import os
+import sys
+
+# The chunker builds on the SSML tokenizer in the validation package
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'validation'))
+
+from ssml_chunker import chunk_ssml
+from chunk_planner import plan_synthesis, print_plan
 
 def chunk_large_text(text: str, max_chunk_size: int = 800) -> list:
     """
-    Test the intelligent SSML chunking algorithm
+    Test the structure-aware SSML chunking algorithm
 
     Args:
         text: SSML formatted text
@@ -20,55 +27,16 @@ def chunk_large_text(text: str, max_chunk_size: int = 800) -> list:
     """
     print(f"📝 Analyzing script: {len(text)} characters")
 
-    # Remove XML declaration and root speak tags for processing
-    text_content = text.strip()
-    if text_content.startswith('<?xml'):
-        text_content = re.sub(r'<\?xml.*?\?>', '', text_content, flags=re.DOTALL)
-
-    # Extract content between <speak> tags
-    speak_match = re.search(r'<speak>(.*)</speak>', text_content, re.DOTALL)
-    if speak_match:
-        inner_content = speak_match.group(1).strip()
-    else:
-        inner_content = text_content
-
-    chunks = []
-    current_chunk = ""
-
-    # Split on natural SSML break points
-    segments = re.split(r'(</prosody>|<break time="[^"]*"/>)', inner_content)
-
-    print(f"🔍 Found {len(segments)} segments after SSML splitting")
-
-    for i, segment in enumerate(segments):
-        segment = segment.strip()
-        if not segment:
-            continue
-
-        # Check if adding this segment exceeds chunk size
-        if len(current_chunk) + len(segment) <= max_chunk_size:
-            current_chunk += segment + " "
-        else:
-            if current_chunk.strip():
-                # Wrap in speak tags for synthesis
-                chunk_text = f'<speak>{current_chunk.strip()}</speak>'
-                chunks.append({
-                    'content': chunk_text,
-                    'size': len(chunk_text),
-                    'original_size': len(current_chunk.strip())
-                })
-            current_chunk = segment + " "
-
-    # Add final chunk
-    if current_chunk.strip():
-        chunk_text = f'<speak>{current_chunk.strip()}</speak>'
-        chunks.append({
-            'content': chunk_text,
-            'size': len(chunk_text),
-            'original_size': len(current_chunk.strip())
-        })
-
-    return chunks
+    chunks = chunk_ssml(text, max_chunk_size)
+
+    print(f"🔍 Packed {len(chunks)} chunks at paragraph, sentence and break boundaries")
+
+    return [{
+        'content': chunk.content,
+        'size': chunk.size,
+        'original_size': chunk.size - len('<speak></speak>'),
+        'boundary': chunk.boundary
+    } for chunk in chunks]
 
 def analyze_ssml_complexity(text: str) -> dict:
     """Analyze SSML markup complexity"""
@@ -126,44 +94,33 @@ def main():
     print(f"   Phoneme tags: {complexity['phoneme_tags']}")
     print(f"   Markup density: {complexity['markup_density']:.1f}%")
 
-    # Test different chunk sizes
-    chunk_sizes = [500, 800, 1200, 1600]
+    # Let the planner choose chunk size and model from pricing, limits and latency
+    try:
+        plan = plan_synthesis(script_content)
+    except ValueError as e:
+        print(f"❌ Planning error: {e}")
+        return
 
-    print(f"\n📊 Chunking Analysis:")
+    print(f"\n📊 Synthesis Plan:")
     print("-" * 50)
+    print_plan(plan)
 
-    for size in chunk_sizes:
-        chunks = chunk_large_text(script_content, size)
-
-        total_chars = sum(chunk['size'] for chunk in chunks)
-        avg_size = total_chars / len(chunks) if chunks else 0
-        min_size = min(chunk['size'] for chunk in chunks) if chunks else 0
-        max_size = max(chunk['size'] for chunk in chunks) if chunks else 0
-
-        print(f"Chunk size {size:4d}: {len(chunks):2d} chunks | "
-              f"Avg: {avg_size:4.0f} | Min: {min_size:3d} | Max: {max_size:4d}")
-
-    # Detailed analysis for optimal size (800)
-    print(f"\n📝 Detailed Analysis (800 char chunks):")
+    # Detailed analysis of the planned chunks
+    print(f"\n📝 Detailed Analysis ({plan.max_chars} char limit):")
     print("-" * 50)
 
-    optimal_chunks = chunk_large_text(script_content, 800)
+    for i, chunk in enumerate(plan.chunks[:5]):  # Show first 5 chunks
+        preview = chunk.content[:100].replace('\n', ' ')
+        print(f"Chunk {i+1:2d}: {chunk.size:5d} chars | {preview}...")
 
-    for i, chunk in enumerate(optimal_chunks[:5]):  # Show first 5 chunks
-        preview = chunk['content'][:100].replace('\n', ' ')
-        print(f"Chunk {i+1:2d}: {chunk['size']:3d} chars | {preview}...")
-
-    if len(optimal_chunks) > 5:
-        print(f"... and {len(optimal_chunks)-5} more chunks")
+    if len(plan.chunks) > 5:
+        print(f"... and {len(plan.chunks)-5} more chunks")
 
     # Cost estimation
-    total_chars = sum(chunk['size'] for chunk in optimal_chunks)
-    estimated_cost = total_chars / 1000 * 0.18  # $0.18 per 1k chars
-
     print(f"\n💰 Cost Estimation:")
-    print(f"   Total characters: {total_chars:,}")
-    print(f"   Estimated cost: ${estimated_cost:.2f}")
-    print(f"   Cost per chunk: ${estimated_cost/len(optimal_chunks):.3f}")
+    print(f"   Total characters: {plan.billed_characters:,}")
+    print(f"   Estimated cost: ${plan.cost:.2f}")
+    print(f"   Cost per chunk: ${plan.cost/len(plan.chunks):.3f}")
 
     print("=" * 50)
     print("✅ Chunking algorithm validation complete")
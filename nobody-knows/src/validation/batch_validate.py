@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Batch SSML Validation
+Validates every episode script of a season or the whole series in parallel, streaming JSON lines.
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, IO, Iterable, List, Optional, Tuple
+
+from ssml_validator import TTS_MODELS_PATH, SSMLValidator
+
+NOBODY_KNOWS_DIR = os.path.join(os.path.dirname(__file__), "..", "..")
+PRODUCTION_DIR = os.path.join(NOBODY_KNOWS_DIR, "production")
+EPISODES_MASTER_PATH = os.path.join(NOBODY_KNOWS_DIR, "content", "series-bible", "episodes_master.json")
+MANIFEST_NAME = ".ssml_validation_manifest.json"
+
+# Exit status
+EXIT_VALID = 0      # every script passed
+EXIT_INVALID = 1    # at least one script has validation errors
+EXIT_FAILURE = 2    # a script could not be read, or nothing to validate
+
+_EPISODE_DIR_RE = re.compile(r"ep_?(\d+)", re.IGNORECASE)
+_VALIDATOR_SOURCES = ("ssml_parser.py", "ssml_validator.py")
+
+
+def season_episodes(seasons: Iterable[int], master_path: str = EPISODES_MASTER_PATH) -> List[int]:
+    """Episode numbers of the given seasons, from episodes_master.json"""
+    with open(master_path, 'r', encoding='utf-8') as f:
+        master = json.load(f)
+    wanted = set(seasons)
+    return [episode["episode_number"] for season in master["seasons"] if season["season_number"] in wanted
+            for episode in season["episodes"]]
+
+
+def discover_scripts(production_dir: str = PRODUCTION_DIR,
+                     episodes: Optional[Iterable[int]] = None) -> List[Tuple[Optional[int], str]]:
+    """
+    Episode SSML scripts under the production directory
+
+    Scripts live at ``ep_<number>*/script/*.ssml``.
+
+    Args:
+        production_dir: Directory holding one folder per episode
+        episodes: Only these episode numbers (default: all)
+
+    Returns:
+        (episode number, script path) pairs sorted by episode
+    """
+    wanted = set(episodes) if episodes is not None else None
+    scripts = []
+    for path in glob.glob(os.path.join(production_dir, "*", "script", "*.ssml")):
+        match = _EPISODE_DIR_RE.match(os.path.basename(os.path.dirname(os.path.dirname(path))))
+        episode = int(match.group(1)) if match else None
+        if wanted is None or episode in wanted:
+            scripts.append((episode, path))
+    return sorted(scripts, key=lambda item: (item[0] is None, item[0] or 0, item[1]))
+
+
+def validator_fingerprint(model: Optional[str] = None) -> str:
+    """Hash of the validator's source and model profile, so rule changes invalidate the manifest"""
+    digest = hashlib.sha256(str(model).encode())
+    paths = [os.path.join(os.path.dirname(os.path.abspath(__file__)), name) for name in _VALIDATOR_SOURCES]
+    for path in paths + ([TTS_MODELS_PATH] if model else []):
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def validate_script(path: str, model: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Validate one script (runs in a worker process)
+
+    Args:
+        path: Script file
+        model: TTS model whose provider rules apply
+
+    Returns:
+        Validation summary with the script's content hash
+    """
+    started = time.perf_counter()
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+        result = SSMLValidator(model).validate_ssml_structure(raw.decode('utf-8'))
+    except (OSError, UnicodeDecodeError) as e:
+        return {"status": "error", "errors": [f"Could not read script: {e}"], "warnings": [], "sha256": None}
+
+    statistics = result['statistics']
+    return {
+        "status": "valid" if result['valid'] else "invalid",
+        "errors": result['errors'],
+        "warnings": result['warnings'],
+        "sha256": hashlib.sha256(raw).hexdigest(),
+        "word_count": statistics.get('word_count'),
+        "estimated_minutes": round(statistics.get('estimated_duration_minutes', 0)
+                                   + statistics.get('total_break_time_minutes', 0), 2),
+        "seconds": round(time.perf_counter() - started, 4)
+    }
+
+
+def _load_manifest(manifest_path: Optional[str], fingerprint: str) -> Dict[str, Dict[str, Any]]:
+    if not manifest_path or not os.path.exists(manifest_path):
+        return {}
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest.get("scripts", {}) if manifest.get("validator") == fingerprint else {}
+
+
+def _save_manifest(manifest_path: str, fingerprint: str, scripts: Dict[str, Dict[str, Any]]) -> None:
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"validator": fingerprint, "scripts": scripts}, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+
+def run_batch(scripts: List[Tuple[Optional[int], str]], manifest_path: Optional[str] = None,
+              workers: Optional[int] = None, force: bool = False, out: IO[str] = sys.stdout,
+              model: Optional[str] = None) -> int:
+    """
+    Validate scripts in parallel and stream one JSON line per script
+
+    Scripts whose content hash matches the manifest (and were checked by the
+    same validator version) are not revalidated; their recorded result is
+    re-emitted with ``"cached": true``. A final ``{"summary": ...}`` line
+    closes the stream.
+
+    Args:
+        scripts: (episode number, path) pairs
+        manifest_path: Hash manifest to read and update (None disables skipping)
+        workers: Worker processes (default: CPU count)
+        force: Revalidate even unchanged scripts
+        out: Stream for the JSON lines
+        model: TTS model whose provider rules apply (see tts_models.json)
+
+    Returns:
+        EXIT_VALID, EXIT_INVALID or EXIT_FAILURE
+    """
+    started = time.perf_counter()
+    fingerprint = validator_fingerprint(model)
+    previous = {} if force else _load_manifest(manifest_path, fingerprint)
+    manifest: Dict[str, Dict[str, Any]] = {}
+    counts = {"valid": 0, "invalid": 0, "error": 0, "cached": 0}
+
+    def emit(episode, path, record, cached):
+        counts[record["status"]] += 1
+        counts["cached"] += cached
+        line = {"script": path, "episode": episode, "cached": cached}
+        line.update(record)
+        out.write(json.dumps(line) + "\n")
+        out.flush()
+
+    pending = []
+    for episode, path in scripts:
+        key = os.path.relpath(path, os.path.dirname(manifest_path)) if manifest_path else path
+        try:
+            with open(path, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            digest = None
+        entry = previous.get(key)
+        if digest is not None and entry is not None and entry.get("sha256") == digest:
+            manifest[key] = entry
+            emit(episode, path, entry, True)
+        else:
+            pending.append((episode, path, key))
+
+    def record_result(episode, path, key, record):
+        if record["status"] != "error":
+            manifest[key] = record
+        emit(episode, path, record, False)
+
+    if len(pending) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(validate_script, path, model): (episode, path, key)
+                       for episode, path, key in pending}
+            for future in as_completed(futures):
+                record_result(*futures[future], future.result())
+    else:
+        for episode, path, key in pending:
+            record_result(episode, path, key, validate_script(path, model))
+
+    if manifest_path:
+        _save_manifest(manifest_path, fingerprint, manifest)
+
+    if counts["error"] or not scripts:
+        status = EXIT_FAILURE
+    elif counts["invalid"]:
+        status = EXIT_INVALID
+    else:
+        status = EXIT_VALID
+    out.write(json.dumps({"summary": dict(counts, scripts=len(scripts), exit_status=status,
+                                          seconds=round(time.perf_counter() - started, 3))}) + "\n")
+    out.flush()
+    return status
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point for CI and pre-synthesis gates"""
+    parser = argparse.ArgumentParser(description="Validate episode SSML scripts in parallel (JSON lines on stdout)")
+    parser.add_argument("scripts", nargs="*", help="Script files (default: discover under --production-dir)")
+    parser.add_argument("--season", type=int, action="append", help="Only episodes of this season (repeatable)")
+    parser.add_argument("--production-dir", default=PRODUCTION_DIR)
+    parser.add_argument("--manifest", help=f"Hash manifest (default: <production-dir>/{MANIFEST_NAME})")
+    parser.add_argument("--no-manifest", action="store_true", help="Validate everything and record nothing")
+    parser.add_argument("--force", action="store_true", help="Revalidate unchanged scripts")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--model", help="TTS model whose limits and supported tags are checked")
+    args = parser.parse_args(argv)
+
+    if args.model:
+        try:
+            SSMLValidator(args.model)
+        except ValueError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return EXIT_FAILURE
+
+    if args.scripts:
+        scripts = [(None, path) for path in args.scripts]
+    else:
+        episodes = season_episodes(args.season) if args.season else None
+        scripts = discover_scripts(args.production_dir, episodes)
+
+    manifest_path = None if args.no_manifest else (args.manifest or os.path.join(args.production_dir, MANIFEST_NAME))
+    status = run_batch(scripts, manifest_path, args.workers, args.force, model=args.model)
+    if not scripts:
+        print("❌ No scripts found to validate", file=sys.stderr)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
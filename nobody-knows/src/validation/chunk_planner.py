@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+TTS Chunk Planner
+Chooses the chunk partition and model that minimize synthesis cost plus wall-clock time.
+"""
+
+import heapq
+import json
+import sys
+from functools import lru_cache
+from typing import AbstractSet, Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from ssml_chunker import SSMLChunk, SSMLDocument, pack_chunks
+from ssml_parser import EMPTY, START, tokenize_ssml
+from ssml_validator import TTS_MODELS_PATH
+
+LIMIT_GROWTH = 1.25  # ratio between consecutive candidate chunk limits
+
+
+class SynthesisPlan(NamedTuple):
+    """A chunk partition and model, with its predicted cost and duration"""
+    model: str
+    max_chars: int
+    chunks: List[SSMLChunk]
+    billed_characters: int
+    cost: float                    # USD
+    wall_clock_seconds: float
+    objective: float               # cost + time_cost_per_minute * wall-clock minutes
+    price_per_1k_characters: float
+    alternatives: Tuple[Dict[str, Any], ...] = ()   # best plan of every other model considered
+    ignored_tags: Tuple[str, ...] = ()              # script tags the model does not support
+
+
+@lru_cache(maxsize=None)
+def _load_models_config(models_path: str) -> Dict[str, Any]:
+    """tts_models.json, read once per path (callers must not mutate it)"""
+    with open(models_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_planning_config(models_path: str = TTS_MODELS_PATH) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Planner defaults and model profiles (pricing, limits, latency) from tts_models.json"""
+    config = _load_models_config(models_path)
+    return config["planning"], config["models"]
+
+
+def load_default_model(models_path: str = TTS_MODELS_PATH) -> Tuple[str, Dict[str, Any]]:
+    """The configured default model and its profile"""
+    config = _load_models_config(models_path)
+    return config["default_model"], config["models"][config["default_model"]]
+
+
+def ssml_tags(ssml_text: str) -> AbstractSet[str]:
+    """Element names used in an SSML script"""
+    return frozenset(event.name for event in tokenize_ssml(ssml_text) if event.kind in (START, EMPTY))
+
+
+def ignored_tags(tags: AbstractSet[str], profile: Dict[str, Any]) -> Tuple[str, ...]:
+    """Tags of a script that a model would ignore"""
+    return tuple(sorted(set(tags) - set(profile["supported_tags"])))
+
+
+def request_seconds(profile: Dict[str, Any], characters: int) -> float:
+    """Predicted latency of one request of ``characters``"""
+    return profile["request_overhead_seconds"] + profile["seconds_per_1k_characters"] * characters / 1000
+
+
+def fit_latency(samples: Sequence[Tuple[int, float]]) -> Optional[Dict[str, float]]:
+    """
+    Least-squares fit of request latency against request size
+
+    Args:
+        samples: (characters, seconds) of completed requests
+
+    Returns:
+        Latency profile fields, or None with fewer than two distinct sizes
+    """
+    if len({characters for characters, _ in samples}) < 2:
+        return None
+    count = len(samples)
+    mean_x = sum(characters for characters, _ in samples) / count
+    mean_y = sum(seconds for _, seconds in samples) / count
+    spread = sum((characters - mean_x) ** 2 for characters, _ in samples)
+    slope = sum((characters - mean_x) * (seconds - mean_y) for characters, seconds in samples) / spread
+    slope = max(slope, 0.0)
+    return {
+        "request_overhead_seconds": max(mean_y - slope * mean_x, 0.0),
+        "seconds_per_1k_characters": slope * 1000
+    }
+
+
+def measured_latency(log_paths: Iterable[str], default_model: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Latency profiles fitted from synthesis logs
+
+    Uses the ``characters`` and ``request_seconds`` of every chunk that was
+    actually synthesized (cache hits are skipped).
+
+    Args:
+        log_paths: Synthesis log JSON files written by ElevenLabsDirectAPI
+        default_model: Model of logs that do not record one
+
+    Returns:
+        Fitted latency fields per model, for models with enough samples
+    """
+    samples: Dict[str, List[Tuple[int, float]]] = {}
+    for path in log_paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                log = json.load(f)
+        except (OSError, ValueError):
+            continue
+        model = log.get("model_id", default_model)
+        for record in log.get("audio_files", []):
+            if model and not record.get("cached") and record.get("request_seconds"):
+                samples.setdefault(model, []).append((record["characters"], record["request_seconds"]))
+
+    fitted = {model: fit_latency(points) for model, points in samples.items()}
+    return {model: profile for model, profile in fitted.items() if profile is not None}
+
+
+def wall_clock_seconds(latencies: Sequence[float], concurrency: int,
+                       requests_per_second: Optional[float] = None, burst: int = 1) -> float:
+    """
+    Makespan of requests submitted in order to ``concurrency`` workers
+
+    Each request starts when a worker is free and, with a rate limit, no
+    earlier than the token bucket (``burst`` requests back to back, then
+    ``requests_per_second``) grants it.
+    """
+    workers = [0.0] * max(concurrency, 1)
+    finish = 0.0
+    for index, latency in enumerate(latencies):
+        start = heapq.heappop(workers)
+        if requests_per_second:
+            start = max(start, (index - max(burst, 1) + 1) / requests_per_second)
+        heapq.heappush(workers, start + latency)
+        finish = max(finish, start + latency)
+    return finish
+
+
+def estimate(sizes: Sequence[int], profile: Dict[str, Any], concurrency: int,
+             requests_per_second: Optional[float], time_cost_per_minute: float,
+             burst: int = 1) -> Tuple[float, float, float]:
+    """
+    Cost, wall-clock time and objective of synthesizing requests of the given sizes
+
+    Returns:
+        (cost in USD, wall-clock seconds, cost + time_cost_per_minute * minutes)
+    """
+    cost = (sum(sizes) / 1000 * profile["price_per_1k_characters"]
+            + len(sizes) * profile.get("price_per_request", 0.0))
+    seconds = wall_clock_seconds([request_seconds(profile, size) for size in sizes],
+                                 concurrency, requests_per_second, burst)
+    return cost, seconds, cost + time_cost_per_minute * seconds / 60
+
+
+def candidate_limits(max_characters: int, min_characters: int) -> List[int]:
+    """Chunk-size limits to try: a geometric series up to the model's maximum"""
+    limits = []
+    limit = float(min(min_characters, max_characters))
+    while limit < max_characters:
+        limits.append(int(limit))
+        limit *= LIMIT_GROWTH
+    limits.append(max_characters)
+    return limits
+
+
+def _model_profiles(models: Optional[Sequence[str]], planning: Dict[str, Any], profiles: Dict[str, Any],
+                    latency_overrides: Optional[Dict[str, Dict[str, float]]]) -> List[Tuple[str, Dict[str, Any]]]:
+    selected = []
+    for model in models or planning["models"]:
+        if model not in profiles:
+            raise ValueError(f"Unknown TTS model '{model}'. Known: {sorted(profiles)}")
+        profile = dict(profiles[model])
+        profile.update((latency_overrides or {}).get(model, {}))
+        selected.append((model, profile))
+    return selected
+
+
+def _schedule(planning: Dict[str, Any], concurrency: Optional[int], requests_per_second: Optional[float],
+              burst: Optional[int], time_cost_per_minute: Optional[float]) -> Dict[str, Any]:
+    """Scheduling arguments for estimate(), falling back to the planning config"""
+    return {
+        "concurrency": concurrency or planning["concurrency"],
+        "requests_per_second": planning["requests_per_second"] if requests_per_second is None else requests_per_second,
+        "burst": burst or planning["burst"],
+        "time_cost_per_minute": planning["time_cost_per_minute"] if time_cost_per_minute is None else time_cost_per_minute
+    }
+
+
+def choose_model(sizes: Sequence[int], models: Optional[Sequence[str]] = None,
+                 concurrency: Optional[int] = None, requests_per_second: Optional[float] = None,
+                 burst: Optional[int] = None, time_cost_per_minute: Optional[float] = None,
+                 models_path: str = TTS_MODELS_PATH,
+                 latency_overrides: Optional[Dict[str, Dict[str, float]]] = None,
+                 tags: AbstractSet[str] = frozenset()) -> Optional[Dict[str, Any]]:
+    """
+    Best model for a fixed set of requests
+
+    Models that ignore fewer of ``tags`` win; the objective breaks ties.
+
+    Args:
+        sizes: Characters of each request
+        models: Candidate models (default: the planning config's list)
+        tags: Element names the script uses (see ssml_tags)
+
+    Returns:
+        {"model", "cost", "wall_clock_seconds", "objective", "ignored_tags"},
+        or None if no model accepts the largest request
+    """
+    planning, profiles = load_planning_config(models_path)
+    schedule = _schedule(planning, concurrency, requests_per_second, burst, time_cost_per_minute)
+    best = None
+    for model, profile in _model_profiles(models, planning, profiles, latency_overrides):
+        if max(sizes, default=0) > profile["max_characters"]:
+            continue
+        cost, seconds, objective = estimate(sizes, profile, **schedule)
+        ignored = ignored_tags(tags, profile)
+        if best is None or (len(ignored), objective) < (len(best["ignored_tags"]), best["objective"]):
+            best = {"model": model, "cost": cost, "wall_clock_seconds": seconds, "objective": objective,
+                    "ignored_tags": list(ignored)}
+    return best
+
+
+def plan_synthesis(ssml_text: str, models: Optional[Sequence[str]] = None, max_chars: Optional[int] = None,
+                   concurrency: Optional[int] = None, requests_per_second: Optional[float] = None,
+                   burst: Optional[int] = None, time_cost_per_minute: Optional[float] = None,
+                   max_requests: Optional[int] = None, models_path: str = TTS_MODELS_PATH,
+                   latency_overrides: Optional[Dict[str, Dict[str, float]]] = None) -> SynthesisPlan:
+    """
+    Choose the chunk partition and model with the lowest cost plus wall-clock time
+
+    For every candidate model and chunk-size limit, the script is packed
+    with the structure-aware chunker and the partition is priced (billed
+    characters include each chunk's wrapper and re-opened tags, plus any
+    per-request price) and timed (requests of predicted latency scheduled
+    on ``concurrency`` workers under the rate limit). Smaller chunks
+    parallelize better but bill more markup; the objective weighs the two.
+    Models are ranked first by how many of the script's tags they ignore
+    (per their supported_tags), so a script with <phoneme> goes to a model
+    that pronounces it.
+
+    Args:
+        ssml_text: SSML script
+        models: Candidate models (default: the planning config's list)
+        max_chars: Evaluate only this chunk-size limit instead of searching
+        concurrency: Parallel requests (default: planning config)
+        requests_per_second: Request rate limit (default: planning config)
+        burst: Requests allowed back to back before the rate limit applies (default: planning config)
+        time_cost_per_minute: USD value of a minute of wall-clock time (default: planning config)
+        max_requests: Only partitions with at most this many chunks
+        models_path: Model profiles file
+        latency_overrides: Measured latency fields per model (see measured_latency)
+
+    Returns:
+        The best plan, with the best plan of each other model as alternatives
+        (ranked the same way)
+
+    Raises:
+        ValueError: Malformed SSML, or no candidate model can synthesize the
+            script within its limits
+    """
+    planning, profiles = load_planning_config(models_path)
+    schedule = _schedule(planning, concurrency, requests_per_second, burst, time_cost_per_minute)
+
+    document = SSMLDocument(ssml_text)
+    tags = ssml_tags(ssml_text)
+    best_per_model: List[SynthesisPlan] = []
+    for model, profile in _model_profiles(models, planning, profiles, latency_overrides):
+        if max_chars:
+            limits = [max_chars] if max_chars <= profile["max_characters"] else []
+        else:
+            limits = candidate_limits(profile["max_characters"], planning["min_chunk_characters"])
+
+        best, previous_sizes = None, None
+        for limit in limits:
+            try:
+                chunks = pack_chunks(document, limit)
+            except ValueError:
+                continue  # a word or unsplittable element is longer than this limit
+            if not chunks or (max_requests and len(chunks) > max_requests):
+                continue
+            sizes = [chunk.size for chunk in chunks]
+            if sizes == previous_sizes:
+                continue
+            previous_sizes = sizes
+            cost, seconds, objective = estimate(sizes, profile, **schedule)
+            if best is None or objective < best.objective:
+                best = SynthesisPlan(model, limit, chunks, sum(sizes), cost, seconds, objective,
+                                     profile["price_per_1k_characters"],
+                                     ignored_tags=ignored_tags(tags, profile))
+        if best is not None:
+            best_per_model.append(best)
+
+    if not best_per_model:
+        raise ValueError("No candidate model can synthesize this script within its limits")
+    best_per_model.sort(key=lambda plan: (len(plan.ignored_tags), plan.objective))
+    chosen = best_per_model[0]
+    return chosen._replace(alternatives=tuple(plan_summary(plan) for plan in best_per_model[1:]))
+
+
+def plan_summary(plan: SynthesisPlan) -> Dict[str, Any]:
+    """JSON-ready summary of a plan (without chunk contents)"""
+    sizes = [chunk.size for chunk in plan.chunks]
+    return {
+        "model": plan.model,
+        "max_chars": plan.max_chars,
+        "chunks": len(plan.chunks),
+        "smallest_chunk": min(sizes, default=0),
+        "largest_chunk": max(sizes, default=0),
+        "billed_characters": plan.billed_characters,
+        "price_per_1k_characters": plan.price_per_1k_characters,
+        "cost": round(plan.cost, 4),
+        "wall_clock_seconds": round(plan.wall_clock_seconds, 2),
+        "objective": round(plan.objective, 4),
+        "ignored_tags": list(plan.ignored_tags),
+        "alternatives": list(plan.alternatives)
+    }
+
+
+def print_plan(plan: SynthesisPlan) -> None:
+    """Report a plan before any request is sent"""
+    summary = plan_summary(plan)
+    print(f"🧭 Synthesis plan: {summary['model']}, {summary['chunks']} chunks "
+          f"({summary['smallest_chunk']}-{summary['largest_chunk']} chars, limit {summary['max_chars']})")
+    print(f"   Billed: {summary['billed_characters']:,} chars | Cost: ${summary['cost']:.2f} | "
+          f"Wall clock: {summary['wall_clock_seconds']:.1f}s")
+    if summary["ignored_tags"]:
+        print(f"   ⚠️ {summary['model']} ignores: " + ", ".join(f"<{tag}>" for tag in summary["ignored_tags"]))
+    for alternative in summary["alternatives"]:
+        print(f"   vs {alternative['model']}: {alternative['chunks']} chunks, ${alternative['cost']:.2f}, "
+              f"{alternative['wall_clock_seconds']:.1f}s")
+
+
+def main():
+    """Plan synthesis of one script"""
+    print("🧭 TTS Chunk Planner")
+    print("=" * 60)
+
+    script_path = sys.argv[1] if len(sys.argv) > 1 else "nobody-knows/production/ep_001_test/script/tts_optimized_script.ssml"
+    try:
+        with open(script_path, 'r', encoding='utf-8') as f:
+            script_content = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"❌ Error reading script: {e}")
+        return
+
+    try:
+        plan = plan_synthesis(script_content)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    print_plan(plan)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+SSML Validation Benchmark
+Times the single-pass SSMLValidator against the previous regex-per-rule validator on the reference scripts.
+"""
+
+import contextlib
+import glob
+import io
+import os
+import random
+import re
+import sys
+import time
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, List, Optional
+
+from ssml_incremental import IncrementalSSMLValidator
+from ssml_validator import SSMLValidator
+
+REFERENCE_SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "content", "reference-scripts")
+
+
+class MultipassSSMLValidator(SSMLValidator):
+    """
+    The pre-tokenizer validator, kept as the benchmark baseline
+
+    Parses with ElementTree and then rescans the whole document with a
+    separate regex pass per rule.
+    """
+
+    def validate_ssml_structure(self, ssml_text: str) -> Dict[str, Any]:
+        self.validation_errors = []
+        self.validation_warnings = []
+        self._validate_xml_structure(ssml_text)
+        self._validate_ssml_tags(ssml_text)
+        self._validate_prosody_attributes(ssml_text)
+        self._validate_break_tags(ssml_text)
+        self._validate_emphasis_tags(ssml_text)
+        self._validate_phoneme_tags(ssml_text)
+        self._validate_tag_nesting(ssml_text)
+        self._validate_content_balance(ssml_text)
+        return {
+            'valid': not self.validation_errors,
+            'errors': self.validation_errors,
+            'warnings': self.validation_warnings,
+            'statistics': self._generate_statistics(ssml_text)
+        }
+
+    def _validate_xml_structure(self, ssml_text: str) -> None:
+        """Validate basic XML structure"""
+        try:
+            # Check for XML declaration
+            if not ssml_text.strip().startswith('<?xml'):
+                self.validation_warnings.append("Missing XML declaration")
+
+            # Check for root <speak> tags
+            if '<speak>' not in ssml_text or '</speak>' not in ssml_text:
+                self.validation_errors.append("Missing required <speak> root tags")
+
+            # Basic XML parsing attempt
+            # Clean version without XML declaration for ET parsing
+            clean_ssml = re.sub(r'<\?xml.*?\?>', '', ssml_text, flags=re.DOTALL).strip()
+
+            # Try parsing to check well-formedness
+            try:
+                ET.fromstring(clean_ssml)
+            except ET.ParseError as e:
+                self.validation_errors.append(f"XML parsing error: {str(e)}")
+
+        except Exception as e:
+            self.validation_errors.append(f"XML structure validation failed: {str(e)}")
+
+    def _validate_ssml_tags(self, ssml_text: str) -> None:
+        """Validate SSML-specific tags"""
+        # Find all SSML tags
+        ssml_tags = re.findall(r'<(/?)([a-zA-Z][a-zA-Z0-9]*)', ssml_text)
+
+        valid_ssml_tags = {'speak', 'prosody', 'break', 'emphasis', 'phoneme', 'say-as', 'audio', 'mark', 'p', 's', 'voice'}
+
+        for is_closing, tag_name in ssml_tags:
+            if tag_name not in valid_ssml_tags:
+                self.validation_warnings.append(f"Unknown SSML tag: <{tag_name}>")
+
+    def _validate_prosody_attributes(self, ssml_text: str) -> None:
+        """Validate prosody tag attributes"""
+        prosody_tags = re.findall(r'<prosody([^>]*)>', ssml_text)
+
+        for attributes in prosody_tags:
+            attr_matches = re.findall(r'(\w+)=["\']([^"\']*)["\']', attributes)
+
+            for attr_name, attr_value in attr_matches:
+                if attr_name in self.valid_prosody_attrs:
+                    valid_values = self.valid_prosody_attrs[attr_name]
+                    if attr_value not in valid_values:
+                        # Check if it's a relative value (like +20% or -10%)
+                        if not re.match(r'[+-]\d+(\.\d+)?%?|[+-]?\d+(\.\d+)?(Hz|st)', attr_value):
+                            self.validation_warnings.append(
+                                f"Prosody {attr_name}='{attr_value}' not in standard values: {valid_values}"
+                            )
+                else:
+                    self.validation_warnings.append(f"Unknown prosody attribute: {attr_name}")
+
+    def _validate_break_tags(self, ssml_text: str) -> None:
+        """Validate break tag syntax and values"""
+        break_tags = re.findall(r'<break([^>]*)/?>', ssml_text)
+
+        for attributes in break_tags:
+            if 'time=' in attributes:
+                time_match = re.search(r'time=["\']([^"\']*)["\']', attributes)
+                if time_match:
+                    time_value = time_match.group(1)
+                    # Validate time format (e.g., "500ms", "2s", "1.5s")
+                    if not re.match(r'\d+(\.\d+)?(ms|s)', time_value):
+                        self.validation_errors.append(f"Invalid break time format: '{time_value}'")
+
+    def _validate_emphasis_tags(self, ssml_text: str) -> None:
+        """Validate emphasis tag levels"""
+        emphasis_tags = re.findall(r'<emphasis([^>]*)>', ssml_text)
+
+        for attributes in emphasis_tags:
+            if 'level=' in attributes:
+                level_match = re.search(r'level=["\']([^"\']*)["\']', attributes)
+                if level_match:
+                    level_value = level_match.group(1)
+                    if level_value not in self.valid_emphasis_levels:
+                        self.validation_errors.append(
+                            f"Invalid emphasis level '{level_value}'. Valid: {self.valid_emphasis_levels}"
+                        )
+
+    def _validate_phoneme_tags(self, ssml_text: str) -> None:
+        """Validate phoneme pronunciation tags"""
+        phoneme_tags = re.findall(r'<phoneme([^>]*)>', ssml_text)
+
+        for attributes in phoneme_tags:
+            # Check for required alphabet attribute
+            if 'alphabet=' not in attributes:
+                self.validation_errors.append("Phoneme tag missing required 'alphabet' attribute")
+
+            # Check for required ph attribute
+            if 'ph=' not in attributes:
+                self.validation_errors.append("Phoneme tag missing required 'ph' attribute")
+
+            # Validate alphabet type
+            alphabet_match = re.search(r'alphabet=["\']([^"\']*)["\']', attributes)
+            if alphabet_match:
+                alphabet = alphabet_match.group(1)
+                if alphabet not in ['ipa', 'x-sampa', 'x-amazon-pron']:
+                    self.validation_warnings.append(f"Unknown phoneme alphabet: '{alphabet}'")
+
+    def _validate_tag_nesting(self, ssml_text: str) -> None:
+        """Validate proper SSML tag nesting"""
+        # This is a simplified nesting check
+        # Remove self-closing tags first
+        text_no_self_closing = re.sub(r'<[^>]+/>', '', ssml_text)
+
+        # Find all opening and closing tags
+        tags = re.findall(r'<(/?)([a-zA-Z][a-zA-Z0-9]*)', text_no_self_closing)
+
+        stack = []
+        for is_closing, tag_name in tags:
+            if not is_closing:  # Opening tag
+                stack.append(tag_name)
+            else:  # Closing tag
+                if not stack:
+                    self.validation_errors.append(f"Closing tag </{tag_name}> without matching opening tag")
+                elif stack[-1] != tag_name:
+                    self.validation_warnings.append(f"Tag nesting issue: expected </{stack[-1]}>, found </{tag_name}>")
+                else:
+                    stack.pop()
+
+        # Check for unclosed tags
+        if stack:
+            for tag in stack:
+                self.validation_errors.append(f"Unclosed tag: <{tag}>")
+
+    def _validate_content_balance(self, ssml_text: str) -> None:
+        """Validate content balance and optimization"""
+        # Remove all markup to get plain text
+        plain_text = re.sub(r'<[^>]*>', '', ssml_text)
+        plain_text = re.sub(r'<!--.*?-->', '', plain_text, flags=re.DOTALL)
+        plain_text = plain_text.strip()
+
+        # Calculate ratios
+        total_length = len(ssml_text)
+        markup_length = total_length - len(plain_text)
+        content_length = len(plain_text)
+
+        if content_length == 0:
+            self.validation_errors.append("No actual content found in SSML")
+            return
+
+        markup_ratio = (markup_length / total_length) * 100
+
+        # Warn if markup is too heavy
+        if markup_ratio > 50:
+            self.validation_warnings.append(f"High markup ratio: {markup_ratio:.1f}% (consider simplifying)")
+        elif markup_ratio > 40:
+            self.validation_warnings.append(f"Moderate markup ratio: {markup_ratio:.1f}%")
+
+    def _generate_statistics(self, ssml_text: str) -> Dict[str, Any]:
+        """Generate comprehensive SSML statistics"""
+        stats = {
+            'total_characters': len(ssml_text),
+            'prosody_tags': len(re.findall(r'<prosody', ssml_text)),
+            'break_tags': len(re.findall(r'<break', ssml_text)),
+            'emphasis_tags': len(re.findall(r'<emphasis', ssml_text)),
+            'phoneme_tags': len(re.findall(r'<phoneme', ssml_text)),
+            'comment_blocks': len(re.findall(r'<!--.*?-->', ssml_text, flags=re.DOTALL)),
+        }
+
+        # Calculate plain text
+        plain_text = re.sub(r'<[^>]*>', '', ssml_text)
+        plain_text = re.sub(r'<!--.*?-->', '', plain_text, flags=re.DOTALL).strip()
+
+        stats['plain_text_characters'] = len(plain_text)
+        stats['markup_characters'] = stats['total_characters'] - stats['plain_text_characters']
+        stats['markup_percentage'] = (stats['markup_characters'] / stats['total_characters']) * 100
+
+        # Estimate speech duration (using empirically validated 206 WPM from Episode 1)
+        word_count = len(plain_text.split())
+        stats['word_count'] = word_count
+        stats['estimated_duration_minutes'] = word_count / 206  # Episode 1 empirical rate
+
+        # Break analysis
+        break_times = re.findall(r'<break time=["\']([^"\']*)["\']', ssml_text)
+        total_break_time = 0
+        for break_time in break_times:
+            if break_time.endswith('s'):
+                total_break_time += float(break_time[:-1])
+            elif break_time.endswith('ms'):
+                total_break_time += float(break_time[:-2]) / 1000
+
+        stats['total_break_time_seconds'] = total_break_time
+        stats['total_break_time_minutes'] = total_break_time / 60
+
+        return stats
+
+
+
+def reference_script_ssml(markdown: str, sentences: bool = False) -> str:
+    """
+    Wrap a reference script's paragraphs in <p> elements inside a <speak> document
+
+    With ``sentences`` every sentence is also wrapped in <s><prosody>, giving
+    the markup density of a fully formatted TTS script.
+    """
+    paragraphs = [re.sub(r'^#+\s*', '', block.strip()).replace('&', '&amp;')
+                  for block in re.split(r'\n\s*\n', markdown)]
+    if sentences:
+        paragraphs = ["".join(f'<s><prosody rate="medium">{sentence}</prosody></s>'
+                              for sentence in re.split(r'(?<=[.!?])\s+', paragraph))
+                      for paragraph in paragraphs if paragraph]
+    body = "\n".join(f"<p>{paragraph}</p>" for paragraph in paragraphs if paragraph)
+    return f'<?xml version="1.0"?>\n<speak>\n{body}\n</speak>\n'
+
+
+def _best_time(validator: SSMLValidator, ssml_text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            validator.validate_ssml_structure(ssml_text)
+            best = min(best, time.perf_counter() - started)
+    return best
+
+
+def benchmark_reference_scripts(paths: Optional[List[str]] = None, repeat: int = 20,
+                                sentences: bool = False) -> Dict[str, Any]:
+    """
+    Time both validators on each reference script
+
+    Args:
+        paths: Markdown scripts (default: every reference script)
+        repeat: Runs per script; the best time is kept
+        sentences: Use sentence-level markup (see reference_script_ssml)
+
+    Returns:
+        Per-script timings and the overall speedup
+    """
+    paths = paths or sorted(glob.glob(os.path.join(REFERENCE_SCRIPTS_DIR, "*.md")))
+    single_pass, multipass = SSMLValidator(), MultipassSSMLValidator()
+
+    scripts = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            ssml_text = reference_script_ssml(f.read(), sentences)
+        single_seconds = _best_time(single_pass, ssml_text, repeat)
+        multipass_seconds = _best_time(multipass, ssml_text, repeat)
+        scripts.append({
+            "script": os.path.basename(path),
+            "characters": len(ssml_text),
+            "single_pass_ms": round(single_seconds * 1000, 3),
+            "multipass_ms": round(multipass_seconds * 1000, 3),
+            "speedup": round(multipass_seconds / single_seconds, 2) if single_seconds else None
+        })
+
+    single_total = sum(script["single_pass_ms"] for script in scripts)
+    multipass_total = sum(script["multipass_ms"] for script in scripts)
+    return {
+        "markup": "sentences" if sentences else "paragraphs",
+        "scripts": scripts,
+        "single_pass_total_ms": round(single_total, 3),
+        "multipass_total_ms": round(multipass_total, 3),
+        "speedup": round(multipass_total / single_total, 2) if single_total else None
+    }
+
+
+def benchmark_edit_loop(path: Optional[str] = None, edits: int = 200, seed: int = 0) -> Dict[str, Any]:
+    """
+    Time an edit-validate loop: insert a word into a random sentence, then revalidate
+
+    Args:
+        path: Markdown script (default: the first reference script), with sentence-level markup
+        edits: Number of edits
+        seed: Random seed for edit positions
+
+    Returns:
+        Mean milliseconds per validation for full and incremental validation
+    """
+    path = path or sorted(glob.glob(os.path.join(REFERENCE_SCRIPTS_DIR, "*.md")))[0]
+    with open(path, 'r', encoding='utf-8') as f:
+        ssml_text = reference_script_ssml(f.read(), sentences=True)
+
+    rng = random.Random(seed)
+    documents = []
+    for _ in range(edits):
+        position = ssml_text.index('</s>', rng.randrange(len(ssml_text) // 2))
+        ssml_text = ssml_text[:position] + ' really' + ssml_text[position:]
+        documents.append(ssml_text)
+
+    timings = {}
+    for label, validator in (("full", SSMLValidator()), ("incremental", IncrementalSSMLValidator())):
+        with contextlib.redirect_stdout(io.StringIO()):
+            validator.validate_ssml_structure(documents[0])
+            started = time.perf_counter()
+            for document in documents:
+                validator.validate_ssml_structure(document)
+            timings[label] = (time.perf_counter() - started) / edits * 1000
+
+    return {
+        "script": os.path.basename(path),
+        "edits": edits,
+        "full_ms_per_edit": round(timings["full"], 3),
+        "incremental_ms_per_edit": round(timings["incremental"], 3),
+        "speedup": round(timings["full"] / timings["incremental"], 2)
+    }
+
+
+def profile_rules(paths: Optional[List[str]] = None, model: Optional[str] = "eleven_turbo_v2_5",
+                  repeat: int = 20) -> Dict[str, Any]:
+    """
+    Time spent in each validation rule over the reference scripts (sentence markup)
+
+    Args:
+        paths: Markdown scripts (default: every reference script)
+        model: TTS model whose provider rules are enabled too
+        repeat: Runs per script
+
+    Returns:
+        Milliseconds per rule (summed over scripts, averaged over runs), slowest first
+    """
+    paths = paths or sorted(glob.glob(os.path.join(REFERENCE_SCRIPTS_DIR, "*.md")))
+    validator = SSMLValidator(model=model, profile_rules=True)
+    totals: Dict[str, float] = {}
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            ssml_text = reference_script_ssml(f.read(), sentences=True)
+        for _ in range(repeat):
+            for name, seconds in validator.validate_ssml_structure(ssml_text)['rule_timings'].items():
+                totals[name] = totals.get(name, 0.0) + seconds
+
+    rules = {name: round(seconds / repeat * 1000, 3) for name, seconds in totals.items()}
+    return {"model": model, "rules_ms": dict(sorted(rules.items(), key=lambda item: -item[1]))}
+
+
+def main():
+    """Benchmark validation on the reference scripts, as authored and fully marked up"""
+    print("⏱️ SSML Validation Benchmark")
+    print("=" * 60)
+
+    for sentences in (False, True):
+        report = benchmark_reference_scripts(sys.argv[1:] or None, sentences=sentences)
+        print(f"\n📄 Markup: {report['markup']}")
+        for script in report["scripts"]:
+            print(f"   {script['script']}: {script['multipass_ms']:.2f}ms → {script['single_pass_ms']:.2f}ms "
+                  f"({script['speedup']}x)")
+        print(f"📊 Total: {report['multipass_total_ms']:.2f}ms → {report['single_pass_total_ms']:.2f}ms "
+              f"({report['speedup']}x faster)")
+
+    edit_loop = benchmark_edit_loop()
+    print(f"\n✏️ Edit loop ({edit_loop['script']}, {edit_loop['edits']} edits): "
+          f"{edit_loop['full_ms_per_edit']:.3f}ms full → {edit_loop['incremental_ms_per_edit']:.3f}ms incremental "
+          f"({edit_loop['speedup']}x)")
+
+    rule_profile = profile_rules()
+    print(f"\n🧮 Per-rule cost ({rule_profile['model']}):")
+    for name, milliseconds in rule_profile["rules_ms"].items():
+        print(f"   {name}: {milliseconds:.3f}ms")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
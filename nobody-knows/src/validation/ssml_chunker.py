@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Structure-Aware SSML Chunker
+Splits an SSML script into balanced synthesis chunks at the best-scoring boundaries.
+"""
+
+import re
+import sys
+from typing import List, NamedTuple, Optional, Tuple
+
+from ssml_parser import (CDATA, COMMENT, DECLARATION, DOCTYPE, EMPTY, END, INVALID, START, TEXT, tokenize_ssml,
+                         line_column)
+
+# Boundary kinds, best first; a chunk ending at a boundary pays its penalty
+PARAGRAPH = "paragraph"   # after </p>, a top-level element or a blank line
+SENTENCE = "sentence"     # after </s> or sentence-ending punctuation
+BREAK = "break"           # after <break/>
+WORD = "word"             # between words, only where a sentence cannot fit
+END_OF_SCRIPT = "end"
+BOUNDARY_PENALTIES = {PARAGRAPH: 0.0, SENTENCE: 1.0, BREAK: 2.0, WORD: 8.0, END_OF_SCRIPT: 0.0}
+
+# Elements that are never split: re-opening them would repeat or garble their content
+UNSPLITTABLE_TAGS = frozenset({'phoneme', 'say-as', 'sub', 'audio'})
+SPEAK_OPEN, SPEAK_CLOSE = "<speak>", "</speak>"
+
+_PARAGRAPH_BREAK_RE = re.compile(r"\n[ \t\r]*\n")
+_WHITESPACE_RE = re.compile(r"\s+")
+_SENTENCE_END_RE = re.compile(r"[.!?]+[\"')\]]* ")
+_SPACE_RE = re.compile(" ")
+
+
+class Boundary(NamedTuple):
+    """A place the script may be cut, in the normalized document"""
+    position: int
+    kind: str
+    open_tags: Tuple[Tuple[str, str], ...]   # (name, start tag) of elements open here, outermost first
+    open_length: int                         # characters to re-open them
+    close_length: int                        # characters to close them
+
+
+class SSMLChunk(NamedTuple):
+    """One synthesis request"""
+    content: str
+    size: int
+    boundary: str       # kind of boundary the chunk ends at
+
+
+class SSMLDocument:
+    """
+    An SSML script flattened for chunking
+
+    The body of <speak> is re-serialized with comments, declarations and
+    the DOCTYPE dropped and whitespace collapsed; every candidate boundary
+    records the elements open at that point, so a chunk between any two
+    boundaries can re-open them at its start and close what is still open
+    at its end.
+    """
+
+    def __init__(self, ssml_text: str):
+        self.text, self.boundaries, self._text_runs = self._flatten(ssml_text)
+
+    @staticmethod
+    def _flatten(ssml_text: str):
+        parts: List[str] = []
+        position = 0
+        stack: List[Tuple[str, str, int, int]] = []  # (name, start tag, open length, close length) cumulative
+        unsplittable = 0
+        boundaries: List[Boundary] = []
+        text_runs: List[Tuple[int, str, Boundary]] = []  # (start, text, boundary at its start)
+
+        def boundary_at(at: int, kind: str) -> Boundary:
+            return Boundary(at, kind, tuple((name, tag) for name, tag, _, _ in stack),
+                            stack[-1][2] if stack else 0, stack[-1][3] if stack else 0)
+
+        def add_boundary(kind: str, at: Optional[int] = None):
+            if unsplittable:
+                return
+            boundary = boundary_at(position if at is None else at, kind)
+            if boundaries and boundaries[-1].position == boundary.position:
+                if BOUNDARY_PENALTIES[kind] < BOUNDARY_PENALTIES[boundaries[-1].kind]:
+                    boundaries[-1] = boundary
+            else:
+                boundaries.append(boundary)
+
+        def emit(piece: str):
+            nonlocal position
+            parts.append(piece)
+            position += len(piece)
+
+        add_boundary(PARAGRAPH)
+        for event in tokenize_ssml(ssml_text):
+            kind, name = event.kind, event.name
+            if kind == COMMENT or kind == DECLARATION or kind == DOCTYPE:
+                continue
+            if kind == INVALID:
+                raise ValueError(f"Cannot chunk malformed SSML: invalid markup at "
+                                 f"{line_column(ssml_text, event.start)}")
+            if name == 'speak' and not stack and kind in (START, END):
+                continue  # the root is re-added around every chunk
+
+            if kind == TEXT:
+                for index, paragraph in enumerate(_PARAGRAPH_BREAK_RE.split(event.text)):
+                    if index:
+                        if parts and not parts[-1].endswith(" "):
+                            emit(" ")
+                        add_boundary(PARAGRAPH)
+                    run = _WHITESPACE_RE.sub(" ", paragraph)
+                    if run[:1] == " " and (not parts or parts[-1].endswith(" ")):
+                        run = run[1:]  # text runs separated only by a comment or the root tag
+                    if not run:
+                        continue
+                    start = position
+                    emit(run)
+                    if not unsplittable:
+                        text_runs.append((start, run, boundary_at(start, WORD)))
+                        for match in _SENTENCE_END_RE.finditer(run):
+                            add_boundary(SENTENCE, start + match.end())
+            elif kind == START:
+                open_length = (stack[-1][2] if stack else 0) + len(event.text)
+                close_length = (stack[-1][3] if stack else 0) + len(name) + 3
+                stack.append((name, event.text, open_length, close_length))
+                emit(event.text)
+                if name in UNSPLITTABLE_TAGS:
+                    unsplittable += 1
+            elif kind == END:
+                if not stack or stack[-1][0] != name:
+                    raise ValueError(f"Cannot chunk malformed SSML: unexpected </{name}> at "
+                                     f"{line_column(ssml_text, event.start)}")
+                stack.pop()
+                emit(event.text)
+                if name in UNSPLITTABLE_TAGS:
+                    unsplittable -= 1
+                elif name == 'p' or not stack:
+                    add_boundary(PARAGRAPH)
+                elif name == 's':
+                    add_boundary(SENTENCE)
+            elif kind == CDATA:
+                emit(event.text)  # literal text, never split
+            elif kind == EMPTY:
+                emit(event.text)
+                if name == 'break':
+                    add_boundary(BREAK)
+
+        if stack:
+            raise ValueError(f"Cannot chunk malformed SSML: unclosed <{stack[-1][0]}>")
+        add_boundary(END_OF_SCRIPT)
+        return "".join(parts), boundaries, text_runs
+
+    def span(self, first: Boundary, last: Boundary) -> Tuple[int, int]:
+        """Source span of a chunk, without the spaces next to its boundaries"""
+        start, end = first.position, last.position
+        if self.text[start:start + 1] == " ":
+            start += 1
+        if end > 0 and self.text[end - 1] == " ":
+            end -= 1
+        return start, end
+
+    def chunk_size(self, first: Boundary, last: Boundary) -> int:
+        """Characters of the chunk between two boundaries, including the wrapper and re-opened tags"""
+        start, end = self.span(first, last)
+        return len(SPEAK_OPEN) + first.open_length + (end - start) + last.close_length + len(SPEAK_CLOSE)
+
+    def chunk_content(self, first: Boundary, last: Boundary) -> str:
+        """Balanced SSML of the chunk between two boundaries"""
+        start, end = self.span(first, last)
+        return "".join([SPEAK_OPEN, *(tag for _, tag in first.open_tags), self.text[start:end],
+                        *(f"</{name}>" for name, _ in reversed(last.open_tags)), SPEAK_CLOSE])
+
+    def candidate_boundaries(self, max_chars: int) -> List[Boundary]:
+        """
+        Structural boundaries, plus word boundaries inside any stretch too long for one chunk
+
+        Args:
+            max_chars: Maximum characters per chunk
+
+        Returns:
+            Boundaries in document order
+        """
+        boundaries = self.boundaries
+        if all(self.chunk_size(a, b) <= max_chars for a, b in zip(boundaries, boundaries[1:])):
+            return boundaries
+
+        candidates: List[Boundary] = []
+        runs = self._text_runs
+        run_index = 0
+        for first, last in zip(boundaries, boundaries[1:]):
+            candidates.append(first)
+            if self.chunk_size(first, last) <= max_chars:
+                continue
+            while run_index < len(runs) and runs[run_index][0] + len(runs[run_index][1]) <= first.position:
+                run_index += 1
+            scan = run_index
+            while scan < len(runs) and runs[scan][0] < last.position:
+                start, run, run_boundary = runs[scan]
+                for match in _SPACE_RE.finditer(run):
+                    position = start + match.end()
+                    if first.position < position < last.position:
+                        candidates.append(run_boundary._replace(position=position))
+                scan += 1
+        candidates.append(boundaries[-1])
+        return candidates
+
+
+def chunk_ssml(ssml_text: str, max_chars: int = 800, target_chars: Optional[int] = None) -> List[SSMLChunk]:
+    """
+    Split an SSML script into the fewest balanced chunks (see pack_chunks)
+
+    Args:
+        ssml_text: SSML script (with or without XML declaration and <speak> root)
+        max_chars: Hard limit on characters per chunk, wrapper included
+        target_chars: Preferred chunk size (default: max_chars)
+
+    Returns:
+        Chunks in script order, each a complete <speak> document
+
+    Raises:
+        ValueError: Malformed SSML, or a word or unsplittable element longer than max_chars
+    """
+    return pack_chunks(SSMLDocument(ssml_text), max_chars, target_chars)
+
+
+def pack_chunks(document: SSMLDocument, max_chars: int, target_chars: Optional[int] = None) -> List[SSMLChunk]:
+    """
+    Pack a flattened script into the fewest balanced chunks
+
+    Chunks are cut only at candidate boundaries. A dynamic program over the
+    boundaries picks the partition with the fewest chunks of at most
+    ``max_chars``; among those it prefers better boundaries (paragraph over
+    sentence over break over word) and sizes near ``target_chars``. Each
+    boundary only looks back over the boundaries within one maximum chunk
+    length, so the cost is linear in the number of boundaries for a given
+    ``max_chars``.
+
+    Args:
+        document: Flattened script
+        max_chars: Hard limit on characters per chunk, wrapper included
+        target_chars: Preferred chunk size (default: max_chars)
+
+    Returns:
+        Chunks in script order, each a complete <speak> document
+
+    Raises:
+        ValueError: A word or unsplittable element longer than max_chars
+    """
+    boundaries = document.candidate_boundaries(max_chars)
+    target = target_chars or max_chars
+
+    if len(boundaries) == 2 and document.span(*boundaries)[0] >= document.span(*boundaries)[1]:
+        return []  # nothing to synthesize
+
+    # best[j] = (chunks, penalty) of the best partition ending at boundary j
+    infinity = (sys.maxsize, 0.0)
+    best: List[Tuple[int, float]] = [(0, 0.0)] + [infinity] * (len(boundaries) - 1)
+    previous = [0] * len(boundaries)
+    window_start = 0
+    for j in range(1, len(boundaries)):
+        last = boundaries[j]
+        while last.position - boundaries[window_start].position > max_chars:
+            window_start += 1
+        penalty = BOUNDARY_PENALTIES[last.kind]
+        for i in range(window_start, j):
+            if best[i] is infinity:
+                continue
+            first = boundaries[i]
+            start, end = document.span(first, last)
+            if start >= end:
+                continue
+            size = document.chunk_size(first, last)
+            if size > max_chars:
+                continue
+            candidate = (best[i][0] + 1, best[i][1] + penalty + ((size - target) / target) ** 2)
+            if candidate < best[j]:
+                best[j], previous[j] = candidate, i
+
+    if best[-1] is infinity:
+        raise ValueError(f"Script cannot be split into chunks of {max_chars} characters "
+                         f"(a word or unsplittable element is longer)")
+
+    cuts = [len(boundaries) - 1]
+    while cuts[-1]:
+        cuts.append(previous[cuts[-1]])
+    cuts.reverse()
+
+    chunks = []
+    for i, j in zip(cuts, cuts[1:]):
+        first, last = boundaries[i], boundaries[j]
+        chunks.append(SSMLChunk(document.chunk_content(first, last), document.chunk_size(first, last), last.kind))
+    return chunks
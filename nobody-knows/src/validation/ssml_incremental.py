@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Incremental SSML Validation
+Revalidates only the lines of an edited script that changed since the last validation.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from ssml_parser import (CDATA, DECLARATION, DOCTYPE, END, INVALID, START, TEXT, SSMLEvent, SSMLVisitor,
+                         ends_inside_markup, has_undefined_entity, line_column, timed_handler, walk_ssml)
+from ssml_validator import (EVENTS, MarkupRuleCache, NestingRule, SSMLValidator, StatisticsRule,
+                            ValidationRule, XMLStructureRule)
+
+BLOCK_SEPARATOR = "\n"
+# Markup that may span a line break: a tag up to a newline (outside or inside
+# a quoted value, which may contain '>'), or a comment or CDATA section
+_MULTILINE_MARKUP_RE = re.compile(r"""
+    <(?:[^<>"'\n]|"[^"<\n]*"|'[^'<\n]*')*(?:\n|"[^"<\n]*\n|'[^'<\n]*\n)
+  | <!--(?:(?!-->).)*?\n
+  | <!\[CDATA\[(?:(?!\]\]>).)*?\n
+""", re.DOTALL | re.VERBOSE)
+
+
+def split_blocks(ssml_text: str) -> List[str]:
+    """
+    Split a document into blocks at line breaks
+
+    A line break inside a tag or comment is not a boundary. Each separator
+    stays with the block before it, so the blocks concatenate back to the
+    document and an edit only changes the blocks it touches.
+    """
+    pieces = ssml_text.split(BLOCK_SEPARATOR)
+    if _MULTILINE_MARKUP_RE.search(ssml_text) is None:
+        blocks = [piece + BLOCK_SEPARATOR for piece in pieces[:-1]]
+        return blocks + [pieces[-1]] if pieces[-1] else blocks
+
+    blocks = []
+    pending = ""
+    for index, piece in enumerate(pieces):
+        pending += piece if index == len(pieces) - 1 else piece + BLOCK_SEPARATOR
+        if pending and not ends_inside_markup(pending):
+            blocks.append(pending)
+            pending = ""
+    if pending:
+        blocks.append(pending)
+    return blocks
+
+
+class BlockStructure(SSMLVisitor):
+    """
+    Structure facts about one block that do not depend on its surroundings
+
+    Everything that happens inside an element opened in the block is
+    context-free. Events at the block's own depth 0 (elements it opens,
+    closing tags for elements opened earlier, bare text) depend on what is
+    open around it, so they are recorded in order and resolved at merge time.
+    A text run may continue from the previous block, so errors at offset 0
+    of a block that starts with text are moved to where the run began.
+    """
+
+    name = "block_structure"
+
+    def __init__(self):
+        self.boundary: List[Tuple[str, str, int]] = []   # (kind, name, offset)
+        self.declarations: List[int] = []
+        self.first_content: Optional[int] = None
+        self.fatal: Optional[Tuple[int, str, int]] = None  # (offset, message, reported offset)
+        self.nesting_warnings: List[Tuple[int, str]] = []
+        self.speak_opened = False
+        self.speak_mismatched_close = False
+        self.open_elements: List[str] = []
+        self.leading_text = False
+        self.trailing_text: Optional[int] = None  # start of a text run that reaches the block's end
+        self._last_text: Tuple[int, int] = (0, -1)
+
+    def _content(self, offset: int):
+        if self.first_content is None:
+            self.first_content = offset
+
+    def _fail(self, message: str, offset: int, reported: Optional[int] = None):
+        if self.fatal is None:
+            self.fatal = (offset, message, offset if reported is None else reported)
+
+    def other(self, event: SSMLEvent, stack: List[str]) -> None:
+        self._content(event.start)
+        if event.kind == DECLARATION and event.text.startswith('<?xml'):
+            self.declarations.append(event.start)
+        elif event.kind == INVALID:
+            self._fail("not well-formed (invalid token)", event.start)
+        elif event.kind == DOCTYPE:
+            if stack:
+                self._fail("not well-formed (invalid token)", event.start, event.start + 2)
+            else:
+                self.boundary.append((DOCTYPE, "", event.start))
+        elif event.kind == CDATA and not stack:
+            self.boundary.append((TEXT, "", event.start))
+
+    def start_element(self, event: SSMLEvent, stack: List[str]) -> None:
+        self._content(event.start)
+        if not stack:
+            self.boundary.append((START, event.name, event.start))
+        if event.name == 'speak' and event.kind == START:
+            self.speak_opened = True
+
+    def unmatched_end(self, event: SSMLEvent, stack: List[str]) -> None:
+        if not stack:
+            self.boundary.append((END, event.name, event.start))
+            return
+        self._fail("mismatched tag", event.start, event.start + 2)
+        self.nesting_warnings.append((event.start, f"Tag nesting issue: expected </{stack[-1]}>, found </{event.name}>"))
+        if event.name == 'speak':
+            self.speak_mismatched_close = True
+
+    def text(self, text: str, offset: int, stack: List[str]) -> None:
+        if offset == 0:
+            self.leading_text = True
+        self._last_text = (offset, offset + len(text))
+        if '&' in text and has_undefined_entity(text):
+            self._fail("undefined entity", offset)
+        if not stack and not text.isspace():
+            self._content(offset)
+            self.boundary.append((TEXT, "", offset))
+
+    def finish(self, ssml_text: str, stack: List[str]) -> None:
+        self.open_elements = list(stack)
+        start, end = self._last_text
+        if end == len(ssml_text):
+            self.trailing_text = start
+
+
+class BlockStatistics(StatisticsRule):
+    """Statistics partials of one block, summed across blocks at merge time"""
+
+    def finish(self, ssml_text: str, stack: List[str]) -> None:
+        text = "".join(self.text_runs)
+        self.text_characters = len(text)
+        self.leading_whitespace = len(text) - len(text.lstrip())
+        self.trailing_whitespace = len(text) - len(text.rstrip())
+        self.has_content = self.leading_whitespace < len(text)
+        self.word_count = len(text.split())
+        self.starts_word = bool(text) and not text[0].isspace()
+        self.ends_word = bool(text) and not text[-1].isspace()
+        self.text_runs = []
+
+
+class BlockResult:
+    """Cached validation of one block"""
+
+    def __init__(self, length: int, markup_messages: List[Tuple[int, List[str], List[str]]],
+                 structure: BlockStructure, statistics: BlockStatistics):
+        self.length = length
+        self.markup_messages = markup_messages  # (rule index, errors, warnings) for rules that reported
+        self.structure = structure
+        self.statistics = statistics
+
+
+class IncrementalSSMLValidator(SSMLValidator):
+    """
+    SSMLValidator that reuses per-block results between calls
+
+    Blocks are cached by content, so after an edit only the changed blocks
+    are tokenized again. Nesting and well-formedness across blocks are
+    recomputed from each block's recorded depth-0 events, and statistics
+    are summed from per-block partials. Results match a full validation.
+    Event rules other than markup-only and the structure, nesting and
+    statistics rules have no per-block form and walk the whole document.
+    """
+
+    def __init__(self, model: Optional[str] = None, profile_rules: bool = False, **kwargs):
+        super().__init__(model, profile_rules, **kwargs)
+        self._block_cache: Dict[str, BlockResult] = {}
+        self.last_run = {'blocks': 0, 'revalidated_blocks': 0}
+
+    def _validate_block(self, block: str) -> BlockResult:
+        markup_rules = [rule(self) for rule in self.rules if rule.needs == EVENTS and rule.markup_only]
+        structure, statistics = BlockStructure(), BlockStatistics(self)
+        walk_ssml(block, [structure, statistics, MarkupRuleCache(markup_rules, self.rule_timings)], self.rule_timings)
+        markup_messages = [(index, rule.errors, rule.warnings) for index, rule in enumerate(markup_rules)
+                           if rule.errors or rule.warnings]
+        return BlockResult(len(block), markup_messages, structure, statistics)
+
+    def _run_rules(self, ssml_text: str) -> List[ValidationRule]:
+        blocks = split_blocks(ssml_text)
+        cache, results = {}, []
+        revalidated = 0
+        for block in blocks:
+            result = cache.get(block) or self._block_cache.get(block)
+            if result is None:
+                result = self._validate_block(block)
+                revalidated += 1
+            cache[block] = result
+            results.append(result)
+        # Only blocks of the current document are kept
+        self._block_cache = cache
+        self.last_run = {'blocks': len(blocks), 'revalidated_blocks': revalidated}
+
+        rules = [rule(self) for rule in self.rules]
+        markup_rules = [rule for rule in rules if rule.needs == EVENTS and rule.markup_only]
+        for result in results:
+            for index, errors, warnings in result.markup_messages:
+                markup_rules[index].errors.extend(errors)
+                markup_rules[index].warnings.extend(warnings)
+
+        document_rules = []
+        for rule in rules:
+            if isinstance(rule, XMLStructureRule):
+                structure_rule = rule
+            elif isinstance(rule, NestingRule):
+                nesting_rule = rule
+            elif isinstance(rule, StatisticsRule):
+                statistics_rule = rule
+            elif rule.needs == EVENTS and not rule.markup_only:
+                document_rules.append(rule)
+        merge_structure, merge_statistics = self._merge_structure, self._merge_statistics
+        if self.rule_timings is not None:
+            merge_structure = timed_handler(merge_structure, "block_merge", self.rule_timings)
+            merge_statistics = timed_handler(merge_statistics, "block_merge", self.rule_timings)
+        merge_structure(ssml_text, results, structure_rule, nesting_rule)
+        merge_statistics(ssml_text, results, statistics_rule)
+        if document_rules:
+            walk_ssml(ssml_text, document_rules, self.rule_timings)
+        self._check_raw_text(rules, ssml_text)
+        return rules
+
+    @staticmethod
+    def _merge_structure(ssml_text: str, results: List[BlockResult],
+                         structure_rule: XMLStructureRule, nesting_rule: NestingRule) -> None:
+        """Replay each block's depth-0 events against the document-level stack"""
+        stack: List[str] = []
+        fatal = None
+        root_seen = doctype_seen = speak_opened = speak_closed = has_declaration = False
+        first_content = None
+        nesting_warnings: List[Tuple[int, str]] = []
+
+        def fail(message, offset, reported=None):
+            nonlocal fatal
+            if fatal is None or offset < fatal[0]:
+                fatal = (offset, message, offset if reported is None else reported)
+
+        base = 0
+        run_start = None  # where a text run reaching the end of the previous block began
+        for result in results:
+            block = result.structure
+
+            def locate(offset):
+                if offset == 0 and block.leading_text and run_start is not None:
+                    return run_start
+                return base + offset
+
+            if block.fatal is not None:
+                offset, message, reported = block.fatal
+                fail(message, locate(offset), locate(reported))
+            if first_content is None and block.first_content is not None:
+                first_content = base + block.first_content
+                has_declaration = block.first_content in block.declarations
+            for offset in block.declarations:
+                if base + offset != first_content:
+                    fail("XML or text declaration not at start of entity", base + offset)
+            speak_opened = speak_opened or block.speak_opened
+            speak_closed = speak_closed or block.speak_mismatched_close
+            nesting_warnings.extend((base + offset, message) for offset, message in block.nesting_warnings)
+
+            for kind, name, offset in block.boundary:
+                offset = locate(offset)
+                if kind == START:
+                    if not stack:
+                        if root_seen:
+                            fail("junk after document element", offset)
+                        root_seen = True
+                elif kind == TEXT:
+                    if not stack:
+                        fail("junk after document element" if root_seen else "syntax error", offset)
+                elif kind == DOCTYPE:
+                    if stack:
+                        fail("not well-formed (invalid token)", offset, offset + 2)
+                    elif root_seen:
+                        fail("junk after document element", offset)
+                    elif doctype_seen:
+                        fail("syntax error", offset)
+                    doctype_seen = True
+                elif stack and stack[-1] == name:
+                    stack.pop()
+                else:
+                    fail("mismatched tag", offset, offset + 2)
+                    if name == 'speak':
+                        speak_closed = True
+                    if not stack:
+                        nesting_rule.errors.append(f"Closing tag </{name}> without matching opening tag")
+                    else:
+                        nesting_warnings.append((offset, f"Tag nesting issue: expected </{stack[-1]}>, found </{name}>"))
+            stack.extend(block.open_elements)
+            if block.trailing_text is None:
+                run_start = None
+            elif block.trailing_text or not block.leading_text or run_start is None:
+                run_start = base + block.trailing_text
+            base += result.length
+
+        if not has_declaration:
+            structure_rule.warnings.append("Missing XML declaration")
+        if not (speak_opened and (speak_closed or 'speak' not in stack)):
+            structure_rule.errors.append("Missing required <speak> root tags")
+        if fatal is None and (stack or not root_seen):
+            fatal = (len(ssml_text), "no element found", len(ssml_text))
+        if fatal is not None:
+            _, message, reported = fatal
+            structure_rule.errors.append(f"XML parsing error: {message}: {line_column(ssml_text, reported)}")
+
+        nesting_rule.warnings.extend(message for _, message in sorted(nesting_warnings, key=lambda item: item[0]))
+        nesting_rule.errors.extend(f"Unclosed tag: <{tag}>" for tag in stack)
+
+    @staticmethod
+    def _merge_statistics(ssml_text: str, results: List[BlockResult], statistics_rule: StatisticsRule) -> None:
+        """Sum per-block partials as if the whole document's markup had been stripped at once"""
+        text_characters = word_count = 0
+        ends_word = False
+        for result in results:
+            partial = result.statistics
+            for name, count in partial.tag_counts.items():
+                statistics_rule.tag_counts[name] = statistics_rule.tag_counts.get(name, 0) + count
+            statistics_rule.comment_blocks += partial.comment_blocks
+            statistics_rule.break_times.extend(partial.break_times)
+
+            if partial.text_characters:
+                text_characters += partial.text_characters
+                word_count += partial.word_count
+                if ends_word and partial.starts_word:
+                    word_count -= 1  # a word continues across the block boundary
+                ends_word = partial.ends_word
+
+        with_text = [result.statistics for result in results if result.statistics.text_characters]
+        plain = 0
+        if any(partial.has_content for partial in with_text):
+            leading = trailing = 0
+            for partial in with_text:
+                if partial.has_content:
+                    leading += partial.leading_whitespace
+                    break
+                leading += partial.text_characters
+            for partial in reversed(with_text):
+                if partial.has_content:
+                    trailing += partial.trailing_whitespace
+                    break
+                trailing += partial.text_characters
+            plain = text_characters - leading - trailing
+
+        statistics_rule.summarize(len(ssml_text), plain, word_count)
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Streaming SSML Tokenizer
+Single-pass tokenizer and event walker that SSML validation rules run on as visitors.
+"""
+
+import re
+import time
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# Event kinds
+START = "start"          # <prosody rate="slow">
+END = "end"              # </prosody>
+EMPTY = "empty"          # <break time="1s"/>
+TEXT = "text"
+COMMENT = "comment"      # <!-- ... -->
+DECLARATION = "decl"     # <?xml ... ?>
+DOCTYPE = "doctype"      # <!DOCTYPE speak ...>
+CDATA = "cdata"          # <![CDATA[ ... ]]>, character data taken literally
+INVALID = "invalid"      # a '<' that does not start any markup
+
+CDATA_OPEN, CDATA_CLOSE = "<![CDATA[", "]]>"
+
+# Splits a document into text and markup; each distinct markup string is then
+# classified once with _TAG_RE. Quoted attribute values may contain '>'
+# (X-SAMPA phonemes such as ph="p_>a") but never '<', and a DOCTYPE may carry
+# an internal subset in brackets.
+_SPLIT_RE = re.compile(r"""(
+    <!--.*?-->
+  | <!\[CDATA\[.*?\]\]>
+  | <!DOCTYPE(?:[^<>\["']|"[^"<]*"|'[^'<]*'|\[.*?\])*>
+  | <(?:[^<>"']|"[^"<]*"|'[^'<]*')*>
+)""", re.DOTALL | re.VERBOSE)
+_TAG_RE = re.compile(r"""
+    <(?P<close>/)?(?P<name>[A-Za-z_][\w:.\-]*)
+    (?P<attrs>(?:\s+[^\s=/>]+\s*=\s*(?:"[^"]*"|'[^']*'))*)
+    \s*(?P<empty>/)?>
+""", re.VERBOSE)
+_ATTR_RE = re.compile(r"""([^\s=/>]+)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+_ENTITY_RE = re.compile(r"&(?!(?:amp|lt|gt|quot|apos|#\d+|#x[0-9A-Fa-f]+);)")
+
+
+class SSMLEvent(NamedTuple):
+    """One token of an SSML document"""
+    kind: str
+    name: str                  # element name for START/END/EMPTY, else ""
+    attrs: Dict[str, str]      # parsed attributes for START/EMPTY
+    text: str                  # raw source of the token
+    start: int                 # offset of the token in the document
+    end: int
+
+
+def parse_attributes(raw: str) -> Dict[str, str]:
+    """Attributes of a tag from its raw attribute string"""
+    if not raw:
+        return {}
+    return {name: double if double or not single else single
+            for name, double, single in _ATTR_RE.findall(raw)}
+
+
+def classify_markup(markup: str) -> Tuple[str, str, Dict[str, str]]:
+    """
+    Kind, element name and attributes of one piece of markup
+
+    Returns:
+        (kind, name, attrs); name and attrs are empty for non-element markup
+    """
+    if markup.startswith("<!--"):
+        return COMMENT, "", {}
+    if markup.startswith(CDATA_OPEN):
+        return CDATA, "", {}
+    if markup.startswith("<!DOCTYPE"):
+        return DOCTYPE, "", {}
+    if markup.startswith("<?") and markup.endswith("?>"):
+        return DECLARATION, "", {}
+    match = _TAG_RE.fullmatch(markup)
+    if match is None:
+        return INVALID, "", {}
+    if match.group("close"):
+        return END, match.group("name"), {}
+    return EMPTY if match.group("empty") else START, match.group("name"), parse_attributes(match.group("attrs"))
+
+
+def tokenize_ssml(ssml_text: str, offset: int = 0) -> Iterator[SSMLEvent]:
+    """
+    Tokenize an SSML document in one left-to-right scan
+
+    A '<' that does not start well-formed markup becomes an INVALID event.
+
+    Args:
+        ssml_text: Document (or fragment) to tokenize
+        offset: Added to every event position, for fragments of a larger document
+
+    Yields:
+        Events in document order; text between markup becomes TEXT events
+    """
+    position = offset
+    for index, piece in enumerate(_SPLIT_RE.split(ssml_text)):
+        if not piece:
+            continue
+        end = position + len(piece)
+        if index % 2:
+            kind, name, attrs = classify_markup(piece)
+            yield SSMLEvent(kind, name, attrs, piece, position, end)
+        elif "<" in piece:
+            # An unterminated '<' leaves the rest of the run unparseable
+            cut = piece.index("<")
+            if cut:
+                yield SSMLEvent(TEXT, "", {}, piece[:cut], position, position + cut)
+            yield SSMLEvent(INVALID, "", {}, piece[cut:], position + cut, end)
+        else:
+            yield SSMLEvent(TEXT, "", {}, piece, position, end)
+        position = end
+
+
+def ends_inside_markup(text: str) -> bool:
+    """True if ``text`` ends inside a tag, comment, CDATA section or DOCTYPE (or after a stray '<')"""
+    pieces = _SPLIT_RE.split(text)
+    if "<" in pieces[-1]:
+        return True
+    # An unterminated comment, CDATA section or DOCTYPE runs over any tags after it
+    return any("<!" in piece for piece in pieces[::2])
+
+
+def line_column(ssml_text: str, offset: int) -> str:
+    """Expat-style "line L, column C" for an offset (computed only when reporting)"""
+    line = ssml_text.count("\n", 0, offset) + 1
+    column = offset - (ssml_text.rfind("\n", 0, offset) + 1)
+    return f"line {line}, column {column}"
+
+
+def has_undefined_entity(text: str) -> bool:
+    """True if a text run contains an '&' that is not a predefined XML entity"""
+    return "&" in text and _ENTITY_RE.search(text) is not None
+
+
+class SSMLVisitor:
+    """
+    Base class for rules that run over the event stream
+
+    Subclasses override the hooks they need. ``elements`` restricts the
+    element hooks to a set of tag names (None means every element), so a
+    prosody rule is never called for breaks. ``stack`` is the list of
+    currently open element names; for END events it still contains the
+    element being closed.
+    """
+
+    elements: Optional[frozenset] = None
+
+    def start_element(self, event: SSMLEvent, stack: List[str]) -> None:
+        """Opening tag or self-closing element"""
+
+    def end_element(self, event: SSMLEvent, stack: List[str]) -> None:
+        """Closing tag"""
+
+    def unmatched_end(self, event: SSMLEvent, stack: List[str]) -> None:
+        """Closing tag that does not match the innermost open element (which stays open)"""
+
+    def text(self, text: str, offset: int, stack: List[str]) -> None:
+        """Character data between tags, starting at ``offset``"""
+
+    def other(self, event: SSMLEvent, stack: List[str]) -> None:
+        """Comments, declarations, DOCTYPE, CDATA sections and invalid markup"""
+
+    def finish(self, ssml_text: str, stack: List[str]) -> None:
+        """End of document"""
+
+
+def _overrides(visitor: SSMLVisitor, hook: str) -> bool:
+    return getattr(type(visitor), hook) is not getattr(SSMLVisitor, hook)
+
+
+def timed_handler(handler: Callable, name: str, timings: Dict[str, float]) -> Callable:
+    """Wrap ``handler`` so the time spent in it is added to ``timings[name]``"""
+    def timed(*args):
+        started = time.perf_counter()
+        try:
+            return handler(*args)
+        finally:
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+    return timed
+
+
+def walk_ssml(ssml_text: str, visitors: List[SSMLVisitor],
+              timings: Optional[Dict[str, float]] = None) -> List[str]:
+    """
+    Run every visitor over one tokenization of the document
+
+    Handlers are resolved once per distinct piece of markup, so each event
+    costs a dict lookup plus the handlers that actually care about it.
+
+    Args:
+        ssml_text: Document to walk
+        visitors: Visitors in the order their handlers run
+        timings: If given, time spent in each visitor that has a ``name``
+            is accumulated here under that name
+
+    Returns:
+        Element names still open at the end of the document
+    """
+    def bind(visitor: SSMLVisitor, hook: str) -> Callable:
+        handler = getattr(visitor, hook)
+        name = getattr(visitor, "name", None)
+        return timed_handler(handler, name, timings) if timings is not None and name else handler
+
+    def element_handlers(hook: str, name: str) -> list:
+        return [bind(visitor, hook) for visitor in visitors
+                if _overrides(visitor, hook) and (visitor.elements is None or name in visitor.elements)]
+
+    text_handlers = [bind(visitor, "text") for visitor in visitors if _overrides(visitor, "text")]
+    other_handlers = [bind(visitor, "other") for visitor in visitors if _overrides(visitor, "other")]
+    unmatched_handlers = [bind(visitor, "unmatched_end") for visitor in visitors
+                          if _overrides(visitor, "unmatched_end")]
+
+    # Inlined tokenize_ssml: the split runs in C and text runs are passed as
+    # plain strings. Scripts repeat the same few tags, so each distinct markup
+    # string is classified, and its handlers resolved, only once (attribute
+    # dicts are shared and must be treated as read-only by handlers).
+    markup_cache: Dict[str, tuple] = {}
+    stack: List[str] = []
+    position = 0
+    is_text = False
+    for piece in _SPLIT_RE.split(ssml_text):
+        start = position
+        position += len(piece)
+        is_text = not is_text  # pieces alternate text, markup, text, ...
+        if is_text:
+            if not piece:
+                continue
+            if "<" in piece:
+                cut = piece.index("<")
+                if cut:
+                    for handler in text_handlers:
+                        handler(piece[:cut], start, stack)
+                event = SSMLEvent(INVALID, "", {}, piece[cut:], start + cut, position)
+                for handler in other_handlers:
+                    handler(event, stack)
+            else:
+                for handler in text_handlers:
+                    handler(piece, start, stack)
+            continue
+
+        cached = markup_cache.get(piece)
+        if cached is None:
+            kind, name, attrs = classify_markup(piece)
+            if kind == START or kind == EMPTY:
+                handlers = element_handlers("start_element", name)
+            elif kind == END:
+                handlers = element_handlers("end_element", name)
+            else:
+                handlers = other_handlers
+            cached = markup_cache[piece] = (kind, name, attrs, handlers)
+        kind, name, attrs, handlers = cached
+
+        event = SSMLEvent(kind, name, attrs, piece, start, position)
+        for handler in handlers:
+            handler(event, stack)
+        if kind == START:
+            stack.append(name)
+        elif kind == END:
+            if stack and stack[-1] == name:
+                stack.pop()
+            else:
+                for handler in unmatched_handlers:
+                    handler(event, stack)
+
+    for visitor in visitors:
+        bind(visitor, "finish")(ssml_text, stack)
+    return stack
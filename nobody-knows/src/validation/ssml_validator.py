@@ -4,21 +4,468 @@ SSML Processing and Validation System
 Comprehensive validation for complex prosody markup in Episode 1 script
 """
 
+import json
+import os
 import re
-import xml.etree.ElementTree as ET
-from typing import Dict, List, Tuple, Any
+import sys
+from typing import Dict, List, Optional, Pattern, Tuple, Any, Type
 from datetime import datetime
 
+from ssml_parser import (CDATA, CDATA_CLOSE, CDATA_OPEN, COMMENT, DECLARATION, DOCTYPE, INVALID, START, SSMLEvent,
+                         SSMLVisitor, has_undefined_entity, line_column, timed_handler, walk_ssml)
+
+VALID_SSML_TAGS = frozenset({'speak', 'prosody', 'break', 'emphasis', 'phoneme', 'say-as', 'audio',
+                             'mark', 'p', 's', 'voice'})
+VALID_PROSODY_ATTRS = {
+    'rate': ['x-slow', 'slow', 'medium', 'fast', 'x-fast'],
+    'pitch': ['x-low', 'low', 'medium', 'high', 'x-high'],
+    'volume': ['silent', 'x-soft', 'soft', 'medium', 'loud', 'x-loud', 'medium-loud', 'medium-soft']
+}
+VALID_EMPHASIS_LEVELS = ['strong', 'moderate', 'reduced']
+PHONEME_ALPHABETS = ('ipa', 'x-sampa', 'x-amazon-pron')
+RELATIVE_PROSODY_RE = re.compile(r'[+-]\d+(\.\d+)?%?|[+-]?\d+(\.\d+)?(Hz|st)')
+BREAK_TIME_RE = re.compile(r'\d+(\.\d+)?(ms|s)')
+SPEAKING_RATE_WPM = 206  # Episode 1 empirical rate
+
+TTS_MODELS_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "content", "config", "tts_models.json")
+
+# What a rule runs on
+EVENTS = "events"        # the tokenized event stream (walked once, shared by all rules)
+RAW_TEXT = "raw_text"    # the document string, via check_text()
+
+
+def break_seconds(time_value: str) -> float:
+    """Duration of a break time attribute ("500ms", "1.5s"); 0 if unparseable"""
+    try:
+        if time_value.endswith('ms'):
+            return float(time_value[:-2]) / 1000
+        if time_value.endswith('s'):
+            return float(time_value[:-1])
+    except ValueError:
+        pass
+    return 0.0
+
+
+class ValidationRule(SSMLVisitor):
+    """
+    A validation rule run as a visitor over the SSML event stream
+
+    Each rule declares its registry ``name``, the compiled ``patterns`` it
+    uses and what it ``needs``: EVENTS rules are visitors on the shared walk,
+    RAW_TEXT rules check the whole document string in ``check_text``.
+
+    Rules that set ``markup_only`` judge each opening tag by its own markup
+    alone (name and attributes, not position or context); they run once per
+    distinct tag and their messages are replayed for repeats.
+
+    ``default`` rules run unless a model profile disables them; the others
+    are enabled per TTS model. ``required`` rules produce the result's
+    structure and statistics and cannot be disabled.
+    """
+
+    name = ""
+    needs = EVENTS
+    patterns: Dict[str, Pattern] = {}
+    markup_only = False
+    default = True
+    required = False
+
+    def __init__(self, validator: 'SSMLValidator'):
+        self.validator = validator
+        self.errors: List[str] = []
+        self.warnings: List[str] = []
+
+    def check_text(self, ssml_text: str) -> None:
+        """Check the raw document (RAW_TEXT rules)"""
+
+
+# Registered rules by name, in reporting order
+RULE_REGISTRY: Dict[str, Type[ValidationRule]] = {}
+
+
+def register_rule(rule_class: Type[ValidationRule]) -> Type[ValidationRule]:
+    """Class decorator adding a rule to RULE_REGISTRY"""
+    if not rule_class.name:
+        raise ValueError(f"{rule_class.__name__} has no rule name")
+    if rule_class.name in RULE_REGISTRY:
+        raise ValueError(f"Duplicate validation rule name: {rule_class.name}")
+    RULE_REGISTRY[rule_class.name] = rule_class
+    return rule_class
+
+
+def load_model_profiles(models_path: str = TTS_MODELS_PATH) -> Dict[str, Any]:
+    """TTS model profiles (limits, supported tags, enabled rules) from tts_models.json"""
+    with open(models_path, 'r', encoding='utf-8') as f:
+        return json.load(f)["models"]
+
+
+def select_rules(profile: Optional[Dict[str, Any]] = None) -> Tuple[Type[ValidationRule], ...]:
+    """
+    Rules enabled for a model profile
+
+    Args:
+        profile: Model profile; its ``rules`` are enabled on top of the
+            defaults and its ``disabled_rules`` removed (None: defaults only)
+
+    Returns:
+        Rule classes in reporting order
+    """
+    profile = profile or {}
+    enabled, disabled = set(profile.get("rules", ())), set(profile.get("disabled_rules", ()))
+    unknown = sorted((enabled | disabled) - set(RULE_REGISTRY))
+    if unknown:
+        raise ValueError(f"Unknown validation rules: {unknown}")
+    required = sorted(name for name in disabled if RULE_REGISTRY[name].required)
+    if required:
+        raise ValueError(f"Required validation rules cannot be disabled: {required}")
+    return tuple(rule for name, rule in RULE_REGISTRY.items()
+                 if (rule.default or name in enabled) and name not in disabled)
+
+
+class MarkupRuleCache(SSMLVisitor):
+    """Runs markup-only rules once per distinct tag and replays their messages"""
+
+    def __init__(self, rules: List[ValidationRule], timings: Optional[Dict[str, float]] = None):
+        self.rules = rules
+        self.replays: Dict[str, List[Tuple[ValidationRule, List[str], List[str]]]] = {}
+        # Only first runs are timed per rule; replays are bookkeeping of the walk
+        self.handlers = [(rule, rule.start_element if timings is None
+                          else timed_handler(rule.start_element, rule.name, timings)) for rule in rules]
+
+    def start_element(self, event: SSMLEvent, stack: List[str]) -> None:
+        replay = self.replays.get(event.text)
+        if replay is not None:
+            for rule, errors, warnings in replay:
+                rule.errors.extend(errors)
+                rule.warnings.extend(warnings)
+            return
+
+        replay = self.replays[event.text] = []
+        for rule, handler in self.handlers:
+            if rule.elements is not None and event.name not in rule.elements:
+                continue
+            error_count, warning_count = len(rule.errors), len(rule.warnings)
+            handler(event, stack)
+            if len(rule.errors) > error_count or len(rule.warnings) > warning_count:
+                replay.append((rule, rule.errors[error_count:], rule.warnings[warning_count:]))
+
+
+@register_rule
+class XMLStructureRule(ValidationRule):
+    """XML declaration, <speak> root and well-formedness (first fatal error, as expat reports it)"""
+    name = "xml_structure"
+    required = True
+
+    def __init__(self, validator):
+        super().__init__(validator)
+        self.has_declaration = False
+        self.seen_content = False
+        self.speak_opened = self.speak_closed = False
+        self.root_seen = self.doctype_seen = False
+        self.fatal: Tuple[str, int] = None
+
+    def _fail(self, message: str, offset: int):
+        if self.fatal is None:
+            self.fatal = (message, offset)
+
+    def other(self, event: SSMLEvent, stack: List[str]) -> None:
+        if event.kind == DECLARATION:
+            if not self.seen_content and event.text.startswith('<?xml'):
+                self.has_declaration = True
+            elif event.text.startswith('<?xml'):
+                self._fail("XML or text declaration not at start of entity", event.start)
+        elif event.kind == INVALID:
+            self._fail("not well-formed (invalid token)", event.start)
+        elif event.kind == DOCTYPE:
+            if stack:
+                self._fail("not well-formed (invalid token)", event.start + 2)  # expat points past the "<!"
+            elif self.root_seen:
+                self._fail("junk after document element", event.start)
+            elif self.doctype_seen:
+                self._fail("syntax error", event.start)
+            self.doctype_seen = True
+        elif event.kind == CDATA and not stack:
+            self._fail("junk after document element" if self.root_seen else "syntax error", event.start)
+        self.seen_content = True
+
+    def start_element(self, event: SSMLEvent, stack: List[str]) -> None:
+        self.seen_content = True
+        if not stack:
+            if self.root_seen:
+                self._fail("junk after document element", event.start)
+            self.root_seen = True
+        if event.name == 'speak' and event.kind == START:
+            self.speak_opened = True
+
+    def unmatched_end(self, event: SSMLEvent, stack: List[str]) -> None:
+        self._fail("mismatched tag", event.start + 2)  # expat points past the "</"
+        if event.name == 'speak':
+            self.speak_closed = True
+
+    def text(self, text: str, offset: int, stack: List[str]) -> None:
+        if '&' in text and has_undefined_entity(text):
+            self._fail("undefined entity", offset)
+        if not stack and not text.isspace():
+            self.seen_content = True
+            self._fail("junk after document element" if self.root_seen else "syntax error", offset)
+
+    def finish(self, ssml_text: str, stack: List[str]) -> None:
+        if not self.has_declaration:
+            self.warnings.append("Missing XML declaration")
+        # An open element only leaves the stack through its own closing tag
+        if not (self.speak_opened and (self.speak_closed or 'speak' not in stack)):
+            self.errors.append("Missing required <speak> root tags")
+        if self.fatal is None and (stack or not self.root_seen):
+            self.fatal = ("no element found", len(ssml_text))
+        if self.fatal is not None:
+            message, offset = self.fatal
+            self.errors.append(f"XML parsing error: {message}: {line_column(ssml_text, offset)}")
+
+
+@register_rule
+class TagNameRule(ValidationRule):
+    """Only known SSML elements"""
+    name = "tag_names"
+    markup_only = True
+
+    def start_element(self, event: SSMLEvent, stack: List[str]) -> None:
+        if event.name not in VALID_SSML_TAGS:
+            self.warnings.append(f"Unknown SSML tag: <{event.name}>")
+
+
+@register_rule
+class ProsodyRule(ValidationRule):
+    """Prosody attributes use standard or relative values"""
+    name = "prosody"
+    patterns = {'relative': RELATIVE_PROSODY_RE}
+    markup_only = True
+    elements = frozenset({'prosody'})
+
+    def start_element(self, event: SSMLEvent, stack: List[str]) -> None:
+        valid_prosody_attrs = self.validator.valid_prosody_attrs
+        for attr_name, attr_value in event.attrs.items():
+            if attr_name not in valid_prosody_attrs:
+                self.warnings.append(f"Unknown prosody attribute: {attr_name}")
+                continue
+            valid_values = valid_prosody_attrs[attr_name]
+            # Relative values (like +20% or -10%) are allowed too
+            if attr_value not in valid_values and not self.patterns['relative'].match(attr_value):
+                self.warnings.append(
+                    f"Prosody {attr_name}='{attr_value}' not in standard values: {valid_values}"
+                )
+
+
+@register_rule
+class BreakRule(ValidationRule):
+    """Break times look like 500ms, 2s or 1.5s"""
+    name = "break_time"
+    patterns = {'time': BREAK_TIME_RE}
+    markup_only = True
+    elements = frozenset({'break'})
+
+    def start_element(self, event: SSMLEvent, stack: List[str]) -> None:
+        time_value = event.attrs.get('time')
+        if time_value is not None and not self.patterns['time'].match(time_value):
+            self.errors.append(f"Invalid break time format: '{time_value}'")
+
+
+@register_rule
+class EmphasisRule(ValidationRule):
+    """Emphasis levels are strong, moderate or reduced"""
+    name = "emphasis"
+    markup_only = True
+    elements = frozenset({'emphasis'})
+
+    def start_element(self, event: SSMLEvent, stack: List[str]) -> None:
+        level_value = event.attrs.get('level')
+        if level_value is not None and level_value not in self.validator.valid_emphasis_levels:
+            self.errors.append(
+                f"Invalid emphasis level '{level_value}'. Valid: {self.validator.valid_emphasis_levels}"
+            )
+
+
+@register_rule
+class PhonemeRule(ValidationRule):
+    """Phonemes carry a known alphabet and a ph pronunciation"""
+    name = "phoneme"
+    markup_only = True
+    elements = frozenset({'phoneme'})
+
+    def start_element(self, event: SSMLEvent, stack: List[str]) -> None:
+        attrs = event.attrs
+        if 'alphabet' not in attrs:
+            self.errors.append("Phoneme tag missing required 'alphabet' attribute")
+        if 'ph' not in attrs:
+            self.errors.append("Phoneme tag missing required 'ph' attribute")
+        alphabet = attrs.get('alphabet')
+        if alphabet is not None and alphabet not in PHONEME_ALPHABETS:
+            self.warnings.append(f"Unknown phoneme alphabet: '{alphabet}'")
+
+
+@register_rule
+class NestingRule(ValidationRule):
+    """Closing tags match the innermost open element and nothing is left open"""
+    name = "nesting"
+    required = True
+
+    def unmatched_end(self, event: SSMLEvent, stack: List[str]) -> None:
+        if not stack:
+            self.errors.append(f"Closing tag </{event.name}> without matching opening tag")
+        else:
+            self.warnings.append(f"Tag nesting issue: expected </{stack[-1]}>, found </{event.name}>")
+
+    def finish(self, ssml_text: str, stack: List[str]) -> None:
+        for tag in stack:
+            self.errors.append(f"Unclosed tag: <{tag}>")
+
+
+@register_rule
+class StatisticsRule(ValidationRule):
+    """
+    Tag counts, plain-text size, word count and break time, plus the
+    content-balance checks that depend on them
+
+    Text runs are collected as they stream past and measured once at the
+    end, so words split by a tag ("hel<emphasis>lo</emphasis>") count once,
+    exactly as if the markup had been stripped first.
+    """
+
+    name = "statistics"
+    required = True
+    elements = frozenset({'prosody', 'break', 'emphasis', 'phoneme'})
+
+    def __init__(self, validator):
+        super().__init__(validator)
+        self.tag_counts: Dict[str, int] = {}
+        self.comment_blocks = 0
+        self.text_runs: List[str] = []
+        self.break_times: List[float] = []
+        self.statistics: Dict[str, Any] = {}
+
+    def start_element(self, event: SSMLEvent, stack: List[str]) -> None:
+        self.tag_counts[event.name] = self.tag_counts.get(event.name, 0) + 1
+        if event.name == 'break' and 'time' in event.attrs:
+            self.break_times.append(break_seconds(event.attrs['time']))
+
+    def other(self, event: SSMLEvent, stack: List[str]) -> None:
+        if event.kind == COMMENT:
+            self.comment_blocks += 1
+        elif event.kind == CDATA:
+            self.text_runs.append(event.text[len(CDATA_OPEN):-len(CDATA_CLOSE)])
+
+    def text(self, text: str, offset: int, stack: List[str]) -> None:
+        self.text_runs.append(text)
+
+    def finish(self, ssml_text: str, stack: List[str]) -> None:
+        plain_text = "".join(self.text_runs).strip()
+        self.summarize(len(ssml_text), len(plain_text), len(plain_text.split()))
+
+    def summarize(self, total: int, plain: int, word_count: int) -> None:
+        """Content-balance checks and statistics from the document-level totals"""
+        if plain == 0:
+            self.errors.append("No actual content found in SSML")
+        else:
+            markup_ratio = ((total - plain) / total) * 100
+            # Warn if markup is too heavy
+            if markup_ratio > 50:
+                self.warnings.append(f"High markup ratio: {markup_ratio:.1f}% (consider simplifying)")
+            elif markup_ratio > 40:
+                self.warnings.append(f"Moderate markup ratio: {markup_ratio:.1f}%")
+
+        total_break_time = sum(self.break_times)
+        self.statistics = {
+            'total_characters': total,
+            'prosody_tags': self.tag_counts.get('prosody', 0),
+            'break_tags': self.tag_counts.get('break', 0),
+            'emphasis_tags': self.tag_counts.get('emphasis', 0),
+            'phoneme_tags': self.tag_counts.get('phoneme', 0),
+            'comment_blocks': self.comment_blocks,
+            'plain_text_characters': plain,
+            'markup_characters': total - plain,
+            'markup_percentage': ((total - plain) / total) * 100 if total else 0.0,
+            'word_count': word_count,
+            'estimated_duration_minutes': word_count / SPEAKING_RATE_WPM,
+            'total_break_time_seconds': total_break_time,
+            'total_break_time_minutes': total_break_time / 60
+        }
+
+
+@register_rule
+class CharacterLimitRule(ValidationRule):
+    """Script fits the model's per-request character limit"""
+    name = "character_limit"
+    needs = RAW_TEXT
+    default = False
+
+    def check_text(self, ssml_text: str) -> None:
+        limit = self.validator.model_profile['max_characters']
+        if len(ssml_text) > limit:
+            requests = -(-len(ssml_text) // limit)
+            self.warnings.append(f"Exceeds {self.validator.model} request limit: {len(ssml_text):,}/{limit:,} chars "
+                                 f"(needs at least {requests} chunks)")
+
+
+@register_rule
+class SupportedTagsRule(ValidationRule):
+    """Tags the model ignores, reported once per tag name with a count"""
+    name = "supported_tags"
+    needs = RAW_TEXT
+    patterns = {'open_tag': re.compile(r'<!--.*?-->|<([A-Za-z_][\w:.\-]*)', re.DOTALL)}
+    default = False
+
+    def check_text(self, ssml_text: str) -> None:
+        supported = self.validator.model_profile['supported_tags']
+        counts: Dict[str, int] = {}
+        for tag in self.patterns['open_tag'].findall(ssml_text):
+            if tag and tag not in supported:
+                counts[tag] = counts.get(tag, 0) + 1
+        for tag, count in counts.items():
+            self.warnings.append(f"{self.validator.model} ignores <{tag}> ({count} tags)")
+
+
+@register_rule
+class BreakLimitRule(ValidationRule):
+    """Breaks are no longer than the model allows"""
+    name = "break_limit"
+    markup_only = True
+    elements = frozenset({'break'})
+    default = False
+
+    def start_element(self, event: SSMLEvent, stack: List[str]) -> None:
+        limit = self.validator.model_profile['max_break_seconds']
+        time_value = event.attrs.get('time')
+        if time_value is not None and break_seconds(time_value) > limit:
+            self.warnings.append(f"Break '{time_value}' exceeds {self.validator.model} maximum of {limit:g}s")
+
+
+# Default rules in reporting order
+VALIDATION_RULES = select_rules()
+
+
 class SSMLValidator:
     """Production-grade SSML validation and processing system"""
 
-    def __init__(self):
-        self.valid_prosody_attrs = {
-            'rate': ['x-slow', 'slow', 'medium', 'fast', 'x-fast'],
-            'pitch': ['x-low', 'low', 'medium', 'high', 'x-high'],
-            'volume': ['silent', 'x-soft', 'soft', 'medium', 'loud', 'x-loud', 'medium-loud', 'medium-soft']
-        }
-        self.valid_emphasis_levels = ['strong', 'moderate', 'reduced']
+    def __init__(self, model: Optional[str] = None, profile_rules: bool = False,
+                 models_path: str = TTS_MODELS_PATH):
+        """
+        Args:
+            model: TTS model whose profile in tts_models.json enables
+                provider rules (None: generic SSML rules only)
+            profile_rules: Record time spent per rule in ``rule_timings``
+            models_path: Model profiles file
+        """
+        self.valid_prosody_attrs = VALID_PROSODY_ATTRS
+        self.valid_emphasis_levels = VALID_EMPHASIS_LEVELS
+        self.model = model
+        self.model_profile: Dict[str, Any] = {}
+        if model is not None:
+            profiles = load_model_profiles(models_path)
+            if model not in profiles:
+                raise ValueError(f"Unknown TTS model '{model}'. Known: {sorted(profiles)}")
+            self.model_profile = profiles[model]
+        self.rules = select_rules(self.model_profile)
+        self.profile_rules = profile_rules
+        self.rule_timings: Optional[Dict[str, float]] = None
         self.validation_errors = []
         self.validation_warnings = []
 
@@ -26,14 +473,15 @@ class SSMLValidator:
         """
         Comprehensive SSML structure validation
 
+        The document is tokenized once and every rule runs as a visitor over
+        that single event stream.
+
         Args:
             ssml_text: SSML formatted text to validate
 
         Returns:
             Validation results with errors, warnings, and statistics
         """
-        print("🔍 Starting comprehensive SSML validation...")
-
         validation_result = {
             'valid': True,
             'errors': [],
@@ -45,34 +493,14 @@ class SSMLValidator:
         # Reset validation state
         self.validation_errors = []
         self.validation_warnings = []
+        self.rule_timings = {} if self.profile_rules else None
 
         try:
-            # 1. Basic XML structure validation
-            self._validate_xml_structure(ssml_text)
-
-            # 2. SSML tag validation
-            self._validate_ssml_tags(ssml_text)
-
-            # 3. Prosody attribute validation
-            self._validate_prosody_attributes(ssml_text)
-
-            # 4. Break tag validation
-            self._validate_break_tags(ssml_text)
-
-            # 5. Emphasis validation
-            self._validate_emphasis_tags(ssml_text)
-
-            # 6. Phoneme validation
-            self._validate_phoneme_tags(ssml_text)
-
-            # 7. Nesting validation
-            self._validate_tag_nesting(ssml_text)
-
-            # 8. Content balance validation
-            self._validate_content_balance(ssml_text)
-
-            # 9. Generate statistics
-            validation_result['statistics'] = self._generate_statistics(ssml_text)
+            for rule in self._run_rules(ssml_text):
+                self.validation_errors.extend(rule.errors)
+                self.validation_warnings.extend(rule.warnings)
+                if isinstance(rule, StatisticsRule):
+                    validation_result['statistics'] = rule.statistics
 
             # Compile results
             validation_result['errors'] = self.validation_errors
@@ -81,6 +509,9 @@ class SSMLValidator:
 
             # Generate recommendations
             validation_result['recommendations'] = self._generate_recommendations()
+            if self.rule_timings is not None:
+                validation_result['rule_timings'] = dict(sorted(self.rule_timings.items(),
+                                                                key=lambda item: -item[1]))
 
         except Exception as e:
             validation_result['valid'] = False
@@ -88,194 +519,24 @@ class SSMLValidator:
 
         return validation_result
 
-    def _validate_xml_structure(self, ssml_text: str) -> None:
-        """Validate basic XML structure"""
-        try:
-            # Check for XML declaration
-            if not ssml_text.strip().startswith('<?xml'):
-                self.validation_warnings.append("Missing XML declaration")
-
-            # Check for root <speak> tags
-            if '<speak>' not in ssml_text or '</speak>' not in ssml_text:
-                self.validation_errors.append("Missing required <speak> root tags")
-
-            # Basic XML parsing attempt
-            # Clean version without XML declaration for ET parsing
-            clean_ssml = re.sub(r'<\?xml.*?\?>', '', ssml_text, flags=re.DOTALL).strip()
-
-            # Try parsing to check well-formedness
-            try:
-                ET.fromstring(clean_ssml)
-            except ET.ParseError as e:
-                self.validation_errors.append(f"XML parsing error: {str(e)}")
-
-        except Exception as e:
-            self.validation_errors.append(f"XML structure validation failed: {str(e)}")
-
-    def _validate_ssml_tags(self, ssml_text: str) -> None:
-        """Validate SSML-specific tags"""
-        # Find all SSML tags
-        ssml_tags = re.findall(r'<(/?)([a-zA-Z][a-zA-Z0-9]*)', ssml_text)
-
-        valid_ssml_tags = {'speak', 'prosody', 'break', 'emphasis', 'phoneme', 'say-as', 'audio', 'mark', 'p', 's', 'voice'}
-
-        for is_closing, tag_name in ssml_tags:
-            if tag_name not in valid_ssml_tags:
-                self.validation_warnings.append(f"Unknown SSML tag: <{tag_name}>")
-
-    def _validate_prosody_attributes(self, ssml_text: str) -> None:
-        """Validate prosody tag attributes"""
-        prosody_tags = re.findall(r'<prosody([^>]*)>', ssml_text)
-
-        for attributes in prosody_tags:
-            attr_matches = re.findall(r'(\w+)=["\']([^"\']*)["\']', attributes)
-
-            for attr_name, attr_value in attr_matches:
-                if attr_name in self.valid_prosody_attrs:
-                    valid_values = self.valid_prosody_attrs[attr_name]
-                    if attr_value not in valid_values:
-                        # Check if it's a relative value (like +20% or -10%)
-                        if not re.match(r'[+-]\d+(\.\d+)?%?|[+-]?\d+(\.\d+)?(Hz|st)', attr_value):
-                            self.validation_warnings.append(
-                                f"Prosody {attr_name}='{attr_value}' not in standard values: {valid_values}"
-                            )
-                else:
-                    self.validation_warnings.append(f"Unknown prosody attribute: {attr_name}")
-
-    def _validate_break_tags(self, ssml_text: str) -> None:
-        """Validate break tag syntax and values"""
-        break_tags = re.findall(r'<break([^>]*)/?>', ssml_text)
-
-        for attributes in break_tags:
-            if 'time=' in attributes:
-                time_match = re.search(r'time=["\']([^"\']*)["\']', attributes)
-                if time_match:
-                    time_value = time_match.group(1)
-                    # Validate time format (e.g., "500ms", "2s", "1.5s")
-                    if not re.match(r'\d+(\.\d+)?(ms|s)', time_value):
-                        self.validation_errors.append(f"Invalid break time format: '{time_value}'")
-
-    def _validate_emphasis_tags(self, ssml_text: str) -> None:
-        """Validate emphasis tag levels"""
-        emphasis_tags = re.findall(r'<emphasis([^>]*)>', ssml_text)
-
-        for attributes in emphasis_tags:
-            if 'level=' in attributes:
-                level_match = re.search(r'level=["\']([^"\']*)["\']', attributes)
-                if level_match:
-                    level_value = level_match.group(1)
-                    if level_value not in self.valid_emphasis_levels:
-                        self.validation_errors.append(
-                            f"Invalid emphasis level '{level_value}'. Valid: {self.valid_emphasis_levels}"
-                        )
-
-    def _validate_phoneme_tags(self, ssml_text: str) -> None:
-        """Validate phoneme pronunciation tags"""
-        phoneme_tags = re.findall(r'<phoneme([^>]*)>', ssml_text)
-
-        for attributes in phoneme_tags:
-            # Check for required alphabet attribute
-            if 'alphabet=' not in attributes:
-                self.validation_errors.append("Phoneme tag missing required 'alphabet' attribute")
-
-            # Check for required ph attribute
-            if 'ph=' not in attributes:
-                self.validation_errors.append("Phoneme tag missing required 'ph' attribute")
-
-            # Validate alphabet type
-            alphabet_match = re.search(r'alphabet=["\']([^"\']*)["\']', attributes)
-            if alphabet_match:
-                alphabet = alphabet_match.group(1)
-                if alphabet not in ['ipa', 'x-sampa', 'x-amazon-pron']:
-                    self.validation_warnings.append(f"Unknown phoneme alphabet: '{alphabet}'")
-
-    def _validate_tag_nesting(self, ssml_text: str) -> None:
-        """Validate proper SSML tag nesting"""
-        # This is a simplified nesting check
-        # Remove self-closing tags first
-        text_no_self_closing = re.sub(r'<[^>]+/>', '', ssml_text)
-
-        # Find all opening and closing tags
-        tags = re.findall(r'<(/?)([a-zA-Z][a-zA-Z0-9]*)', text_no_self_closing)
-
-        stack = []
-        for is_closing, tag_name in tags:
-            if not is_closing:  # Opening tag
-                stack.append(tag_name)
-            else:  # Closing tag
-                if not stack:
-                    self.validation_errors.append(f"Closing tag </{tag_name}> without matching opening tag")
-                elif stack[-1] != tag_name:
-                    self.validation_warnings.append(f"Tag nesting issue: expected </{stack[-1]}>, found </{tag_name}>")
-                else:
-                    stack.pop()
-
-        # Check for unclosed tags
-        if stack:
-            for tag in stack:
-                self.validation_errors.append(f"Unclosed tag: <{tag}>")
-
-    def _validate_content_balance(self, ssml_text: str) -> None:
-        """Validate content balance and optimization"""
-        # Remove all markup to get plain text
-        plain_text = re.sub(r'<[^>]*>', '', ssml_text)
-        plain_text = re.sub(r'<!--.*?-->', '', plain_text, flags=re.DOTALL)
-        plain_text = plain_text.strip()
-
-        # Calculate ratios
-        total_length = len(ssml_text)
-        markup_length = total_length - len(plain_text)
-        content_length = len(plain_text)
-
-        if content_length == 0:
-            self.validation_errors.append("No actual content found in SSML")
-            return
-
-        markup_ratio = (markup_length / total_length) * 100
-
-        # Warn if markup is too heavy
-        if markup_ratio > 50:
-            self.validation_warnings.append(f"High markup ratio: {markup_ratio:.1f}% (consider simplifying)")
-        elif markup_ratio > 40:
-            self.validation_warnings.append(f"Moderate markup ratio: {markup_ratio:.1f}%")
-
-    def _generate_statistics(self, ssml_text: str) -> Dict[str, Any]:
-        """Generate comprehensive SSML statistics"""
-        stats = {
-            'total_characters': len(ssml_text),
-            'prosody_tags': len(re.findall(r'<prosody', ssml_text)),
-            'break_tags': len(re.findall(r'<break', ssml_text)),
-            'emphasis_tags': len(re.findall(r'<emphasis', ssml_text)),
-            'phoneme_tags': len(re.findall(r'<phoneme', ssml_text)),
-            'comment_blocks': len(re.findall(r'<!--.*?-->', ssml_text, flags=re.DOTALL)),
-        }
-
-        # Calculate plain text
-        plain_text = re.sub(r'<[^>]*>', '', ssml_text)
-        plain_text = re.sub(r'<!--.*?-->', '', plain_text, flags=re.DOTALL).strip()
-
-        stats['plain_text_characters'] = len(plain_text)
-        stats['markup_characters'] = stats['total_characters'] - stats['plain_text_characters']
-        stats['markup_percentage'] = (stats['markup_characters'] / stats['total_characters']) * 100
-
-        # Estimate speech duration (using empirically validated 206 WPM from Episode 1)
-        word_count = len(plain_text.split())
-        stats['word_count'] = word_count
-        stats['estimated_duration_minutes'] = word_count / 206  # Episode 1 empirical rate
-
-        # Break analysis
-        break_times = re.findall(r'<break time=["\']([^"\']*)["\']', ssml_text)
-        total_break_time = 0
-        for break_time in break_times:
-            if break_time.endswith('s'):
-                total_break_time += float(break_time[:-1])
-            elif break_time.endswith('ms'):
-                total_break_time += float(break_time[:-2]) / 1000
-
-        stats['total_break_time_seconds'] = total_break_time
-        stats['total_break_time_minutes'] = total_break_time / 60
-
-        return stats
+    def _run_rules(self, ssml_text: str) -> List[ValidationRule]:
+        """Run every event rule over one walk of the document, then the raw-text rules"""
+        rules = [rule(self) for rule in self.rules]
+        event_rules = [rule for rule in rules if rule.needs == EVENTS]
+        visitors: List[SSMLVisitor] = [rule for rule in event_rules if not rule.markup_only]
+        visitors.append(MarkupRuleCache([rule for rule in event_rules if rule.markup_only], self.rule_timings))
+        walk_ssml(ssml_text, visitors, self.rule_timings)
+        self._check_raw_text(rules, ssml_text)
+        return rules
+
+    def _check_raw_text(self, rules: List[ValidationRule], ssml_text: str) -> None:
+        """Run the RAW_TEXT rules on the whole document"""
+        for rule in rules:
+            if rule.needs == RAW_TEXT:
+                check = rule.check_text
+                if self.rule_timings is not None:
+                    check = timed_handler(check, rule.name, self.rule_timings)
+                check(ssml_text)
 
     def _generate_recommendations(self) -> List[str]:
         """Generate optimization recommendations"""
@@ -295,11 +556,11 @@ class SSMLValidator:
 
 
 def main():
-    """Test SSML validation with Episode 1 script"""
+    """Validate one script (default: Episode 1); use batch_validate.py for a season or the series"""
     print("🔍 SSML Processing & Validation System")
     print("=" * 60)
 
-    script_path = "nobody-knows/production/ep_001_test/script/tts_optimized_script.ssml"
+    script_path = sys.argv[1] if len(sys.argv) > 1 else "nobody-knows/production/ep_001_test/script/tts_optimized_script.ssml"
 
     # Validate and read the script
     try:
@@ -326,8 +587,8 @@ def main():
         print(f"❌ Error reading script: {e}")
         return
 
-    # Initialize validator
-    validator = SSMLValidator()
+    # Initialize validator (optionally with a TTS model profile, e.g. eleven_multilingual_v2)
+    validator = SSMLValidator(model=sys.argv[2] if len(sys.argv) > 2 else None)
 
     # Run validation
     print("🔍 Running comprehensive SSML validation...")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Audio Pipeline Tests
+Validates pipelined synthesis, chunk validation and concatenation against a local stub API.
+"""
+
+import sys
+import os
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add archived API clients to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '.archived', 'python-api-clients'))
+
+from audio_pipeline import AudioPipeline
+from http_client import PooledHTTPClient
+from mp3_concat import parse_frame_header
+from tts_direct_api import ElevenLabsDirectAPI
+
+FRAME_HEADER = bytes((0xFF, 0xFB, 0x90, 0x40))  # MPEG-1 Layer III, 128 kbps, 44.1 kHz
+FRAME_LENGTH = parse_frame_header(FRAME_HEADER).length
+
+
+class _StubMP3Handler(BaseHTTPRequestHandler):
+    """Answers synthesis requests with two MP3 frames tagged by paragraph number"""
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    texts = []
+
+    def do_POST(self):
+        text = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["text"]
+        with self.lock:
+            self.texts.append(text)
+        marker = int(text.split("number ")[1].split()[0])
+        audio = (FRAME_HEADER + bytes([marker]) * (FRAME_LENGTH - 4)) * 2
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.send_header("Content-Length", str(len(audio)))
+        self.end_headers()
+        self.wfile.write(audio)
+
+    def log_message(self, *args):
+        pass
+
+
+class _FlakyValidator:
+    """Scores every chunk perfectly except the first attempt at paragraph 3"""
+
+    def __init__(self):
+        self.calls = []
+
+    def validate_chunk(self, audio_path, source_text):
+        self.calls.append(audio_path)
+        first_try = sum(1 for path in self.calls if path == audio_path) == 1
+        accuracy = 40.0 if "number 3 " in source_text and first_try else 100.0
+        return {"success": True, "transcript": "", "word_accuracy_percent": accuracy, "request_seconds": 0.0}
+
+
+def test_pipeline_appends_in_order_and_resynthesizes_failed_chunks(tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubMP3Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        script = tmp_path / "script.ssml"
+        script.write_text("<speak>" + "".join(
+            f'<prosody rate="95%">Paragraph number {i} of the episode.</prosody>' for i in range(6)
+        ) + "</speak>")
+
+        tts = ElevenLabsDirectAPI("test-key", cache_dir=str(tmp_path / "cache"), max_concurrency=3,
+                                  requests_per_second=100, burst=6,
+                                  base_url=f"http://127.0.0.1:{server.server_address[1]}/v1",
+                                  http_client=PooledHTTPClient())
+        validator = _FlakyValidator()
+        log = AudioPipeline(tts, validator).run(str(script), str(tmp_path / "audio"), "ep", max_chunk_size=90)
+
+        chunk_count = log["total_chunks"]
+        assert log["success"] and log["chunks_appended"] == chunk_count
+        assert log["resynthesized_chunks"] == [4] and not log["low_accuracy_chunks"]
+        # The re-synthesis bypassed the cache and hit the API again
+        assert len(_StubMP3Handler.texts) == chunk_count + 1
+        assert len(validator.calls) == chunk_count + 1
+
+        data = open(log["final_audio_path"], "rb").read()
+        markers = [data[offset + 4] for offset in range(FRAME_LENGTH, len(data), FRAME_LENGTH)]
+        assert markers == sorted(markers) and log["final_audio"]["frames"] == 2 * chunk_count
+        assert log["timing"]["first_append_seconds"] is not None
+    finally:
+        server.shutdown()
+
+
+class _BrokenValidator:
+    """Raises for paragraph 2 instead of returning a result"""
+
+    def validate_chunk(self, audio_path, source_text):
+        if "number 2 " in source_text:
+            raise OSError("transcript upload failed")
+        return {"success": True, "transcript": "", "word_accuracy_percent": 100.0, "request_seconds": 0.0}
+
+
+def test_pipeline_plans_prices_by_model_and_logs_raising_stages(tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubMP3Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        script = tmp_path / "script.ssml"
+        script.write_text("<speak>" + "".join(
+            f'<prosody rate="95%">Paragraph number {i} of the episode.</prosody>' for i in range(4)
+        ) + "</speak>")
+
+        tts = ElevenLabsDirectAPI("test-key", cache_dir=str(tmp_path / "cache"), max_concurrency=2,
+                                  requests_per_second=100, burst=4,
+                                  base_url=f"http://127.0.0.1:{server.server_address[1]}/v1",
+                                  http_client=PooledHTTPClient())
+        log = AudioPipeline(tts, _BrokenValidator()).run(str(script), str(tmp_path / "audio"), "ep",
+                                                         max_chunk_size=90)
+
+        assert log["success"] and log["plan"]["model"] == log["model_id"]
+        assert log["estimated_cost"] == tts.plan_episode(script.read_text(), 90).cost
+        price = log["plan"]["price_per_1k_characters"]
+        assert log["actual_cost"] == log["characters_synthesized"] / 1000 * price
+        broken = [record for record in log["chunks"] if "validation_error" in record]
+        assert len(broken) == 1 and "transcript upload failed" in broken[0]["validation_error"]
+        assert log["unvalidated_chunks"] == [broken[0]["chunk_number"]]
+        assert os.path.exists(tmp_path / "audio" / "ep_pipeline_log.json")
+    finally:
+        server.shutdown()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Batch SSML Validation Tests
+Validates season discovery, JSON-lines output, exit status and hash-manifest skipping.
+"""
+
+import sys
+import os
+import io
+import json
+
+# Add SSML validation modules to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'nobody-knows', 'src', 'validation'))
+
+from batch_validate import (EXIT_FAILURE, EXIT_INVALID, EXIT_VALID, discover_scripts, run_batch,
+                            season_episodes)
+
+VALID_SSML = '<?xml version="1.0"?>\n<speak>\n<p>Nobody knows <break time="500ms"/> for sure.</p>\n</speak>\n'
+INVALID_SSML = '<?xml version="1.0"?>\n<speak>\n<p>Unclosed <emphasis level="loud">thought</p>\n</speak>\n'
+
+
+def _write_script(production_dir, folder, content):
+    script_dir = os.path.join(production_dir, folder, "script")
+    os.makedirs(script_dir, exist_ok=True)
+    path = os.path.join(script_dir, "tts_optimized_script.ssml")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return path
+
+
+def _run(scripts, manifest_path, **kwargs):
+    out = io.StringIO()
+    status = run_batch(scripts, manifest_path, out=out, **kwargs)
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    return status, {line["episode"]: line for line in lines[:-1]}, lines[-1]["summary"]
+
+
+def test_batch_validation_streams_results_and_skips_unchanged_scripts(tmp_path):
+    production_dir = str(tmp_path)
+    manifest_path = os.path.join(production_dir, "manifest.json")
+    _write_script(production_dir, "ep_001_test", VALID_SSML)
+    _write_script(production_dir, "ep_002_pilot", VALID_SSML.replace("sure", "certain"))
+    invalid_path = _write_script(production_dir, "ep_026_season2", INVALID_SSML)
+
+    assert season_episodes([2])[:2] == [26, 27]
+    assert [episode for episode, _ in discover_scripts(production_dir)] == [1, 2, 26]
+    assert [episode for episode, _ in discover_scripts(production_dir, season_episodes([1]))] == [1, 2]
+
+    status, results, summary = _run(discover_scripts(production_dir), manifest_path, workers=2)
+    assert status == EXIT_INVALID
+    assert results[1]["status"] == "valid" and not results[1]["cached"]
+    assert results[26]["status"] == "invalid"
+    assert "Invalid emphasis level 'loud'. Valid: ['strong', 'moderate', 'reduced']" in results[26]["errors"]
+    assert summary["valid"] == 2 and summary["invalid"] == 1 and summary["exit_status"] == EXIT_INVALID
+
+    # Unchanged scripts come from the manifest; only the fixed one is revalidated
+    with open(invalid_path, 'w', encoding='utf-8') as f:
+        f.write(VALID_SSML)
+    status, results, summary = _run(discover_scripts(production_dir), manifest_path)
+    assert status == EXIT_VALID
+    assert results[1]["cached"] and results[2]["cached"] and not results[26]["cached"]
+    assert summary["cached"] == 2
+
+    status, results, _ = _run(discover_scripts(production_dir), manifest_path, force=True)
+    assert status == EXIT_VALID and not any(result["cached"] for result in results.values())
+
+    assert _run([], manifest_path)[0] == EXIT_FAILURE
+    missing = os.path.join(production_dir, "ep_003", "script", "missing.ssml")
+    status, results, _ = _run([(3, missing)], None)
+    assert status == EXIT_FAILURE and results[3]["status"] == "error"
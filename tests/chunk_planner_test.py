@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Chunk Planner Tests
+Validates that synthesis plans fit provider limits and trade billed markup against wall-clock time.
+"""
+
+import sys
+import os
+import glob
+import json
+
+import pytest
+
+# Add SSML validation modules to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'nobody-knows', 'src', 'validation'))
+
+from chunk_planner import (choose_model, fit_latency, load_default_model, load_planning_config,
+                           measured_latency, plan_synthesis, ssml_tags, wall_clock_seconds)
+from ssml_benchmark import REFERENCE_SCRIPTS_DIR, reference_script_ssml
+
+
+def _reference_script():
+    path = sorted(glob.glob(os.path.join(REFERENCE_SCRIPTS_DIR, "*.md")))[0]
+    with open(path, 'r', encoding='utf-8') as f:
+        return reference_script_ssml(f.read(), sentences=True)
+
+
+def test_wall_clock_respects_concurrency_and_rate_limit():
+    assert wall_clock_seconds([2.0] * 4, concurrency=1) == 8.0
+    assert wall_clock_seconds([2.0] * 4, concurrency=4) == 2.0
+    # 4 workers, but only one request every half second after a burst of 2
+    assert wall_clock_seconds([2.0] * 4, concurrency=4, requests_per_second=2.0, burst=2) == 3.0
+
+    fitted = fit_latency([(1000, 1.5), (2000, 2.5), (4000, 4.5)])
+    assert fitted == pytest.approx({"request_overhead_seconds": 0.5, "seconds_per_1k_characters": 1.0})
+    assert fit_latency([(1000, 1.5), (1000, 1.7)]) is None
+
+
+def test_plan_fits_limits_and_trades_markup_for_parallelism():
+    ssml_text = _reference_script()
+    _, profiles = load_planning_config()
+    plan = plan_synthesis(ssml_text)
+    assert plan.model in profiles
+    assert all(chunk.size <= plan.max_chars <= profiles[plan.model]["max_characters"] for chunk in plan.chunks)
+    assert plan.billed_characters == sum(chunk.size for chunk in plan.chunks)
+    assert [alternative["model"] for alternative in plan.alternatives] == ["eleven_turbo_v2", "eleven_multilingual_v2"]
+
+    # Without a value on time, the fewest billed characters win: one request
+    assert len(plan_synthesis(ssml_text, time_cost_per_minute=0.0).chunks) == 1
+    # Valuing time and allowing more parallel requests splits the script further
+    fast = plan_synthesis(ssml_text, concurrency=16, requests_per_second=50, time_cost_per_minute=60.0)
+    assert len(fast.chunks) > len(plan.chunks) and fast.wall_clock_seconds < plan.wall_clock_seconds
+
+    fixed = plan_synthesis(ssml_text, models=["eleven_multilingual_v2"], max_chars=800)
+    assert fixed.model == "eleven_multilingual_v2" and max(chunk.size for chunk in fixed.chunks) <= 800
+    with pytest.raises(ValueError):
+        plan_synthesis(ssml_text, models=["eleven_multilingual_v2"], max_chars=20000)
+    with pytest.raises(ValueError):
+        plan_synthesis(ssml_text, models=["no_such_model"])
+
+
+def test_single_request_model_choice_and_measured_latency(tmp_path):
+    assert choose_model([20000])["model"] == "eleven_turbo_v2_5"
+    assert choose_model([20000], models=["eleven_multilingual_v2"]) is None
+    model, profile = load_default_model()
+    assert model == "eleven_turbo_v2_5" and profile["price_per_1k_characters"] > 0
+    assert choose_model([5000], models=["eleven_multilingual_v2", "eleven_flash_v2_5"],
+                        time_cost_per_minute=60.0)["model"] == "eleven_flash_v2_5"
+
+    log = {"model_id": "eleven_turbo_v2_5", "audio_files": [
+        {"characters": 1000, "request_seconds": 3.0, "cached": False},
+        {"characters": 3000, "request_seconds": 7.0, "cached": False},
+        {"characters": 9000, "request_seconds": 0.1, "cached": True},
+    ]}
+    (tmp_path / "ep_synthesis_log.json").write_text(json.dumps(log))
+    latency = measured_latency(glob.glob(str(tmp_path / "*_synthesis_log.json")))
+    assert latency["eleven_turbo_v2_5"] == pytest.approx(
+        {"request_overhead_seconds": 1.0, "seconds_per_1k_characters": 2.0})
+
+
+def test_phoneme_scripts_go_to_a_model_that_supports_them():
+    ssml_text = ('<speak>We asked <phoneme alphabet="ipa" ph="ˈjoʊʃuə bɛnˈdʒioʊ">Yoshua Bengio</phoneme>'
+                 ' about it.<break time="1s"/> Then we moved on.</speak>')
+    assert ssml_tags(ssml_text) == {"speak", "phoneme", "break"}
+
+    plan = plan_synthesis(ssml_text)
+    _, profiles = load_planning_config()
+    assert "phoneme" in profiles[plan.model]["supported_tags"] and plan.ignored_tags == ()
+    assert all(alternative["ignored_tags"] == ["phoneme"] for alternative in plan.alternatives)
+    assert choose_model([5000], tags=ssml_tags(ssml_text))["model"] == "eleven_turbo_v2"
+    # A fixed model is still planned, with the tags it ignores reported
+    assert plan_synthesis(ssml_text, models=["eleven_turbo_v2_5"]).ignored_tags == ("phoneme",)
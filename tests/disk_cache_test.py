@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Disk Cache Tests
+Validates persistence, TTL, eviction and multi-process access of the disk tier.
+"""
+
+import sys
+import os
+import time
+from multiprocessing import Process
+
+# Add production modules to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'nobody-knows', 'production'))
+
+from disk_cache import DiskCache, TieredCache, make_cache_key
+from query_cache import SizeAwareQueryCache
+
+
+def test_values_survive_reopen(tmp_path):
+    key = make_cache_key("research", "fusion energy", model="sonar-pro")
+    assert key != make_cache_key("research", "fusion energy", model="sonar")
+
+    cache = DiskCache(str(tmp_path))
+    cache.put(key, {"answer": "tokamaks", "sources": ["a", "b"]})
+    cache.put("audio", b"\xff\xfb\x90\x00" * 100)
+    cache.close()
+
+    reopened = DiskCache(str(tmp_path))
+    assert reopened.get(key) == {"answer": "tokamaks", "sources": ["a", "b"]}
+    assert reopened.get("audio") == b"\xff\xfb\x90\x00" * 100
+    assert len(reopened) == 2
+    reopened.close()
+
+
+def test_ttl_and_size_bounded_eviction(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=2_000, slots=64)
+    cache.put("short", "x", ttl=0.05)
+    time.sleep(0.1)
+    assert cache.get("short") is None
+
+    for i in range(20):
+        cache.put(f"k{i}", os.urandom(300))
+    stats = cache.get_stats()
+    assert stats["bytes"] <= 2_000
+    assert stats["evictions"] > 0
+    assert cache.get("k19") is not None
+    cache.close()
+
+
+def test_churn_reclaims_tombstones_and_keeps_probes_short(tmp_path):
+    cache = DiskCache(str(tmp_path), slots=256, default_ttl=None)
+    for i in range(5_000):
+        cache.put(f"churn{i}", i)
+        if i >= 100:
+            cache.delete(f"churn{i - 100}")
+
+    stats = cache.get_stats()
+    assert stats["compactions"] > 0
+    assert stats["entries"] == 100 and stats["tombstones"] <= 64
+
+    probes = stats["probes"]
+    for i in range(200):
+        assert cache.get(f"missing{i}") is None
+    assert (cache.get_stats()["probes"] - probes) / 200 < 8
+    assert all(cache.get(f"churn{i}") == i for i in range(4_900, 5_000))
+    cache.close()
+
+
+def _writer(root, offset):
+    cache = DiskCache(root, slots=1024)
+    for i in range(50):
+        cache.put(f"p{offset}_{i}", {"i": i})
+    cache.close()
+
+
+def test_concurrent_processes_share_index(tmp_path):
+    processes = [Process(target=_writer, args=(str(tmp_path), n)) for n in range(3)]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+
+    cache = DiskCache(str(tmp_path), slots=1024)
+    assert len(cache) == 150
+    assert cache.get("p2_49") == {"i": 49}
+    cache.close()
+
+
+def test_tiered_cache_promotes_disk_hits(tmp_path):
+    disk = DiskCache(str(tmp_path))
+    disk.put("query", {"answer": 42})
+    tiered = TieredCache(SizeAwareQueryCache(max_bytes=1_000_000), disk)
+
+    assert tiered.get("query") == {"answer": 42}
+    assert tiered.get("query") == {"answer": 42}
+    stats = tiered.get_stats()
+    assert stats["disk_hits"] == 1 and stats["memory_hits"] == 1
+
+    # A promoted entry expires from memory with the disk entry, not after the memory default TTL
+    disk.put("brief", "soon stale", ttl=0.1)
+    assert tiered.get("brief") == "soon stale"
+    time.sleep(0.15)
+    assert tiered.get("brief") is None
+    disk.close()
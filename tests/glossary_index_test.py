@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Glossary Index Tests
+Validates series glossary extraction, incremental rebuilds and phoneme injection.
+"""
+
+import sys
+import os
+import json
+
+# Add series utilities and archived API clients to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'nobody-knows', 'src', 'utils'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '.archived', 'python-api-clients'))
+
+from glossary_index import GlossaryIndex, build_glossary_index, extract_terms, words_to_number
+from term_matcher import build_glossary_matcher
+
+
+def test_extracts_proper_nouns_numerals_and_acronyms():
+    assert words_to_number(["two", "hundred", "ninety-eight"]) == 298
+    assert words_to_number(["eight", "fifteen"]) is None
+
+    terms = extract_terms(
+        "# Episode 2: When Machines Learn To Talk\n"
+        "Welcome back to Nobody Knows. The model from DeepMind's lab scored "
+        "<break time=\"1s\"/> eighty-seven percent, and AI-generated text fooled the FDA. "
+        "Researchers at DeepMind agree. Consider Google and the meeting at eight fifteen.")
+
+    assert set(terms["proper_nouns"]) == {"Nobody Knows", "DeepMind", "Google"}
+    assert terms["proper_nouns"]["DeepMind"] == 2
+    assert set(terms["acronyms"]) == {"AI", "FDA"}
+    assert set(terms["numerals"]) == {"eighty-seven percent", "eight fifteen"}
+
+
+def test_incremental_build_lookup_and_phoneme_injection(tmp_path):
+    scripts = tmp_path / "scripts"
+    scripts.mkdir()
+    (scripts / "ep001.md").write_text("Host: We asked Yoshua Bengio about GPS and seventeen percent of users.")
+    (scripts / "ep002.md").write_text("Host: Then Yoshua Bengio called OpenAI.")
+    (tmp_path / "pronunciations.json").write_text(json.dumps({"Yoshua Bengio": "ˈjoʊʃuə bɛnˈdʒioʊ"}))
+    sources = [str(path) for path in sorted(scripts.iterdir())]
+    index_path = str(tmp_path / "glossary_index.json")
+
+    stats = build_glossary_index(sources, index_path, str(tmp_path / "pronunciations.json"), content_dir=str(tmp_path))
+    assert stats["rebuilt_sources"] == ["scripts/ep001.md", "scripts/ep002.md"]
+
+    (scripts / "ep002.md").write_text("Host: Then Yoshua Bengio called Anthropic. Anthropic agreed.")
+    stats = build_glossary_index(sources, index_path, str(tmp_path / "pronunciations.json"), content_dir=str(tmp_path))
+    assert stats["rebuilt_sources"] == ["scripts/ep002.md"] and stats["reused_sources"] == ["scripts/ep001.md"]
+
+    index = GlossaryIndex.load(index_path)
+    terms = {entry.term: entry for entry in index.entries}
+    assert "OpenAI" not in terms and "Anthropic" in terms
+    assert terms["Yoshua Bengio"].count == 2 and terms["Yoshua Bengio"].category == "person_names"
+    assert terms["seventeen percent"].variants == ["17 percent", "17%"]
+    assert [entry.term for entry in index.lookup("yoshua")] == ["Yoshua Bengio"]
+    assert [(s, e) for s, e, _ in index.match_tokens("so yoshua bengio said".split())] == [(1, 3)]
+
+    ssml = index.inject_phonemes('<speak>Yoshua Bengio agreed. <phoneme alphabet="ipa" ph="x">Yoshua Bengio</phoneme></speak>')
+    assert ssml.count("<phoneme") == 2
+    assert ssml.startswith('<speak><phoneme alphabet="ipa" ph="ˈjoʊʃuə bɛnˈdʒioʊ">Yoshua Bengio</phoneme> agreed.')
+
+    matcher = build_glossary_matcher(index.to_validator_glossary())
+    found = matcher.scan("about 17% of users trusted the g p s and yoshua-bengio")
+    assert set(found["statistics"]) == {"seventeen percent"}
+    assert set(found["technical_terms"]) == {"gps"}
+    assert set(found["expert_names"]) == {"yoshua bengio"}
+
+
+def test_cross_source_checks_drop_capitalized_common_words(tmp_path):
+    (tmp_path / "scripts").mkdir()
+    (tmp_path / "bible").mkdir()
+    # Sentence-initial inside quotes, or mid-sentence after "stands for"
+    (tmp_path / "scripts" / "ep001.md").write_text(
+        'Ask it: "Help me plan." A stands for Action here. We host Nobody Knows near Google.')
+    (tmp_path / "scripts" / "ep002.md").write_text(
+        "We need help and action. Still, nobody can say. Then Elon Musk and Google disagree. It takes time.")
+    (tmp_path / "bible" / "episodes.json").write_text(json.dumps(
+        {"titles": ["Confession Time: the day Google shrugged", "Why Ignorance Is Wisdom",
+                    "A researcher at Stanford changed everything"]}))
+    sources = [str(path) for path in sorted(tmp_path.glob("*/*"))]
+    index_path = str(tmp_path / "glossary_index.json")
+    build_glossary_index(sources, index_path, None, content_dir=str(tmp_path))
+
+    index = GlossaryIndex.load(index_path)
+    by_category = {}
+    for entry in index.entries:
+        by_category.setdefault(entry.category, set()).add(entry.term)
+    assert by_category["proper_nouns"] == {"Nobody Knows", "Google"}
+    assert by_category["person_names"] == {"Elon Musk"}
+    assert {"bible/episodes.json", "scripts/ep001.md"} <= {
+        source for entry in index.entries for source in entry.sources}
+    assert [entry["term"] for entry in index.to_validator_glossary()["expert_names"]] == ["elon musk"]
+
+
+def test_word_acronyms_labels_and_compounds_stay_out_of_the_validator_glossary(tmp_path):
+    (tmp_path / "ep001.md").write_text(
+        "At eight twenty AM we tried the STAR method, AKA the GPU trick. Our Series A pitch "
+        "cited Nobel Prize-winning work from the University of Pennsylvania. "
+        "English-language data from Google, and English speakers at Google. Someone named Sarah "
+        "looked at Earth. Then Yoshua Bengio spoke.")
+    index_path = str(tmp_path / "glossary_index.json")
+    build_glossary_index([str(tmp_path / "ep001.md")], index_path, None, content_dir=str(tmp_path))
+
+    index = GlossaryIndex.load(index_path)
+    by_category = {}
+    for entry in index.entries:
+        by_category.setdefault(entry.category, set()).add(entry.term)
+    assert by_category["acronyms"] == {"GPU"}
+    assert by_category["proper_nouns"] == {"Nobel Prize", "University of Pennsylvania", "English", "Google"}
+    assert by_category["person_names"] == {"Yoshua Bengio"}
+
+    matcher = build_glossary_matcher(index.to_validator_glossary())
+    assert matcher.scan("i am happy to see the star at eight pm") == {}
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+MP3 Concatenation Tests
+Validates frame-level joining of synthesized chunks without ffmpeg.
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add archived API clients to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '.archived', 'python-api-clients'))
+
+from mp3_concat import MP3FormatError, concatenate_mp3, parse_frame_header
+
+# MPEG-1 Layer III, no CRC, 44.1 kHz joint stereo: 128 kbps (417 bytes) and 160 kbps (522 bytes)
+HEADER_128 = bytes((0xFF, 0xFB, 0x90, 0x40))
+HEADER_160 = bytes((0xFF, 0xFB, 0xA0, 0x40))
+
+
+def _frame(header: bytes, marker: int) -> bytes:
+    length = parse_frame_header(header).length
+    return header + bytes([marker]) * (length - 4)
+
+
+def _chunk(path, markers, header=HEADER_128) -> str:
+    id3 = b"ID3\x04\x00\x00\x00\x00\x00\x0a" + bytes(10)
+    xing = header + bytes(32) + b"Info" + bytes(parse_frame_header(header).length - 40)
+    body = b"".join(_frame(header, m) for m in markers)
+    path.write_bytes(id3 + xing + body + b"TAG" + bytes(125))
+    return str(path)
+
+
+def test_concatenate_strips_tags_and_writes_xing_header(tmp_path):
+    first = _chunk(tmp_path / "chunk_001.mp3", [1, 2, 3])
+    second = _chunk(tmp_path / "chunk_002.mp3", [4, 5], header=HEADER_160)
+    output = tmp_path / "episode.mp3"
+
+    result = concatenate_mp3([first, second], str(output))
+
+    data = output.read_bytes()
+    info = parse_frame_header(data)
+    assert data[36:40] == b"Xing" and result["vbr"]
+    assert int.from_bytes(data[44:48], "big") == 5 == result["frames"]
+    assert int.from_bytes(data[48:52], "big") == len(data) == result["bytes"]
+
+    offset, markers = info.length, []
+    while offset < len(data):
+        header = parse_frame_header(data, offset)
+        markers.append(data[offset + 4])
+        offset += header.length
+    assert markers == [1, 2, 3, 4, 5]
+    assert result["duration_seconds"] == round(5 * 1152 / 44100, 3)
+    assert os.path.exists(first) and os.path.exists(second)
+
+
+def test_concatenate_rejects_mismatched_chunks_and_leaves_no_output(tmp_path):
+    first = _chunk(tmp_path / "a.mp3", [1])
+    # Same bitrate but 48 kHz
+    other = _chunk(tmp_path / "b.mp3", [2], header=bytes((0xFF, 0xFB, 0x94, 0x40)))
+    junk = tmp_path / "c.mp3"
+    junk.write_bytes(b"not audio at all")
+
+    with pytest.raises(MP3FormatError):
+        concatenate_mp3([first, other], str(tmp_path / "out.mp3"))
+    with pytest.raises(MP3FormatError):
+        concatenate_mp3([str(junk)], str(tmp_path / "out.mp3"))
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.mp3", "b.mp3", "c.mp3"]
@@ -78,13 +78,13 @@ def test_system_reliability():
         success_count = 0
         for i in range(3):
             episode_id = f"test_episode_{i}"
-            success = processor.submit_episode(
+            future = processor.submit_episode(
                 episode_id=episode_id,
                 task_type="research",
                 data={"topic": f"Test Topic {i}"},
                 priority=5
             )
-            if success:
+            if future is not None:
                 success_count += 1
         
         logger.info(f"Successfully submitted {success_count}/3 episodes")
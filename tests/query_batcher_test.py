@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Research Query Batcher Tests
+Validates cross-episode batching, coalescing and fan-out of research queries.
+"""
+
+import sys
+import os
+import threading
+
+# Add production modules to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'nobody-knows', 'production'))
+
+from query_batcher import ResearchQueryBatcher, MockResearchBackend
+from semantic_cache import SemanticQueryCache
+from thread_safety import ThreadSafeEpisodeProcessor
+
+
+def test_concurrent_episodes_share_one_batched_call():
+    backend = MockResearchBackend()
+    batcher = ResearchQueryBatcher(backend, window_seconds=0.1, enabled=True)
+    try:
+        results = {}
+
+        def episode(episode_id):
+            fs = [batcher.submit(q, episode_id) for q in ("quantum error correction", "Qubit  decoherence")]
+            results[episode_id] = [f.result(timeout=2.0) for f in fs]
+
+        threads = [threading.Thread(target=episode, args=(f"ep_{i}",)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(backend.calls) == 1
+        assert len(backend.calls[0]) == 2
+        assert all(r[0]["query"] == "quantum error correction" for r in results.values())
+
+        stats = batcher.get_stats()
+        assert stats["queries_submitted"] == 8
+        assert stats["duplicates_coalesced"] == 6
+        assert stats["estimated_savings"] > 0
+    finally:
+        batcher.close()
+
+
+def test_batches_respect_max_size_and_backend_errors_fan_out():
+    class FailingBackend(MockResearchBackend):
+        def batch_search(self, queries):
+            raise ConnectionError("research tool unavailable")
+
+    batcher = ResearchQueryBatcher(MockResearchBackend(), window_seconds=0.05, max_batch_size=3, enabled=True)
+    try:
+        fs = [batcher.submit(f"query {i}", "ep_1") for i in range(7)]
+        assert len([f.result(timeout=2.0) for f in fs]) == 7
+        assert [len(call) for call in batcher.backend.calls] == [3, 3, 1]
+    finally:
+        batcher.close()
+
+    failing = ResearchQueryBatcher(FailingBackend(), window_seconds=0.01, enabled=True)
+    try:
+        fs = [failing.submit("same query", f"ep_{i}") for i in range(2)]
+        for f in fs:
+            assert isinstance(f.exception(timeout=2.0), ConnectionError)
+    finally:
+        failing.close()
+
+
+def test_cancelled_waiter_does_not_stop_the_batcher():
+    batcher = ResearchQueryBatcher(MockResearchBackend(), window_seconds=0.05, enabled=True)
+    try:
+        cancelled = batcher.submit("shared query", "ep_1")
+        waiting = batcher.submit("shared query", "ep_2")
+        assert cancelled.cancel()
+        assert waiting.result(timeout=2.0)["query"] == "shared query"
+        assert cancelled.cancelled()
+
+        # The flush thread survived and still serves new queries
+        assert batcher.search("later query", "ep_3", timeout=2.0)["query"] == "later query"
+    finally:
+        batcher.close()
+
+
+def test_disabled_batching_sends_queries_individually():
+    backend = MockResearchBackend()
+    batcher = ResearchQueryBatcher(backend, enabled=False)
+    batcher.search("a", "ep_1")
+    batcher.search("a", "ep_2")
+    assert backend.calls == [["a"], ["a"]]
+
+
+def test_processor_research_phase_uses_batcher():
+    backend = MockResearchBackend()
+    batcher = ResearchQueryBatcher(backend, window_seconds=0.1, enabled=True)
+    processor = ThreadSafeEpisodeProcessor(max_concurrent_episodes=3, research_batcher=batcher)
+    try:
+        fs = [
+            processor.submit_episode(f"ep_{i}", "research", {"queries": ["shared topic", f"topic {i}"]})
+            for i in range(3)
+        ]
+        results = [f.result(timeout=5.0) for f in fs]
+        assert all(len(r["query_results"]) == 2 for r in results)
+        assert len(backend.calls) < 3
+    finally:
+        processor.shutdown(timeout=5.0)
+        batcher.close()
+
+
+def test_semantic_cache_answers_near_duplicates_across_episodes():
+    cache = SemanticQueryCache(similarity_threshold=0.7, enabled=True)
+    cache.store("Latest advances in quantum error correction", {"answer": "surface codes"}, episode_id="ep_1")
+    cache.store("History of the Byzantine empire", {"answer": "Constantinople"}, episode_id="ep_1")
+
+    hit = cache.lookup("quantum error correction advances", episode_id="ep_7")
+    assert hit is not None and hit.result == {"answer": "surface codes"}
+    assert hit.source_episode == "ep_1" and hit.similarity >= 0.7
+    assert cache.lookup("deep sea hydrothermal vents", episode_id="ep_7") is None
+
+    stats = cache.get_stats()
+    assert stats["per_episode"]["ep_7"]["hit_rate"] == 0.5
+    assert stats["per_episode"]["ep_7"]["cross_episode_hits"] == 1
+
+
+def test_semantic_cache_keeps_freshness_words():
+    cache = SemanticQueryCache(enabled=True)
+    cache.store("quantum error correction", {"answer": "2023 survey"})
+    cache.store("History of the Byzantine empire", {"answer": "Constantinople"})
+    assert cache.lookup("latest quantum error correction") is None
+    assert cache.lookup("current quantum error correction") is None
+    assert cache.lookup("Quantum error-correction?").result == {"answer": "2023 survey"}
+
+
+def test_semantic_cache_evicts_lru_and_round_trips(tmp_path):
+    cache = SemanticQueryCache(max_entries=2, enabled=True)
+    cache.store("alpha topic", 1)
+    cache.store("beta topic", 2)
+    cache.lookup("alpha topic")
+    cache.store("gamma topic", 3)
+    assert len(cache) == 2
+    assert cache.lookup("beta topic") is None
+    assert cache.lookup("alpha topic").result == 1
+
+    path = str(tmp_path / "research_cache.json")
+    cache.save(path)
+    restored = SemanticQueryCache(enabled=True)
+    assert restored.load(path) == 2
+    assert restored.lookup("gamma topic").result == 3
+    assert SemanticQueryCache(enabled=False).load(path) == 0
+
+
+def test_batcher_serves_cached_research_without_backend_call():
+    backend = MockResearchBackend()
+    cache = SemanticQueryCache(enabled=True)
+    batcher = ResearchQueryBatcher(backend, enabled=False, cache=cache)
+    batcher.search("Black holes and Hawking radiation", "ep_1")
+    batcher.search("hawking radiation from black holes", "ep_2")
+    assert len(backend.calls) == 1
+    assert batcher.get_stats()["cache_hits"] == 1
+
+
+def test_failing_cache_write_still_resolves_every_waiter():
+    class BrokenCache(SemanticQueryCache):
+        def store(self, query, result, episode_id=None):
+            raise MemoryError("cache full")
+
+    backend = MockResearchBackend()
+    batcher = ResearchQueryBatcher(backend, window_seconds=0.01, enabled=True, cache=BrokenCache(enabled=True))
+    try:
+        fs = [batcher.submit(f"query {i}", "ep_1") for i in range(3)]
+        assert [f.result(timeout=2.0)["query"] for f in fs] == ["query 0", "query 1", "query 2"]
+        # The flusher thread survived and keeps serving
+        assert batcher.search("one more query", "ep_2", timeout=2.0)["query"] == "one more query"
+        assert batcher.flush(timeout=1.0)
+    finally:
+        batcher.close()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Query Cache Tests
+Validates eviction, TTL expiry, byte budgets and counters of the monitor's query cache.
+"""
+
+import sys
+import os
+import threading
+import time
+
+# Add production modules to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'nobody-knows', 'production'))
+
+from query_cache import SizeAwareQueryCache
+
+
+def test_entry_limit_evicts_least_used_and_counts():
+    cache = SizeAwareQueryCache(max_entries=2, shards=1)
+    cache.put("a", 1, size=100)
+    cache.put("b", 2, size=100)
+    assert cache.get("a") == 1
+    cache.put("c", 3, size=100)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.get("b") is None
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 3 and stats["misses"] == 1
+    assert stats["hit_rate"] == 0.75
+
+
+def test_ttl_expires_lazily_and_on_purge():
+    cache = SizeAwareQueryCache(max_entries=10, default_ttl=0.05)
+    cache.put("short", 1)
+    cache.put("forever", 2, ttl=None)
+    cache.put("swept", 3)
+    time.sleep(0.1)
+
+    assert cache.get("short") is None
+    assert cache.purge_expired() == 1
+    assert cache.get("forever") == 2
+    assert cache.stats()["expirations"] == 2
+
+
+def test_concurrent_access_stays_bounded():
+    cache = SizeAwareQueryCache(max_entries=100, shards=4)
+
+    def worker(offset):
+        for i in range(1000):
+            cache.put(f"q{offset}_{i}", i)
+            cache.get(f"q{offset}_{i - 1}")
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = cache.stats()
+    assert len(cache) <= 100
+    assert stats["evictions"] == 4000 - len(cache)
+
+
+def test_size_aware_cache_keeps_small_hot_entries_under_byte_budget():
+    cache = SizeAwareQueryCache(max_bytes=10_000, shards=1)
+    cache.put("small", "x", size=100)
+    cache.get("small")
+    cache.put("medium", "y", size=4_000)
+    cache.put("huge", "z", size=7_000)
+
+    assert cache.total_bytes <= 10_000
+    # The largest, never-reread entry is the cheapest to lose
+    assert "small" in cache and "medium" in cache
+    assert "huge" not in cache
+    assert cache.put("too_big", "w", size=20_000) is False
+    assert cache.stats()["rejected"] == 1
+
+
+def test_size_aware_cache_expensive_entries_outlive_cheap_ones():
+    cache = SizeAwareQueryCache(max_bytes=3_000, shards=1)
+    cache.put("research", {"answer": "..."}, cost=1.50, size=1_000)
+    cache.put("cheap_a", "a", cost=0.01, size=1_000)
+    cache.put("cheap_b", "b", cost=0.01, size=1_000)
+    cache.put("cheap_c", "c", cost=0.01, size=1_000)
+    assert "research" in cache
+    assert len(cache) == 3
+
+
+def test_resize_degrades_gradually():
+    cache = SizeAwareQueryCache(max_bytes=100_000, shards=1)
+    for i in range(50):
+        cache.put(f"q{i}", i, size=1_000)
+        for _ in range(i % 5):
+            cache.get(f"q{i}")
+
+    released = cache.resize(25_000)
+    assert released == 25_000
+    assert len(cache) == 25
+    # Frequently read entries survive the shrink
+    assert all(f"q{i}" in cache for i in range(4, 50, 5))
+
+
+def test_size_aware_budget_is_cache_wide_not_per_shard():
+    cache = SizeAwareQueryCache(max_bytes=16_000, shards=8)
+    # Larger than an eighth of the budget: fits because the budget is shared
+    assert cache.put("large_research", "r", size=6_000)
+    assert "large_research" in cache
+
+    for i in range(20):
+        cache.put(f"small{i}", i, size=1_000)
+    assert cache.total_bytes <= 16_000
+    assert cache.stats()["bytes"] == cache.total_bytes
+
+    cache.resize(4_000)
+    assert cache.total_bytes <= 4_000
+    assert cache.put("after_shrink", "a", size=3_000, cost=10.0) and "after_shrink" in cache
+    assert cache.stats()["rejected"] == 0
+
+
+def test_size_aware_entry_limit_is_cache_wide():
+    cache = SizeAwareQueryCache(max_entries=3, shards=8)
+    for i in range(10):
+        cache.put(f"q{i}", i, size=10)
+    assert len(cache) == 3 and cache.stats()["size"] == 3
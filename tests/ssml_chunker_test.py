@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+SSML Chunker Tests
+Validates that structure-aware chunks are balanced, complete, within size and minimal in number.
+"""
+
+import sys
+import os
+import glob
+import re
+
+import pytest
+
+# Add SSML validation modules to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'nobody-knows', 'src', 'validation'))
+
+from ssml_chunker import END_OF_SCRIPT, SENTENCE, WORD, SSMLDocument, chunk_ssml
+from ssml_validator import SSMLValidator
+from ssml_benchmark import REFERENCE_SCRIPTS_DIR, reference_script_ssml
+
+
+def _words(ssml_text):
+    return re.sub(r'<!--.*?-->|<[^>]*>', ' ', ssml_text, flags=re.DOTALL).split()
+
+
+def test_chunks_of_reference_scripts_are_valid_complete_and_within_size():
+    validator = SSMLValidator()
+    for path in sorted(glob.glob(os.path.join(REFERENCE_SCRIPTS_DIR, "*.md")))[:3]:
+        with open(path, 'r', encoding='utf-8') as f:
+            ssml_text = reference_script_ssml(f.read(), sentences=True)
+        for max_chars in (300, 800, 1600):
+            chunks = chunk_ssml(ssml_text, max_chars)
+            assert all(len(chunk.content) == chunk.size <= max_chars for chunk in chunks)
+            assert all(validator.validate_ssml_structure(chunk.content)['valid'] for chunk in chunks)
+            assert [word for chunk in chunks for word in _words(chunk.content)] == _words(ssml_text)
+
+            # No partition over the same boundaries has fewer chunks
+            document = SSMLDocument(ssml_text)
+            boundaries = document.candidate_boundaries(max_chars)
+            fewest = [0] + [len(boundaries)] * (len(boundaries) - 1)
+            for j in range(1, len(boundaries)):
+                for i in range(j):
+                    start, end = document.span(boundaries[i], boundaries[j])
+                    if start < end and document.chunk_size(boundaries[i], boundaries[j]) <= max_chars:
+                        fewest[j] = min(fewest[j], fewest[i] + 1)
+            assert len(chunks) == fewest[-1]
+
+
+def test_cuts_reopen_enclosing_tags_and_prefer_paragraphs():
+    ssml_text = ('<?xml version="1.0"?>\n<speak>\n<!-- intro -->\n<prosody rate="slow"><p>First idea here. '
+                 'It continues.</p><p>Second <phoneme alphabet="ipa" ph="tə">tomato tomato tomato</phoneme> '
+                 'idea.</p></prosody>\n</speak>\n')
+    assert [chunk.content for chunk in chunk_ssml(ssml_text, 130)] == [
+        '<speak><prosody rate="slow"><p>First idea here. It continues.</p></prosody></speak>',
+        '<speak><prosody rate="slow"><p>Second <phoneme alphabet="ipa" ph="tə">tomato tomato tomato</phoneme>'
+        ' idea.</p></prosody></speak>',
+    ]
+
+    # Too long for two chunks: falls back to word boundaries, never inside the phoneme
+    chunks = chunk_ssml(ssml_text, 120)
+    assert [chunk.content for chunk in chunks] == [
+        '<speak><prosody rate="slow"><p>First idea here. It continues.</p><p>Second</p></prosody></speak>',
+        '<speak><prosody rate="slow"><p><phoneme alphabet="ipa" ph="tə">tomato tomato tomato</phoneme>'
+        '</p></prosody></speak>',
+        '<speak><prosody rate="slow"><p>idea.</p></prosody></speak>',
+    ]
+    assert [chunk.boundary for chunk in chunks] == [WORD, WORD, END_OF_SCRIPT]
+    assert chunk_ssml('<speak>One. Two. Three.</speak>', 30)[0].boundary == SENTENCE
+
+    with pytest.raises(ValueError):
+        chunk_ssml('<speak><prosody>Unclosed</speak>')
+    with pytest.raises(ValueError):
+        chunk_ssml('<speak><phoneme alphabet="ipa" ph="x">far too long to fit</phoneme></speak>', 40)
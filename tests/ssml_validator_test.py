@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+SSML Validator Tests
+Validates the single-pass tokenizer and rule visitors against the previous multi-pass validator.
+"""
+
+import sys
+import os
+import glob
+import random
+
+import pytest
+
+# Add SSML validation modules to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'nobody-knows', 'src', 'validation'))
+
+from ssml_incremental import IncrementalSSMLValidator, split_blocks
+from ssml_parser import INVALID, tokenize_ssml
+from ssml_validator import SSMLValidator, select_rules
+from ssml_benchmark import REFERENCE_SCRIPTS_DIR, MultipassSSMLValidator, reference_script_ssml
+
+
+def test_statistics_match_multipass_validator_on_reference_scripts():
+    validator, baseline = SSMLValidator(), MultipassSSMLValidator()
+    for path in sorted(glob.glob(os.path.join(REFERENCE_SCRIPTS_DIR, "*.md"))):
+        with open(path, 'r', encoding='utf-8') as f:
+            markdown = f.read()
+        for sentences in (False, True):
+            ssml_text = reference_script_ssml(markdown, sentences)
+            assert "".join(event.text for event in tokenize_ssml(ssml_text)) == ssml_text
+
+            result, expected = validator.validate_ssml_structure(ssml_text), baseline.validate_ssml_structure(ssml_text)
+            assert result['valid'] and expected['valid']
+            assert result['statistics'] == expected['statistics']
+            assert result['warnings'] == expected['warnings']
+
+
+def test_rules_report_structural_and_attribute_problems():
+    ssml_text = (
+        '<speak><prosody rate="glacial" tone="x">Hello <emphasis level="loud">there</emphasis></prosody>'
+        '<break time="soon"/><break time="500ms"/><phoneme>tomato</phoneme><say-as interpret-as="date">x</say-as>'
+        '<p><s>Open</p> R&D <prosody rate="glacial" tone="x">again</prosody></speak>'
+    )
+    result = SSMLValidator().validate_ssml_structure(ssml_text)
+
+    assert not result['valid']
+    assert result['errors'] == [
+        "XML parsing error: mismatched tag: line 1, column 211",
+        "Invalid break time format: 'soon'",
+        "Invalid emphasis level 'loud'. Valid: ['strong', 'moderate', 'reduced']",
+        "Phoneme tag missing required 'alphabet' attribute",
+        "Phoneme tag missing required 'ph' attribute",
+        "Unclosed tag: <speak>",
+        "Unclosed tag: <p>",
+        "Unclosed tag: <s>",
+    ]
+    # Repeated tags report every occurrence; say-as is a known element
+    assert result['warnings'].count("Unknown prosody attribute: tone") == 2
+    assert not any("say" in warning for warning in result['warnings'])
+    assert "Tag nesting issue: expected </s>, found </p>" in result['warnings']
+    assert result['statistics']['total_break_time_seconds'] == 0.5
+    assert result['statistics']['word_count'] == 4  # tags do not separate words
+
+    unterminated = SSMLValidator().validate_ssml_structure('<?xml version="1.0"?><speak>a < b &amp; c</speak>')
+    assert unterminated['errors'][0].startswith("XML parsing error: not well-formed (invalid token)")
+    assert [event.kind for event in tokenize_ssml("a < b")] == ["text", INVALID]
+
+
+def test_quoted_angle_brackets_doctype_and_cdata_match_elementtree():
+    declaration = '<?xml version="1.0"?>\n'
+    well_formed = [
+        declaration + '<speak><phoneme alphabet="x-sampa" ph="p_>a">pa</phoneme> <prosody rate="slow">x</prosody></speak>',
+        declaration + '<!DOCTYPE speak PUBLIC "-//W3C//DTD SYNTHESIS 1.0//EN"\n  "synthesis.dtd">\n<speak>a</speak>',
+        declaration + '<speak><phoneme alphabet="x-sampa"\n ph="t_>\na">ta</phoneme></speak>\n',
+    ]
+    malformed = [
+        '<speak>a</speak><!DOCTYPE speak>', '<speak>a</speak>\n<![CDATA[x]]>', '<![CDATA[x]]><speak>a</speak>',
+        '<speak><!DOCTYPE x>a</speak>', '<!DOCTYPE speak>\n<!DOCTYPE speak><speak>a</speak>',
+    ]
+    validators = SSMLValidator(), IncrementalSSMLValidator()
+    baseline = MultipassSSMLValidator()
+    for ssml_text in well_formed + malformed:
+        expected = baseline.validate_ssml_structure(ssml_text)
+        for validator in validators:
+            result = validator.validate_ssml_structure(ssml_text)
+            assert (result['valid'], result['errors']) == (expected['valid'], expected['errors'])
+            if ssml_text in well_formed:
+                assert not any(warning.startswith("Tag nesting") for warning in result['warnings'])
+
+    # CDATA is literal character data: valid, and its words are spoken
+    cdata = declaration + '<speak>Research <![CDATA[R&D <in> labs]]>\n today</speak>'
+    for validator in validators:
+        result = validator.validate_ssml_structure(cdata)
+        assert result['valid'] and result['statistics']['word_count'] == 5
+
+
+def test_incremental_validation_matches_full_validation_across_edits():
+    rng = random.Random(11)
+    snippets = ['</p>', '<p>', '</speak>', '<!-- note\n\nmore -->', '<?xml version="1.0"?>', 'R&D', 'x < y',
+                '<prosody rate="fast">', '</prosody>', '<break time="250ms"/>', '\n', 'word', '<emphasis level="x">',
+                '<break\ntime="1s"/>', '<phoneme alphabet="x-sampa"\nph="p_>a">', '<![CDATA[a <b>\n]]>',
+                '<!DOCTYPE speak>', '<!DOCTYPE s [\n<!ENTITY a "b">\n]>', "it's", '"', '\n\n  ']
+    full, incremental = SSMLValidator(), IncrementalSSMLValidator()
+
+    # Malformed documents whose offending text run starts in an earlier block
+    declaration = '<?xml version="1.0"?>\n'
+    for ssml_text in [declaration + "it's<speak>a</speak>", declaration + '\n\n  "x"\n<speak>a</speak>',
+                      declaration + '<speak>a</speak>\n\nafter', declaration + '<speak>\n  \nR&D\n</speak>',
+                      declaration + '<speak>a</speak>\n<![CDATA[x]]>', declaration + '<speak>\n</p>\n</speak>']:
+        expected = full.validate_ssml_structure(ssml_text)
+        assert not expected['valid']
+        assert incremental.validate_ssml_structure(ssml_text) == expected
+    with open(sorted(glob.glob(os.path.join(REFERENCE_SCRIPTS_DIR, "*.md")))[0], 'r', encoding='utf-8') as f:
+        ssml_text = reference_script_ssml(f.read(), sentences=True)
+
+    incremental.validate_ssml_structure(ssml_text)
+    position = ssml_text.index('</s>', len(ssml_text) // 2)
+    edited = ssml_text[:position] + ' really' + ssml_text[position:]
+    assert incremental.validate_ssml_structure(edited) == full.validate_ssml_structure(edited)
+    assert incremental.last_run['revalidated_blocks'] == 1
+
+    for _ in range(150):
+        if rng.random() < 0.7:
+            position = rng.randrange(len(ssml_text) + 1)
+            ssml_text = ssml_text[:position] + rng.choice(snippets) + ssml_text[position:]
+        else:
+            position = rng.randrange(len(ssml_text))
+            ssml_text = ssml_text[:position] + ssml_text[position + rng.randint(1, 30):]
+        assert "".join(split_blocks(ssml_text)) == ssml_text
+        assert incremental.validate_ssml_structure(ssml_text) == full.validate_ssml_structure(ssml_text)
+
+
+def test_model_profiles_enable_provider_rules_and_expose_rule_timings():
+    line = '<prosody rate="slow">Nobody <break time="5s"/> knows, <break time="1s"/> really.</prosody>\n'
+    ssml_text = ('<?xml version="1.0"?>\n<speak>\n<!-- <emphasis> in a comment is not a tag -->\n'
+                 + line * 120 + '</speak>\n')
+    generic = SSMLValidator().validate_ssml_structure(ssml_text)
+    assert generic['valid'] and 'rule_timings' not in generic
+
+    validator = SSMLValidator(model="eleven_multilingual_v2", profile_rules=True)
+    result = validator.validate_ssml_structure(ssml_text)
+    assert result['valid']
+    assert [rule.name for rule in validator.rules][-3:] == ["character_limit", "supported_tags", "break_limit"]
+    assert result['warnings'][len(generic['warnings']):] == [
+        f"Exceeds eleven_multilingual_v2 request limit: {len(ssml_text):,}/10,000 chars (needs at least 2 chunks)",
+        "eleven_multilingual_v2 ignores <prosody> (120 tags)",
+    ] + ["Break '5s' exceeds eleven_multilingual_v2 maximum of 3s"] * 120
+    assert set(result['rule_timings']) >= {"xml_structure", "statistics", "supported_tags", "break_limit"}
+
+    incremental = IncrementalSSMLValidator(model="eleven_multilingual_v2")
+    assert incremental.validate_ssml_structure(ssml_text) == SSMLValidator(
+        model="eleven_multilingual_v2").validate_ssml_structure(ssml_text)
+
+    with pytest.raises(ValueError):
+        select_rules({"disabled_rules": ["statistics"]})
+    with pytest.raises(ValueError):
+        SSMLValidator(model="no_such_model")
+    assert "phoneme" not in [rule.name for rule in select_rules({"disabled_rules": ["phoneme"]})]
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+STT Validation Tests
+Validates chunk-level transcription, retries and metric merging against a local stub API.
+"""
+
+import sys
+import os
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add archived API clients to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '.archived', 'python-api-clients'))
+
+from http_client import PooledHTTPClient
+from stt_validation import ElevenLabsSTTValidator
+
+
+class _StubSTTHandler(BaseHTTPRequestHandler):
+    """Transcribes an uploaded 'audio' file as its own text; fails the first upload of chunk 2"""
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    uploads = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        part = body[body.index(b"filename="):]
+        content = part[part.index(b"\r\n\r\n") + 4:part.index(b"\r\n--")].decode()
+        with self.lock:
+            self.uploads.append(content)
+            retry_later = content.startswith("chunk two") and self.uploads.count(content) == 1
+
+        if retry_later:
+            response, status = b"busy", 503
+        else:
+            response, status = json.dumps({"text": content}).encode(), 200
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_chunked_validation_retries_per_chunk_and_merges_metrics(tmp_path, monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubSTTHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        sources = [
+            "<speak>chunk one says geoffrey hinton won the turing award</speak>",
+            "<speak>chunk two covers deep learning and neural networks</speak>",
+            "<speak>chunk three reports fifty-six percent of people agree</speak>",
+        ]
+        spoken = [
+            "chunk one says geoffrey hinton won the turing award",
+            "chunk two covers deep learning and neural networks",
+            "chunk three reports sixty percent of people agree",
+        ]
+        chunks = []
+        for i, (source, audio_text) in enumerate(zip(sources, spoken), 1):
+            path = tmp_path / f"chunk_{i:03d}.mp3"
+            path.write_text(audio_text)
+            chunks.append((str(path), source))
+
+        validator = ElevenLabsSTTValidator("test-key", http_client=PooledHTTPClient())
+        validator.base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+        report = validator.validate_episode_chunks(chunks, str(tmp_path / "reports"), max_workers=3)
+
+        assert report["success"] and not report["failed_chunks"]
+        assert [c["attempts"] for c in report["chunks"]] == [1, 2, 1]
+        assert report["weakest_chunks"][0]["chunk_number"] == 3
+
+        metrics = report["accuracy_metrics"]
+        total_words = sum(len(text.split()) for text in spoken)
+        assert metrics["original_word_count"] == total_words
+        assert metrics["word_accuracy_percent"] == round((total_words - 1) / total_words * 100, 2)
+        assert metrics["technical_term_accuracy"]["correct_terms"] == 3
+        assert metrics["statistics_accuracy"]["total_statistics"] == 1
+        assert metrics["statistics_accuracy"]["correct_statistics"] == 0
+        assert metrics["differences_sample"][0]["chunk_number"] == 3
+        assert os.path.exists(tmp_path / "reports" / "chunked_audio_validation_report.json")
+    finally:
+        server.shutdown()
+
+
+def test_perfect_transcript_without_expert_names_scores_full_marks():
+    validator = ElevenLabsSTTValidator("test-key", http_client=PooledHTTPClient())
+    text = "chunk two covers deep learning and neural networks"
+    metrics = validator.calculate_accuracy_metrics(text, text)
+
+    assert metrics["expert_name_accuracy"]["accuracy_percent"] == 100
+    assert metrics["expert_name_accuracy"]["total_names"] == 0
+    assert metrics["composite_quality_score"] == 100
+
+    merged = validator.merge_chunk_metrics([metrics, validator.calculate_accuracy_metrics(
+        "geoffrey hinton won the turing award", "geoffrey hinton won the turing award")])
+    assert merged["expert_name_accuracy"]["total_names"] == 1
+    assert merged["expert_name_accuracy"]["accuracy_percent"] == 100
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Term Matcher Tests
+Validates the Aho-Corasick glossary matcher and its use in STT validation.
+"""
+
+import sys
+import os
+import json
+import random
+
+# Add archived API clients to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '.archived', 'python-api-clients'))
+
+from term_matcher import TermMatcher, build_glossary_matcher, load_glossary
+from stt_validation import ElevenLabsSTTValidator
+
+
+def test_matcher_finds_every_overlapping_occurrence():
+    rng = random.Random(5)
+    for _ in range(200):
+        patterns = {"".join(rng.choice("ab") for _ in range(rng.randint(1, 4))) for _ in range(6)}
+        text = "".join(rng.choice("ab") for _ in range(40))
+        matcher = TermMatcher(whole_words=False)
+        for pattern in patterns:
+            matcher.add(pattern)
+
+        found = sorted((m.start, m.end, m.surface) for m in matcher.find_all(text))
+        expected = sorted((i, i + len(p), p) for p in patterns for i in range(len(text)) if text.startswith(p, i))
+        assert found == expected
+
+    words = TermMatcher()
+    words.add("ai")
+    assert [(m.start, m.end) for m in words.find_all("She said AI twice: ai.")] == [(9, 11), (19, 21)]
+
+
+def test_series_glossary_drives_validator_checks(tmp_path):
+    glossary = {
+        "technical_terms": [{"term": "large language model", "variants": ["llm"]}]
+                           + [f"term number {i}" for i in range(3000)],
+        "statistics": ["forty-two percent"],
+        "expert_names": ["fei-fei li", "demis hassabis"]
+    }
+    path = tmp_path / "glossary.json"
+    path.write_text(json.dumps(glossary))
+    assert load_glossary(str(path)) == glossary
+    assert len(build_glossary_matcher(glossary)) > 3000
+
+    validator = ElevenLabsSTTValidator("test-key", glossary_path=str(path))
+    original = "<speak>Demis Hassabis said a large language model is right forty-two percent of the time.</speak>"
+    transcript = "demis-hassabis said an llm is right forty two percent of the time"
+    metrics = validator.calculate_accuracy_metrics(original, transcript)
+
+    assert metrics["technical_term_accuracy"]["correct_terms"] == 1
+    assert metrics["statistics_accuracy"]["correct_statistics"] == 1
+    names = metrics["expert_name_accuracy"]
+    assert names["correct_names"] == 1 and names["total_names"] == 1
+    assert names["name_details"][0]["positions"] == [(0, 14)]
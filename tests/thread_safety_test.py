@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Thread Safety Module Tests
+Validates queueing, backpressure and lifecycle of the episode processor.
+"""
+
+import sys
+import os
+import time
+
+# Add production modules to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'nobody-knows', 'production'))
+
+from thread_safety import ThreadSafeEpisodeProcessor, QueueFullPolicy
+from cancellation import CancellationToken, TaskCancelledError
+
+
+def _blocked_processor(**kwargs):
+    """Processor whose workers are stalled so the queue fills up"""
+    processor = ThreadSafeEpisodeProcessor(max_concurrent_episodes=1, **kwargs)
+    processor._process_research_phase = lambda episode_id, data, *args: time.sleep(0.3) or {}
+    return processor
+
+
+def test_reject_policy_refuses_when_full():
+    processor = _blocked_processor(max_queue_size=1, queue_full_policy="reject")
+    try:
+        results = processor.submit_batch([
+            {"episode_id": f"ep_{i}", "task_type": "research", "data": {"topic": i}}
+            for i in range(4)
+        ])
+        # One entry per submission; rejected ones are None
+        assert len(results) == 4 and results[0] is not None
+        assert None in results
+        assert processor.get_status()["statistics"]["submissions_rejected"] == results.count(None)
+        assert len(list(processor.as_completed(results, timeout=5.0))) == 4 - results.count(None)
+    finally:
+        processor.shutdown(timeout=5.0)
+
+
+def test_spill_policy_keeps_queue_bounded_and_completes():
+    processor = _blocked_processor(max_queue_size=1, queue_full_policy=QueueFullPolicy.SPILL)
+    try:
+        payload = {"research": "x" * 100_000}
+        for i in range(5):
+            assert processor.submit_episode(f"ep_{i}", "research", payload)
+
+        status = processor.get_status()
+        assert status["queue_size"] <= 1
+        assert status["spilled_tasks"] >= 1
+
+        assert processor.wait_for_completion(timeout=10.0)
+        processor.task_queue.join()
+        status = processor.get_status()
+        assert status["statistics"]["episodes_processed"] == 5
+        assert status["payload_store_bytes"] == 0
+    finally:
+        processor.shutdown(timeout=5.0)
+
+
+def test_spilled_tasks_are_refed_by_priority():
+    processor = ThreadSafeEpisodeProcessor(max_concurrent_episodes=1, max_queue_size=1,
+                                           queue_full_policy=QueueFullPolicy.SPILL)
+    order = []
+    processor._process_research_phase = lambda episode_id, data, *args: order.append(episode_id) or time.sleep(0.1) or {}
+    try:
+        assert processor.submit_episode("running", "research", {})
+        time.sleep(0.05)
+        assert processor.submit_episode("queued", "research", {})
+        for i in range(3):
+            assert processor.submit_episode(f"low_{i}", "research", {}, priority=9)
+        # Spilled after the low-priority tasks, but must not wait behind them
+        assert processor.submit_episode("urgent", "research", {}, priority=1)
+        assert processor.get_status()["spilled_tasks"] == 4
+
+        processor.task_queue.join()
+        assert order == ["running", "queued", "urgent", "low_0", "low_1", "low_2"]
+    finally:
+        processor.shutdown(timeout=5.0)
+
+
+def test_block_policy_times_out():
+    processor = _blocked_processor(max_queue_size=1, submit_timeout=0.05)
+    try:
+        results = [processor.submit_episode(f"ep_{i}", "research", {}) for i in range(4)]
+        assert results.count(None) >= 1
+    finally:
+        processor.shutdown(timeout=5.0)
+
+
+def test_lock_table_is_bounded_and_stats_merge_across_workers():
+    processor = ThreadSafeEpisodeProcessor(max_concurrent_episodes=3, lock_stripes=8)
+    processor._process_research_phase = lambda episode_id, data, *args: time.sleep(0.01) or {}
+    try:
+        for i in range(30):
+            assert processor.submit_episode(f"ep_{i}", "research", {})
+        processor.task_queue.join()
+
+        assert len(processor.episode_locks) == 8
+        stats = processor.get_status()["statistics"]
+        assert stats["episodes_processed"] == 30
+        percentiles = stats["processing_time_percentiles"]
+        assert percentiles["count"] == 30
+        assert 0.005 < percentiles["p50"] <= percentiles["p99"]
+    finally:
+        processor.shutdown(timeout=5.0)
+
+
+def test_stuck_phase_is_timed_out_and_worker_replaced():
+    processor = ThreadSafeEpisodeProcessor(
+        max_concurrent_episodes=1,
+        task_timeouts={"audio": 0.2},
+        cancel_grace_period=0.1
+    )
+    # Ignores its token entirely, like a hung HTTP call
+    processor._process_audio_phase = lambda episode_id, data, *args: time.sleep(2.0) or {}
+    released = []
+    token = CancellationToken()
+    token.add_callback(released.append)
+    try:
+        assert processor.submit_episode("ep_stuck", "audio", {}, cancel_token=token)
+        assert processor.submit_episode("ep_next", "research", {})
+
+        # The research task must not wait for the 2s hung audio call
+        assert processor.wait_for_completion(timeout=1.5)
+        processor.task_queue.join()
+
+        assert released and "deadline" in released[0]
+        stats = processor.get_status()["statistics"]
+        assert stats["workers_abandoned"] == 1
+        assert stats["episodes_processed"] == 1
+    finally:
+        processor.shutdown(timeout=1.0)
+
+
+def test_cancel_episode_skips_queued_tasks():
+    processor = _blocked_processor()
+    try:
+        processor.submit_episode("ep_a", "research", {})
+        for _ in range(3):
+            processor.submit_episode("ep_b", "script", {})
+        assert processor.cancel_episode("ep_b") == 3
+
+        processor.task_queue.join()
+        stats = processor.get_status()["statistics"]
+        assert stats["episodes_cancelled"] == 3
+        assert stats["episodes_processed"] == 1
+    finally:
+        processor.shutdown(timeout=5.0)
+
+
+def test_futures_deliver_results_and_progress():
+    processor = ThreadSafeEpisodeProcessor(max_concurrent_episodes=2)
+    try:
+        events = []
+        audio = processor.submit_episode("ep_1", "audio", {"chunks": ["a", "b", "c"]})
+        audio.add_progress_callback(events.append)
+        research = processor.submit_batch([
+            {"episode_id": f"ep_{i}", "task_type": "research", "data": {}} for i in range(3)
+        ])
+
+        completed = list(processor.as_completed(research + [audio], timeout=5.0))
+        assert len(completed) == 4
+        assert research[0].result()["cost"] == 1.50
+        assert audio.result()["chunks_synthesized"] == 3
+        assert [e.current for e in audio.iter_progress(timeout=1.0)] == [1, 2, 3]
+        assert events[-1].current == events[-1].total == 3
+    finally:
+        processor.shutdown(timeout=5.0)
+
+
+def test_cancelling_future_interrupts_running_phase():
+    processor = ThreadSafeEpisodeProcessor(max_concurrent_episodes=1)
+    try:
+        script = processor.submit_episode("ep_1", "script", {})
+        time.sleep(0.1)
+        script.cancel()
+        try:
+            script.result(timeout=1.0)
+            assert False, "cancelled task returned a result"
+        except TaskCancelledError:
+            pass
+    finally:
+        processor.shutdown(timeout=5.0)
+
+
+def test_abandoned_worker_is_tracked_apart_and_its_episode_stays_busy():
+    processor = ThreadSafeEpisodeProcessor(
+        max_concurrent_episodes=2,
+        task_timeouts={"audio": 0.1},
+        cancel_grace_period=0.1
+    )
+    running = []
+
+    def stuck_audio(episode_id, data, *args):
+        running.append(("audio", episode_id))
+        time.sleep(1.0)
+        running.remove(("audio", episode_id))
+        return {}
+
+    def research(episode_id, data, *args):
+        # The abandoned audio phase of the same episode must have returned
+        assert ("audio", episode_id) not in running
+        return {}
+
+    processor._process_audio_phase = stuck_audio
+    processor._process_research_phase = research
+    try:
+        processor.submit_episode("ep_stuck", "audio", {})
+        time.sleep(0.05)
+        follow_up = processor.submit_episode("ep_stuck", "research", {})
+        other = processor.submit_episode("ep_other", "research", {})
+
+        assert other.result(timeout=1.0) == {}
+        deadline = time.time() + 1.0
+        while len(processor.abandoned_threads) + len(processor.worker_threads) < 3 and time.time() < deadline:
+            time.sleep(0.01)  # the watchdog is still starting the replacement
+        status = processor.get_status()
+        assert not follow_up.done()
+        assert status["worker_threads_alive"] == 2
+        assert status["abandoned_threads_alive"] == 1
+        assert len(processor.worker_threads) == 2
+
+        assert follow_up.result(timeout=3.0) == {}
+        processor.task_queue.join()
+        assert processor.abandoned_threads == []
+        assert processor.get_status()["statistics"]["workers_abandoned"] == 1
+    finally:
+        processor.shutdown(timeout=2.0)
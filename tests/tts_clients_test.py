@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+TTS/STT Client Tests
+Validates caching and pipeline helpers of the archived ElevenLabs clients.
+"""
+
+import sys
+import os
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Add archived API clients to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '.archived', 'python-api-clients'))
+
+from tts_cache import TTSAudioCache, normalize_ssml
+from rate_limiter import TokenBucket
+from tts_direct_api import ElevenLabsDirectAPI
+from http_client import PooledHTTPClient
+
+VOICE_SETTINGS = {"stability": 0.65, "similarity_boost": 0.8, "style": 0.3, "use_speaker_boost": True}
+
+
+def test_tts_cache_keys_ignore_formatting_but_not_voice(tmp_path):
+    a = '<speak>\n  <prosody rate="95%">Hello there</prosody>\n  <break time=\'1s\' />\n</speak>'
+    b = '<speak><prosody rate="95%">Hello there</prosody><break time="1s"/></speak>'
+    assert normalize_ssml(a) == normalize_ssml(b)
+
+    # Spoken whitespace between inline elements and quotes in text are part of the audio
+    for spaced, joined in (('<emphasis>Hello</emphasis> <emphasis>world</emphasis>',
+                            '<emphasis>Hello</emphasis><emphasis>world</emphasis>'),
+                           ("<speak>He said ='hi'</speak>", '<speak>He said ="hi"</speak>')):
+        assert (TTSAudioCache.make_key(spaced, "voice", "eleven_turbo_v2_5", VOICE_SETTINGS)
+                != TTSAudioCache.make_key(joined, "voice", "eleven_turbo_v2_5", VOICE_SETTINGS))
+    assert normalize_ssml('<phoneme alphabet = "x-sampa" ph=\'p_>a\'>pa</phoneme>') == \
+        '<phoneme alphabet="x-sampa" ph="p_>a">pa</phoneme>'
+    stray = "<speak>Is 3 < 4? It's <emphasis>true</emphasis>, isn't it ='yes'></speak>"
+    assert normalize_ssml(stray) == stray
+
+    key = TTSAudioCache.make_key(a, "voice", "eleven_turbo_v2_5", VOICE_SETTINGS)
+    assert key == TTSAudioCache.make_key(b, "voice", "eleven_turbo_v2_5", VOICE_SETTINGS)
+    assert key != TTSAudioCache.make_key(b, "other_voice", "eleven_turbo_v2_5", VOICE_SETTINGS)
+    assert key != TTSAudioCache.make_key(b, "voice", "eleven_turbo_v2_5", {**VOICE_SETTINGS, "style": 0.5})
+
+    cache = TTSAudioCache(str(tmp_path))
+    assert cache.get(key, characters=1000) is None
+    cache.put(key, b"ID3fake-mp3")
+    assert cache.get(key, characters=1000) == b"ID3fake-mp3"
+
+    stats = cache.get_stats()
+    assert stats["cache_hits"] == 1 and stats["cache_misses"] == 1
+    assert stats["dollars_saved"] == 0.18
+
+
+class _StubTTSHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the ElevenLabs API: echoes the text as 'audio'"""
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    rate_limit_first = True
+    lock = threading.Lock()
+    requests_seen = 0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.lock:
+            type(self).requests_seen += 1
+            limited = type(self).rate_limit_first
+            type(self).rate_limit_first = False
+
+        if limited:
+            self.send_response(429)
+            self.send_header("Retry-After", "0.2")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        audio = body["text"].encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.send_header("Content-Length", str(len(audio)))
+        self.end_headers()
+        self.wfile.write(audio)
+
+    def do_GET(self):
+        body = json.dumps({"voices": []}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubTTSHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def test_token_bucket_limits_rate_and_pauses():
+    bucket = TokenBucket(rate=50.0, capacity=2)
+    assert bucket.acquire(timeout=0) and bucket.acquire(timeout=0)
+    assert not bucket.acquire(timeout=0)
+    assert bucket.acquire(timeout=0.1)
+
+    bucket.pause(10)
+    assert not bucket.acquire(timeout=0.05)
+    assert bucket.get_stats()["provider_pauses"] == 1
+    with pytest.raises(ValueError):
+        bucket.acquire(3)
+
+
+def test_token_bucket_refills_only_after_a_pause_ends():
+    bucket = TokenBucket(rate=10.0, capacity=3)
+    bucket.pause(0.2)
+    time.sleep(0.3)
+    # About 0.1s of refill since the pause ended: one request, not a full burst
+    assert bucket.acquire(timeout=0)
+    assert not bucket.acquire(timeout=0)
+
+
+def test_concurrent_synthesis_keeps_chunk_order_and_honors_retry_after(tmp_path):
+    server, base_url = _stub_server()
+    try:
+        script = tmp_path / "script.ssml"
+        script.write_text("<speak>" + "".join(
+            f'<prosody rate="95%">Paragraph number {i} of the episode.</prosody>' for i in range(8)
+        ) + "</speak>")
+
+        client = ElevenLabsDirectAPI("test-key", cache_dir=None, max_concurrency=4,
+                                     requests_per_second=100, burst=4, base_url=base_url,
+                                     http_client=PooledHTTPClient(pool_maxsize=4))
+        chunks = client.chunk_large_text(script.read_text(), max_chunk_size=60)
+        log = client.synthesize_episode(str(script), str(tmp_path / "audio"), "ep_test", max_chunk_size=60)
+
+        assert log["chunks_synthesized"] == len(chunks) and not log["failed_chunks"]
+        assert [r["chunk_number"] for r in log["audio_files"]] == list(range(1, len(chunks) + 1))
+        for record, chunk in zip(log["audio_files"], chunks):
+            with open(record["file_path"], "rb") as f:
+                assert f.read() == chunk.encode()
+        assert log["rate_limiter"]["provider_pauses"] == 1
+        assert _StubTTSHandler.requests_seen == len(chunks) + 1
+    finally:
+        server.shutdown()
+
+
+def test_pooled_client_reuses_connections_and_times_phases():
+    server, base_url = _stub_server()
+    http = PooledHTTPClient(pool_maxsize=2, host_limits={"127.0.0.1": 1})
+    try:
+        for _ in range(5):
+            response = http.get(f"{base_url}/voices", timeout=5)
+            assert response.status_code == 200
+            assert response.timing.total >= response.timing.ttfb
+
+        stats = http.get_stats()
+        assert stats["requests"] == 5
+        assert stats["connections_opened"] == 1
+        assert stats["connection_reuse_rate"] == 0.8
+        first = http.recent_timings()[0]
+        assert not first["reused_connection"] and first["connect"] > 0
+    finally:
+        http.close()
+        server.shutdown()
+
+
+def test_pooled_client_falls_back_across_resolved_addresses(monkeypatch):
+    import socket
+
+    server, base_url = _stub_server()
+    port = server.server_address[1]
+    real_getaddrinfo = socket.getaddrinfo
+
+    def dual_stack(host, *args, **kwargs):
+        if host != "dual-stack.test":
+            return real_getaddrinfo(host, *args, **kwargs)
+        # The first address refuses connections, like a host with broken IPv6
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, port)) for address in ("127.0.0.2", "127.0.0.1")]
+
+    monkeypatch.setattr(socket, "getaddrinfo", dual_stack)
+    http = PooledHTTPClient()
+    try:
+        response = http.get(f"http://dual-stack.test:{port}/v1/voices", timeout=5)
+        assert response.status_code == 200
+        assert not response.timing.reused_connection and response.timing.connect > 0
+    finally:
+        http.close()
+        server.shutdown()
+
+
+def test_streamed_synthesis_writes_blocks_and_fills_cache(tmp_path):
+    import hashlib
+
+    server, base_url = _stub_server()
+    _StubTTSHandler.rate_limit_first = False
+    try:
+        client = ElevenLabsDirectAPI("test-key", cache_dir=str(tmp_path / "cache"), base_url=base_url,
+                                     http_client=PooledHTTPClient())
+        text = "<speak>" + "Streaming audio block. " * 5000 + "</speak>"
+        progress = []
+        output = tmp_path / "chunk.mp3"
+
+        result = client.synthesize_chunk(text, str(output),
+                                         progress_callback=lambda done, total: progress.append((done, total)))
+        assert result["success"] and not result["cached"]
+        assert result["sha256"] == hashlib.sha256(text.encode()).hexdigest()
+        assert len(progress) > 1 and progress[-1] == (len(text), len(text))
+        assert not list(tmp_path.glob("*.part"))
+
+        # The streamed file is linked into the cache, not copied
+        assert output.stat().st_nlink == 2
+        again = tmp_path / "again.mp3"
+        assert client.synthesize_chunk(text, str(again))["cached"]
+        assert again.read_bytes() == output.read_bytes()
+        assert again.stat().st_nlink == 1
+
+        # Rewriting the linked output in place changes the entry too: the digest check turns it into a miss
+        with open(output, "r+b") as f:
+            f.write(b"XX")
+        assert not client.cache.copy_to(TTSAudioCache.make_key(text, client.voice_id, "eleven_turbo_v2_5",
+                                                               client.voice_settings), str(again))
+        assert again.read_bytes() == text.encode()
+        assert not client.cache.put_file("k" * 64, str(output), size=len(text) + 1)
+    finally:
+        server.shutdown()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Word Alignment Tests
+Validates the Myers diff and banded edit distance against reference implementations.
+"""
+
+import sys
+import os
+import random
+import difflib
+
+# Add archived API clients to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '.archived', 'python-api-clients'))
+
+from word_alignment import align_texts, compare_with_difflib, edit_distance, matching_blocks, opcodes_from_blocks
+
+
+def _levenshtein(a, b):
+    previous = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        current = [i]
+        for j, y in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (x != y)))
+        previous = current
+    return previous[-1]
+
+
+def test_edit_distance_and_diff_match_reference_implementations():
+    rng = random.Random(7)
+    for _ in range(300):
+        a = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 25)))
+        b = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 25)))
+        assert edit_distance(a, b, band=1) == _levenshtein(a, b)
+
+        blocks = matching_blocks(a, b)
+        lcs = sum(size for _, _, size in blocks)
+        assert len(a) + len(b) - 2 * lcs == edit_distance(a, b, substitution_cost=2)
+        difflib_matches = difflib.SequenceMatcher(None, a, b, autojunk=False).get_matching_blocks()
+        assert lcs >= sum(block.size for block in difflib_matches)
+
+        # Applying the opcodes to a must reproduce b
+        rebuilt = "".join(b[j1:j2] if tag != "equal" else a[i1:i2]
+                          for tag, i1, i2, j1, j2 in opcodes_from_blocks(blocks, len(a), len(b)))
+        assert rebuilt == b
+
+
+def test_alignment_reports_wer_cer_and_matches_difflib_word_accuracy():
+    rng = random.Random(3)
+    # Large vocabulary, so difflib's popular-word heuristic does not junk everything
+    vocabulary = [f"term{i}" for i in range(600)]
+    reference = [rng.choice(vocabulary) for _ in range(2000)]
+    hypothesis = []
+    for word in reference:
+        roll = rng.random()
+        if roll < 0.03:
+            hypothesis.append(rng.choice(vocabulary) + "s")
+        elif roll > 0.99:
+            continue
+        else:
+            hypothesis.append(word)
+
+    result = align_texts(" ".join(reference), " ".join(hypothesis))
+    assert result.wer == edit_distance(reference, hypothesis) / len(reference)
+    assert 0 < result.cer < 0.05
+    assert result.differences(limit=3)[0]["type"] in ("replace", "delete")
+
+    report = compare_with_difflib(" ".join(reference), " ".join(hypothesis))
+    engine, baseline = report["alignment_engine"], report["difflib"]
+    assert abs(engine["word_accuracy_percent"] - baseline["word_accuracy_percent"]) < 0.5